@@ -5,7 +5,7 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-from redis_client import redis
+from redis_client import cache
 
 
 # Load environment variables from mongo/.env file
@@ -58,15 +58,8 @@ from routes.performance_analytics import performance_analytics_router
 from routes.career_simulation import career_simulation_router
 from routes.githubAPI import github_router
 from routes.salaryBLS import salaryBLS_router
-from services.referral_reminder_scheduler import start_referral_reminder_scheduler, stop_referral_reminder_scheduler
-from services.referral_followup_scheduler import start_referral_followup_scheduler, stop_referral_followup_scheduler
-from services.event_reminder_scheduler import start_event_reminder_scheduler, stop_event_reminder_scheduler
-from services.interview_reminder_scheduler import start_interview_reminder_scheduler, stop_interview_reminder_scheduler
-from services.background_scheduler_service import start_scheduler, stop_scheduler
-from services.application_workflow_scheduler import (
-    start_workflow_scheduler,
-    stop_workflow_scheduler
-)
+from services.job_runner import job_runner, embedded_runner_enabled
+from services.scheduled_jobs import register_jobs
 from routes.salary_research_routes import salary_research_router
 from routes.api_metrics import router as api_metrics_router
 from routes.emails_router import emails_router
@@ -74,6 +67,15 @@ from routes.extension_import import extension_import_router
 from routes.material_comparison_router import material_comparison_router
 from routes.badges import badges_router
 from routes.problem_submissions import problem_submissions_router
+from services.api_telemetry import api_telemetry
+from services.job_queue import job_queue
+from services.browser_pool import browser_pool
+from services.code_execution import code_executor
+from services.notification_dispatcher import notification_dispatcher
+from services.github_sync import github_client
+from services.skill_taxonomy import skill_taxonomy
+from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry, import_dao_modules, STRICT as STRICT_INDEXES
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -226,35 +228,50 @@ app.include_router(career_simulation_router, prefix = api_prefix)
 async def startup_event():
     """Backend startup initialization"""
     print("[Startup] Backend ready!")
-    # Start referral reminder scheduler
-    try:
-        start_referral_reminder_scheduler()
-    except Exception as e:
-        print(f"[Startup] Warning: Could not start referral reminder scheduler: {e}")
-    # Start referral follow-up scheduler
+    # Start batched API telemetry flusher
+    api_telemetry.start()
+    # Start the outbound email worker shared by the reminder services
+    notification_dispatcher.start()
+    # Build missing indexes declared by the DAOs and report drift
     try:
-        start_referral_followup_scheduler()
+        import_dao_modules()
+        await index_registry.reconcile(db_client)
     except Exception as e:
-        print(f"[Startup] Warning: Could not start referral follow-up scheduler: {e}")
-    # Start event reminder scheduler
+        if STRICT_INDEXES:
+            raise
+        print(f"[Startup] Warning: Could not reconcile Mongo indexes: {e}")
+    # Compile the skill taxonomy used by requirement extraction and matching, then poll for new versions
     try:
-        start_event_reminder_scheduler()
+        await skill_taxonomy.refresh()
     except Exception as e:
-        print(f"[Startup] Warning: Could not start event reminder scheduler: {e}")
-    # Start interview reminder scheduler
+        print(f"[Startup] Warning: Could not load skill taxonomy (using built-in defaults): {e}")
+    skill_taxonomy.start()
+    # Launch the shared headless browser used by PDF export and job scraping
     try:
-        start_interview_reminder_scheduler()
+        browser_pool.start()
+        await browser_pool.warm()
     except Exception as e:
-        print(f"[Startup] Warning: Could not start interview reminder scheduler: {e}")
-    # Start workflow automation scheduler
+        print(f"[Startup] Warning: Could not launch pooled browser (will retry on first use): {e}")
+    # Technical prep grading needs the code execution sandbox; say so now rather than per submission
     try:
-        start_workflow_scheduler()
+        if not await code_executor.sandbox_available():
+            print("[Startup] Warning: Code execution sandbox unavailable, technical prep submissions "
+                  "will not be graded (the API needs root with CAP_SYS_ADMIN, see Dockerfile)")
     except Exception as e:
-        print(f"[Startup] Warning: Could not start workflow automation scheduler: {e}")
+        print(f"[Startup] Warning: Could not check the code execution sandbox: {e}")
+    # Start durable background job workers (post-create job research)
     try:
-        start_scheduler()
+        await job_queue.start()
     except Exception as e:
-        print(f"[Startup] Warning: Could not start sheduele reminder scheduler: {e}")
+        print(f"[Startup] Warning: Could not start job queue workers: {e}")
+    # Start the periodic background jobs (reminders, scheduled submissions, rollups).
+    # A Mongo lease runs each job once per cluster; JOB_RUNNER=off leaves them to scripts/run_jobs.py
+    if embedded_runner_enabled():
+        try:
+            register_jobs()
+            await job_runner.start()
+        except Exception as e:
+            print(f"[Startup] Warning: Could not start background job runner: {e}")
 
 
 
@@ -262,35 +279,39 @@ async def startup_event():
 async def shutdown_event():
     """Backend shutdown cleanup"""
     print("[Shutdown] Cleaning up...")
-    # Stop referral reminder scheduler
+    # Stop claiming periodic jobs; a job cut short is re-run once its lease lapses
     try:
-        stop_referral_reminder_scheduler()
+        await job_runner.stop()
     except Exception as e:
-        print(f"[Shutdown] Warning: Could not stop referral reminder scheduler: {e}")
-    # Stop referral follow-up scheduler
+        print(f"[Shutdown] Warning: Could not stop background job runner: {e}")
+    # Stop background job workers; in-flight tasks are re-claimed after their lease expires
     try:
-        stop_referral_followup_scheduler()
+        await job_queue.stop()
     except Exception as e:
-        print(f"[Shutdown] Warning: Could not stop referral follow-up scheduler: {e}")
-    # Stop event reminder scheduler
+        print(f"[Shutdown] Warning: Could not stop job queue workers: {e}")
+    await skill_taxonomy.stop()
+    # Send queued notification emails and close the SMTP connection
     try:
-        stop_event_reminder_scheduler()
+        await notification_dispatcher.stop()
     except Exception as e:
-        print(f"[Shutdown] Warning: Could not stop event reminder scheduler: {e}")
-    # Stop interview reminder scheduler
+        print(f"[Shutdown] Warning: Could not stop notification dispatcher: {e}")
+    # Close the pooled browser
     try:
-        stop_interview_reminder_scheduler()
+        await browser_pool.stop()
     except Exception as e:
-        print(f"[Shutdown] Warning: Could not stop interview reminder scheduler: {e}")
-    # Stop workflow automation scheduler
+        print(f"[Shutdown] Warning: Could not stop browser pool: {e}")
+    # Close pooled GitHub API connections
     try:
-        stop_workflow_scheduler()
+        await github_client.aclose()
     except Exception as e:
-        print(f"[Shutdown] Warning: Could not stop workflow automation scheduler: {e}")
+        print(f"[Shutdown] Warning: Could not close GitHub client: {e}")
+    # Drain buffered API telemetry
     try:
-        stop_scheduler()
+        await api_telemetry.stop()
     except Exception as e:
-        print(f"[Shutdown] Warning: Could not stop schedueler scheduler: {e}")
+        print(f"[Shutdown] Warning: Could not flush API telemetry: {e}")
+    # Release pooled cache connections
+    await cache.close()
 
 @app.get("/api/csrf-token")
 def get_csrf_token(response: Response):
@@ -1,8 +1,13 @@
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime
 from typing import List, Optional
 
+
+index_registry.declare("advisor_engagements", "user_uuid")
+
+
 class AdvisorsDAO:
     def __init__(self):
 
@@ -3,8 +3,17 @@ API Metrics DAO
 Handles all database operations for API call logging, usage tracking, and metrics
 """
 from mongo.dao_setup import db_client, API_CALL_LOGS, API_USAGE_QUOTAS, API_FALLBACK_EVENTS
+from mongo.index_registry import index_registry
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from pymongo import UpdateOne
+
+
+index_registry.declare(API_CALL_LOGS, [("timestamp", -1)])
+index_registry.declare(API_CALL_LOGS, [("success", 1), ("timestamp", -1)])
+index_registry.declare(API_FALLBACK_EVENTS, [("timestamp", -1)])
+index_registry.declare(API_USAGE_QUOTAS, [("provider", 1), ("period", 1), ("key_owner", 1)])
+
 
 class APIMetricsDAO:
     def __init__(self):
@@ -69,6 +78,34 @@ class APIMetricsDAO:
             upsert=True
         )
 
+    async def insert_call_logs(self, log_entries: List[Dict]) -> int:
+        """Insert a batch of API call logs in one round trip"""
+        if not log_entries:
+            return 0
+        result = await self.call_logs.insert_many(log_entries, ordered=False)
+        return len(result.inserted_ids)
+
+    async def bulk_increment_usage(self, increments: Dict[Tuple[str, str, str], Dict[str, int]]) -> int:
+        """
+        Apply pre-aggregated usage increments in one bulk write
+
+        Args:
+            increments: {(provider, key_owner, period): {"calls": n, "tokens": n, "errors": n}}
+        """
+        if not increments:
+            return 0
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {"provider": provider, "key_owner": key_owner, "period": period},
+                {"$inc": counters, "$set": {"updated_at": now}},
+                upsert=True
+            )
+            for (provider, key_owner, period), counters in increments.items()
+        ]
+        result = await self.usage_quotas.bulk_write(operations, ordered=False)
+        return result.modified_count + result.upserted_count
+
     async def get_usage_stats(
         self,
         start_date: datetime,
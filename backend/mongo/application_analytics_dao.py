@@ -1,379 +1,596 @@
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional
-from collections import defaultdict
+from typing import Any, List, Dict, Optional
+
+
+index_registry.declare("application_analytics", [("uuid", 1), ("date_created", -1)])
+
+# Analytics run as aggregation pipelines: every metric is a set of named
+# $facet sub-pipelines over the user's jobs plus a small function that shapes
+# the grouped rows into the response. Each endpoint runs one aggregate(), and
+# get_dashboard() runs them all in a single $facet round trip.
+
+ACTIVE = {"archived": {"$ne": True}}
+FUNNEL_STAGES = ["applied", "screening", "interview", "offer", "rejected"]
+RESPONSE_STATUSES = ["screening", "interview", "offer", "rejected"]
+MS_PER_DAY = 86400000
+
+INDUSTRY_BENCHMARKS = {
+    "average_response_time_days": 14,
+    "average_interview_rate": 15.0,  # 15% of applications lead to interviews
+    "average_offer_rate": 3.0,  # 3% of applications lead to offers
+    "average_applications_per_week": 10
+}
+
+
+def _field_or(path: str, default: Any) -> Dict:
+    """doc.get(field, default): only a missing field falls back, null stays null"""
+    return {"$cond": [{"$eq": [{"$type": path}, "missing"]}, default, path]}
+
+
+def _truthy(path: str) -> Dict:
+    """Python truthiness of an id field (Mongo treats "" as true)"""
+    return {"$and": [path, {"$ne": [path, ""]}]}
+
+
+def _status_lower() -> Dict:
+    return {"$toLower": _field_or("$status", "")}
+
+
+def _week_start(path: str) -> Dict:
+    """Monday of the (UTC) week containing the date, as YYYY-MM-DD"""
+    days_since_monday = {"$subtract": [{"$isoDayOfWeek": path}, 1]}
+    return {"$dateToString": {
+        "format": "%Y-%m-%d",
+        "date": {"$subtract": [path, {"$multiply": [days_since_monday, MS_PER_DAY]}]},
+    }}
+
+
+def _company_name(path: str = "$company") -> Dict:
+    """Company stored either as a name or as a {name: ...} document"""
+    return {"$cond": [
+        {"$eq": [{"$type": path}, "object"]},
+        _field_or(f"{path}.name", "Unknown"),
+        _field_or(path, "Unknown"),
+    ]}
+
+
+def _group_key(group_by: Optional[str]) -> Any:
+    if group_by == "company":
+        return _company_name()
+    if group_by == "industry":
+        return _field_or("$industry", "Unknown")
+    if group_by == "job_type":
+        return _field_or("$job_type", "Unknown")
+    if group_by == "materials":
+        has_resume = _truthy("$materials.resume_id")
+        has_cover_letter = _truthy("$materials.cover_letter_id")
+        return {"$switch": {
+            "branches": [
+                {"case": {"$and": [has_resume, has_cover_letter]}, "then": "Resume + Cover Letter"},
+                {"case": has_resume, "then": "Resume Only"},
+                {"case": has_cover_letter, "then": "Cover Letter Only"},
+            ],
+            "default": "No Materials",
+        }}
+    return "overall"
+
+
+def _avg(total: float, count: int) -> float:
+    return round(total / count, 1) if count else 0
+
+
+# --------------------------------------------
+# Facet builders: {facet name: [stages]}
+# --------------------------------------------
+
+def _funnel_facets(date_range: Optional[Dict] = None) -> Dict[str, List[Dict]]:
+    match = dict(ACTIVE)
+    if date_range:
+        match["date_created"] = {"$gte": date_range.get("start"), "$lte": date_range.get("end")}
+    return {"funnel": [
+        {"$match": match},
+        {"$group": {"_id": _status_lower(), "count": {"$sum": 1}}},
+    ]}
+
+
+def _response_time_facets(group_by: Optional[str] = None, name: str = "response_times") -> Dict[str, List[Dict]]:
+    # [status, timestamp] pairs; anything else in the history is ignored
+    entries = {"$map": {
+        "input": {"$filter": {
+            "input": "$status_history",
+            "as": "e",
+            "cond": {"$cond": [{"$isArray": "$$e"}, {"$gte": [{"$size": "$$e"}, 2]}, False]},
+        }},
+        "as": "e",
+        "in": {
+            "status": {"$toLower": {"$arrayElemAt": ["$$e", 0]}},
+            "at": {"$convert": {"input": {"$arrayElemAt": ["$$e", 1]}, "to": "date", "onError": None, "onNull": None}},
+        },
+    }}
+    # First "applied" entry, then the first response after the history starts
+    # responding; a response logged before any "applied" entry ends the scan
+    first_response = {"$reduce": {
+        "input": entries,
+        "initialValue": {"applied": None, "response": None, "done": False},
+        "in": {"$cond": [
+            "$$value.done",
+            "$$value",
+            {"$cond": [
+                {"$and": [{"$eq": ["$$this.status", "applied"]}, {"$eq": ["$$value.applied", None]}]},
+                {"applied": "$$this.at", "response": None, "done": False},
+                {"$cond": [
+                    {"$in": ["$$this.status", RESPONSE_STATUSES]},
+                    {"applied": "$$value.applied", "response": "$$this.at", "done": True},
+                    "$$value",
+                ]},
+            ]},
+        ]},
+    }}
+    return {name: [
+        {"$match": {**ACTIVE, "status_history.1": {"$exists": True}}},
+        {"$project": {"key": _group_key(group_by), "first": first_response}},
+        {"$match": {"first.applied": {"$ne": None}, "first.response": {"$ne": None}}},
+        {"$project": {"key": 1, "days": {"$floor": {
+            "$divide": [{"$subtract": ["$first.response", "$first.applied"]}, MS_PER_DAY]
+        }}}},
+        {"$group": {
+            "_id": "$key",
+            "total": {"$sum": "$days"},
+            "count": {"$sum": 1},
+            "min": {"$min": "$days"},
+            "max": {"$max": "$days"},
+        }},
+    ]}
+
+
+def _success_rate_facets(group_by: Optional[str] = None, name: str = "success_rates") -> Dict[str, List[Dict]]:
+    status = _status_lower()
+    return {name: [
+        {"$match": ACTIVE},
+        {"$group": {
+            "_id": _group_key(group_by),
+            "total": {"$sum": 1},
+            "offers": {"$sum": {"$cond": [{"$eq": [status, "offer"]}, 1, 0]}},
+            "interviews": {"$sum": {"$cond": [{"$in": [status, ["interview", "offer"]]}, 1, 0]}},
+        }},
+    ]}
+
+
+def _trend_facets(days: int) -> Dict[str, List[Dict]]:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    match = {"$match": {**ACTIVE, "date_created": {"$gte": cutoff}}}
+    return {
+        f"trends_{days}_weekly": [match, {"$group": {"_id": _week_start("$date_created"), "count": {"$sum": 1}}}],
+        f"trends_{days}_status": [match, {"$group": {"_id": _field_or("$status", "Unknown"), "count": {"$sum": 1}}}],
+    }
+
+
+def _response_metric_facets() -> Dict[str, List[Dict]]:
+    responded = {"$match": {
+        **ACTIVE,
+        "response_tracking.responded_at": {"$ne": None},
+        "response_tracking.response_days": {"$ne": None},
+    }}
+    days = "$response_tracking.response_days"
+    job_info = {"$project": {
+        "_id": 1,
+        "company": {"$cond": [{"$eq": [{"$type": "$company"}, "string"]}, "$company", _field_or("$company.name", "Unknown")]},
+        "title": _field_or("$title", "Unknown"),
+        "days": days,
+    }}
+    company_size = {"$cond": [
+        {"$eq": [{"$type": "$company_data"}, "object"]},
+        _field_or("$company_data.size", "Unknown"),
+        "Unknown",
+    ]}
+    return {
+        "responded": [responded, {"$group": {"_id": None, "days": {"$push": days}}}],
+        "fastest": [responded, {"$sort": {"response_tracking.response_days": 1, "_id": 1}}, {"$limit": 1}, job_info],
+        "slowest": [responded, {"$sort": {"response_tracking.response_days": -1, "_id": 1}}, {"$limit": 1}, job_info],
+        "by_industry": [responded, {"$group": {"_id": _field_or("$industry", "Unknown"), "total": {"$sum": days}, "count": {"$sum": 1}}}],
+        "by_company_size": [responded, {"$group": {"_id": company_size, "total": {"$sum": days}, "count": {"$sum": 1}}}],
+        "pending": [{"$match": {**ACTIVE, "response_tracking.responded_at": None}}, {"$count": "count"}],
+    }
+
+
+def _response_trend_facets(days: int) -> Dict[str, List[Dict]]:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    return {f"response_trends_{days}": [
+        {"$match": {
+            **ACTIVE,
+            "response_tracking.responded_at": {"$ne": None, "$gte": cutoff},
+            "response_tracking.response_days": {"$ne": None},
+        }},
+        {"$group": {
+            "_id": _week_start("$response_tracking.responded_at"),
+            "total": {"$sum": "$response_tracking.response_days"},
+            "count": {"$sum": 1},
+        }},
+    ]}
+
+
+def _breakdown_facets() -> Dict[str, List[Dict]]:
+    """Counts the dashboard used to compute client-side from the full job list (archived included)"""
+    def label(path, default):
+        return {"$cond": [_truthy(path), path, default]}
+    return {
+        "by_industry_all": [{"$group": {"_id": label("$industry", "Unknown"), "count": {"$sum": 1}}}],
+        "by_job_type_all": [{"$group": {"_id": label("$job_type", "Unknown"), "count": {"$sum": 1}}}],
+        "by_status_all": [{"$group": {"_id": {"$toLower": label("$status", "applied")}, "count": {"$sum": 1}}}],
+    }
+
+
+# --------------------------------------------
+# Shaping grouped rows into API responses
+# --------------------------------------------
+
+def _funnel_result(facets: Dict[str, List[Dict]]) -> Dict:
+    counts = {row["_id"]: row["count"] for row in facets["funnel"]}
+    stage_counts = {stage: counts.get(stage, 0) for stage in FUNNEL_STAGES}
+    total = sum(counts.values())
+
+    conversion_rates = {}
+    if total > 0:
+        conversion_rates["applied_to_screening"] = round((stage_counts["screening"] / total) * 100, 2)
+        conversion_rates["screening_to_interview"] = round((stage_counts["interview"] / stage_counts["screening"]) * 100, 2) if stage_counts["screening"] else 0
+        conversion_rates["interview_to_offer"] = round((stage_counts["offer"] / stage_counts["interview"]) * 100, 2) if stage_counts["interview"] else 0
+        conversion_rates["overall"] = round((stage_counts["offer"] / total) * 100, 2)
+
+    return {
+        "total_applications": total,
+        "stage_counts": stage_counts,
+        "conversion_rates": conversion_rates,
+        "rejection_rate": round((stage_counts["rejected"] / total) * 100, 2) if total else 0
+    }
+
+
+def _response_time_result(facets: Dict[str, List[Dict]], name: str = "response_times") -> Dict:
+    return {
+        row["_id"]: {
+            "average_days": round(row["total"] / row["count"], 1),
+            "min_days": int(row["min"]),
+            "max_days": int(row["max"]),
+            "sample_size": row["count"]
+        }
+        for row in facets[name]
+    }
+
+
+def _success_rate_result(facets: Dict[str, List[Dict]], name: str = "success_rates") -> Dict:
+    return {
+        row["_id"]: {
+            "total_applications": row["total"],
+            "interview_rate": round((row["interviews"] / row["total"]) * 100, 2),
+            "offer_rate": round((row["offers"] / row["total"]) * 100, 2),
+            "interviews": row["interviews"],
+            "offers": row["offers"]
+        }
+        for row in facets[name]
+    }
+
+
+def _trend_result(facets: Dict[str, List[Dict]], days: int) -> Dict:
+    weekly_counts = {row["_id"]: row["count"] for row in facets[f"trends_{days}_weekly"]}
+    total_apps = sum(weekly_counts.values())
+    weeks = len(weekly_counts) if weekly_counts else 1
+    return {
+        "total_applications": total_apps,
+        "time_period_days": days,
+        "weekly_average": round(total_apps / weeks, 1),
+        "weekly_breakdown": sorted(weekly_counts.items()),
+        "by_status": {row["_id"]: row["count"] for row in facets[f"trends_{days}_status"]}
+    }
+
+
+def _benchmark_result(funnel: Dict, response_times: Dict, success_rates: Dict, recent_trends: Dict) -> Dict:
+    user_avg_response = response_times.get("overall", {}).get("average_days", 0)
+    user_interview_rate = success_rates.get("overall", {}).get("interview_rate", 0)
+    user_offer_rate = success_rates.get("overall", {}).get("offer_rate", 0)
+    user_weekly_apps = recent_trends.get("weekly_average", 0)
+    benchmarks = INDUSTRY_BENCHMARKS
+
+    return {
+        "user_metrics": {
+            "response_time_days": user_avg_response,
+            "interview_rate": user_interview_rate,
+            "offer_rate": user_offer_rate,
+            "weekly_applications": user_weekly_apps
+        },
+        "industry_benchmarks": dict(benchmarks),
+        "comparisons": {
+            "response_time_vs_benchmark": "faster" if user_avg_response < benchmarks["average_response_time_days"] else "slower",
+            "interview_rate_vs_benchmark": "above" if user_interview_rate > benchmarks["average_interview_rate"] else "below",
+            "offer_rate_vs_benchmark": "above" if user_offer_rate > benchmarks["average_offer_rate"] else "below",
+            "activity_vs_benchmark": "above" if user_weekly_apps > benchmarks["average_applications_per_week"] else "below"
+        }
+    }
+
+
+def _recommendation_result(funnel: Dict, success_rates: Dict, trends: Dict) -> List[Dict]:
+    recommendations = []
+
+    conversion_rates = funnel.get("conversion_rates", {})
+    stage_counts = funnel.get("stage_counts", {})
+
+    # Check interview conversion rate
+    interview_rate = conversion_rates.get("applied_to_screening", 0)
+    if interview_rate < 10:
+        recommendations.append({
+            "category": "materials",
+            "priority": "high",
+            "title": "Improve Application Materials",
+            "description": f"Your interview rate ({interview_rate}%) is below average. Consider tailoring your resume and cover letter more closely to each position.",
+            "action": "Review and improve resume/cover letter quality"
+        })
+
+    # Check materials usage - only if we have data
+    if success_rates and "No Materials" in success_rates:
+        no_materials_rate = success_rates["No Materials"].get("offer_rate", 0)
+        with_materials_rate = success_rates.get("Resume + Cover Letter", {}).get("offer_rate", 0)
+        if with_materials_rate > no_materials_rate:
+            recommendations.append({
+                "category": "materials",
+                "priority": "high",
+                "title": "Always Include Application Materials",
+                "description": f"Applications with resume and cover letter have {with_materials_rate}% offer rate vs {no_materials_rate}% without.",
+                "action": "Attach materials to all applications"
+            })
+
+    # Check application volume
+    weekly_avg = trends.get("weekly_average", 0) if trends else 0
+    if weekly_avg < 5:
+        recommendations.append({
+            "category": "volume",
+            "priority": "medium",
+            "title": "Increase Application Volume",
+            "description": f"You're averaging {weekly_avg} applications per week. Consider increasing to 10-15 per week to improve chances.",
+            "action": "Set a goal of 10+ applications per week"
+        })
+
+    # Check offer conversion - only if we have enough data
+    interview_count = stage_counts.get("interview", 0)
+    if interview_count > 5:
+        offer_rate = conversion_rates.get("interview_to_offer", 0)
+        if offer_rate < 20:
+            recommendations.append({
+                "category": "interview_skills",
+                "priority": "high",
+                "title": "Improve Interview Performance",
+                "description": f"Your interview-to-offer rate ({offer_rate}%) suggests room for improvement in interviews.",
+                "action": "Practice mock interviews and refine your responses"
+            })
+
+    # If we have no recommendations, add a positive one
+    if not recommendations:
+        recommendations.append({
+            "category": "general",
+            "priority": "low",
+            "title": "Keep Up the Good Work!",
+            "description": "Your application metrics are looking strong. Continue with your current strategy.",
+            "action": "Maintain your current application pace and quality"
+        })
+
+    return recommendations
+
+
+FALLBACK_RECOMMENDATIONS = [{
+    "category": "general",
+    "priority": "low",
+    "title": "Track Your Applications",
+    "description": "Continue tracking your applications to get personalized recommendations.",
+    "action": "Keep adding applications to build your analytics"
+}]
+
+
+def _job_info(row: Optional[Dict]) -> Optional[Dict]:
+    if row is None:
+        return None
+    return {"job_id": str(row["_id"]), "company": row["company"], "title": row["title"], "days": row["days"]}
+
+
+def _response_metrics_result(facets: Dict[str, List[Dict]]) -> Dict:
+    pending = facets["pending"][0]["count"] if facets["pending"] else 0
+    response_times = facets["responded"][0]["days"] if facets["responded"] else []
+
+    if not response_times:
+        return {
+            "average_response_days": 0,
+            "median_response_days": 0,
+            "fastest_response": None,
+            "slowest_response": None,
+            "by_company_size": {},
+            "by_industry": {},
+            "total_responded": 0,
+            "total_pending": pending
+        }
+
+    sorted_times = sorted(response_times)
+    n = len(sorted_times)
+    if n % 2 == 0:
+        median = (sorted_times[n//2 - 1] + sorted_times[n//2]) / 2
+    else:
+        median = sorted_times[n//2]
+
+    return {
+        "average_response_days": round(sum(response_times) / n, 1),
+        "median_response_days": round(median, 1),
+        "fastest_response": _job_info(next(iter(facets["fastest"]), None)),
+        "slowest_response": _job_info(next(iter(facets["slowest"]), None)),
+        "by_company_size": {row["_id"]: _avg(row["total"], row["count"]) for row in facets["by_company_size"]},
+        "by_industry": {row["_id"]: _avg(row["total"], row["count"]) for row in facets["by_industry"]},
+        "total_responded": n,
+        "total_pending": pending
+    }
+
+
+def _response_trend_result(facets: Dict[str, List[Dict]], days: int) -> Dict:
+    weekly_averages = [
+        {"week": row["_id"], "average_days": round(row["total"] / row["count"], 1), "count": row["count"]}
+        for row in sorted(facets[f"response_trends_{days}"], key=lambda row: row["_id"])
+    ]
+
+    # Calculate trend direction
+    trend_direction = "stable"
+    if len(weekly_averages) >= 2:
+        recent_avg = sum([w["average_days"] for w in weekly_averages[-4:]]) / min(4, len(weekly_averages[-4:]))
+        older_avg = sum([w["average_days"] for w in weekly_averages[:4]]) / min(4, len(weekly_averages[:4]))
+
+        if recent_avg < older_avg * 0.9:
+            trend_direction = "improving"
+        elif recent_avg > older_avg * 1.1:
+            trend_direction = "slowing"
+
+    return {
+        "time_period_days": days,
+        "weekly_data": weekly_averages,
+        "trend_direction": trend_direction,
+        "total_responses": sum([w["count"] for w in weekly_averages])
+    }
+
+
+def _breakdown_result(facets: Dict[str, List[Dict]]) -> Dict:
+    by_status = {row["_id"]: row["count"] for row in facets["by_status_all"]}
+    return {
+        "total_jobs": sum(by_status.values()),
+        "by_industry": {row["_id"]: row["count"] for row in facets["by_industry_all"]},
+        "by_job_type": {row["_id"]: row["count"] for row in facets["by_job_type_all"]},
+        "by_status": by_status,
+    }
+
 
 class ApplicationAnalyticsDAO:
     """Data Access Object for application analytics (UC-072)"""
-    
+
     def __init__(self):
         self.jobs_collection = db_client.get_collection("jobs")
         self.analytics_collection = db_client.get_collection("application_analytics")
-        
+
+    async def _facets(self, user_uuid: str, facets: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """Run named sub-pipelines over the user's jobs in one aggregate() call"""
+        pipeline = [{"$match": {"uuid": user_uuid}}, {"$facet": facets}]
+        async for doc in await self.jobs_collection.aggregate(pipeline):
+            return doc
+        return {name: [] for name in facets}
+
+    # ============================================
+    # DASHBOARD (all UC-072 / UC-121 metrics at once)
+    # ============================================
+
+    async def get_dashboard(self, user_uuid: str, days: int = 90) -> Dict:
+        """
+        Every analytics dashboard section from a single $facet aggregation:
+        funnel, response times, success rates, trends, benchmarks,
+        recommendations, UC-121 response metrics/trends and job breakdowns
+        """
+        facets = {
+            **_funnel_facets(),
+            **_response_time_facets(),
+            **_success_rate_facets(),
+            **_success_rate_facets("materials", name="success_by_materials"),
+            **_trend_facets(days),
+            **_trend_facets(30),
+            **_trend_facets(90),
+            **_response_metric_facets(),
+            **_response_trend_facets(days),
+            **_breakdown_facets(),
+        }
+        rows = await self._facets(user_uuid, facets)
+
+        funnel = _funnel_result(rows)
+        response_times = _response_time_result(rows)
+        success_rates = _success_rate_result(rows)
+        try:
+            recommendations = _recommendation_result(
+                funnel, _success_rate_result(rows, "success_by_materials"), _trend_result(rows, 90)
+            )
+        except Exception as e:
+            print(f"Error generating recommendations: {str(e)}")
+            recommendations = FALLBACK_RECOMMENDATIONS
+
+        return {
+            "funnel": funnel,
+            "response_times": response_times,
+            "success_rates": success_rates,
+            "trends": _trend_result(rows, days),
+            "benchmarks": _benchmark_result(funnel, response_times, success_rates, _trend_result(rows, 30)),
+            "recommendations": recommendations,
+            "response_metrics": _response_metrics_result(rows),
+            "response_trends": _response_trend_result(rows, days),
+            "breakdowns": _breakdown_result(rows),
+        }
+
     # ============================================
     # APPLICATION FUNNEL ANALYTICS (UC-072)
     # ============================================
-    
+
     async def get_application_funnel(self, user_uuid: str, date_range: Dict = None) -> Dict:
         """
         Calculate application funnel metrics
         Returns: {applied, screening, interview, offer, conversion_rates}
         """
-        query = {"uuid": user_uuid, "archived": {"$ne": True}}
-        
-        if date_range:
-            query["date_created"] = {
-                "$gte": date_range.get("start"),
-                "$lte": date_range.get("end")
-            }
-        
-        # Get all applications
-        cursor = self.jobs_collection.find(query)
-        applications = []
-        async for doc in cursor:
-            applications.append(doc)
-        
-        # Count by stage
-        stage_counts = {
-            "applied": 0,
-            "screening": 0,
-            "interview": 0,
-            "offer": 0,
-            "rejected": 0
-        }
-        
-        for app in applications:
-            status = app.get("status", "").lower()
-            if status == "applied":
-                stage_counts["applied"] += 1
-            elif status == "screening":
-                stage_counts["screening"] += 1
-            elif status == "interview":
-                stage_counts["interview"] += 1
-            elif status == "offer":
-                stage_counts["offer"] += 1
-            elif status == "rejected":
-                stage_counts["rejected"] += 1
-        
-        total = len(applications)
-        
-        # Calculate conversion rates
-        conversion_rates = {}
-        if total > 0:
-            conversion_rates["applied_to_screening"] = round((stage_counts["screening"] / total) * 100, 2) if total else 0
-            conversion_rates["screening_to_interview"] = round((stage_counts["interview"] / stage_counts["screening"]) * 100, 2) if stage_counts["screening"] else 0
-            conversion_rates["interview_to_offer"] = round((stage_counts["offer"] / stage_counts["interview"]) * 100, 2) if stage_counts["interview"] else 0
-            conversion_rates["overall"] = round((stage_counts["offer"] / total) * 100, 2) if total else 0
-        
-        return {
-            "total_applications": total,
-            "stage_counts": stage_counts,
-            "conversion_rates": conversion_rates,
-            "rejection_rate": round((stage_counts["rejected"] / total) * 100, 2) if total else 0
-        }
-    
+        return _funnel_result(await self._facets(user_uuid, _funnel_facets(date_range)))
+
     # ============================================
     # TIME-TO-RESPONSE TRACKING (UC-072)
     # ============================================
-    
+
     async def calculate_response_times(self, user_uuid: str, group_by: str = None) -> Dict:
         """
         Calculate average time to response
         group_by: 'company', 'industry', or None for overall
         """
-        cursor = self.jobs_collection.find({
-            "uuid": user_uuid,
-            "status_history": {"$exists": True, "$ne": []},
-            "archived": {"$ne": True}
-        })
-        
-        response_times = defaultdict(list)
-        
-        async for job in cursor:
-            status_history = job.get("status_history", [])
-            if len(status_history) < 2:
-                continue
-            
-            # Calculate time from Applied to first response
-            applied_time = None
-            first_response_time = None
-            
-            for entry in status_history:
-                if isinstance(entry, list) and len(entry) >= 2:
-                    status, timestamp = entry[0], entry[1]
-                    if status.lower() == "applied" and not applied_time:
-                        applied_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    elif status.lower() in ["screening", "interview", "offer", "rejected"] and not first_response_time:
-                        first_response_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        break
-            
-            if applied_time and first_response_time:
-                days_to_response = (first_response_time - applied_time).days
-                
-                # Group by specified field
-                if group_by == "company":
-                    key = job.get("company", "Unknown")
-                    if isinstance(key, dict):
-                        key = key.get("name", "Unknown")
-                elif group_by == "industry":
-                    key = job.get("industry", "Unknown")
-                else:
-                    key = "overall"
-                
-                response_times[key].append(days_to_response)
-        
-        # Calculate averages
-        averages = {}
-        for key, times in response_times.items():
-            if times:
-                averages[key] = {
-                    "average_days": round(sum(times) / len(times), 1),
-                    "min_days": min(times),
-                    "max_days": max(times),
-                    "sample_size": len(times)
-                }
-        
-        return averages
-    
+        return _response_time_result(await self._facets(user_uuid, _response_time_facets(group_by)))
+
     # ============================================
     # SUCCESS RATE ANALYSIS (UC-072)
     # ============================================
-    
+
     async def analyze_success_rates(self, user_uuid: str, group_by: str = None) -> Dict:
         """
         Analyze success rates by different approaches
         group_by: 'industry', 'job_type', 'materials', or None
         """
-        cursor = self.jobs_collection.find({
-            "uuid": user_uuid,
-            "archived": {"$ne": True}
-        })
-        
-        success_by_group = defaultdict(lambda: {"total": 0, "offers": 0, "interviews": 0})
-        
-        async for job in cursor:
-            # Determine grouping key
-            if group_by == "industry":
-                key = job.get("industry", "Unknown")
-            elif group_by == "job_type":
-                key = job.get("job_type", "Unknown")
-            elif group_by == "materials":
-                materials = job.get("materials", {})
-                has_resume = bool(materials.get("resume_id"))
-                has_cover_letter = bool(materials.get("cover_letter_id"))
-                if has_resume and has_cover_letter:
-                    key = "Resume + Cover Letter"
-                elif has_resume:
-                    key = "Resume Only"
-                elif has_cover_letter:
-                    key = "Cover Letter Only"
-                else:
-                    key = "No Materials"
-            else:
-                key = "overall"
-            
-            status = job.get("status", "").lower()
-            success_by_group[key]["total"] += 1
-            
-            if status == "offer":
-                success_by_group[key]["offers"] += 1
-            if status in ["interview", "offer"]:
-                success_by_group[key]["interviews"] += 1
-        
-        # Calculate rates
-        results = {}
-        for key, data in success_by_group.items():
-            total = data["total"]
-            if total > 0:
-                results[key] = {
-                    "total_applications": total,
-                    "interview_rate": round((data["interviews"] / total) * 100, 2),
-                    "offer_rate": round((data["offers"] / total) * 100, 2),
-                    "interviews": data["interviews"],
-                    "offers": data["offers"]
-                }
-        
-        return results
-    
+        return _success_rate_result(await self._facets(user_uuid, _success_rate_facets(group_by)))
+
     # ============================================
     # VOLUME AND FREQUENCY TRENDS (UC-072)
     # ============================================
-    
+
     async def get_application_trends(self, user_uuid: str, days: int = 90) -> Dict:
         """Get application volume and frequency trends"""
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-        
-        cursor = self.jobs_collection.find({
-            "uuid": user_uuid,
-            "date_created": {"$gte": cutoff_date},
-            "archived": {"$ne": True}
-        }).sort("date_created", 1)
-        
-        # Group by week
-        weekly_counts = defaultdict(int)
-        applications_by_status = defaultdict(int)
-        
-        async for job in cursor:
-            created = job.get("date_created")
-            if created:
-                if created.tzinfo is None:
-                    created = created.replace(tzinfo=timezone.utc)
-                week_start = created - timedelta(days=created.weekday())
-                week_key = week_start.strftime("%Y-%m-%d")
-                weekly_counts[week_key] += 1
-                
-                status = job.get("status", "Unknown")
-                applications_by_status[status] += 1
-        
-        # Calculate weekly average
-        total_apps = sum(weekly_counts.values())
-        weeks = len(weekly_counts) if weekly_counts else 1
-        weekly_average = round(total_apps / weeks, 1)
-        
-        # Sort weekly data
-        sorted_weeks = sorted(weekly_counts.items())
-        
-        return {
-            "total_applications": total_apps,
-            "time_period_days": days,
-            "weekly_average": weekly_average,
-            "weekly_breakdown": sorted_weeks,
-            "by_status": dict(applications_by_status)
-        }
-    
+        return _trend_result(await self._facets(user_uuid, _trend_facets(days)), days)
+
     # ============================================
     # PERFORMANCE BENCHMARKING (UC-072)
     # ============================================
-    
+
     async def get_performance_benchmarks(self, user_uuid: str) -> Dict:
         """Compare user's performance to industry averages"""
-        user_stats = await self.get_application_funnel(user_uuid)
-        
-        # Industry benchmarks (these would ideally come from aggregated data)
-        industry_benchmarks = {
-            "average_response_time_days": 14,
-            "average_interview_rate": 15.0,  # 15% of applications lead to interviews
-            "average_offer_rate": 3.0,  # 3% of applications lead to offers
-            "average_applications_per_week": 10
-        }
-        
-        # Calculate user's metrics
-        user_response_times = await self.calculate_response_times(user_uuid)
-        user_success_rates = await self.analyze_success_rates(user_uuid)
-        user_trends = await self.get_application_trends(user_uuid, days=30)
-        
-        # Get user averages
-        user_avg_response = user_response_times.get("overall", {}).get("average_days", 0)
-        user_interview_rate = user_success_rates.get("overall", {}).get("interview_rate", 0)
-        user_offer_rate = user_success_rates.get("overall", {}).get("offer_rate", 0)
-        user_weekly_apps = user_trends.get("weekly_average", 0)
-        
-        # Compare to benchmarks
-        return {
-            "user_metrics": {
-                "response_time_days": user_avg_response,
-                "interview_rate": user_interview_rate,
-                "offer_rate": user_offer_rate,
-                "weekly_applications": user_weekly_apps
-            },
-            "industry_benchmarks": industry_benchmarks,
-            "comparisons": {
-                "response_time_vs_benchmark": "faster" if user_avg_response < industry_benchmarks["average_response_time_days"] else "slower",
-                "interview_rate_vs_benchmark": "above" if user_interview_rate > industry_benchmarks["average_interview_rate"] else "below",
-                "offer_rate_vs_benchmark": "above" if user_offer_rate > industry_benchmarks["average_offer_rate"] else "below",
-                "activity_vs_benchmark": "above" if user_weekly_apps > industry_benchmarks["average_applications_per_week"] else "below"
-            }
-        }
-    
+        rows = await self._facets(user_uuid, {
+            **_funnel_facets(), **_response_time_facets(), **_success_rate_facets(), **_trend_facets(30)
+        })
+        return _benchmark_result(
+            _funnel_result(rows), _response_time_result(rows), _success_rate_result(rows), _trend_result(rows, 30)
+        )
+
     # ============================================
     # OPTIMIZATION RECOMMENDATIONS (UC-072)
     # ============================================
-    
+
     async def generate_recommendations(self, user_uuid: str) -> List[Dict]:
         """Generate optimization recommendations based on analytics"""
-        recommendations = []
-        
         try:
-            # Get various metrics
-            funnel = await self.get_application_funnel(user_uuid)
-            success_rates = await self.analyze_success_rates(user_uuid, group_by="materials")
-            trends = await self.get_application_trends(user_uuid, days=90)
-            
-            # Safely get conversion rates
-            conversion_rates = funnel.get("conversion_rates", {})
-            stage_counts = funnel.get("stage_counts", {})
-            
-            # Check interview conversion rate
-            interview_rate = conversion_rates.get("applied_to_screening", 0)
-            if interview_rate < 10:
-                recommendations.append({
-                    "category": "materials",
-                    "priority": "high",
-                    "title": "Improve Application Materials",
-                    "description": f"Your interview rate ({interview_rate}%) is below average. Consider tailoring your resume and cover letter more closely to each position.",
-                    "action": "Review and improve resume/cover letter quality"
-                })
-            
-            # Check materials usage - only if we have data
-            if success_rates and "No Materials" in success_rates:
-                no_materials_rate = success_rates["No Materials"].get("offer_rate", 0)
-                with_materials_rate = success_rates.get("Resume + Cover Letter", {}).get("offer_rate", 0)
-                if with_materials_rate > no_materials_rate:
-                    recommendations.append({
-                        "category": "materials",
-                        "priority": "high",
-                        "title": "Always Include Application Materials",
-                        "description": f"Applications with resume and cover letter have {with_materials_rate}% offer rate vs {no_materials_rate}% without.",
-                        "action": "Attach materials to all applications"
-                    })
-            
-            # Check application volume
-            weekly_avg = trends.get("weekly_average", 0) if trends else 0
-            if weekly_avg < 5:
-                recommendations.append({
-                    "category": "volume",
-                    "priority": "medium",
-                    "title": "Increase Application Volume",
-                    "description": f"You're averaging {weekly_avg} applications per week. Consider increasing to 10-15 per week to improve chances.",
-                    "action": "Set a goal of 10+ applications per week"
-                })
-            
-            # Check offer conversion - only if we have enough data
-            interview_count = stage_counts.get("interview", 0)
-            if interview_count > 5:
-                offer_rate = conversion_rates.get("interview_to_offer", 0)
-                if offer_rate < 20:
-                    recommendations.append({
-                        "category": "interview_skills",
-                        "priority": "high",
-                        "title": "Improve Interview Performance",
-                        "description": f"Your interview-to-offer rate ({offer_rate}%) suggests room for improvement in interviews.",
-                        "action": "Practice mock interviews and refine your responses"
-                    })
-            
-            # If we have no recommendations, add a positive one
-            if not recommendations:
-                recommendations.append({
-                    "category": "general",
-                    "priority": "low",
-                    "title": "Keep Up the Good Work!",
-                    "description": "Your application metrics are looking strong. Continue with your current strategy.",
-                    "action": "Maintain your current application pace and quality"
-                })
-            
-            return recommendations
-            
+            rows = await self._facets(user_uuid, {
+                **_funnel_facets(), **_success_rate_facets("materials"), **_trend_facets(90)
+            })
+            return _recommendation_result(_funnel_result(rows), _success_rate_result(rows), _trend_result(rows, 90))
         except Exception as e:
             # Log the error and return a generic recommendation
             print(f"Error generating recommendations: {str(e)}")
-            return [{
-                "category": "general",
-                "priority": "low",
-                "title": "Track Your Applications",
-                "description": "Continue tracking your applications to get personalized recommendations.",
-                "action": "Keep adding applications to build your analytics"
-            }]
-        
+            return FALLBACK_RECOMMENDATIONS
+
     # ============================================
     # GOAL TRACKING (UC-072)
     # ============================================
@@ -457,102 +674,7 @@ class ApplicationAnalyticsDAO:
         Calculate user's personal response time statistics (UC-121)
         Returns: {average, median, fastest, slowest, by_company_size, by_industry}
         """
-        cursor = self.jobs_collection.find({
-            "uuid": user_uuid,
-            "response_tracking.responded_at": {"$ne": None},
-            "archived": {"$ne": True}
-        })
-
-        response_times = []
-        by_industry = defaultdict(list)
-        by_company_size = defaultdict(list)
-        fastest = None
-        slowest = None
-
-        async for job in cursor:
-            tracking = job.get("response_tracking", {})
-            days = tracking.get("response_days")
-
-            if days is not None:
-                response_times.append(days)
-
-                # Track by industry
-                industry = job.get("industry", "Unknown")
-                by_industry[industry].append(days)
-
-                # Track by company size
-                company_data = job.get("company_data", {})
-                if isinstance(company_data, dict):
-                    size = company_data.get("size", "Unknown")
-                else:
-                    size = "Unknown"
-                by_company_size[size].append(days)
-
-                # Track fastest/slowest
-                job_info = {
-                    "job_id": str(job.get("_id")),
-                    "company": job.get("company") if isinstance(job.get("company"), str) else job.get("company", {}).get("name", "Unknown"),
-                    "title": job.get("title", "Unknown"),
-                    "days": days
-                }
-
-                if fastest is None or days < fastest["days"]:
-                    fastest = job_info
-                if slowest is None or days > slowest["days"]:
-                    slowest = job_info
-
-        # Calculate statistics
-        if not response_times:
-            return {
-                "average_response_days": 0,
-                "median_response_days": 0,
-                "fastest_response": None,
-                "slowest_response": None,
-                "by_company_size": {},
-                "by_industry": {},
-                "total_responded": 0,
-                "total_pending": await self.jobs_collection.count_documents({
-                    "uuid": user_uuid,
-                    "response_tracking.responded_at": None,
-                    "archived": {"$ne": True}
-                })
-            }
-
-        # Calculate median
-        sorted_times = sorted(response_times)
-        n = len(sorted_times)
-        if n % 2 == 0:
-            median = (sorted_times[n//2 - 1] + sorted_times[n//2]) / 2
-        else:
-            median = sorted_times[n//2]
-
-        # Calculate averages by group
-        industry_avgs = {
-            k: round(sum(v) / len(v), 1)
-            for k, v in by_industry.items()
-        }
-        size_avgs = {
-            k: round(sum(v) / len(v), 1)
-            for k, v in by_company_size.items()
-        }
-
-        # Count pending
-        pending_count = await self.jobs_collection.count_documents({
-            "uuid": user_uuid,
-            "response_tracking.responded_at": None,
-            "archived": {"$ne": True}
-        })
-
-        return {
-            "average_response_days": round(sum(response_times) / len(response_times), 1),
-            "median_response_days": round(median, 1),
-            "fastest_response": fastest,
-            "slowest_response": slowest,
-            "by_company_size": size_avgs,
-            "by_industry": industry_avgs,
-            "total_responded": len(response_times),
-            "total_pending": pending_count
-        }
+        return _response_metrics_result(await self._facets(user_uuid, _response_metric_facets()))
 
     async def get_pending_applications_with_days(self, user_uuid: str) -> List[Dict]:
         """
@@ -625,58 +747,7 @@ class ApplicationAnalyticsDAO:
         """
         Calculate response time trends over time (UC-121)
         """
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-
-        cursor = self.jobs_collection.find({
-            "uuid": user_uuid,
-            "response_tracking.responded_at": {"$ne": None, "$gte": cutoff_date},
-            "archived": {"$ne": True}
-        }).sort("response_tracking.responded_at", 1)
-
-        # Group by week
-        weekly_data = defaultdict(list)
-
-        async for job in cursor:
-            tracking = job.get("response_tracking", {})
-            responded_at = tracking.get("responded_at")
-            response_days = tracking.get("response_days")
-
-            if responded_at and response_days is not None:
-                if responded_at.tzinfo is None:
-                    responded_at = responded_at.replace(tzinfo=timezone.utc)
-
-                # Get week start (Monday)
-                week_start = responded_at - timedelta(days=responded_at.weekday())
-                week_key = week_start.strftime("%Y-%m-%d")
-                weekly_data[week_key].append(response_days)
-
-        # Calculate weekly averages
-        weekly_averages = []
-        for week, times in sorted(weekly_data.items()):
-            avg = sum(times) / len(times)
-            weekly_averages.append({
-                "week": week,
-                "average_days": round(avg, 1),
-                "count": len(times)
-            })
-
-        # Calculate trend direction
-        trend_direction = "stable"
-        if len(weekly_averages) >= 2:
-            recent_avg = sum([w["average_days"] for w in weekly_averages[-4:]]) / min(4, len(weekly_averages[-4:]))
-            older_avg = sum([w["average_days"] for w in weekly_averages[:4]]) / min(4, len(weekly_averages[:4]))
-
-            if recent_avg < older_avg * 0.9:
-                trend_direction = "improving"
-            elif recent_avg > older_avg * 1.1:
-                trend_direction = "slowing"
-
-        return {
-            "time_period_days": days,
-            "weekly_data": weekly_averages,
-            "trend_direction": trend_direction,
-            "total_responses": sum([w["count"] for w in weekly_averages])
-        }
+        return _response_trend_result(await self._facets(user_uuid, _response_trend_facets(days)), days)
 
 # Singleton instance
-application_analytics_dao = ApplicationAnalyticsDAO()
\ No newline at end of file
+application_analytics_dao = ApplicationAnalyticsDAO()
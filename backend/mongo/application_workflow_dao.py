@@ -1,7 +1,56 @@
-from mongo.dao_setup import db_client
+from mongo.dao_setup import db_client, JOBS
+from mongo.index_registry import index_registry
 from datetime import datetime, timezone, timedelta
 from bson import ObjectId
-from typing import List, Optional, Dict
+from typing import Any, Iterable, List, Optional, Dict
+
+
+index_registry.declare("application_workflows", [("uuid", 1), ("date_created", -1)])
+index_registry.declare("application_packages", [("uuid", 1), ("date_created", -1)])
+index_registry.declare("application_schedules", [("uuid", 1), ("status", 1), ("scheduled_time", 1)])
+index_registry.declare("application_schedules", [("status", 1), ("scheduled_time", 1)])
+index_registry.declare("response_templates", [("uuid", 1), ("category", 1), ("date_created", -1)])
+index_registry.declare("quality_analyses", [("package_id", 1), ("created_at", -1)])
+index_registry.declare("quality_analyses", "user_id")
+
+ACTIVE_SCHEDULE_STATUSES = ["scheduled", "pending"]
+
+
+def parse_schedule_time(value: Any) -> Optional[datetime]:
+    """scheduled_time as an aware UTC datetime; accepts the ISO strings the API receives"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def require_schedule_time(value: Any) -> datetime:
+    """parse_schedule_time for writes: an unparseable scheduled_time is an error, never stored as None"""
+    parsed = parse_schedule_time(value)
+    if parsed is None:
+        raise ValueError(f"scheduled_time must be an ISO 8601 datetime, got {value!r}")
+    return parsed
+
+
+def _stringify_id(doc: Optional[dict]) -> Optional[dict]:
+    if doc:
+        doc["_id"] = str(doc["_id"])
+    return doc
+
+
+def _schedule_out(doc: dict) -> dict:
+    """Schedule as returned to callers: string _id, aware UTC scheduled_time (Mongo hands back naive UTC)"""
+    doc["_id"] = str(doc["_id"])
+    if "scheduled_time" in doc:
+        doc["scheduled_time"] = parse_schedule_time(doc["scheduled_time"])
+    return doc
+
 
 class ApplicationWorkflowDAO:
     """Data Access Object for application workflow automation (UC-069)"""
@@ -106,6 +155,9 @@ class ApplicationWorkflowDAO:
         data["date_created"] = time
         data["status"] = data.get("status", "scheduled")
         data["retry_count"] = 0
+        # Stored as a real datetime so range queries compare times, not strings
+        if "scheduled_time" in data:
+            data["scheduled_time"] = require_schedule_time(data["scheduled_time"])
         
         result = await self.schedules_collection.insert_one(data)
         return str(result.inserted_id)
@@ -114,22 +166,19 @@ class ApplicationWorkflowDAO:
         """Get all scheduled applications for a user"""
         cursor = self.schedules_collection.find({
             "uuid": user_uuid,
-            "status": {"$in": ["scheduled", "pending"]}
+            "status": {"$in": ACTIVE_SCHEDULE_STATUSES}
         }).sort("scheduled_time", 1)
         
         results = []
         async for doc in cursor:
-            doc["_id"] = str(doc["_id"])
-            results.append(doc)
+            results.append(_schedule_out(doc))
         return results
     
     async def get_schedule_by_id(self, schedule_id: str) -> Optional[dict]:
         """Get a single schedule by ID"""
         try:
             doc = await self.schedules_collection.find_one({"_id": schedule_id})
-            if doc:
-                doc["_id"] = str(doc["_id"])
-            return doc
+            return _schedule_out(doc) if doc else None
         except Exception as e:
             print(f"Error getting schedule by ID: {e}")
             return None
@@ -139,13 +188,12 @@ class ApplicationWorkflowDAO:
         query = {"uuid": user_uuid}
         
         if not include_completed:
-            query["status"] = {"$in": ["scheduled", "pending"]}
+            query["status"] = {"$in": ACTIVE_SCHEDULE_STATUSES}
         
         cursor = self.schedules_collection.find(query).sort("scheduled_time", 1)
         results = []
         async for doc in cursor:
-            doc["_id"] = str(doc["_id"])
-            results.append(doc)
+            results.append(_schedule_out(doc))
         return results
     
     async def get_due_applications(self, time_window_minutes: int = 5) -> List[dict]:
@@ -163,34 +211,84 @@ class ApplicationWorkflowDAO:
         
         results = []
         async for doc in cursor:
-            doc["_id"] = str(doc["_id"])
-            results.append(doc)
+            results.append(_schedule_out(doc))
         return results
     
     async def get_due_schedules(self, before_time: datetime) -> List[dict]:
         """Get schedules due before specified time"""
         cursor = self.schedules_collection.find({
             'status': 'scheduled',
-            'scheduled_time': {'$lte': before_time.isoformat()}
+            'scheduled_time': {'$lte': before_time}
         })
         results = []
         async for doc in cursor:
-            doc["_id"] = str(doc["_id"])
-            results.append(doc)
+            results.append(_schedule_out(doc))
         return results
     
-    async def get_schedules_by_time_range(self, start_time: datetime, end_time: datetime) -> List[dict]:
-        """Get schedules within time range"""
-        cursor = self.schedules_collection.find({
+    async def get_schedules_by_time_range(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        uuid: Optional[str] = None
+    ) -> List[dict]:
+        """Get schedules within time range, for one user when uuid is given"""
+        query: Dict[str, Any] = {
             'status': 'scheduled',
             'scheduled_time': {
-                '$gte': start_time.isoformat(),
-                '$lte': end_time.isoformat()
+                '$gte': start_time,
+                '$lte': end_time
             }
-        })
+        }
+        if uuid:
+            query['uuid'] = uuid
+        cursor = self.schedules_collection.find(query).sort('scheduled_time', 1)
         results = []
         async for doc in cursor:
-            doc["_id"] = str(doc["_id"])
+            results.append(_schedule_out(doc))
+        return results
+
+    async def get_schedules_with_details(
+        self,
+        uuid: str,
+        start_time: datetime,
+        end_time: datetime,
+        statuses: Iterable[str] = ("scheduled",)
+    ) -> List[dict]:
+        """
+        A user's schedules in a time range, in time order, each with its job and
+        application package joined in ("job" / "package", None if gone). One
+        aggregation on the (uuid, status, scheduled_time) index instead of two
+        lookups per schedule.
+        """
+        pipeline = [
+            {"$match": {
+                "uuid": uuid,
+                "status": {"$in": list(statuses)},
+                "scheduled_time": {"$gte": start_time, "$lte": end_time},
+            }},
+            {"$sort": {"scheduled_time": 1}},
+            # Schedules hold ids as strings; jobs are keyed by ObjectId, packages by either
+            {"$addFields": {
+                "_job_oid": {"$convert": {"input": "$job_id", "to": "objectId", "onError": None, "onNull": None}},
+                "_package_oid": {"$convert": {"input": "$package_id", "to": "objectId", "onError": None, "onNull": None}},
+            }},
+            {"$lookup": {"from": JOBS, "localField": "_job_oid", "foreignField": "_id", "as": "_jobs"}},
+            {"$lookup": {"from": "application_packages", "localField": "package_id", "foreignField": "_id",
+                         "as": "_packages"}},
+            {"$lookup": {"from": "application_packages", "localField": "_package_oid", "foreignField": "_id",
+                         "as": "_packages_by_oid"}},
+            {"$addFields": {
+                "job": {"$arrayElemAt": ["$_jobs", 0]},
+                "package": {"$arrayElemAt": [{"$concatArrays": ["$_packages", "$_packages_by_oid"]}, 0]},
+            }},
+            {"$project": {"_jobs": 0, "_packages": 0, "_packages_by_oid": 0, "_job_oid": 0, "_package_oid": 0}},
+        ]
+        cursor = await self.schedules_collection.aggregate(pipeline)
+        results = []
+        async for doc in cursor:
+            _schedule_out(doc)
+            doc["job"] = _stringify_id(doc.get("job"))
+            doc["package"] = _stringify_id(doc.get("package"))
             results.append(doc)
         return results
     
@@ -216,6 +314,8 @@ class ApplicationWorkflowDAO:
     async def update_schedule(self, schedule_id: str, data: dict) -> int:
         """Update schedule data"""
         data["date_updated"] = datetime.now(timezone.utc)
+        if "scheduled_time" in data:
+            data["scheduled_time"] = require_schedule_time(data["scheduled_time"])
         result = await self.schedules_collection.update_one(
             {"_id": schedule_id},
             {"$set": data}
@@ -473,6 +573,8 @@ class ApplicationWorkflowDAO:
             data["date_created"] = time
             data["status"] = "scheduled"
             data["retry_count"] = 0
+            if "scheduled_time" in data:
+                data["scheduled_time"] = require_schedule_time(data["scheduled_time"])
             schedule_ids.append(data["_id"])
         
         if schedules_data:
@@ -1,8 +1,13 @@
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
 from datetime import datetime
 from bson import ObjectId
 from typing import List, Dict
 
+
+index_registry.declare("audit_logs", [("organization_id", 1), ("timestamp", -1)])
+
+
 class AuditDAO:
     def __init__(self):
         # Separate collection for security logs. This is used for the enterprises...
@@ -1,4 +1,9 @@
 from mongo.dao_setup import db_client, AUTH
+from mongo.index_registry import index_registry
+
+
+index_registry.declare(AUTH, "email")
+
 
 class UserAuthenticationDAO:
     def __init__(self):
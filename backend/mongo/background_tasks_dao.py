@@ -0,0 +1,156 @@
+"""
+Background Tasks DAO
+Persistent work queue. Every task has an idempotency key, so enqueueing the
+same work twice never runs it twice; claiming is a single atomic
+find_one_and_update, so any number of workers/processes can share the queue.
+"""
+from mongo.dao_setup import db_client, BACKGROUND_TASKS
+from mongo.index_registry import index_registry
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+index_registry.declare(BACKGROUND_TASKS, "idempotency_key", unique=True)
+index_registry.declare(BACKGROUND_TASKS, [("kind", 1), ("status", 1), ("run_at", 1)])
+
+
+class BackgroundTasksDAO:
+    def __init__(self):
+        self.collection = db_client.get_collection(BACKGROUND_TASKS)
+
+    async def enqueue(
+        self,
+        kind: str,
+        idempotency_key: str,
+        payload: Dict,
+        max_attempts: int = 5,
+        force: bool = False
+    ) -> Dict:
+        """
+        Queue a task. If a task with the same key is already queued or running it
+        is returned untouched; a finished task is only re-queued when force=True.
+        """
+        now = datetime.now(timezone.utc)
+        fresh = {
+            "kind": kind,
+            "payload": payload,
+            "status": QUEUED,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "run_at": now,
+            "lease_expires_at": None,
+            "worker_id": None,
+            "last_error": None,
+            "updated_at": now,
+        }
+
+        if force:
+            # Re-queue unless it is currently being worked on
+            task = await self.collection.find_one_and_update(
+                {"idempotency_key": idempotency_key, "status": {"$ne": RUNNING}},
+                {"$set": fresh},
+                return_document=ReturnDocument.AFTER
+            )
+            if task:
+                return task
+
+        try:
+            return await self.collection.find_one_and_update(
+                {"idempotency_key": idempotency_key},
+                {"$setOnInsert": {**fresh, "idempotency_key": idempotency_key, "created_at": now}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Lost an upsert race with another worker; the winner's task stands
+            return await self.collection.find_one({"idempotency_key": idempotency_key})
+
+    async def claim_next(self, worker_id: str, kinds: List[str], lease_seconds: int) -> Optional[Dict]:
+        """Atomically take the next due task (or one whose lease expired) for this worker"""
+        now = datetime.now(timezone.utc)
+        return await self.collection.find_one_and_update(
+            {
+                "kind": {"$in": kinds},
+                "$or": [
+                    {"status": QUEUED, "run_at": {"$lte": now}},
+                    {"status": RUNNING, "lease_expires_at": {"$lte": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "worker_id": worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def extend_lease(self, task_id, worker_id: str, lease_seconds: int) -> bool:
+        """Push out the lease of a task this worker is still running. False once the lease was lost."""
+        now = datetime.now(timezone.utc)
+        result = await self.collection.update_one(
+            {"_id": task_id, "worker_id": worker_id, "status": RUNNING},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=lease_seconds), "updated_at": now}}
+        )
+        return result.matched_count > 0
+
+    # Outcomes are only recorded by the worker that still holds the task, so a
+    # worker whose lease lapsed cannot overwrite the run that re-claimed it
+
+    async def complete(self, task_id, worker_id: str, result: Optional[Dict] = None) -> bool:
+        now = datetime.now(timezone.utc)
+        outcome = await self.collection.update_one(
+            {"_id": task_id, "worker_id": worker_id, "status": RUNNING},
+            {"$set": {
+                "status": COMPLETED,
+                "result": result,
+                "last_error": None,
+                "lease_expires_at": None,
+                "completed_at": now,
+                "updated_at": now,
+            }}
+        )
+        return outcome.matched_count > 0
+
+    async def retry_later(self, task_id, worker_id: str, error: str, run_at: datetime) -> bool:
+        outcome = await self.collection.update_one(
+            {"_id": task_id, "worker_id": worker_id, "status": RUNNING},
+            {"$set": {
+                "status": QUEUED,
+                "last_error": error,
+                "run_at": run_at,
+                "lease_expires_at": None,
+                "updated_at": datetime.now(timezone.utc),
+            }}
+        )
+        return outcome.matched_count > 0
+
+    async def fail(self, task_id, worker_id: str, error: str) -> bool:
+        outcome = await self.collection.update_one(
+            {"_id": task_id, "worker_id": worker_id, "status": RUNNING},
+            {"$set": {
+                "status": FAILED,
+                "last_error": error,
+                "lease_expires_at": None,
+                "updated_at": datetime.now(timezone.utc),
+            }}
+        )
+        return outcome.matched_count > 0
+
+    async def get_by_key(self, idempotency_key: str) -> Optional[Dict]:
+        return await self.collection.find_one({"idempotency_key": idempotency_key})
+
+
+background_tasks_dao = BackgroundTasksDAO()
@@ -1,7 +1,12 @@
 from mongo.dao_setup import db_client, BADGES
+from mongo.index_registry import index_registry
 from datetime import datetime, timezone
 from bson import ObjectId
 
+
+index_registry.declare(BADGES, [("user_id", 1), ("platform", 1), ("category", 1)])
+
+
 class BadgesDAO:
     def __init__(self):
         self.collection = db_client.get_collection(BADGES)
@@ -0,0 +1,86 @@
+"""
+Candidate Snapshots DAO
+One document per user (_id = uuid) holding the profile matching scores
+against, denormalized from the profile, skills, education and employment
+collections so a match or skills-gap request reads it in one find_one.
+
+The skills, education, employment and profile DAOs call invalidate() after
+every write; the next read rebuilds the snapshot (mongo/matching_service.py).
+invalidate() bumps a per-user version and save() only lands if the version
+is still the one read before building, so a snapshot built from data a
+concurrent write just changed is dropped instead of cached.
+
+Recently read snapshots are also kept in a process-local LRU. A worker's
+own writes evict it immediately; writes on other workers are seen within
+LOCAL_CACHE_SECONDS.
+"""
+from mongo.dao_setup import db_client, CANDIDATE_SNAPSHOTS
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pymongo.errors import DuplicateKeyError
+from typing import Any, Dict, Optional, Tuple
+import os
+import time
+
+LOCAL_CACHE_SECONDS = int(os.getenv("CANDIDATE_SNAPSHOT_CACHE_SECONDS", "30"))
+LOCAL_CACHE_SIZE = 5000
+
+
+class CandidateSnapshotsDAO:
+    def __init__(self):
+        self.collection = db_client.get_collection(CANDIDATE_SNAPSHOTS)
+        # uuid -> (version, snapshot, cached_until monotonic)
+        self.local_cache: "OrderedDict[str, Tuple[int, Dict[str, Any], float]]" = OrderedDict()
+
+    def _cache_locally(self, uuid: str, version: int, snapshot: Dict[str, Any]) -> None:
+        self.local_cache[uuid] = (version, snapshot, time.monotonic() + LOCAL_CACHE_SECONDS)
+        self.local_cache.move_to_end(uuid)
+        while len(self.local_cache) > LOCAL_CACHE_SIZE:
+            self.local_cache.popitem(last=False)
+
+    async def get(self, uuid: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """(version, snapshot); snapshot is None when it has to be rebuilt. Pass the version to save()."""
+        cached = self.local_cache.get(uuid)
+        if cached and cached[2] > time.monotonic():
+            self.local_cache.move_to_end(uuid)
+            return cached[0], cached[1]
+        self.local_cache.pop(uuid, None)
+
+        doc = await self.collection.find_one({"_id": uuid})
+        if not doc:
+            return 0, None
+        version = doc.get("version", 0)
+        if doc.get("snapshot") is not None:
+            self._cache_locally(uuid, version, doc["snapshot"])
+        return version, doc.get("snapshot")
+
+    async def save(self, uuid: str, version: int, snapshot: Dict[str, Any]) -> bool:
+        """Store a rebuilt snapshot unless the user's data changed since `version` was read"""
+        now = datetime.now(timezone.utc)
+        try:
+            if version == 0:
+                await self.collection.insert_one({"_id": uuid, "version": 0, "snapshot": snapshot, "date_updated": now})
+            else:
+                result = await self.collection.update_one(
+                    {"_id": uuid, "version": version},
+                    {"$set": {"snapshot": snapshot, "date_updated": now}}
+                )
+                if result.matched_count == 0:
+                    return False
+        except DuplicateKeyError:
+            # Invalidated (or built by another request) since it was read
+            return False
+        self._cache_locally(uuid, version, snapshot)
+        return True
+
+    async def invalidate(self, uuid: str) -> None:
+        """Mark the user's snapshot stale; called by the DAOs it is built from after every write"""
+        self.local_cache.pop(uuid, None)
+        await self.collection.update_one(
+            {"_id": uuid},
+            {"$inc": {"version": 1}, "$set": {"snapshot": None, "date_updated": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+
+candidate_snapshots_dao = CandidateSnapshotsDAO()
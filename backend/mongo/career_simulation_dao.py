@@ -1,10 +1,15 @@
 from bson.objectid import ObjectId
-from pymongo import ASCENDING
 from datetime import datetime
 import uuid
 from mongo.dao_setup import db_client, CAREER_SIMULATIONS
+from mongo.index_registry import index_registry
 from schema.CareerSimulation import CareerSimulation, CareerSimulationRequest, CareerSimulationResponse
 
+
+index_registry.declare(CAREER_SIMULATIONS, [("user_uuid", 1), ("created_at", -1)])
+index_registry.declare(CAREER_SIMULATIONS, [("request.offer_id", 1), ("status", 1)])
+
+
 class CareerSimulationDAO:
     """Data Access Object for managing career path simulations"""
 
@@ -106,13 +111,6 @@ class CareerSimulationDAO:
         result = await self.collection.delete_one({"_id": ObjectId(simulation_id)})
         return result.deleted_count > 0
 
-    async def create_indexes(self):
-        """Create indexes for efficient querying"""
-        await self.collection.create_index([("user_uuid", ASCENDING)])
-        await self.collection.create_index([("request.offer_id", ASCENDING)])
-        await self.collection.create_index([("status", ASCENDING)])
-        await self.collection.create_index([("created_at", ASCENDING)])
-
     async def get_simulation_statistics(self, user_uuid: str) -> dict:
         """Get statistics about user's simulations"""
         pipeline = [
@@ -0,0 +1,81 @@
+"""
+Company Intelligence DAO
+Shared (cross-user) cache of generated company research. One document per
+(company, section), _id = "<company_key>:<section>".
+"""
+from mongo.dao_setup import db_client, COMPANY_INTEL_CACHE
+from mongo.index_registry import index_registry
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, Optional
+
+
+# Entries are dropped by Mongo once even the stale copy is unusable
+index_registry.declare(COMPANY_INTEL_CACHE, "stale_until", ttl_seconds=0)
+index_registry.declare(COMPANY_INTEL_CACHE, [("section", 1), ("fetched_at", -1)])
+
+
+def _entry_id(company_key: str, section: str) -> str:
+    return f"{company_key}:{section}"
+
+
+class CompanyIntelDAO:
+    def __init__(self):
+        self.collection = db_client.get_collection(COMPANY_INTEL_CACHE)
+
+    async def get_entry(self, company_key: str, section: str) -> Optional[Dict]:
+        return await self.collection.find_one({"_id": _entry_id(company_key, section)})
+
+    async def put_entry(
+        self,
+        company_key: str,
+        section: str,
+        data: Any,
+        fresh_seconds: int,
+        stale_seconds: int,
+        company_name: Optional[str] = None
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        await self.collection.update_one(
+            {"_id": _entry_id(company_key, section)},
+            {
+                "$set": {
+                    "company_key": company_key,
+                    "company_name": company_name,
+                    "section": section,
+                    "data": data,
+                    "fetched_at": now,
+                    "fresh_until": now + timedelta(seconds=fresh_seconds),
+                    "stale_until": now + timedelta(seconds=fresh_seconds + stale_seconds),
+                    "refreshing_until": None,
+                },
+                "$inc": {"generations": 1},
+            },
+            upsert=True
+        )
+
+    async def try_begin_refresh(self, company_key: str, section: str, lock_seconds: int) -> bool:
+        """Claim the right to refresh a stale entry so only one worker regenerates it"""
+        now = datetime.now(timezone.utc)
+        result = await self.collection.update_one(
+            {
+                "_id": _entry_id(company_key, section),
+                "$or": [{"refreshing_until": None}, {"refreshing_until": {"$lte": now}}],
+            },
+            {"$set": {"refreshing_until": now + timedelta(seconds=lock_seconds)}}
+        )
+        return result.modified_count == 1
+
+    async def end_refresh(self, company_key: str, section: str) -> None:
+        await self.collection.update_one(
+            {"_id": _entry_id(company_key, section)},
+            {"$set": {"refreshing_until": None}}
+        )
+
+    async def count_by_section(self) -> Dict[str, int]:
+        cursor = await self.collection.aggregate([
+            {"$group": {"_id": "$section", "count": {"$sum": 1}}}
+        ])
+        return {row["_id"]: row["count"] async for row in cursor}
+
+
+company_intel_dao = CompanyIntelDAO()
@@ -1,10 +1,20 @@
 from mongo.dao_setup import db_client, COVER_LETTERS
+from mongo.index_registry import index_registry
 from pymongo import DESCENDING
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Optional
 from bson import ObjectId
 import secrets
 
+
+index_registry.declare(COVER_LETTERS, [("uuid", 1), ("created_at", -1)])
+index_registry.declare(COVER_LETTERS, "template_type")
+index_registry.declare("cover_letter_feedback", [("cover_letter_id", 1), ("date_created", -1)])
+index_registry.declare("cover_letter_shares", "token")
+index_registry.declare("cover_letter_shares", "cover_letter_id")
+index_registry.declare("cover_letter_versions", [("cover_letter_id", 1), ("created_at", -1)])
+
+
 class CoverLettersDAO:
     def __init__(self):
         self.collection = db_client.get_collection(COVER_LETTERS)
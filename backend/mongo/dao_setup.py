@@ -41,6 +41,7 @@ BADGES = os.getenv("BADGES_COLLECTION", "badges")
 PROBLEM_SUBMISSIONS = os.getenv("PROBLEM_SUBMISSIONS_COLLECTION", "problem_submissions")
 
 RESET_LINKS = os.getenv("RESET_LINKS_COLLECTION")
+SESSIONS = os.getenv("SESSIONS_COLLECTION", "sessions")
 GOOGLE_OAUTH = os.getenv("GOOGLE_OAUTH_CREDENTIALS")
 COHERE_API = os.getenv("COHERE_API_KEY")
 JOB_REQUIREMENTS = os.getenv("JOB_REQUIREMENTS_COLLECTION", "job_requirements")
@@ -49,6 +50,31 @@ OFFERS = "offers"  # UC-083: Salary negotiation collection
 CAREER_SIMULATIONS = "career_simulations"  # Career path simulations collection
 TECHNICAL_CHALLENGES = os.getenv("TECHNICAL_CHALLENGES_COLLECTION", "technical_challenges")  # UC-078: Technical Interview Prep
 CHALLENGE_ATTEMPTS = os.getenv("CHALLENGE_ATTEMPTS_COLLECTION", "challenge_attempts")  # UC-078: Challenge performance tracking
+CHALLENGE_LEADERBOARDS = os.getenv("CHALLENGE_LEADERBOARDS_COLLECTION", "challenge_leaderboards")  # Best score per (challenge, user)
+TECHNICAL_PREP_USER_STATS = os.getenv("TECHNICAL_PREP_USER_STATS_COLLECTION", "technical_prep_user_stats")  # Progress counters per user
+
+# Durable background work queue (post-create job research, etc.)
+BACKGROUND_TASKS = os.getenv("BACKGROUND_TASKS_COLLECTION", "background_tasks")
+
+# Periodic job leases and run metrics (services/job_runner.py)
+SCHEDULED_JOBS = os.getenv("SCHEDULED_JOBS_COLLECTION", "scheduled_jobs")
+
+# Cross-user company research cache, keyed by normalized company name
+COMPANY_INTEL_CACHE = os.getenv("COMPANY_INTEL_CACHE_COLLECTION", "company_intel_cache")
+
+# UC-104: Precomputed peer cohort statistics and the per-user rows they are rolled up from
+PEER_BENCHMARKS = os.getenv("PEER_BENCHMARKS_COLLECTION", "peer_benchmarks")
+PEER_BENCHMARK_MEMBERS = os.getenv("PEER_BENCHMARK_MEMBERS_COLLECTION", "peer_benchmark_members")
+
+# Notification emails the dispatcher gave up on, kept for inspection and resend
+NOTIFICATION_DEAD_LETTERS = os.getenv("NOTIFICATION_DEAD_LETTERS_COLLECTION", "notification_dead_letters")
+
+# Denormalized matching profile per user (skills, highest degree, years of experience)
+CANDIDATE_SNAPSHOTS = os.getenv("CANDIDATE_SNAPSHOTS_COLLECTION", "candidate_snapshots")
+
+# Canonical skills (ids, aliases, parent categories) and the version processes reload on
+SKILL_TAXONOMY = os.getenv("SKILL_TAXONOMY_COLLECTION", "skill_taxonomy")
+SKILL_TAXONOMY_STATE = os.getenv("SKILL_TAXONOMY_STATE_COLLECTION", "skill_taxonomy_state")
 
 # UC-117: API Rate Limiting and Error Handling Dashboard collections
 API_CALL_LOGS = "api_call_logs"
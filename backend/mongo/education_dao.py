@@ -1,7 +1,13 @@
 from mongo.dao_setup import db_client, EDUCATION
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 from utils.sanitize import sanitize_dict
+from mongo.candidate_snapshots_dao import candidate_snapshots_dao
+
+
+index_registry.declare(EDUCATION, "uuid")
+
 
 class EducationDAO:
     def __init__(self):
@@ -14,6 +20,7 @@ class EducationDAO:
         data["date_created"] = time
         data["date_updated"] = time
         result = await self.collection.insert_one(data)
+        await candidate_snapshots_dao.invalidate(uuid)
         return str(result.inserted_id)
 
     async def get_all_education(self, uuid: str) -> list[dict]:
@@ -45,6 +52,7 @@ class EducationDAO:
             },
             {"$set": data}
         )
+        await candidate_snapshots_dao.invalidate(uuid)
         return updated.matched_count
 
     async def delete_education(self, education_id: str, uuid: str) -> int:
@@ -52,6 +60,7 @@ class EducationDAO:
             "_id": ObjectId(education_id),
             "uuid": uuid
         })
+        await candidate_snapshots_dao.invalidate(uuid)
         return result.deleted_count
 
 education_dao = EducationDAO()
\ No newline at end of file
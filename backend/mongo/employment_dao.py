@@ -1,7 +1,13 @@
 from mongo.dao_setup import db_client, EMPLOYMENT
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 from utils.sanitize import sanitize_dict
+from mongo.candidate_snapshots_dao import candidate_snapshots_dao
+
+
+index_registry.declare(EMPLOYMENT, "uuid")
+
 
 class EmploymentDAO:
     def __init__(self):
@@ -14,6 +20,7 @@ class EmploymentDAO:
         data["date_created"] = time
         data["date_updated"] = time
         result = await self.collection.insert_one(data)
+        await candidate_snapshots_dao.invalidate(uuid)
         return str(result.inserted_id)
 
     async def get_all_employment(self, uuid: str) -> list[dict]:
@@ -43,6 +50,7 @@ class EmploymentDAO:
             {"_id": ObjectId(employment_id), "uuid": uuid},
             {"$set": data}
         )
+        await candidate_snapshots_dao.invalidate(uuid)
         return updated.matched_count
 
     async def delete_employment(self, employment_id: str, uuid: str) -> int:
@@ -50,6 +58,7 @@ class EmploymentDAO:
             "_id": ObjectId(employment_id),
             "uuid": uuid
         })
+        await candidate_snapshots_dao.invalidate(uuid)
         return result.deleted_count
 
 employment_dao = EmploymentDAO()
\ No newline at end of file
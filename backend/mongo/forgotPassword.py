@@ -117,6 +117,7 @@ from datetime import datetime, timedelta, timezone
 from email.mime.text import MIMEText
 from dotenv import load_dotenv
 from mongo.dao_setup import db_client, RESET_LINKS
+from mongo.index_registry import index_registry
 from mongo.auth_dao import auth_dao
 
 
@@ -128,6 +129,9 @@ import json
 from bson import json_util
 
 
+index_registry.declare(RESET_LINKS, "token")
+index_registry.declare(RESET_LINKS, "expires", ttl_seconds=0)
+
 
 class ForgotPassword:
     def __init__(self):
@@ -273,7 +277,6 @@ class ForgotPassword:
         except Exception as e:
             print("Error storing token:", e)
 
-        await self.collection.create_index("expires", expireAfterSeconds=0)
         
         
         data = await self.collection.find_one({"token": db_token})
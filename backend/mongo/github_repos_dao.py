@@ -1,11 +1,24 @@
 """
 MongoDB Data Access Object for GitHub repository data
+
+github_sync_state holds one document per user (_id = uuid) with the ETag
+and repo ids of every page of their last repository listing, so a sync can
+send conditional requests and skip pages GitHub reports as unchanged.
 """
 
-from typing import Optional, Dict, List
+from typing import Any, Iterable, Optional, Dict, List
 from datetime import datetime
 from pymongo import UpdateOne
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
+
+
+index_registry.declare("github_repositories", [("uuid", 1), ("repo_id", 1)])
+
+# User-managed fields a sync never overwrites
+USER_FIELDS_DEFAULTS = {"is_featured": False, "linked_skills": [], "notes": ""}
+# Sync bookkeeping and bulky activity data left out of repository lists
+LIST_PROJECTION = {"_id": 0, "languages_etag": 0, "commit_activity_etag": 0, "commit_activity.weekly_data": 0}
 
 
 class GitHubReposDAO:
@@ -14,7 +27,7 @@ class GitHubReposDAO:
     def __init__(self):
         self.collection_name = "github_repositories"
         self.collection = db_client.get_collection(self.collection_name)
-
+        self.sync_state = db_client.get_collection("github_sync_state")
     
     async def get_user_repos(self, uuid: str) -> List[Dict]:
         """
@@ -30,7 +43,7 @@ class GitHubReposDAO:
             collection = self.collection
             cursor = collection.find(
                 {"uuid": uuid},
-                {"_id": 0}  # Exclude _id field (not JSON serializable)
+                LIST_PROJECTION  # _id is not JSON serializable
             ).sort("updated_at", -1)
             repos = await cursor.to_list(length=None)
             return repos
@@ -64,6 +77,9 @@ class GitHubReposDAO:
         """
         Store or update repositories for a user (bulk operation)
         
+        Featured status, linked skills and notes are only set on insert, so
+        a re-sync keeps what the user chose.
+        
         Args:
             uuid: User's unique identifier
             repos: List of repository dictionaries
@@ -72,39 +88,53 @@ class GitHubReposDAO:
             True if successful, False otherwise
         """
         try:
-            collection = self.collection
-            
-            # Add uuid to each repo
-            for repo in repos:
-                repo["uuid"] = uuid
-                repo["synced_at"] = datetime.utcnow()
-                
-                # Preserve existing featured status and notes if repo exists
-                existing = await self.get_repo(uuid, repo["repo_id"])
-                if existing:
-                    repo["is_featured"] = existing.get("is_featured", False)
-                    repo["linked_skills"] = existing.get("linked_skills", [])
-                    repo["notes"] = existing.get("notes", "")
-            
-            # Bulk upsert using UpdateOne operations
+            now = datetime.utcnow()
             operations = []
             for repo in repos:
+                fields = {k: v for k, v in repo.items() if k not in USER_FIELDS_DEFAULTS}
+                fields.update(uuid=uuid, synced_at=now)
                 operations.append(
                     UpdateOne(
                         {"uuid": uuid, "repo_id": repo["repo_id"]},
-                        {"$set": repo},
+                        {"$set": fields, "$setOnInsert": dict(USER_FIELDS_DEFAULTS)},
                         upsert=True
                     )
                 )
             
             if operations:
-                await collection.bulk_write(operations)
+                await self.collection.bulk_write(operations, ordered=False)
             
             return True
         except Exception as e:
             print(f"Error storing repos: {e}")
             return False
     
+    async def get_sync_index(self, uuid: str) -> Dict[int, Dict]:
+        """repo_id -> the fields a sync compares against (pushed_at, ETags), for all of a user's repos"""
+        cursor = self.collection.find(
+            {"uuid": uuid},
+            {"_id": 0, "repo_id": 1, "full_name": 1, "pushed_at": 1, "languages_etag": 1,
+             "commit_activity_etag": 1, "commit_activity_pending": 1}
+        )
+        return {doc["repo_id"]: doc async for doc in cursor}
+    
+    async def update_repo_fields(self, uuid: str, repo_id: int, fields: Dict[str, Any]) -> None:
+        await self.collection.update_one({"uuid": uuid, "repo_id": repo_id}, {"$set": fields})
+    
+    async def mark_synced(self, uuid: str, synced_at: str) -> None:
+        await self.collection.update_many({"uuid": uuid}, {"$set": {"last_synced": synced_at}})
+    
+    async def delete_repos_except(self, uuid: str, repo_ids: Iterable[int]) -> int:
+        """Remove repositories that are no longer in the user's GitHub listing"""
+        result = await self.collection.delete_many({"uuid": uuid, "repo_id": {"$nin": list(repo_ids)}})
+        return result.deleted_count
+    
+    async def get_sync_state(self, uuid: str) -> Optional[Dict]:
+        return await self.sync_state.find_one({"_id": uuid})
+    
+    async def save_sync_state(self, uuid: str, state: Dict[str, Any]) -> None:
+        await self.sync_state.update_one({"_id": uuid}, {"$set": state}, upsert=True)
+    
     async def get_featured_repos(self, uuid: str) -> List[Dict]:
         """
         Get repositories marked as featured
@@ -215,6 +245,7 @@ class GitHubReposDAO:
         try:
             collection = self.collection
             result = await collection.delete_many({"uuid": uuid})
+            await self.sync_state.delete_one({"_id": uuid})
             return result.deleted_count > 0
         except Exception as e:
             print(f"Error deleting user repos: {e}")
@@ -5,6 +5,10 @@ MongoDB Data Access Object for GitHub OAuth tokens
 from typing import Optional, Dict
 from datetime import datetime
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
+
+
+index_registry.declare("github_tokens", "uuid")
 
 
 class GitHubTokensDAO:
@@ -0,0 +1,84 @@
+"""
+Gmail message cache
+Parsed Gmail message metadata per user, one document per message with
+_id = "<uuid>:<message_id>". Bodies are added lazily the first time one is
+opened. gmail_sync_state keeps the mailbox historyId the cache is current
+as of (_id = uuid), so later searches only fetch what changed since.
+"""
+from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+from pymongo import UpdateOne
+
+GMAIL_MESSAGES = "gmail_messages"
+GMAIL_SYNC_STATE = "gmail_sync_state"
+
+
+index_registry.declare(GMAIL_MESSAGES, "uuid")
+
+
+def _message_key(uuid: str, message_id: str) -> str:
+    return f"{uuid}:{message_id}"
+
+
+class GmailMessagesDAO:
+    def __init__(self):
+        self.collection = db_client.get_collection(GMAIL_MESSAGES)
+        self.sync_state = db_client.get_collection(GMAIL_SYNC_STATE)
+
+    async def get_messages(self, uuid: str, message_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Cached metadata for the given ids, keyed by message id (bodies left out)"""
+        keys = [_message_key(uuid, message_id) for message_id in message_ids]
+        if not keys:
+            return {}
+        cursor = self.collection.find({"_id": {"$in": keys}}, {"_id": 0, "uuid": 0, "body": 0})
+        return {doc["id"]: doc async for doc in cursor}
+
+    async def store_messages(self, uuid: str, messages: List[Dict]) -> None:
+        """Upsert parsed metadata; a cached body is kept"""
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne(
+                {"_id": _message_key(uuid, message["id"])},
+                {"$set": {**message, "uuid": uuid, "cached_at": now}},
+                upsert=True
+            )
+            for message in messages
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def get_body(self, uuid: str, message_id: str) -> Optional[str]:
+        doc = await self.collection.find_one({"_id": _message_key(uuid, message_id)}, {"body": 1})
+        return doc.get("body") if doc else None
+
+    async def store_body(self, uuid: str, message_id: str, body: str) -> None:
+        # Only onto a cached message, so a body never outlives an invalidation
+        await self.collection.update_one({"_id": _message_key(uuid, message_id)}, {"$set": {"body": body}})
+
+    async def invalidate(self, uuid: str, message_ids: Iterable[str]) -> int:
+        keys = [_message_key(uuid, message_id) for message_id in message_ids]
+        if not keys:
+            return 0
+        result = await self.collection.delete_many({"_id": {"$in": keys}})
+        return result.deleted_count
+
+    async def get_history_id(self, uuid: str) -> Optional[str]:
+        doc = await self.sync_state.find_one({"_id": uuid})
+        return doc.get("history_id") if doc else None
+
+    async def save_history_id(self, uuid: str, history_id: Optional[str]) -> None:
+        await self.sync_state.update_one(
+            {"_id": uuid},
+            {"$set": {"history_id": history_id, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+    async def delete_user_messages(self, uuid: str) -> None:
+        """Drop a user's whole cache (disconnect, or history too old to replay)"""
+        await self.collection.delete_many({"uuid": uuid})
+        await self.sync_state.delete_one({"_id": uuid})
+
+
+gmail_messages_dao = GmailMessagesDAO()
@@ -1,9 +1,14 @@
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
 from datetime import datetime, timezone
 from typing import Optional, Dict
 
 GMAIL_TOKENS = "gmail_tokens"
 
+
+index_registry.declare(GMAIL_TOKENS, "uuid")
+
+
 class GmailTokensDAO:
     def __init__(self):
         self.collection = db_client.get_collection(GMAIL_TOKENS)
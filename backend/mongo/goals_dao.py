@@ -1,9 +1,14 @@
 # goals_dao.py
 from mongo.dao_setup import db_client, GOALS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 from typing import Optional
 
+
+index_registry.declare(GOALS, "uuid")
+
+
 class GoalsDAO:
     def __init__(self):
         self.collection = db_client.get_collection(GOALS)
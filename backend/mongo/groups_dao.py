@@ -1,7 +1,12 @@
 from mongo.dao_setup import db_client, GROUPS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 
 
+index_registry.declare(GROUPS, [("members.uuid", 1), ("created_at", -1)])
+index_registry.declare(GROUPS, [("created_at", -1)])
+
+
 class groupsDAO:
     def __init__(self):
         self.collection = db_client.get_collection(GROUPS)
@@ -0,0 +1,263 @@
+"""
+Index Registry
+
+Single place where every collection's indexes are declared. DAO modules
+declare the compound/TTL indexes their queries rely on at import time; on
+startup main.py calls reconcile(), which builds whatever is missing and
+reports indexes that exist in Mongo but are not declared (or have not been
+used since the server started).
+
+test_index_registry.py statically scans the DAO modules (mongo/query_paths.py)
+and fails when a query filters a collection without a supporting index, so
+a new query path has to come with its index, or with an explicit
+allow_scan() for small reference collections.
+
+Usage:
+    from mongo.index_registry import index_registry
+
+    index_registry.declare(JOBS, [("uuid", 1), ("date_created", -1)])
+    index_registry.declare(SESSIONS, [("expires_at", 1)], ttl_seconds=0)
+
+    report = await index_registry.reconcile(db_client)
+"""
+
+import importlib
+import os
+import pkgutil
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from pymongo.errors import OperationFailure
+
+# Build missing indexes at startup (set to 0 to only report)
+SYNC_INDEXES = os.getenv("MONGO_SYNC_INDEXES", "1") != "0"
+# Raise instead of warn when an index could not be built or conflicts
+STRICT = os.getenv("MONGO_INDEX_STRICT", "0") == "1"
+
+Keys = Union[str, Sequence[Tuple[str, int]]]
+
+
+@dataclass
+class IndexSpec:
+    collection: str
+    keys: Tuple[Tuple[str, int], ...]
+    unique: bool = False
+    sparse: bool = False
+    ttl_seconds: Optional[int] = None
+    partial_filter: Optional[Dict[str, Any]] = None
+    owner: str = ""
+
+    @property
+    def name(self) -> str:
+        """Mongo's default index name, so hand-made indexes are recognised"""
+        return "_".join(f"{f}_{d}" for f, d in self.keys)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(f for f, _ in self.keys)
+
+    def options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.ttl_seconds is not None:
+            options["expireAfterSeconds"] = self.ttl_seconds
+        if self.partial_filter is not None:
+            options["partialFilterExpression"] = self.partial_filter
+        return options
+
+    def supports(self, fields: Sequence[str], sort: Sequence[str] = ()) -> bool:
+        """
+        An index serves a query when its leading field is one of the
+        equality fields, or (for an unfiltered sorted read) the sort field
+        """
+        leading = self.keys[0][0]
+        if fields:
+            return leading in fields
+        return bool(sort) and leading == sort[0]
+
+
+def _normalize_keys(keys: Keys) -> Tuple[Tuple[str, int], ...]:
+    if isinstance(keys, str):
+        return ((keys, 1),)
+    return tuple((f, d) for f, d in keys)
+
+
+def import_dao_modules() -> None:
+    """Import every module under mongo/ so all declarations are registered"""
+    package_dir = Path(__file__).parent
+    for module in pkgutil.iter_modules([str(package_dir)]):
+        importlib.import_module(f"mongo.{module.name}")
+
+
+class IndexRegistry:
+    def __init__(self):
+        self._specs: Dict[str, List[IndexSpec]] = {}
+        self._scan_allowed: Dict[str, str] = {}
+
+    def declare(self, collection: Optional[str], keys: Keys, *, unique: bool = False,
+                sparse: bool = False, ttl_seconds: Optional[int] = None,
+                partial_filter: Optional[Dict[str, Any]] = None) -> None:
+        """Declare an index. Re-declaring the same keys replaces the spec."""
+        if not collection:
+            # Collection name comes from an unset env var; the DAO reports that itself
+            return
+        spec = IndexSpec(
+            collection=collection,
+            keys=_normalize_keys(keys),
+            unique=unique,
+            sparse=sparse,
+            ttl_seconds=ttl_seconds,
+            partial_filter=partial_filter,
+            owner=sys._getframe(1).f_globals.get("__name__", ""),
+        )
+        specs = self._specs.setdefault(collection, [])
+        specs[:] = [s for s in specs if s.keys != spec.keys]
+        specs.append(spec)
+
+    def allow_scan(self, collection: Optional[str], reason: str) -> None:
+        """Mark a small reference collection whose queries may scan"""
+        if collection:
+            self._scan_allowed[collection] = reason
+
+    def collections(self) -> List[str]:
+        return sorted(self._specs)
+
+    def specs(self, collection: Optional[str] = None) -> List[IndexSpec]:
+        if collection is not None:
+            return list(self._specs.get(collection, []))
+        return [spec for name in self.collections() for spec in self._specs[name]]
+
+    def is_supported(self, collection: str, fields: Sequence[str], sort: Sequence[str] = ()) -> bool:
+        if "_id" in fields or collection in self._scan_allowed:
+            return True
+        if not fields and not sort:
+            # Reads the whole collection; no index can help
+            return True
+        return any(spec.supports(fields, sort) for spec in self._specs.get(collection, []))
+
+    def unsupported(self, paths) -> List[Any]:
+        """Query paths (see mongo.query_paths) with no supporting index"""
+        return [p for p in paths if not self.is_supported(p.collection, p.fields, p.sort)]
+
+    # ------------------------------------------------------------------
+    # Reconciliation against a live database
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def _existing(collection) -> Dict[Tuple[Tuple[str, int], ...], Dict[str, Any]]:
+        existing = {}
+        async for index in await collection.list_indexes():
+            if index["name"] == "_id_":
+                continue
+            keys = tuple((f, int(d) if isinstance(d, (int, float)) else d) for f, d in index["key"].items())
+            existing[keys] = index
+        return existing
+
+    @staticmethod
+    async def _usage(collection) -> Dict[str, int]:
+        """ops per index name since the server started ({} if not permitted)"""
+        usage = {}
+        try:
+            async for stat in await collection.aggregate([{"$indexStats": {}}]):
+                usage[stat["name"]] = int(stat.get("accesses", {}).get("ops", 0))
+        except OperationFailure:
+            pass
+        return usage
+
+    @staticmethod
+    def _conflicts(spec: IndexSpec, index: Dict[str, Any]) -> List[str]:
+        problems = []
+        if bool(index.get("unique")) != spec.unique:
+            problems.append(f"unique={bool(index.get('unique'))}, declared {spec.unique}")
+        if bool(index.get("sparse")) != spec.sparse:
+            problems.append(f"sparse={bool(index.get('sparse'))}, declared {spec.sparse}")
+        if index.get("partialFilterExpression") != spec.partial_filter:
+            problems.append("partialFilterExpression differs")
+        return problems
+
+    async def reconcile(self, db, create_missing: bool = SYNC_INDEXES,
+                        strict: bool = STRICT) -> Dict[str, List[str]]:
+        """
+        Build declared indexes that are missing, fix changed TTLs, and report
+        what does not match. Indexes that exist but are not declared are
+        reported, never dropped.
+        """
+        report: Dict[str, List[str]] = {
+            "created": [], "missing": [], "ttl_updated": [], "failed": [],
+            "conflicts": [], "undeclared": [], "unused": [],
+        }
+
+        for name in self.collections():
+            collection = db.get_collection(name)
+            existing = await self._existing(collection)
+            declared = set()
+
+            for spec in self._specs[name]:
+                label = f"{name}.{spec.name}"
+                declared.add(spec.keys)
+                index = existing.get(spec.keys)
+
+                if index is None:
+                    if not create_missing:
+                        report["missing"].append(label)
+                        continue
+                    try:
+                        await collection.create_index(list(spec.keys), **spec.options())
+                        report["created"].append(label)
+                    except OperationFailure as e:
+                        # e.g. duplicates blocking a unique index
+                        report["failed"].append(f"{label}: {e.details.get('errmsg', e) if e.details else e}")
+                    continue
+
+                problems = self._conflicts(spec, index)
+                if problems:
+                    report["conflicts"].append(f"{label} ({'; '.join(problems)})")
+
+                if spec.ttl_seconds is not None and index.get("expireAfterSeconds") != spec.ttl_seconds:
+                    try:
+                        await db.command({
+                            "collMod": name,
+                            "index": {"name": index["name"], "expireAfterSeconds": spec.ttl_seconds},
+                        })
+                        report["ttl_updated"].append(label)
+                    except OperationFailure as e:
+                        report["failed"].append(f"{label}: {e}")
+
+            for keys, index in existing.items():
+                if keys not in declared:
+                    report["undeclared"].append(f"{name}.{index['name']}")
+
+            for index_name, ops in (await self._usage(collection)).items():
+                if index_name != "_id_" and ops == 0:
+                    report["unused"].append(f"{name}.{index_name}")
+
+        self._print_report(report)
+        if strict and (report["failed"] or report["conflicts"] or report["missing"]):
+            raise RuntimeError(
+                f"Index reconciliation failed: {report['failed'] + report['conflicts'] + report['missing']}"
+            )
+        return report
+
+    @staticmethod
+    def _print_report(report: Dict[str, List[str]]) -> None:
+        summary = ", ".join(f"{len(items)} {key}" for key, items in report.items())
+        print(f"[Indexes] {summary}")
+        for key in ("created", "ttl_updated"):
+            for item in report[key]:
+                print(f"[Indexes] {key}: {item}")
+        for key in ("missing", "failed", "conflicts"):
+            for item in report[key]:
+                print(f"[Indexes] Warning: {key}: {item}")
+        if report["undeclared"]:
+            print(f"[Indexes] Not declared in the registry: {', '.join(report['undeclared'])}")
+        if report["unused"]:
+            print(f"[Indexes] No use since server start: {', '.join(report['unused'])}")
+
+
+# Global instance
+index_registry = IndexRegistry()
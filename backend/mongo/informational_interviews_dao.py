@@ -1,7 +1,12 @@
 from mongo.dao_setup import db_client, INFORMATIONAL_INTERVIEWS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 
+
+index_registry.declare(INFORMATIONAL_INTERVIEWS, [("uuid", 1), ("scheduled_date", 1)])
+
+
 class InformationalInterviewDAO:
     def __init__(self):
         self.collection = db_client.get_collection(INFORMATIONAL_INTERVIEWS)
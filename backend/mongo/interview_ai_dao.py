@@ -1,8 +1,4 @@
-from openai import OpenAI
-import os
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from services.tracked_ai_clients import TrackedOpenAIClient
+from services.tracked_ai_clients import AsyncTrackedOpenAIClient
 
 
 class InterviewAIDAO:
@@ -15,9 +11,8 @@ class InterviewAIDAO:
     """
 
     def __init__(self):
-        # Use TrackedOpenAIClient for automatic logging
-        self.client = TrackedOpenAIClient(key_owner="interview_coaching")
-        self.executor = ThreadPoolExecutor(max_workers=3)
+        # Use AsyncTrackedOpenAIClient for automatic logging
+        self.client = AsyncTrackedOpenAIClient(key_owner="interview_coaching")
 
     async def generate_text(self, prompt: str, system_message="") -> str:
         '''
@@ -31,22 +26,14 @@ class InterviewAIDAO:
             Generated text response from OpenAI
         '''
         try:
-            # Run the synchronous OpenAI call in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                self.executor,
-                self._call_openai,
-                prompt,
-                system_message
-            )
-            return response
+            return await self._call_openai(prompt, system_message)
         except Exception as e:
             raise Exception(f"Error generating interview coaching text: {str(e)}")
 
-    def _call_openai(self, prompt: str, system_message: str) -> str:
-        """Synchronous OpenAI API call wrapper for interview coaching"""
+    async def _call_openai(self, prompt: str, system_message: str) -> str:
+        """Async OpenAI API call wrapper for interview coaching"""
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": system_message},
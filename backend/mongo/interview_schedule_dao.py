@@ -3,6 +3,16 @@ from datetime import datetime, timezone, timedelta
 from typing import List, Optional, Dict, Any
 from bson import ObjectId
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
+
+
+index_registry.declare("interview_schedules", [("uuid", 1), ("interview_datetime", 1)])
+index_registry.declare("interview_schedules", [("status", 1), ("interview_datetime", 1)])
+index_registry.declare("interview_schedules", [("job_application_uuid", 1), ("interview_datetime", 1)])
+index_registry.declare("follow_up_templates", "uuid")
+index_registry.declare("follow_up_templates", "interview_uuid")
+index_registry.declare("follow_up_templates", [("user_uuid", 1), ("date_created", -1)])
+
 
 class InterviewScheduleDAO:
     """Data Access Object for interview schedules"""
@@ -4,7 +4,7 @@
 DAO for storing and retrieving automatically extracted job requirements.
 
 The extraction includes:
-- requiredSkills: [{ name, level, weight }]
+- requiredSkills: [{ name, taxonomyId, level, weight }]
 - minYearsExperience
 - educationLevel
 - extractedAt: timestamp
@@ -13,11 +13,15 @@ The extraction includes:
 from datetime import datetime
 from bson import ObjectId
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
 
 COLLECTION_NAME = "job_requirements"   # You can rename in .env if needed
 requirements_collection = db_client.get_collection(COLLECTION_NAME)
 
 
+index_registry.declare(COLLECTION_NAME, "jobId")
+
+
 class JobRequirementsExtractorDAO:
 
     # ---------------------------------------------------------
@@ -1,11 +1,33 @@
-from mongo.dao_setup import db_client, JOBS
+from mongo.dao_setup import db_client, JOBS, RESUMES, COVER_LETTERS
+from mongo.index_registry import index_registry
 from bson import ObjectId
+from bson.errors import InvalidId
 from datetime import datetime, timezone
 from utils.sanitize import sanitize_text
 
+# Large generated blobs the job list view never renders
+LIST_VIEW_EXCLUDED_FIELDS = ("company_research", "company_news", "salary_negotiation")
+
+
+index_registry.declare(JOBS, [("uuid", 1), ("date_created", -1)])
+
+
+def _object_ids(ids) -> list:
+    result = []
+    for value in ids:
+        try:
+            result.append(ObjectId(value))
+        except (InvalidId, TypeError):
+            continue
+    return result
+
+
 class JobsDAO:
     def __init__(self):
         self.collection = db_client.get_collection(JOBS)
+        self.resumes = db_client.get_collection(RESUMES)
+        self.resume_versions = db_client.get_collection("resume_versions")
+        self.cover_letters = db_client.get_collection(COVER_LETTERS)
 
     async def add_job(self, data: dict) -> str:
         time = datetime.now(timezone.utc)
@@ -21,14 +43,95 @@ class JobsDAO:
         result = await self.collection.insert_one(data)
         return str(result.inserted_id)
 
-    async def get_all_jobs(self, uuid: str) -> list[dict]:
-        cursor = self.collection.find({"uuid": uuid})
+    async def get_all_jobs(self, uuid: str, projection: dict | None = None) -> list[dict]:
+        cursor = self.collection.find({"uuid": uuid}, projection)
         results = []
         async for doc in cursor:
             doc["_id"] = str(doc["_id"])
             results.append(doc)
         return results
 
+    async def get_submissions(self, uuid: str) -> list[dict]:
+        """
+        {submitted_at, status} for each of the user's submitted jobs. submitted_at
+        is stored as a datetime by some writers and an ISO string by others;
+        both come back as a (naive UTC) datetime.
+        """
+        pipeline = [
+            {"$match": {"uuid": uuid, "submitted_at": {"$nin": [None, ""]}}},
+            {"$project": {
+                "_id": 0,
+                "status": 1,
+                "submitted_at": {"$convert": {"input": "$submitted_at", "to": "date", "onError": None, "onNull": None}},
+            }},
+            {"$match": {"submitted_at": {"$ne": None}}},
+        ]
+        return [doc async for doc in await self.collection.aggregate(pipeline)]
+
+    async def attach_material_details(self, jobs: list[dict], uuid: str) -> list[dict]:
+        """
+        Fill materials.resume_name/version and cover_letter_name/version on
+        every job with one $in query per collection instead of one per job.
+        """
+        resume_ids = {j["materials"]["resume_id"] for j in jobs if (j.get("materials") or {}).get("resume_id")}
+        letter_ids = {j["materials"]["cover_letter_id"] for j in jobs if (j.get("materials") or {}).get("cover_letter_id")}
+
+        resumes = {}
+        if resume_ids:
+            cursor = self.resumes.find(
+                {"_id": {"$in": _object_ids(resume_ids)}, "uuid": uuid},
+                {"name": 1, "version_name": 1}
+            )
+            async for doc in cursor:
+                resumes[str(doc["_id"])] = {
+                    "name": doc.get("name", "Unnamed Resume"),
+                    "version": doc.get("version_name", "Version 1"),
+                }
+
+            # Materials may point at a saved version rather than the main resume
+            version_ids = _object_ids(resume_ids - resumes.keys())
+            if version_ids:
+                versions = [doc async for doc in self.resume_versions.find(
+                    {"_id": {"$in": version_ids}}, {"resume_id": 1, "version_name": 1}
+                )]
+                parents = {}
+                parent_ids = _object_ids({v.get("resume_id") for v in versions if v.get("resume_id")})
+                if parent_ids:
+                    async for doc in self.resumes.find({"_id": {"$in": parent_ids}, "uuid": uuid}, {"name": 1}):
+                        parents[str(doc["_id"])] = doc.get("name", "Unnamed Resume")
+                for version in versions:
+                    if version.get("resume_id") in parents:
+                        resumes[str(version["_id"])] = {
+                            "name": parents[version["resume_id"]],
+                            "version": version.get("version_name", "Version 1"),
+                        }
+
+        letters = {}
+        if letter_ids:
+            cursor = self.cover_letters.find(
+                {"_id": {"$in": list(letter_ids)}, "uuid": uuid},
+                {"title": 1, "version_name": 1}
+            )
+            async for doc in cursor:
+                letters[str(doc["_id"])] = {
+                    "name": doc.get("title", "Unnamed Cover Letter"),
+                    "version": doc.get("version_name", "Version 1"),
+                }
+
+        for job in jobs:
+            materials = job.get("materials")
+            if not materials:
+                continue
+            resume = resumes.get(materials.get("resume_id"))
+            if resume:
+                materials["resume_name"] = resume["name"]
+                materials["resume_version"] = resume["version"]
+            letter = letters.get(materials.get("cover_letter_id"))
+            if letter:
+                materials["cover_letter_name"] = letter["name"]
+                materials["cover_letter_version"] = letter["version"]
+        return jobs
+
     async def get_job(self, job_id: str) -> dict | None:
         return await self.collection.find_one({"_id": ObjectId(job_id)})
 
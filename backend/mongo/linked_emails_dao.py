@@ -3,12 +3,18 @@ Email Tracking DAO - Store and retrieve emails linked to job applications
 """
 
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 from typing import List, Dict, Optional
 
 LINKED_EMAILS = "linked_emails"
 
+
+index_registry.declare(LINKED_EMAILS, [("job_id", 1), ("date", -1)])
+index_registry.declare(LINKED_EMAILS, [("linked_by", 1), ("linked_at", -1)])
+
+
 class LinkedEmailsDAO:
     """Data access layer for emails linked to job applications"""
     
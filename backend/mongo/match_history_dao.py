@@ -2,18 +2,23 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List
 
 from mongo.dao_setup import db_client, MATCH_HISTORY
+from mongo.index_registry import index_registry
+
+
+index_registry.declare(MATCH_HISTORY, [("uuid", 1), ("createdAt", -1)])
 
 
 class MatchHistoryDAO:
     def __init__(self):
         self.collection = db_client.get_collection(MATCH_HISTORY)
 
-    async def log_match(self, uuid: str, match: Dict[str, Any]) -> str:
+    @staticmethod
+    def _history_doc(uuid: str, match: Dict[str, Any], created_at: datetime) -> Dict[str, Any]:
         """
         match is the dict returned from compute_match_for_job.
         We store a subset + metadata.
         """
-        doc = {
+        return {
             "uuid": uuid,
             "jobId": match.get("jobId"),
             "jobTitle": match.get("jobTitle"),
@@ -23,11 +28,25 @@ class MatchHistoryDAO:
             "profileWarnings": match.get("profileWarnings", []),
             "usedCategories": match.get("usedCategories", {}),
             "generatedAt": match.get("generatedAt"),
-            "createdAt": datetime.now(timezone.utc),
+            "createdAt": created_at,
         }
+
+    async def log_match(self, uuid: str, match: Dict[str, Any]) -> str:
+        doc = self._history_doc(uuid, match, datetime.now(timezone.utc))
         result = await self.collection.insert_one(doc)
         return str(result.inserted_id)
 
+    async def log_matches(self, uuid: str, matches: List[Dict[str, Any]]) -> int:
+        """Record a batch of matches with one insert; returns how many were written"""
+        if not matches:
+            return 0
+        now = datetime.now(timezone.utc)
+        result = await self.collection.insert_many(
+            [self._history_doc(uuid, match, now) for match in matches],
+            ordered=False
+        )
+        return len(result.inserted_ids)
+
     async def get_history_for_user(self, uuid: str, limit: int = 50) -> List[Dict[str, Any]]:
         cursor = (
             self.collection.find({"uuid": uuid})
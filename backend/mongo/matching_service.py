@@ -1,5 +1,7 @@
 # backend/mongo/matching_service.py
 
+import asyncio
+from dataclasses import dataclass
 from typing import Dict, Any, List
 from datetime import datetime, date
 
@@ -11,7 +13,10 @@ from mongo.education_dao import education_dao
 from mongo.employment_dao import employment_dao
 from mongo.profiles_dao import profiles_dao
 from mongo.match_history_dao import match_history_dao
-from redis_client import redis
+from mongo.candidate_snapshots_dao import candidate_snapshots_dao
+from redis_client import cache
+from services.skill_taxonomy import SkillIndex, skill_taxonomy
+from utils.lexicon import normalize_term
 
 
 jobs_collection = db_client.get_collection(JOBS)
@@ -153,7 +158,7 @@ def _experience_years_from_level(exp_level: str | None) -> float:
 # BUILD DYNAMIC PROFILE
 # ------------------------
 
-async def _get_profile(uuid: str) -> Dict[str, Any] | None:
+async def _build_profile_snapshot(uuid: str) -> Dict[str, Any]:
     """
     Build a full dynamic profile using the user's ACTUAL data sources:
       - skills_dao
@@ -162,13 +167,17 @@ async def _get_profile(uuid: str) -> Dict[str, Any] | None:
       - profiles_dao (experience_level + matching prefs)
     """
 
-    base_profile = await profiles_dao.get_profile(uuid)
+    base_profile, raw_skills, raw_edu, raw_emp = await asyncio.gather(
+        profiles_dao.get_profile(uuid),
+        skills_dao.get_all_skills(uuid),
+        education_dao.get_all_education(uuid),
+        employment_dao.get_all_employment(uuid),
+    )
     base_profile = base_profile or {}
 
     # -------------------------------------------------------
     # 1) SKILLS
     # -------------------------------------------------------
-    raw_skills = await skills_dao.get_all_skills(uuid)
     skills = []
     for s in raw_skills:
         name = (
@@ -184,6 +193,7 @@ async def _get_profile(uuid: str) -> Dict[str, Any] | None:
 
         skills.append({
             "name": name.lower(),
+            "taxonomyId": s.get("taxonomy_id"),
             "level": level_num,
             "weight": 1.0
         })
@@ -191,7 +201,6 @@ async def _get_profile(uuid: str) -> Dict[str, Any] | None:
     # -------------------------------------------------------
     # 2) EDUCATION → highest degree
     # -------------------------------------------------------
-    raw_edu = await education_dao.get_all_education(uuid)
     highest_rank = 0
     highest_label = None
 
@@ -212,7 +221,6 @@ async def _get_profile(uuid: str) -> Dict[str, Any] | None:
     # -------------------------------------------------------
     # 3) EMPLOYMENT → total years experience
     # -------------------------------------------------------
-    raw_emp = await employment_dao.get_all_employment(uuid)
     total_years = 0.0
 
     for job in raw_emp:
@@ -231,26 +239,39 @@ async def _get_profile(uuid: str) -> Dict[str, Any] | None:
     # -------------------------------------------------------
     prefs = base_profile.get("matchingPreferences", {}) or {}
 
-    # If user literally has no data
-    if not skills and total_years == 0 and highest_rank == 0:
-        return None
-    
-    print("PROFILE DEBUG:", {
-    "skills": skills,
-    "educationLevel": highest_label,
-    "totalYearsExperience": total_years
-    })
-
     return {
         "uuid": uuid,
         "skills": skills,
         "educationLevel": highest_label,
+        "educationRank": highest_rank,
         "totalYearsExperience": round(total_years, 2),
         "experience_level": base_profile.get("experience_level"),
-        "matchingPreferences": prefs
+        "matchingPreferences": prefs,
+        # Current jobs count up to today, so a snapshot is only good for the day it was built
+        "asOf": date.today().isoformat(),
     }
 
 
+async def _get_profile(uuid: str) -> Dict[str, Any] | None:
+    """
+    The user's matching profile from their candidate snapshot (one read, often
+    none), rebuilt from the source collections when a write invalidated it.
+    """
+    version, snapshot = await candidate_snapshots_dao.get(uuid)
+    if snapshot is None or snapshot.get("asOf") != date.today().isoformat():
+        snapshot = await _build_profile_snapshot(uuid)
+        try:
+            await candidate_snapshots_dao.save(uuid, version, snapshot)
+        except Exception as e:
+            # Matching still works from the fresh build
+            print("⚠ Failed to save candidate snapshot:", e)
+
+    # If user literally has no data
+    if not snapshot["skills"] and snapshot["totalYearsExperience"] == 0 and snapshot["educationRank"] == 0:
+        return None
+    return snapshot
+
+
 
 async def _get_jobs_for_matching(
     uuid: str,
@@ -268,13 +289,10 @@ async def _get_jobs_for_matching(
     cache_key = f"jobs_for_matching:{uuid}:{job_ids_part}:p{page}:l{limit}"
 
     # ---------- REDIS: try cache ----------
-    try:
-        cached = redis.get(cache_key)
-        if cached:
-            return json.loads(cached)
-    except Exception:
-        # Redis should never break the endpoint
-        pass
+    # (cache errors degrade to a miss, they never break the endpoint)
+    cached = await cache.get_json(cache_key)
+    if cached:
+        return cached
 
     # ---------- MONGODB QUERY ----------
     query: Dict[str, Any] = {"uuid": uuid}
@@ -302,10 +320,7 @@ async def _get_jobs_for_matching(
     }
 
     # ---------- REDIS: store result ----------
-    try:
-        redis.set(cache_key, json.dumps(result, default=str), ex=300)
-    except Exception:
-        pass
+    await cache.set_json(cache_key, result, ex=300)
 
     return result
 
@@ -315,36 +330,66 @@ async def _get_jobs_for_matching(
 # Scoring primitives
 # ------------------------
 
+def _skill_key(index: SkillIndex, name: str, taxonomy_id: Any = None) -> int | str:
+    """
+    Taxonomy id of a skill reference: the stored one if the taxonomy still has
+    it, else the name resolved now. Names outside the taxonomy match by their
+    normalized text.
+    """
+    if taxonomy_id in index.names:
+        return taxonomy_id
+    resolved = index.resolve(name)
+    return resolved if resolved is not None else normalize_term(name)
+
+
+def _profile_skill_levels(index: SkillIndex, profile_skills: list) -> Dict[int | str, int]:
+    """
+    Encode profile skills as {taxonomy id: level}. Each skill also counts
+    towards the categories above it, so a required category is met by any
+    skill under it (a job asking for "cloud" is met by "aws").
+    """
+    levels: Dict[int | str, int] = {}
+    for s in profile_skills:
+        if isinstance(s, str):
+            s = {"name": s}
+        if not isinstance(s, dict) or not isinstance(s.get("name"), str):
+            continue
+        level = s.get("level", 1)
+        key = _skill_key(index, s["name"], s.get("taxonomyId"))
+        for k in index.expand([key]) if isinstance(key, int) else [key]:
+            levels[k] = max(levels.get(k, 0), level)
+    return levels
+
+
 def _compute_skill_match(profile_skills: list, required_skills: list) -> dict:
     """
     Compute detailed skill match including:
     - matching
-    - partial (currently none because no levels exist)
+    - partial (user level below the required level)
     - missing
     - per-skill details for Skills Gap page
+
+    Skills are compared by taxonomy id, so aliases match ("k8s" and
+    "kubernetes").
     """
+    index = skill_taxonomy.index
+    return _match_required_skills(index, _profile_skill_levels(index, profile_skills), required_skills)
 
-    # Normalize profile skills into dict {skill: level}
-    profile_map = {}
-    for s in profile_skills:
-        if isinstance(s, str):
-            profile_map[s.lower()] = 1   # default level
-        elif isinstance(s, dict):
-            name = s.get("name")
-            level = s.get("level", 1)
-            if isinstance(name, str):
-                profile_map[name.lower()] = level
 
+def _match_required_skills(index: SkillIndex, profile_map: Dict[int | str, int], required_skills: list) -> dict:
+    """_compute_skill_match against an already encoded profile"""
     # Normalize required skills into list of dicts
     req_list = []
     for s in required_skills:
         if isinstance(s, str):
-            req_list.append({"name": s, "level": 1})
-        elif isinstance(s, dict):
-            name = s.get("name")
-            level = s.get("level", 1)
-            if isinstance(name, str):
-                req_list.append({"name": name, "level": level})
+            s = {"name": s}
+        if not isinstance(s, dict) or not isinstance(s.get("name"), str):
+            continue
+        req_list.append({
+            "name": s["name"],
+            "key": _skill_key(index, s["name"], s.get("taxonomyId")),
+            "level": s.get("level", 1),
+        })
 
     matched = []
     missing = []
@@ -352,9 +397,8 @@ def _compute_skill_match(profile_skills: list, required_skills: list) -> dict:
     details = []
 
     for req in req_list:
-        skill = req["name"].lower()
-        req_level = req.get("level", 1)
-        user_level = profile_map.get(skill, 0)
+        req_level = req["level"]
+        user_level = profile_map.get(req["key"], 0)
 
         # Determine category
         if user_level >= req_level:
@@ -436,8 +480,13 @@ def _compute_experience_match(
     }
 
 
-def _compute_education_match(user_level: str | None, required_level: str | None) -> Dict[str, Any]:
-    user_rank = _normalize_edu(user_level or "")
+def _compute_education_match(
+    user_level: str | None,
+    required_level: str | None,
+    user_rank: int | None = None,
+) -> Dict[str, Any]:
+    if user_rank is None:
+        user_rank = _normalize_edu(user_level or "")
     req_rank = _normalize_edu(required_level or "")
 
     if req_rank == 0:
@@ -455,33 +504,47 @@ def _compute_education_match(user_level: str | None, required_level: str | None)
     }
 
 
-# ------------------------
-# Public API
-# ------------------------
+@dataclass
+class _EncodedProfile:
+    """A profile reduced to what scoring reads, built once per batch of jobs"""
+    index: SkillIndex
+    skill_levels: Dict[int | str, int]
+    years: float | int | None
+    education_level: str | None
+    education_rank: int | None
+    skills_w: float
+    exp_w: float
+    edu_w: float
+    total_w: float
 
-async def compute_match_for_job(
-    uuid: str,
-    job: Dict[str, Any],
-    profile: Dict[str, Any],
-    weights: Dict[str, float] | None = None,
-) -> Dict[str, Any]:
-    """
-    Core UC-065 logic for a single job.
-    """
+
+def _encode_profile(profile: Dict[str, Any], weights: Dict[str, float] | None = None) -> _EncodedProfile:
     prefs = profile.get("matchingPreferences", {}) or {}
     weights = weights or {}
 
     skills_w = float(weights.get("skillsWeight", prefs.get("skillsWeight", 0.6)))
     exp_w = float(weights.get("experienceWeight", prefs.get("experienceWeight", 0.25)))
     edu_w = float(weights.get("educationWeight", prefs.get("educationWeight", 0.15)))
-    total_w = skills_w + exp_w + edu_w or 1.0
 
-    skills = _compute_skill_match(
-        profile.get("skills", []),
-        job.get("requiredSkills", [])
+    # One taxonomy snapshot for the whole batch, even if a reload lands mid-way
+    index = skill_taxonomy.index
+    return _EncodedProfile(
+        index=index,
+        skill_levels=_profile_skill_levels(index, profile.get("skills", [])),
+        years=profile.get("totalYearsExperience"),
+        education_level=profile.get("educationLevel"),
+        education_rank=profile.get("educationRank"),
+        skills_w=skills_w,
+        exp_w=exp_w,
+        edu_w=edu_w,
+        total_w=skills_w + exp_w + edu_w or 1.0,
     )
+
+
+def _score_job(job: Dict[str, Any], profile: _EncodedProfile, generated_at: str) -> Dict[str, Any]:
+    skills = _match_required_skills(profile.index, profile.skill_levels, job.get("requiredSkills", []))
     exp = _compute_experience_match(
-        profile.get("totalYearsExperience"),
+        profile.years,
         job.get("minYearsExperience"),
         job.get("preferredYearsExperience"),
     )
@@ -493,14 +556,15 @@ async def compute_match_for_job(
         required_level = _infer_job_education(job.get("title"))
 
     edu = _compute_education_match(
-        profile.get("educationLevel"),
+        profile.education_level,
         required_level,
+        profile.education_rank,
     )
 
     overall = round(
-        (skills["score"] * skills_w +
-         exp["score"] * exp_w +
-         edu["score"] * edu_w) / total_w
+        (skills["score"] * profile.skills_w +
+         exp["score"] * profile.exp_w +
+         edu["score"] * profile.edu_w) / profile.total_w
     )
 
     # ----------------------------------------------------------
@@ -534,10 +598,41 @@ async def compute_match_for_job(
         "experience": exp,
         "education": edu,
         "suggestions": suggestions,
-        "generatedAt": datetime.utcnow().isoformat(),
+        "generatedAt": generated_at,
     }
 
 
+# ------------------------
+# Public API
+# ------------------------
+
+def score_jobs(
+    profile: Dict[str, Any],
+    jobs: List[Dict[str, Any]],
+    weights: Dict[str, float] | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score a batch of jobs against one profile, in the given order. The
+    profile's skills are resolved and expanded once for the whole batch,
+    leaving a dictionary lookup per required skill per job.
+    """
+    encoded = _encode_profile(profile, weights)
+    generated_at = datetime.utcnow().isoformat()
+    return [_score_job(job, encoded, generated_at) for job in jobs]
+
+
+async def compute_match_for_job(
+    uuid: str,
+    job: Dict[str, Any],
+    profile: Dict[str, Any],
+    weights: Dict[str, float] | None = None,
+) -> Dict[str, Any]:
+    """
+    Core UC-065 logic for a single job.
+    """
+    return score_jobs(profile, [job], weights)[0]
+
+
 async def compute_matches_for_user(
     uuid: str,
     job_ids: List[str] | None = None,
@@ -555,17 +650,14 @@ async def compute_matches_for_user(
         print("⚠ No jobs found for UUID", uuid)
         return []
 
-    results: List[Dict[str, Any]] = []
-    for job in jobs:
-        match = await compute_match_for_job(uuid, job, profile, weights=weights)
-        results.append(match)
+    results = score_jobs(profile, jobs, weights)
 
-        # save in match history for trends/analytics
-        try:
-            await match_history_dao.log_match(uuid, match)
-        except Exception as e:
-            # don't break matching if history save fails
-            print("⚠ Failed to save match history:", e)
+    # save in match history for trends/analytics, one write for the batch
+    try:
+        await match_history_dao.log_matches(uuid, results)
+    except Exception as e:
+        # don't break matching if history save fails
+        print("⚠ Failed to save match history:", e)
 
     results.sort(key=lambda m: m["overallScore"], reverse=True)
     return results
@@ -4,15 +4,21 @@ from bson import ObjectId
 from datetime import datetime, timezone
 
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
+
+
+index_registry.declare("fs.files", "metadata.parent_id")
+
 
 class MediaDAO:
     def __init__(self):
         self.grid = AsyncGridFSBucket(db_client)
 
-    async def add_media(self, parent_id: str, filename: str, contents: bytes, content_type: str = "application/octet-stream") -> str | None:
+    async def add_media(self, parent_id: str, filename: str, contents: bytes, content_type: str = "application/octet-stream", extra_metadata: dict = None) -> str | None:
         try:
             time = datetime.now(timezone.utc)
             metadata = {
+                **(extra_metadata or {}),
                 "content_type": content_type,
                 "parent_id": parent_id, # store id of whatever piece of content this media is attached to
                 "date_created": time,
@@ -51,6 +57,16 @@ class MediaDAO:
 
         return results
 
+    async def find_media_ids(self, metadata: dict, newest_first: bool = True) -> list[str]:
+        """Ids of files whose metadata matches every given field"""
+        query = {f"metadata.{key}": value for key, value in metadata.items()}
+        cursor = self.grid.find(query, sort=[("uploadDate", -1 if newest_first else 1)])
+
+        results = []
+        async for media in cursor:
+            results.append(str(media._id))
+        return results
+
     async def update_media(self, media_id: str, filename: str, contents: bytes, parent_id: str = None, content_type: str = None) -> bool:
         obj_id = ObjectId(media_id)
         try:
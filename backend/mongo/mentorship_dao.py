@@ -1,7 +1,12 @@
 from mongo.dao_setup import db_client, MENTORSHIP_RELATIONSHIPS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 
+
+index_registry.declare(MENTORSHIP_RELATIONSHIPS, "uuid")
+
+
 class MentorshipDAO:
     def __init__(self):
         self.collection = db_client.get_collection(MENTORSHIP_RELATIONSHIPS)
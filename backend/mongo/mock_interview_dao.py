@@ -2,6 +2,12 @@ import uuid
 from datetime import datetime, timezone
 from bson import ObjectId
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
+
+
+index_registry.declare("mock_interview_sessions", "uuid")
+index_registry.declare("mock_interview_sessions", [("user_uuid", 1), ("date_created", -1)])
+
 
 class MockInterviewSessionDAO:
     """Data Access Object for mock interview sessions"""
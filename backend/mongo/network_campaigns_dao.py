@@ -1,7 +1,12 @@
 from mongo.dao_setup import db_client, NETWORK_CAMPAIGNS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 
+
+index_registry.declare(NETWORK_CAMPAIGNS, "uuid")
+
+
 class NetworkCampaignDAO:
     def __init__(self):
         self.collection = db_client.get_collection(NETWORK_CAMPAIGNS)
@@ -1,24 +1,20 @@
 from mongo.dao_setup import db_client, NETWORKS
+from mongo.index_registry import index_registry
 from mongo.education_dao import education_dao
 from bson import ObjectId
 from datetime import datetime, timezone
 
+
+# One global contact per address; contacts without an email are not constrained
+index_registry.declare(NETWORKS, "email", unique=True, partial_filter={"email": {"$gt": ""}})
+index_registry.declare(NETWORKS, "associated_users.uuid")
+
+
 class NetworkDAO:
     def __init__(self):
         if not NETWORKS:
             raise ValueError("NETWORKS_COLLECTION environment variable not set")
         self.collection = db_client.get_collection(NETWORKS)
-        # Create unique index on email (case-insensitive, sparse to allow null values)
-        # This is created asynchronously and won't block
-        self._setup_indexes()
-    
-    def _setup_indexes(self):
-        """Create indexes for contact collection"""
-        try:
-            # Create unique index on email (case-insensitive)
-            self.collection.create_index("email", unique=True, sparse=True)
-        except Exception as e:
-            print(f"Note: Could not create email index (may already exist): {e}")
     
     async def add_contact(self, data: dict) -> str:
         """
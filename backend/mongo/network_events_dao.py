@@ -1,6 +1,26 @@
 from mongo.dao_setup import db_client, NETWORK_EVENTS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
+from utils.reminder_times import event_datetime, next_event_reminder
+
+
+index_registry.declare(NETWORK_EVENTS, [("uuid", 1), ("event_date", 1)])
+# Only events with a reminder still to send carry next_reminder_at
+index_registry.declare(NETWORK_EVENTS, "next_reminder_at", sparse=True)
+
+# Fields that move an event's reminder due-time
+REMINDER_FIELDS = {"event_date", "start_time", "reminders_sent"}
+
+
+def reminder_fields(event: dict, now: datetime = None) -> tuple[dict, dict]:
+    """($set, $unset) keeping event_at / next_reminder_at in step with the event"""
+    event_at = event_datetime(event.get("event_date"), event.get("start_time"))
+    _, due_at = next_event_reminder(event_at, event.get("reminders_sent"), now or datetime.now(timezone.utc))
+    if due_at is None:
+        return {"event_at": event_at}, {"next_reminder_at": ""}
+    return {"event_at": event_at, "next_reminder_at": due_at}, {}
+
 
 class NetworkEventDAO:
     def __init__(self):
@@ -10,6 +30,7 @@ class NetworkEventDAO:
         time = datetime.now(timezone.utc)
         data["date_created"] = time
         data["date_updated"] = time
+        data.update(reminder_fields(data, time)[0])
         result = await self.collection.insert_one(data)
         return str(result.inserted_id)
 
@@ -30,8 +51,37 @@ class NetworkEventDAO:
     async def update_event(self, event_id: str, data: dict) -> int:
         data["date_updated"] = datetime.now(timezone.utc)
         updated = await self.collection.update_one({"_id": ObjectId(event_id)}, {"$set": data})
+        if updated.matched_count and REMINDER_FIELDS & data.keys():
+            await self.sync_reminder(ObjectId(event_id))
         return updated.matched_count
 
+    async def sync_reminder(self, event_id: ObjectId) -> None:
+        """Recompute event_at / next_reminder_at from the stored event"""
+        event = await self.collection.find_one({"_id": event_id}, {field: 1 for field in REMINDER_FIELDS})
+        if event is None:
+            return
+        to_set, to_unset = reminder_fields(event)
+        update = {"$set": to_set}
+        if to_unset:
+            update["$unset"] = to_unset
+        await self.collection.update_one({"_id": event_id}, update)
+
+    async def get_due_reminders(self, now: datetime, limit: int = 500) -> list[dict]:
+        """Events whose next reminder is due, oldest first"""
+        cursor = self.collection.find({"next_reminder_at": {"$lte": now}}).sort("next_reminder_at", 1).limit(limit)
+        return [doc async for doc in cursor]
+
+    async def backfill_reminder_times(self) -> int:
+        """Give events written before next_reminder_at existed their due-times"""
+        # One pass at startup; documents already carrying event_at are skipped
+        count = 0
+        async for event in self.collection.find({}, {"event_at": 1}):
+            if "event_at" in event:
+                continue
+            await self.sync_reminder(event["_id"])
+            count += 1
+        return count
+
     async def delete_event(self, event_id: str) -> int:
         result = await self.collection.delete_one({"_id": ObjectId(event_id)})
         return result.deleted_count
@@ -83,14 +133,17 @@ class NetworkEventDAO:
             Number of matched documents
         """
         try:
-            reminders_sent = {
-                reminder_type: True,
-                f"{reminder_type}_sent_at": datetime.now(timezone.utc)
-            }
+            now = datetime.now(timezone.utc)
             updated = await self.collection.update_one(
                 {"_id": ObjectId(event_id)},
-                {"$set": {"reminders_sent": reminders_sent, "date_updated": datetime.now(timezone.utc)}}
+                {"$set": {
+                    f"reminders_sent.{reminder_type}": True,
+                    f"reminders_sent.{reminder_type}_sent_at": now,
+                    "date_updated": now
+                }}
             )
+            if updated.matched_count:
+                await self.sync_reminder(ObjectId(event_id))
             return updated.matched_count
         except Exception as e:
             print(f"[NetworkEventDAO] Error marking reminder sent for {event_id}: {e}")
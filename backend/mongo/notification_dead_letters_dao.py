@@ -0,0 +1,46 @@
+"""
+Notification Dead Letters DAO
+Emails the notification dispatcher could not deliver: permanent SMTP
+rejections and messages that ran out of retries. The raw message is kept so
+it can be inspected or resent once the cause is fixed.
+"""
+from mongo.dao_setup import db_client, NOTIFICATION_DEAD_LETTERS
+from mongo.index_registry import index_registry
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+index_registry.declare(NOTIFICATION_DEAD_LETTERS, "failed_at")
+
+
+class NotificationDeadLettersDAO:
+    def __init__(self):
+        self.collection = db_client.get_collection(NOTIFICATION_DEAD_LETTERS)
+
+    async def add(
+        self,
+        recipient: str,
+        sender: Optional[str],
+        subject: Optional[str],
+        raw: str,
+        error: str,
+        attempts: int
+    ) -> str:
+        result = await self.collection.insert_one({
+            "recipient": recipient,
+            "sender": sender,
+            "subject": subject,
+            "raw": raw,
+            "error": error,
+            "attempts": attempts,
+            "failed_at": datetime.now(timezone.utc),
+        })
+        return str(result.inserted_id)
+
+    async def get_recent(self, limit: int = 50) -> List[Dict]:
+        """Most recent failures first, without the raw message"""
+        cursor = self.collection.find({}, {"raw": 0}).sort("failed_at", -1).limit(limit)
+        return [doc async for doc in cursor]
+
+
+notification_dead_letters_dao = NotificationDeadLettersDAO()
@@ -1,8 +1,13 @@
 from bson.objectid import ObjectId
-from pymongo import ASCENDING
 from datetime import datetime
 import uuid
 from mongo.dao_setup import db_client, OFFERS
+from mongo.index_registry import index_registry
+
+
+index_registry.declare(OFFERS, [("user_uuid", 1), ("date_created", -1)])
+index_registry.declare(OFFERS, "job_id")
+
 
 class OffersDAO:
     """Data Access Object for managing job offers and salary negotiation"""
@@ -111,12 +116,6 @@ class OffersDAO:
         result = await self.offers_collection.delete_one({"_id": ObjectId(offer_id)})
         return result.deleted_count > 0
 
-    async def create_indexes(self):
-        """Create indexes for efficient querying"""
-        await self.offers_collection.create_index([("user_uuid", ASCENDING)])
-        await self.offers_collection.create_index([("job_id", ASCENDING)])
-        await self.offers_collection.create_index([("offer_status", ASCENDING)])
-        await self.offers_collection.create_index([("date_created", ASCENDING)])
 
     # ============================================
     # UC-127: Offer Evaluation & Comparison
@@ -1,8 +1,13 @@
 from mongo.dao_setup import db_client, TEAMS, JOBS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime
 from typing import List, Optional, Dict
 
+
+index_registry.declare("organizations", "admin_ids")
+
+
 class OrganizationDAO:
     def __init__(self):
         # 1. ORG COLLECTION (For the Institution itself)
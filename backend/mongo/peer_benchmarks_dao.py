@@ -0,0 +1,136 @@
+"""
+Peer Benchmarks DAO (UC-104)
+Precomputed, anonymous peer statistics for competitive analysis.
+
+- peer_benchmark_members: one row per user (_id = uuid) holding that user's
+  contribution (application counts, skills, salaries) and cohort key
+- peer_benchmarks: one row per cohort (_id = cohort key) rolled up from the
+  member rows, plus the rollup watermark (_id = ROLLUP_STATE_ID)
+"""
+from mongo.dao_setup import (
+    db_client, PEER_BENCHMARKS, PEER_BENCHMARK_MEMBERS, PROFILES, JOBS, SKILLS, SALARY,
+    INFORMATIONAL_INTERVIEWS,
+)
+from mongo.index_registry import index_registry
+from pymongo import ReplaceOne
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+# Sources whose date_updated drives the incremental rollup
+SOURCE_COLLECTIONS = [JOBS, SKILLS, SALARY, INFORMATIONAL_INTERVIEWS]
+
+index_registry.declare(PEER_BENCHMARK_MEMBERS, "cohort")
+for _source in SOURCE_COLLECTIONS:
+    index_registry.declare(_source, "date_updated")
+
+ROLLUP_STATE_ID = "__rollup_state__"
+
+
+class PeerBenchmarksDAO:
+    def __init__(self):
+        self.collection = db_client.get_collection(PEER_BENCHMARKS)
+        self.members = db_client.get_collection(PEER_BENCHMARK_MEMBERS)
+
+    # ============================================
+    # COHORT ROWS (read by the endpoints)
+    # ============================================
+
+    async def get_cohorts(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """Cohort rows by key in a single query"""
+        cursor = self.collection.find({"_id": {"$in": list(keys)}})
+        return {doc["_id"]: doc async for doc in cursor}
+
+    async def save_cohort(self, row: Dict[str, Any]) -> None:
+        await self.collection.replace_one({"_id": row["_id"]}, row, upsert=True)
+
+    async def delete_cohort(self, key: str) -> None:
+        await self.collection.delete_one({"_id": key})
+
+    async def cohort_keys(self) -> Set[str]:
+        return set(await self.collection.distinct("_id")) - {ROLLUP_STATE_ID}
+
+    async def get_state(self) -> Dict[str, Any]:
+        return await self.collection.find_one({"_id": ROLLUP_STATE_ID}) or {}
+
+    async def save_state(self, watermark: datetime, **stats) -> None:
+        await self.collection.update_one(
+            {"_id": ROLLUP_STATE_ID},
+            {"$set": {"watermark": watermark, **stats}},
+            upsert=True
+        )
+
+    # ============================================
+    # MEMBER ROWS (one per contributing user)
+    # ============================================
+
+    async def get_member(self, uuid: str) -> Optional[Dict]:
+        return await self.members.find_one({"_id": uuid})
+
+    async def get_member_cohorts(self, uuids: List[str]) -> Dict[str, str]:
+        cursor = self.members.find({"_id": {"$in": uuids}}, {"cohort": 1})
+        return {doc["_id"]: doc.get("cohort") async for doc in cursor}
+
+    async def save_members(self, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            await self.members.bulk_write([ReplaceOne({"_id": row["_id"]}, row, upsert=True) for row in rows])
+
+    async def delete_members(self, uuids: List[str]) -> None:
+        if uuids:
+            await self.members.delete_many({"_id": {"$in": uuids}})
+
+    async def get_members(self, cohort: Optional[str] = None) -> List[Dict]:
+        """Member rows of one cohort, or every member when cohort is None"""
+        query = {"cohort": cohort} if cohort is not None else {}
+        return await self.members.find(query).to_list(None)
+
+    async def member_cohort_keys(self) -> Set[str]:
+        return set(await self.members.distinct("cohort"))
+
+    # ============================================
+    # SOURCE DATA
+    # ============================================
+
+    async def changed_users(self, since: datetime) -> Set[str]:
+        """Users with a job, skill, salary or interview record modified after `since`"""
+        changed: Set[str] = set()
+        for name in SOURCE_COLLECTIONS:
+            changed.update(await db_client[name].distinct("uuid", {"date_updated": {"$gt": since}}))
+        changed.discard(None)
+        return changed
+
+    async def all_users(self) -> Set[str]:
+        users: Set[str] = set()
+        for name in SOURCE_COLLECTIONS:
+            users.update(await db_client[name].distinct("uuid"))
+        users.discard(None)
+        return users
+
+    async def load_user_data(self, uuids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Everything the rollup needs for a batch of users, one query per source"""
+        data = {
+            uuid: {"profile": {}, "jobs": [], "skills": [], "salaries": [], "interviews": 0}
+            for uuid in uuids
+        }
+        batch = {"$in": uuids}
+
+        async for doc in db_client[PROFILES].find({"_id": batch}, {"industry": 1, "experience_level": 1}):
+            data[doc["_id"]]["profile"] = doc
+        async for doc in db_client[JOBS].find(
+            {"uuid": batch}, {"uuid": 1, "status": 1, "company_industry": 1, "date_created": 1}
+        ):
+            data[doc["uuid"]]["jobs"].append(doc)
+        async for doc in db_client[SKILLS].find({"uuid": batch}, {"uuid": 1, "name": 1, "category": 1}):
+            data[doc["uuid"]]["skills"].append(doc)
+        async for doc in db_client[SALARY].find({"uuid": batch}, {"uuid": 1, "base_salary": 1}):
+            data[doc["uuid"]]["salaries"].append(doc)
+        async for row in await db_client[INFORMATIONAL_INTERVIEWS].aggregate([
+            {"$match": {"uuid": batch}},
+            {"$group": {"_id": "$uuid", "count": {"$sum": 1}}},
+        ]):
+            data[row["_id"]]["interviews"] = row["count"]
+
+        return data
+
+
+peer_benchmarks_dao = PeerBenchmarksDAO()
@@ -2,6 +2,10 @@ from datetime import datetime, timezone
 from bson import ObjectId
 
 from mongo.dao_setup import db_client, PROBLEM_SUBMISSIONS
+from mongo.index_registry import index_registry
+
+
+index_registry.declare(PROBLEM_SUBMISSIONS, [("user_id", 1), ("platform", 1)])
 
 
 class ProblemSubmissionsDAO:
@@ -1,7 +1,12 @@
 from mongo.dao_setup import db_client, PROFESSIONAL_REFERENCES
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 
+
+index_registry.declare(PROFESSIONAL_REFERENCES, "uuid")
+
+
 class ProfessionalReferenceDAO:
     def __init__(self):
         self.collection = db_client.get_collection(PROFESSIONAL_REFERENCES)
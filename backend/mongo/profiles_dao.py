@@ -1,6 +1,12 @@
 from mongo.dao_setup import db_client, PROFILES
+from mongo.index_registry import index_registry
+from mongo.candidate_snapshots_dao import candidate_snapshots_dao
 from datetime import datetime, timezone
 
+
+index_registry.declare(PROFILES, "email")
+
+
 class UserDataDAO:
     def __init__(self):
         self.collection = db_client.get_collection(PROFILES)
@@ -10,6 +16,7 @@ class UserDataDAO:
         data["date_created"] = time
         data["date_updated"] = time
         result = await self.collection.insert_one({"_id": uuid, **data})
+        await candidate_snapshots_dao.invalidate(uuid)
         return result.inserted_id
 
     async def get_profile(self, uuid: str) -> dict | None:
@@ -19,10 +26,12 @@ class UserDataDAO:
         time = datetime.now(timezone.utc)
         data["date_updated"] = time
         updated = await self.collection.update_one({"_id": uuid}, {"$set": data})
+        await candidate_snapshots_dao.invalidate(uuid)
         return updated.matched_count
 
     async def delete_profile(self, uuid: str) -> int:
         result = await self.collection.delete_one({"_id": uuid})
+        await candidate_snapshots_dao.invalidate(uuid)
         return result.deleted_count
 
     async def update_account_tier(self, uuid: str, tier: str) -> int:
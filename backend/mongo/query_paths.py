@@ -0,0 +1,271 @@
+"""
+Query Paths
+
+Static scan of the DAO modules for the filters they send to Mongo. Each
+find/find_one/update/delete/count call, and each aggregate() that starts
+with a $match, on a known collection becomes a QueryPath (collection,
+equality fields, sort fields), which the index registry checks for a
+supporting index. Filters built up in a local
+variable (`query = {...}; query["status"] = ...`) are followed within the
+same function; anything else (filters passed in by the caller, computed
+keys) is skipped rather than guessed.
+
+Collections are resolved from `self.x = db_client.get_collection(NAME)` /
+`db_client[NAME]` assignments, where NAME is a string literal, a constant
+of the module (or the ones it imports from dao_setup), or a
+`self.collection_name` attribute.
+
+Usage:
+    from mongo.query_paths import scan_query_paths
+
+    for path in scan_query_paths():
+        print(path.collection, path.fields, path.sort, path.location)
+"""
+
+import ast
+import importlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MONGO_DIR = Path(__file__).parent
+
+# Methods whose first positional argument is a filter document
+FILTER_METHODS = {
+    "find", "find_one", "find_one_and_update", "find_one_and_delete",
+    "find_one_and_replace", "update_one", "update_many", "replace_one",
+    "delete_one", "delete_many", "count_documents",
+}
+
+
+@dataclass(frozen=True)
+class QueryPath:
+    collection: str
+    fields: Tuple[str, ...]
+    sort: Tuple[str, ...]
+    location: str
+
+
+def _is_db_client(node: ast.AST) -> bool:
+    return isinstance(node, ast.Name) and node.id in ("db_client", "db")
+
+
+def _literal_str(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+class _ModuleScanner:
+    def __init__(self, path: Path):
+        self.path = path
+        self.module_name = f"mongo.{path.stem}"
+        self.tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+        self._module = None
+        self.paths: List[QueryPath] = []
+
+    # -- name resolution -------------------------------------------------
+
+    def _module_value(self, name: str) -> Optional[str]:
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self.module_name)
+            except Exception:
+                self._module = False
+        value = getattr(self._module, name, None) if self._module else None
+        return value if isinstance(value, str) else None
+
+    def _collection_name(self, arg: ast.AST, attrs: Dict[str, str]) -> Optional[str]:
+        literal = _literal_str(arg)
+        if literal is not None:
+            return literal
+        if isinstance(arg, ast.Name):
+            return self._module_value(arg.id)
+        if isinstance(arg, ast.Attribute) and isinstance(arg.value, ast.Name) and arg.value.id == "self":
+            return attrs.get(f"name:{arg.attr}")
+        return None
+
+    def _collection_from_expr(self, node: ast.AST, attrs: Dict[str, str]) -> Optional[str]:
+        """Collection name for `db_client.get_collection(X)` or `db_client[X]`"""
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            if node.func.attr == "get_collection" and _is_db_client(node.func.value) and node.args:
+                return self._collection_name(node.args[0], attrs)
+        if isinstance(node, ast.Subscript) and _is_db_client(node.value):
+            return self._collection_name(node.slice, attrs)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "AsyncGridFSBucket":
+            # GridFS queries hit the bucket's files collection
+            return "fs.files"
+        return None
+
+    def _bindings(self, body: Iterable[ast.AST], attrs: Dict[str, str], prefix: str) -> Dict[str, str]:
+        """Collect `<target> = <collection expr>` bindings found anywhere in body"""
+        found: Dict[str, str] = {}
+        for stmt in body:
+            for node in ast.walk(stmt):
+                if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+                    continue
+                target = node.targets[0]
+                if prefix == "self." and isinstance(target, ast.Attribute) \
+                        and isinstance(target.value, ast.Name) and target.value.id == "self":
+                    literal = _literal_str(node.value)
+                    if literal is not None:
+                        attrs[f"name:{target.attr}"] = literal
+                    key = f"self.{target.attr}"
+                elif prefix == "" and isinstance(target, ast.Name):
+                    key = target.id
+                else:
+                    continue
+                name = self._collection_from_expr(node.value, attrs)
+                if name:
+                    found[key] = name
+        return found
+
+    # -- filter extraction -----------------------------------------------
+
+    @staticmethod
+    def _dict_fields(node: ast.Dict) -> Optional[List[str]]:
+        fields = []
+        for key, value in zip(node.keys, node.values):
+            name = _literal_str(key) if key is not None else None
+            if name is None:
+                return None
+            if name in ("$or", "$and") and isinstance(value, ast.List) and value.elts:
+                # Every branch has to be served; the first is representative
+                first = value.elts[0]
+                if isinstance(first, ast.Dict):
+                    nested = _ModuleScanner._dict_fields(first)
+                    if nested and name == "$and":
+                        fields.extend(nested)
+                continue
+            if name.startswith("$"):
+                continue
+            if isinstance(value, ast.Dict) and len(value.keys) == 1 \
+                    and _literal_str(value.keys[0]) == "$elemMatch" and isinstance(value.values[0], ast.Dict):
+                # {"items": {"$elemMatch": {"uuid": x}}} is served by an index on items.uuid
+                nested = _ModuleScanner._dict_fields(value.values[0]) or []
+                fields.extend(f"{name}.{sub}" for sub in nested)
+                continue
+            fields.append(name)
+        return fields
+
+    @staticmethod
+    def _local_filter(func: ast.AST, var: str) -> Optional[List[str]]:
+        fields: Optional[List[str]] = None
+        for node in ast.walk(func):
+            if isinstance(node, ast.Assign) and len(node.targets) == 1:
+                target = node.targets[0]
+                if isinstance(target, ast.Name) and target.id == var and isinstance(node.value, ast.Dict):
+                    fields = (fields or []) + (_ModuleScanner._dict_fields(node.value) or [])
+                elif isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name) \
+                        and target.value.id == var:
+                    name = _literal_str(target.slice)
+                    if name and not name.startswith("$"):
+                        fields = (fields or []) + [name]
+        return fields
+
+    @staticmethod
+    def _sort_fields(call: ast.Call, parents: Dict[ast.AST, ast.AST]) -> List[str]:
+        for keyword in call.keywords:
+            if keyword.arg == "sort" and isinstance(keyword.value, ast.List):
+                return [
+                    _literal_str(elt.elts[0]) for elt in keyword.value.elts
+                    if isinstance(elt, ast.Tuple) and _literal_str(elt.elts[0])
+                ]
+        # find(...).sort("field", -1) / .sort([("a", 1), ("b", -1)])
+        attr = parents.get(call)
+        if isinstance(attr, ast.Attribute) and attr.attr == "sort":
+            sort_call = parents.get(attr)
+            if isinstance(sort_call, ast.Call) and sort_call.args:
+                first = sort_call.args[0]
+                if _literal_str(first):
+                    return [_literal_str(first)]
+                if isinstance(first, ast.List):
+                    return [
+                        _literal_str(elt.elts[0]) for elt in first.elts
+                        if isinstance(elt, ast.Tuple) and _literal_str(elt.elts[0])
+                    ]
+        return []
+
+    @staticmethod
+    def _pipeline_match(func: ast.AST, pipeline: ast.AST) -> Optional[ast.AST]:
+        """The leading $match document of an aggregate() pipeline, if any"""
+        if isinstance(pipeline, ast.Name):
+            for node in ast.walk(func):
+                if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                        and isinstance(node.targets[0], ast.Name) and node.targets[0].id == pipeline.id \
+                        and isinstance(node.value, ast.List):
+                    pipeline = node.value
+                    break
+        if not isinstance(pipeline, ast.List) or not pipeline.elts:
+            return None
+        stage = pipeline.elts[0]
+        if isinstance(stage, ast.Dict) and len(stage.keys) == 1 and _literal_str(stage.keys[0]) == "$match":
+            return stage.values[0]
+        return None
+
+    def _scan_function(self, func: ast.AST, collections: Dict[str, str], owner: str) -> None:
+        local = dict(collections)
+        local.update(self._bindings(func.body, {}, ""))
+        # `collection = self.collection` aliases
+        for node in ast.walk(func):
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                    and isinstance(node.targets[0], ast.Name) and isinstance(node.value, ast.Attribute):
+                source = collections.get(ast.unparse(node.value))
+                if source:
+                    local[node.targets[0].id] = source
+        parents = {child: parent for parent in ast.walk(func) for child in ast.iter_child_nodes(parent)}
+
+        for node in ast.walk(func):
+            if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute):
+                continue
+            if node.func.attr not in FILTER_METHODS | {"aggregate"} or not node.args:
+                continue
+            receiver = ast.unparse(node.func.value)
+            collection = local.get(receiver) or self._collection_from_expr(node.func.value, {})
+            if not collection:
+                continue
+
+            query = node.args[0]
+            if node.func.attr == "aggregate":
+                query = self._pipeline_match(func, query)
+            if isinstance(query, ast.Dict):
+                fields = self._dict_fields(query)
+            elif isinstance(query, ast.Name):
+                fields = self._local_filter(func, query.id)
+            else:
+                fields = None
+            if fields is None:
+                continue
+
+            self.paths.append(QueryPath(
+                collection=collection,
+                fields=tuple(dict.fromkeys(fields)),
+                sort=tuple(self._sort_fields(node, parents)),
+                location=f"{self.path.name}:{node.lineno} {owner}{func.name}",
+            ))
+
+    def scan(self) -> List[QueryPath]:
+        module_collections = self._bindings(
+            [n for n in self.tree.body if isinstance(n, ast.Assign)], {}, ""
+        )
+        for node in self.tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._scan_function(node, module_collections, "")
+            elif isinstance(node, ast.ClassDef):
+                attrs: Dict[str, str] = {}
+                collections = dict(module_collections)
+                collections.update(self._bindings(node.body, attrs, "self."))
+                for item in node.body:
+                    if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        self._scan_function(item, collections, f"{node.name}.")
+        return self.paths
+
+
+def scan_query_paths(directory: Path = MONGO_DIR) -> List[QueryPath]:
+    """Every statically visible query path in the DAO modules"""
+    paths: List[QueryPath] = []
+    for path in sorted(directory.glob("*.py")):
+        if path.stem in ("__init__", "dao_setup", "index_registry", "query_paths"):
+            continue
+        paths.extend(_ModuleScanner(path).scan())
+    return paths
@@ -2,6 +2,16 @@ import uuid
 from datetime import datetime, timezone
 from bson import ObjectId
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
+
+
+index_registry.declare("question_industries", "uuid")
+index_registry.declare("question_roles", "uuid")
+index_registry.declare("question_roles", "industry_uuid")
+index_registry.declare("questions", "uuid")
+index_registry.declare("questions", [("role_uuid", 1), ("category", 1)])
+index_registry.declare("user_practiced_questions", [("user_uuid", 1), ("question_uuid", 1)])
+
 
 class QuestionIndustryDAO:
     """Data Access Object for question industries"""
@@ -1,6 +1,29 @@
 from mongo.dao_setup import db_client, REFERRALS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone, timedelta
+from utils.reminder_times import request_datetime, next_referral_reminder
+
+
+index_registry.declare(REFERRALS, [("uuid", 1), ("status", 1)])
+index_registry.declare(REFERRALS, "request_date")
+# Only pending referrals with a reminder still to send carry next_reminder_at
+index_registry.declare(REFERRALS, "next_reminder_at", sparse=True)
+
+# Fields that move a referral's reminder due-time
+REMINDER_FIELDS = {"request_date", "status", "reminders_sent"}
+
+
+def reminder_fields(referral: dict, now: datetime = None) -> tuple[dict, dict]:
+    """($set, $unset) keeping request_at / next_reminder_at in step with the referral"""
+    request_at = request_datetime(referral.get("request_date"))
+    _, due_at = next_referral_reminder(
+        request_at, referral.get("status"), referral.get("reminders_sent"), now or datetime.now(timezone.utc)
+    )
+    if due_at is None:
+        return {"request_at": request_at}, {"next_reminder_at": ""}
+    return {"request_at": request_at, "next_reminder_at": due_at}, {}
+
 
 class ReferralDAO:
     def __init__(self):
@@ -10,6 +33,7 @@ class ReferralDAO:
         time = datetime.now(timezone.utc)
         data["date_created"] = time
         data["date_updated"] = time
+        data.update(reminder_fields(data, time)[0])
         result = await self.collection.insert_one(data)
         return str(result.inserted_id)
 
@@ -35,11 +59,40 @@ class ReferralDAO:
         try:
             data["date_updated"] = datetime.now(timezone.utc)
             updated = await self.collection.update_one({"_id": ObjectId(referral_id)}, {"$set": data})
+            if updated.matched_count and REMINDER_FIELDS & data.keys():
+                await self.sync_reminder(ObjectId(referral_id))
             return updated.matched_count
         except Exception as e:
             print(f"[ReferralDAO] Error updating referral {referral_id}: {e}")
             raise Exception(f"Invalid referral ID format: {str(e)}")
 
+    async def sync_reminder(self, referral_id: ObjectId) -> None:
+        """Recompute request_at / next_reminder_at from the stored referral"""
+        referral = await self.collection.find_one({"_id": referral_id}, {field: 1 for field in REMINDER_FIELDS})
+        if referral is None:
+            return
+        to_set, to_unset = reminder_fields(referral)
+        update = {"$set": to_set}
+        if to_unset:
+            update["$unset"] = to_unset
+        await self.collection.update_one({"_id": referral_id}, update)
+
+    async def get_due_reminders(self, now: datetime, limit: int = 500) -> list[dict]:
+        """Pending referrals whose next reminder is due, oldest first"""
+        cursor = self.collection.find({"next_reminder_at": {"$lte": now}}).sort("next_reminder_at", 1).limit(limit)
+        return [doc async for doc in cursor]
+
+    async def backfill_reminder_times(self) -> int:
+        """Give referrals written before next_reminder_at existed their due-times"""
+        # One pass at startup; documents already carrying request_at are skipped
+        count = 0
+        async for referral in self.collection.find({}, {"request_at": 1}):
+            if "request_at" in referral:
+                continue
+            await self.sync_reminder(referral["_id"])
+            count += 1
+        return count
+
     async def delete_referral(self, referral_id: str) -> int:
         try:
             result = await self.collection.delete_one({"_id": ObjectId(referral_id)})
@@ -76,14 +129,17 @@ class ReferralDAO:
             Number of matched documents
         """
         try:
-            reminders_sent = {
-                reminder_type: True,
-                f"{reminder_type}_sent_at": datetime.now(timezone.utc)
-            }
+            now = datetime.now(timezone.utc)
             updated = await self.collection.update_one(
                 {"_id": ObjectId(referral_id)},
-                {"$set": {"reminders_sent": reminders_sent, "date_updated": datetime.now(timezone.utc)}}
+                {"$set": {
+                    f"reminders_sent.{reminder_type}": True,
+                    f"reminders_sent.{reminder_type}_sent_at": now,
+                    "date_updated": now
+                }}
             )
+            if updated.matched_count:
+                await self.sync_reminder(ObjectId(referral_id))
             return updated.matched_count
         except Exception as e:
             print(f"[ReferralDAO] Error marking reminder sent for {referral_id}: {e}")
@@ -1,10 +1,18 @@
 from mongo.dao_setup import db_client, RESUMES
+from mongo.index_registry import index_registry
 from datetime import datetime, timezone, timedelta
 from bson import ObjectId
 import secrets
 from utils.sanitize import sanitize_dict
 
 
+index_registry.declare(RESUMES, "uuid")
+index_registry.declare("resume_versions", [("resume_id", 1), ("date_created", -1)])
+index_registry.declare("resume_feedback", [("resume_id", 1), ("date_created", -1)])
+index_registry.declare("resume_shares", "token")
+index_registry.declare("resume_shares", "resume_id")
+
+
 class ResumeDAO:
     def __init__(self):
         self.collection = db_client.get_collection(RESUMES)
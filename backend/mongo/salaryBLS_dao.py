@@ -5,6 +5,12 @@ MongoDB Data Access Object for SalaryBLS Data
 from typing import Optional, Dict, List
 from datetime import datetime
 from mongo.dao_setup import db_client
+from mongo.index_registry import index_registry
+
+
+index_registry.declare("salaryBLS_data", [("job_title_lower", 1), ("city_lower", 1), ("state_lower", 1)])
+index_registry.declare("salaryBLS_data", [("city_lower", 1), ("state_lower", 1)])
+index_registry.declare("salaryBLS_data", [("last_updated", -1)])
 
 
 class SalaryBLSDAO:
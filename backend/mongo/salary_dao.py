@@ -1,10 +1,15 @@
 # salary_dao.py
 from mongo.dao_setup import db_client, SALARY, MARKET_DATA
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 from typing import Optional
 
 
+index_registry.declare(SALARY, [("uuid", 1), ("year", -1)])
+index_registry.declare(MARKET_DATA, [("job_role", 1), ("location", 1), ("year", -1)])
+
+
 class SalaryDAO:
     def __init__(self):
         self.collection = db_client.get_collection(SALARY)
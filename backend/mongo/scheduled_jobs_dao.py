@@ -0,0 +1,70 @@
+"""
+Scheduled Jobs DAO
+One document per periodic job (_id = job name) holding when it is next due,
+the lease of the process currently running it, and the last run's metrics.
+Claiming is a single conditional find_one_and_update, so across any number
+of API workers and job processes exactly one of them runs each due job.
+"""
+from mongo.dao_setup import db_client, SCHEDULED_JOBS
+from pymongo import ReturnDocument
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+
+class ScheduledJobsDAO:
+    def __init__(self):
+        self.collection = db_client.get_collection(SCHEDULED_JOBS)
+
+    async def ensure(self, name: str, first_run_at: datetime) -> None:
+        """Create the job's document the first time any process registers it"""
+        await self.collection.update_one(
+            {"_id": name},
+            {"$setOnInsert": {"next_run_at": first_run_at, "owner": None, "lease_until": None,
+                              "runs": 0, "failures": 0}},
+            upsert=True
+        )
+
+    async def claim(self, name: str, owner: str, now: datetime, lease_seconds: float) -> Optional[Dict]:
+        """Take the lease if the job is due and nobody holds a live lease. Returns the job before claiming."""
+        return await self.collection.find_one_and_update(
+            {
+                "_id": name,
+                "next_run_at": {"$lte": now},
+                "$or": [{"lease_until": None}, {"lease_until": {"$lte": now}}],
+            },
+            {"$set": {"owner": owner, "lease_until": now + timedelta(seconds=lease_seconds), "started_at": now}},
+            return_document=ReturnDocument.BEFORE
+        )
+
+    async def renew(self, name: str, owner: str, lease_until: datetime) -> bool:
+        """Extend a held lease; False if another process took it over"""
+        result = await self.collection.update_one(
+            {"_id": name, "owner": owner},
+            {"$set": {"lease_until": lease_until}}
+        )
+        return result.matched_count == 1
+
+    async def finish(self, name: str, owner: str, next_run_at: datetime, last_run: Dict[str, Any],
+                     failed: bool) -> None:
+        """Release the lease, schedule the next run and record the run's metrics"""
+        update: Dict[str, Any] = {
+            "$set": {"owner": None, "lease_until": None, "next_run_at": next_run_at, "last_run": last_run},
+            "$inc": {"runs": 1},
+        }
+        if failed:
+            update["$inc"]["failures"] = 1
+        else:
+            update["$set"]["failures"] = 0
+        await self.collection.update_one({"_id": name, "owner": owner}, update)
+
+    async def run_now(self, name: str, now: datetime) -> bool:
+        result = await self.collection.update_one({"_id": name}, {"$set": {"next_run_at": now}})
+        return result.matched_count == 1
+
+    async def get_all(self) -> List[Dict]:
+        # A handful of documents, one per registered job
+        docs = await self.collection.find({}).to_list(None)
+        return sorted(docs, key=lambda doc: doc["_id"])
+
+
+scheduled_jobs_dao = ScheduledJobsDAO()
@@ -0,0 +1,63 @@
+"""
+Skill Taxonomy DAO
+One document per canonical skill or category (_id = its integer id) with
+its name, aliases and parent id. skill_taxonomy_state holds a version
+number (_id = "current") bumped on every write, which is all a process
+has to read to know whether its compiled index is stale.
+"""
+from mongo.dao_setup import db_client, SKILL_TAXONOMY, SKILL_TAXONOMY_STATE
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from pymongo import ReplaceOne, ReturnDocument
+
+STATE_ID = "current"
+
+
+class SkillTaxonomyDAO:
+    def __init__(self):
+        self.collection = db_client.get_collection(SKILL_TAXONOMY)
+        self.state = db_client.get_collection(SKILL_TAXONOMY_STATE)
+
+    async def get_version(self) -> Optional[int]:
+        """Current taxonomy version, or None if no taxonomy was ever stored"""
+        doc = await self.state.find_one({"_id": STATE_ID})
+        return doc.get("version") if doc else None
+
+    async def get_all(self) -> List[Dict]:
+        """Every entry as {id, name, aliases, parent}, in id order"""
+        entries = [
+            {"id": doc["_id"], "name": doc["name"], "aliases": doc.get("aliases", []), "parent": doc.get("parent")}
+            async for doc in self.collection.find({})
+        ]
+        entries.sort(key=lambda e: e["id"])
+        return entries
+
+    async def replace_all(self, entries: List[Dict]) -> int:
+        """
+        Make the stored taxonomy exactly `entries` and bump the version.
+        Ids are kept as given, so skills already resolved against them stay valid.
+        Returns the new version.
+        """
+        now = datetime.now(timezone.utc)
+        ids = [e["id"] for e in entries]
+        if entries:
+            await self.collection.bulk_write([
+                ReplaceOne(
+                    {"_id": e["id"]},
+                    {"name": e["name"], "aliases": list(e.get("aliases", [])), "parent": e.get("parent"),
+                     "date_updated": now},
+                    upsert=True
+                )
+                for e in entries
+            ], ordered=False)
+        await self.collection.delete_many({"_id": {"$nin": ids}})
+        state = await self.state.find_one_and_update(
+            {"_id": STATE_ID},
+            {"$inc": {"version": 1}, "$set": {"date_updated": now, "entries": len(entries)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return state["version"]
+
+
+skill_taxonomy_dao = SkillTaxonomyDAO()
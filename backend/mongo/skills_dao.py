@@ -1,7 +1,14 @@
 from mongo.dao_setup import db_client, SKILLS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 from utils.sanitize import sanitize_dict
+from mongo.candidate_snapshots_dao import candidate_snapshots_dao
+from services.skill_taxonomy import skill_taxonomy
+
+
+index_registry.declare(SKILLS, "uuid")
+
 
 class SkillDAO:
     def __init__(self):
@@ -10,10 +17,13 @@ class SkillDAO:
     async def add_skill(self, uuid: str, data: dict) -> str:
         data = sanitize_dict(data)
         data["uuid"] = uuid
+        # Canonical taxonomy id (None for skills outside the taxonomy), which matching compares on
+        data["taxonomy_id"] = skill_taxonomy.index.resolve(data.get("name"))
         time = datetime.now(timezone.utc)
         data["date_created"] = time
         data["date_updated"] = time
         result = await self.collection.insert_one(data)
+        await candidate_snapshots_dao.invalidate(uuid)
         return str(result.inserted_id)
 
     async def get_all_skills(self, uuid: str) -> list[dict]:
@@ -36,12 +46,15 @@ class SkillDAO:
 
     async def update_skill(self, skill_id: str, uuid: str, data: dict) -> int:
         data = sanitize_dict(data)
+        if "name" in data:
+            data["taxonomy_id"] = skill_taxonomy.index.resolve(data["name"])
         data["date_updated"] = datetime.now(timezone.utc)
 
         updated = await self.collection.update_one(
             {"_id": ObjectId(skill_id), "uuid": uuid},
             {"$set": data}
         )
+        await candidate_snapshots_dao.invalidate(uuid)
         return updated.matched_count
 
     async def delete_skill(self, skill_id: str, uuid: str) -> int:
@@ -49,6 +62,7 @@ class SkillDAO:
             "_id": ObjectId(skill_id),
             " uuid": uuid
         })
+        await candidate_snapshots_dao.invalidate(uuid)
         return result.deleted_count
 
 skills_dao = SkillDAO()
\ No newline at end of file
@@ -1,9 +1,15 @@
 from mongo.dao_setup import db_client, TEAMS
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 
+index_registry.declare(TEAMS, "members.uuid")
+index_registry.declare(TEAMS, "members.email")
+index_registry.declare(TEAMS, "organization_id")
+
+
 class TeamsDAO:
     """Data Access Object for Teams collection"""
     
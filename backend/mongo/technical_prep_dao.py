@@ -1,14 +1,56 @@
-from mongo.dao_setup import db_client, TECHNICAL_CHALLENGES, CHALLENGE_ATTEMPTS
+"""
+Technical Prep DAO (UC-078)
+
+Challenges and attempts, plus two summaries kept current as attempts are
+written so reads never walk attempt history:
+
+- challenge_leaderboards: one row per (challenge, user) with the best score
+  any of the user's attempts reached, raised with $max
+- technical_prep_user_stats: one row per user (_id = uuid) with attempt,
+  completion, score and time counters, moved with $inc
+
+rebuild_summaries() recomputes both from challenge_attempts
+(scripts/rebuild_technical_prep_summaries.py).
+"""
+from mongo.dao_setup import (
+    db_client, TECHNICAL_CHALLENGES, CHALLENGE_ATTEMPTS, CHALLENGE_LEADERBOARDS, TECHNICAL_PREP_USER_STATS,
+)
+from mongo.index_registry import index_registry
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 
+
+index_registry.declare(CHALLENGE_ATTEMPTS, [("uuid", 1), ("created_at", -1)])
+index_registry.declare(CHALLENGE_ATTEMPTS, [("challenge_id", 1), ("created_at", -1)])
+index_registry.declare(TECHNICAL_CHALLENGES, "uuid")
+index_registry.allow_scan(TECHNICAL_CHALLENGES, "seeded challenge catalog, a few hundred documents")
+index_registry.declare(CHALLENGE_LEADERBOARDS, [("challenge_id", 1), ("uuid", 1)], unique=True)
+index_registry.declare(CHALLENGE_LEADERBOARDS, [("challenge_id", 1), ("best_score", -1), ("uuid", 1)])
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def stats_increments(attempt: Dict[str, Any], sign: int = 1) -> Dict[str, Any]:
+    """$inc for a completed attempt's contribution to its user's counters"""
+    score = attempt.get("score")
+    return {
+        "completed_attempts": sign,
+        "total_duration_seconds": sign * (attempt.get("duration_seconds") or 0),
+        "score_sum": sign * (score or 0),
+        "scored_attempts": sign if score is not None else 0,
+    }
+
+
 class TechnicalPrepDAO:
     """DAO for managing technical challenges and user attempts"""
 
     def __init__(self):
         self.challenges_collection = db_client.get_collection(TECHNICAL_CHALLENGES)
         self.attempts_collection = db_client.get_collection(CHALLENGE_ATTEMPTS)
+        self.leaderboards_collection = db_client.get_collection(CHALLENGE_LEADERBOARDS)
+        self.user_stats_collection = db_client.get_collection(TECHNICAL_PREP_USER_STATS)
 
     # ============ CHALLENGE MANAGEMENT ============
 
@@ -115,6 +157,17 @@ class TechnicalPrepDAO:
         """Create a new challenge attempt"""
         attempt_data["created_at"] = datetime.now(timezone.utc)
         result = await self.attempts_collection.insert_one(attempt_data)
+
+        uuid = attempt_data.get("uuid")
+        if uuid:
+            challenge_type = attempt_data.get("challenge_type", "unknown")
+            await self.user_stats_collection.update_one(
+                {"_id": uuid},
+                {"$inc": {"total_attempts": 1, f"attempts_by_type.{challenge_type}": 1}},
+                upsert=True
+            )
+        # Starting a challenge puts the user on its board
+        await self._raise_best_score(attempt_data.get("challenge_id"), uuid, attempt_data.get("score") or 0)
         return str(result.inserted_id)
 
     async def get_attempt(self, attempt_id: str) -> Optional[Dict[str, Any]]:
@@ -173,11 +226,16 @@ class TechnicalPrepDAO:
     async def update_attempt(self, attempt_id: str, update_data: Dict[str, Any]) -> bool:
         """Update an attempt"""
         update_data["updated_at"] = datetime.now(timezone.utc)
-        result = await self.attempts_collection.update_one(
+        attempt = await self.attempts_collection.find_one_and_update(
             {"_id": ObjectId(attempt_id)},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection={"uuid": 1, "challenge_id": 1}
         )
-        return result.matched_count > 0
+        if attempt is None:
+            return False
+        if update_data.get("score") is not None:
+            await self._raise_best_score(attempt.get("challenge_id"), attempt.get("uuid"), update_data["score"])
+        return True
 
     async def complete_attempt(self, attempt_id: str, score: float, passed_tests: int,
                                total_tests: int, code: Optional[str] = None) -> bool:
@@ -205,13 +263,56 @@ class TechnicalPrepDAO:
         if code:
             update_data["user_code"] = code
 
-        return await self.update_attempt(attempt_id, update_data)
+        # The document as it was decides whether this completion is new, so
+        # concurrent completes of one attempt count it once
+        before = await self.attempts_collection.find_one_and_update(
+            {"_id": ObjectId(attempt_id)},
+            {"$set": update_data},
+            projection={"uuid": 1, "challenge_id": 1, "status": 1, "score": 1, "duration_seconds": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        if before is None:
+            return False
+
+        if not before.get("uuid"):
+            return True
+        increments = stats_increments(update_data)
+        if before.get("status") == "completed":
+            # Re-completing replaces the earlier result
+            for field, amount in stats_increments(before, sign=-1).items():
+                increments[field] += amount
+        await self.user_stats_collection.update_one(
+            {"_id": before["uuid"]},
+            {"$inc": increments, "$max": {"best_score": score}},
+            upsert=True
+        )
+        await self._raise_best_score(before.get("challenge_id"), before["uuid"], score)
+        return True
+
+    # ============ LEADERBOARDS & USER STATS ============
+
+    async def _raise_best_score(self, challenge_id: Optional[str], uuid: Optional[str], score: float) -> None:
+        if not challenge_id or not uuid:
+            return
+        await self.leaderboards_collection.update_one(
+            {"challenge_id": challenge_id, "uuid": uuid},
+            {"$max": {"best_score": score}},
+            upsert=True
+        )
+
+    async def get_leaderboard(self, challenge_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Top best scores for a challenge, highest first"""
+        cursor = self.leaderboards_collection.find(
+            {"challenge_id": challenge_id},
+            {"_id": 0, "uuid": 1, "best_score": 1}
+        ).sort([("best_score", -1), ("uuid", 1)]).limit(limit)
+        return [{"uuid": row["uuid"], "score": row["best_score"]} async for row in cursor]
 
     async def get_user_statistics(self, uuid: str) -> Dict[str, Any]:
         """Get comprehensive statistics for a user"""
-        attempts = await self.get_user_attempts(uuid, limit=1000)
+        stats = await self.user_stats_collection.find_one({"_id": uuid})
 
-        if not attempts:
+        if not stats or not stats.get("total_attempts"):
             return {
                 "total_attempts": 0,
                 "completed_attempts": 0,
@@ -222,32 +323,97 @@ class TechnicalPrepDAO:
                 "challenges_by_difficulty": {}
             }
 
-        completed = [a for a in attempts if a.get("status") == "completed"]
-        scores = [a.get("score", 0) for a in completed if a.get("score") is not None]
-
-        # Group by type
-        attempts_by_type = {}
-        for attempt in attempts:
-            challenge_type = attempt.get("challenge_type", "unknown")
-            attempts_by_type[challenge_type] = attempts_by_type.get(challenge_type, 0) + 1
-
-        # Calculate total time
-        total_time = sum(a.get("duration_seconds", 0) for a in completed) // 60
-
+        scored = stats.get("scored_attempts", 0)
         return {
-            "total_attempts": len(attempts),
-            "completed_attempts": len(completed),
-            "average_score": sum(scores) / len(scores) if scores else 0,
-            "attempts_by_type": attempts_by_type,
-            "best_score": max(scores) if scores else 0,
-            "total_time_spent_minutes": total_time,
-            "recent_attempts": attempts[:5]
+            "total_attempts": stats["total_attempts"],
+            "completed_attempts": stats.get("completed_attempts", 0),
+            "average_score": stats.get("score_sum", 0) / scored if scored else 0,
+            "attempts_by_type": {t: n for t, n in stats.get("attempts_by_type", {}).items() if n},
+            "best_score": stats.get("best_score", 0) if scored else 0,
+            "total_time_spent_minutes": stats.get("total_duration_seconds", 0) // 60,
+            "recent_attempts": await self.get_user_attempts(uuid, limit=5)
         }
 
+    async def rebuild_summaries(self) -> Dict[str, int]:
+        """Recompute every leaderboard row and user's counters from challenge_attempts"""
+        boards = await self.attempts_collection.aggregate([
+            {"$match": {"challenge_id": {"$ne": None}, "uuid": {"$ne": None}}},
+            {"$group": {
+                "_id": {"challenge_id": "$challenge_id", "uuid": "$uuid"},
+                "best_score": {"$max": {"$ifNull": ["$score", 0]}},
+            }},
+        ])
+        board_rows = 0
+        batch = []
+        async for row in boards:
+            batch.append(UpdateOne(row["_id"], {"$set": {"best_score": row["best_score"]}}, upsert=True))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                await self.leaderboards_collection.bulk_write(batch, ordered=False)
+                board_rows += len(batch)
+                batch = []
+        if batch:
+            await self.leaderboards_collection.bulk_write(batch, ordered=False)
+            board_rows += len(batch)
+
+        completed = {"$eq": ["$status", "completed"]}
+        scored = {"$and": [completed, {"$ne": [{"$ifNull": ["$score", None]}, None]}]}
+        users = await self.attempts_collection.aggregate([
+            {"$match": {"uuid": {"$ne": None}}},
+            {"$group": {
+                "_id": {"uuid": "$uuid", "type": {"$ifNull": ["$challenge_type", "unknown"]}},
+                "attempts": {"$sum": 1},
+                "completed_attempts": {"$sum": {"$cond": [completed, 1, 0]}},
+                "scored_attempts": {"$sum": {"$cond": [scored, 1, 0]}},
+                "score_sum": {"$sum": {"$cond": [scored, "$score", 0]}},
+                "best_score": {"$max": {"$cond": [scored, "$score", None]}},
+                "total_duration_seconds": {"$sum": {"$cond": [completed, {"$ifNull": ["$duration_seconds", 0]}, 0]}},
+            }},
+            {"$group": {
+                "_id": "$_id.uuid",
+                "total_attempts": {"$sum": "$attempts"},
+                "completed_attempts": {"$sum": "$completed_attempts"},
+                "scored_attempts": {"$sum": "$scored_attempts"},
+                "score_sum": {"$sum": "$score_sum"},
+                "best_score": {"$max": "$best_score"},
+                "total_duration_seconds": {"$sum": "$total_duration_seconds"},
+                "attempts_by_type": {"$push": {"k": "$_id.type", "v": "$attempts"}},
+            }},
+            {"$addFields": {"attempts_by_type": {"$arrayToObject": "$attempts_by_type"}}},
+        ])
+        user_rows = 0
+        batch = []
+        async for row in users:
+            uuid = row.pop("_id")
+            if row.get("best_score") is None:
+                row.pop("best_score", None)
+            batch.append(UpdateOne({"_id": uuid}, {"$set": row}, upsert=True))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                await self.user_stats_collection.bulk_write(batch, ordered=False)
+                user_rows += len(batch)
+                batch = []
+        if batch:
+            await self.user_stats_collection.bulk_write(batch, ordered=False)
+            user_rows += len(batch)
+
+        return {"leaderboard_rows": board_rows, "user_stats_rows": user_rows}
+
     async def delete_attempt(self, attempt_id: str) -> bool:
         """Delete an attempt"""
-        result = await self.attempts_collection.delete_one({"_id": ObjectId(attempt_id)})
-        return result.deleted_count > 0
+        attempt = await self.attempts_collection.find_one_and_delete(
+            {"_id": ObjectId(attempt_id)},
+            projection={"uuid": 1, "challenge_type": 1, "status": 1, "score": 1, "duration_seconds": 1}
+        )
+        if attempt is None:
+            return False
+        if not attempt.get("uuid"):
+            return True
+
+        # Best scores only ever rise; a rebuild drops a deleted attempt's best
+        increments = {"total_attempts": -1, f"attempts_by_type.{attempt.get('challenge_type', 'unknown')}": -1}
+        if attempt.get("status") == "completed":
+            increments.update(stats_increments(attempt, sign=-1))
+        await self.user_stats_collection.update_one({"_id": attempt.get("uuid")}, {"$inc": increments})
+        return True
 
 
 # Export singleton instance
@@ -1,8 +1,13 @@
 from mongo.dao_setup import db_client, RESUME_TEMPLATES
+from mongo.index_registry import index_registry
 from bson import ObjectId
 from datetime import datetime, timezone
 
 
+index_registry.declare(RESUME_TEMPLATES, "uuid")
+index_registry.declare(RESUME_TEMPLATES, "is_public")
+
+
 class TemplatesDAO:
     """
     Data Access Object for Resume Templates
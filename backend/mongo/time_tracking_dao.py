@@ -2,6 +2,11 @@ from datetime import datetime, timezone
 from bson import ObjectId
 from typing import List, Dict, Optional
 from mongo.dao_setup import db_client, TIME
+from mongo.index_registry import index_registry
+
+
+index_registry.declare(TIME, [("uuid", 1), ("date", -1)])
+
 
 class TimeTrackingDAO:
     """Data Access Object for time tracking operations"""
@@ -5,6 +5,11 @@ Handles all database operations for writing practice sessions and responses
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 from bson import ObjectId
+from mongo.index_registry import index_registry
+
+
+index_registry.declare("writing_practice_questions", [("category", 1), ("created_at", -1)])
+index_registry.declare("writing_practice_sessions", [("uuid", 1), ("created_at", -1)])
 
 
 class WritingPracticeDAO:
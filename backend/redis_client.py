@@ -1,7 +1,411 @@
+"""
+Async Cache Layer
+
+Asyncio-native key/value cache shared by every service that needs short-lived
+caching. All operations are awaitable so a slow cache round trip never stalls
+the event loop.
+
+Backends (picked once at import time from the environment):
+- REDIS_URL set                       -> redis.asyncio with a shared connection pool
+- UPSTASH_REDIS_REST_URL/TOKEN set    -> upstash_redis.asyncio (one pooled keep-alive HTTP client)
+- neither / CACHE_BACKEND=memory      -> in-process TTL dict (local dev and tests)
+
+Usage:
+    from redis_client import cache
+
+    value = await cache.get_json("key")
+    await cache.set_json("key", {"a": 1}, ex=300)
+    values = await cache.mget(["k1", "k2"])
+    await cache.mset({"k1": "v1", "k2": "v2"}, ex=60)
+    await cache.sadd("set", "a", "b", ex=60)
+"""
+
 import os
-from upstash_redis import Redis
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class InMemoryCache:
+    """
+    In-process TTL cache with the same async interface as the remote backends.
+
+    Bounded by max_entries (least recently used entries are evicted first).
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def _expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at <= time.monotonic()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if self._expired(expires_at):
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + ex if ex else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._data.pop(key, None) is not None:
+                removed += 1
+        return removed
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [await self.get(k) for k in keys]
+
+    async def mset(self, mapping: Dict[str, str], ex: Optional[int] = None) -> bool:
+        for key, value in mapping.items():
+            await self.set(key, value, ex=ex)
+        return True
+
+    async def sadd(self, key: str, *members: str, ex: Optional[int] = None) -> int:
+        entry = self._data.get(key)
+        if entry is None or self._expired(entry[1]):
+            entry = (set(), None)
+        members_set, expires_at = entry
+        added = len(set(members) - members_set)
+        members_set.update(members)
+        if ex:
+            # Like EXPIRE NX + EXPIRE GT: set a TTL if there is none, otherwise only extend it
+            new_expiry = time.monotonic() + ex
+            expires_at = new_expiry if expires_at is None else max(expires_at, new_expiry)
+        self._data[key] = (members_set, expires_at)
+        self._data.move_to_end(key)
+        return added
+
+    async def srem(self, key: str, *members: str) -> int:
+        members_set = await self.get(key)
+        if not members_set:
+            return 0
+        removed = len(members_set & set(members))
+        members_set.difference_update(members)
+        if not members_set:
+            self._data.pop(key, None)
+        return removed
+
+    async def smembers(self, key: str) -> List[str]:
+        return list(await self.get(key) or ())
+
+    async def expire(self, key: str, seconds: int, gt: bool = False) -> bool:
+        if await self.get(key) is None:
+            return False
+        value, expires_at = self._data[key]
+        new_expiry = time.monotonic() + seconds
+        if gt and (expires_at is None or expires_at >= new_expiry):
+            return False
+        self._data[key] = (value, new_expiry)
+        return True
+
+    async def close(self) -> None:
+        self._data.clear()
+
+
+class UpstashCache:
+    """
+    Upstash REST backend using the async client.
+
+    The client keeps a single httpx.AsyncClient, so TLS connections are reused
+    across requests. Multi-key operations are sent as one pipelined request.
+    """
+
+    def __init__(self, url: str, token: str):
+        from upstash_redis.asyncio import Redis as AsyncUpstashRedis
+
+        self.client = AsyncUpstashRedis(url=url, token=token)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        return await self.client.set(key, value, ex=ex)
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return await self.client.delete(*keys)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        return await self.client.mget(*keys)
+
+    async def mset(self, mapping: Dict[str, str], ex: Optional[int] = None) -> bool:
+        if not mapping:
+            return True
+        if not ex:
+            return await self.client.mset(mapping)
+        # MSET has no TTL option, so pipeline one SET EX per key
+        pipeline = self.client.pipeline()
+        for key, value in mapping.items():
+            pipeline.set(key, value, ex=ex)
+        await pipeline.exec()
+        return True
+
+    async def sadd(self, key: str, *members: str, ex: Optional[int] = None) -> int:
+        transaction = self.client.multi()
+        transaction.sadd(key, *members)
+        if ex:
+            transaction.expire(key, ex, nx=True)
+            transaction.expire(key, ex, gt=True)
+        results = await transaction.exec()
+        return results[0]
+
+    async def srem(self, key: str, *members: str) -> int:
+        return await self.client.srem(key, *members)
+
+    async def smembers(self, key: str) -> List[str]:
+        return list(await self.client.smembers(key) or [])
+
+    async def expire(self, key: str, seconds: int, gt: bool = False) -> bool:
+        return bool(await self.client.expire(key, seconds, gt=gt))
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class RedisCache:
+    """
+    Native Redis backend (redis.asyncio) with a shared connection pool.
+    """
+
+    def __init__(self, url: str, max_connections: int = 20):
+        import redis.asyncio as aioredis
+
+        self.pool = aioredis.ConnectionPool.from_url(
+            url,
+            max_connections=max_connections,
+            decode_responses=True,
+        )
+        self.client = aioredis.Redis(connection_pool=self.pool)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        return await self.client.set(key, value, ex=ex)
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        return await self.client.delete(*keys)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        return await self.client.mget(keys)
+
+    async def mset(self, mapping: Dict[str, str], ex: Optional[int] = None) -> bool:
+        if not mapping:
+            return True
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=ex)
+            await pipe.execute()
+        return True
+
+    async def sadd(self, key: str, *members: str, ex: Optional[int] = None) -> int:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.sadd(key, *members)
+            if ex:
+                pipe.expire(key, ex, nx=True)
+                pipe.expire(key, ex, gt=True)
+            results = await pipe.execute()
+        return results[0]
+
+    async def srem(self, key: str, *members: str) -> int:
+        return await self.client.srem(key, *members)
+
+    async def smembers(self, key: str) -> List[str]:
+        return list(await self.client.smembers(key))
+
+    async def expire(self, key: str, seconds: int, gt: bool = False) -> bool:
+        return bool(await self.client.expire(key, seconds, gt=gt))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+        await self.pool.disconnect()
+
+
+class Cache:
+    """
+    Facade over the selected backend.
+
+    Cache failures are swallowed (logged) so a cache outage degrades to a
+    cache miss instead of breaking the endpoint.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] get failed for {key}: {e}")
+            return None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        try:
+            return bool(await self.backend.set(key, value, ex=ex))
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] set failed for {key}: {e}")
+            return False
+
+    async def delete(self, *keys: str) -> int:
+        try:
+            return await self.backend.delete(*keys)
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] delete failed: {e}")
+            return 0
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        try:
+            values = await self.backend.mget(list(keys))
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] mget failed: {e}")
+            return [None] * len(keys)
+        for value in values:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return values
+
+    async def mset(self, mapping: Dict[str, str], ex: Optional[int] = None) -> bool:
+        try:
+            return bool(await self.backend.mset(mapping, ex=ex))
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] mset failed: {e}")
+            return False
+
+    async def sadd(self, key: str, *members: str, ex: Optional[int] = None) -> int:
+        """Add members to a set; ex sets the set's TTL if it has none and otherwise only extends it."""
+        try:
+            return await self.backend.sadd(key, *members, ex=ex)
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] sadd failed for {key}: {e}")
+            return 0
+
+    async def srem(self, key: str, *members: str) -> int:
+        try:
+            return await self.backend.srem(key, *members)
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] srem failed for {key}: {e}")
+            return 0
+
+    async def smembers(self, key: str) -> List[str]:
+        try:
+            return await self.backend.smembers(key)
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] smembers failed for {key}: {e}")
+            return []
+
+    async def expire(self, key: str, seconds: int, gt: bool = False) -> bool:
+        """Set a key's TTL; with gt=True only ever extend it."""
+        try:
+            return await self.backend.expire(key, seconds, gt=gt)
+        except Exception as e:
+            self.errors += 1
+            print(f"[Cache] expire failed for {key}: {e}")
+            return False
+
+    async def get_json(self, key: str) -> Any:
+        raw = await self.get(key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+
+    async def set_json(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        return await self.set(key, json.dumps(value, default=str), ex=ex)
+
+    async def mget_json(self, keys: List[str]) -> List[Any]:
+        results = []
+        for raw in await self.mget(keys):
+            try:
+                results.append(json.loads(raw) if raw is not None else None)
+            except (TypeError, ValueError):
+                results.append(None)
+        return results
+
+    async def mset_json(self, mapping: Dict[str, Any], ex: Optional[int] = None) -> bool:
+        return await self.mset(
+            {k: json.dumps(v, default=str) for k, v in mapping.items()},
+            ex=ex,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / total * 100, 2) if total else 0.0,
+        }
+
+    async def close(self) -> None:
+        try:
+            await self.backend.close()
+        except Exception as e:
+            print(f"[Cache] close failed: {e}")
+
+
+def _build_backend():
+    backend_name = (os.getenv("CACHE_BACKEND") or "").lower()
+    redis_url = os.getenv("REDIS_URL")
+    upstash_url = os.getenv("UPSTASH_REDIS_REST_URL")
+    upstash_token = os.getenv("UPSTASH_REDIS_REST_TOKEN")
+
+    if backend_name == "memory":
+        return InMemoryCache()
+
+    if redis_url and backend_name in ("", "redis"):
+        try:
+            return RedisCache(redis_url, max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "20")))
+        except ImportError as e:
+            # A per-process cache would silently stop being shared between workers
+            raise RuntimeError("REDIS_URL is set but the redis package is not installed") from e
+
+    if upstash_url and upstash_token and backend_name in ("", "upstash"):
+        return UpstashCache(upstash_url, upstash_token)
+
+    return InMemoryCache()
+
 
-redis = Redis(
-    url=os.getenv("UPSTASH_REDIS_REST_URL"),
-    token=os.getenv("UPSTASH_REDIS_REST_TOKEN"),
-)
+cache = Cache(_build_backend())
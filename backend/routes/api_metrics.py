@@ -12,6 +12,8 @@ from sessions.admin_authorizer import authorize_admin
 from mongo.api_metrics_dao import api_metrics_dao
 from services.api_metrics_report import generate_weekly_pdf_report
 from services.api_key_manager import api_key_manager
+from services.company_intel_cache import company_intel_cache, SECTION_TTLS
+from mongo.company_intel_dao import company_intel_dao
 
 router = APIRouter()
 
@@ -214,6 +216,36 @@ async def get_response_times(
         raise HTTPException(500, f"Error fetching response times: {str(e)}")
 
 
+@router.get("/company-cache")
+async def get_company_cache_stats(
+    uuid: str = Depends(authorize_admin)
+):
+    """
+    Get hit/miss counters for the shared company research cache (this process)
+    and the number of cached entries per section
+    Admin only
+    """
+    try:
+        try:
+            entries = await company_intel_dao.count_by_section()
+        except Exception as e:
+            print(f"[API Metrics] Could not count company cache entries: {e}")
+            entries = None
+
+        return {
+            "success": True,
+            "stats": company_intel_cache.stats(),
+            "entries": entries,
+            "ttls": {
+                section: {"fresh_seconds": fresh, "stale_seconds": stale}
+                for section, (fresh, stale) in SECTION_TTLS.items()
+            }
+        }
+
+    except Exception as e:
+        raise HTTPException(500, f"Error fetching company cache stats: {str(e)}")
+
+
 @router.get("/export/weekly-report")
 async def export_weekly_report(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
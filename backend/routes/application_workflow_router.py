@@ -5,7 +5,7 @@ from typing import Optional
 from datetime import datetime, timezone, timedelta
 
 # DAOs
-from mongo.application_workflow_dao import application_workflow_dao
+from mongo.application_workflow_dao import ACTIVE_SCHEDULE_STATUSES, application_workflow_dao, parse_schedule_time
 from mongo.application_analytics_dao import application_analytics_dao
 from mongo.jobs_dao import jobs_dao
 
@@ -157,6 +157,13 @@ async def bulk_apply(payload: dict, uuid: str = Depends(authorize)):
 # APPLICATION SCHEDULING
 # ================================================================
 
+def _schedule_time_or_400(value: str) -> datetime:
+    scheduled_time = parse_schedule_time(value)
+    if scheduled_time is None:
+        raise HTTPException(400, "scheduled_time must be an ISO 8601 datetime")
+    return scheduled_time
+
+
 @workflow_router.post("/schedules")
 async def schedule_application(
     schedule: ApplicationSchedule,
@@ -164,6 +171,7 @@ async def schedule_application(
 ):
     data = schedule.model_dump()
     data["uuid"] = uuid
+    data["scheduled_time"] = _schedule_time_or_400(data["scheduled_time"])
     schedule_id = await application_workflow_dao.schedule_application(data)
     return {"detail": "Scheduled", "schedule_id": schedule_id}
 
@@ -263,26 +271,19 @@ async def get_upcoming_schedules(
     now = datetime.now(timezone.utc)
     future_time = now + timedelta(hours=hours)
     
-    schedules = await application_workflow_dao.get_schedules_by_time_range(
+    schedules = await application_workflow_dao.get_schedules_with_details(
+        uuid,
         start_time=now,
         end_time=future_time
     )
     
-    user_schedules = [s for s in schedules if s.get('uuid') == uuid]
-    
-    enriched = []
-    for schedule in user_schedules:
-        job = await jobs_dao.get_job(schedule['job_id'])
-        package = await application_workflow_dao.get_application_package(schedule['package_id'])
-        
-        enriched.append({
+    enriched = [
+        {
             **schedule,
-            'job': job,
-            'package': package,
-            'hours_until': (
-                datetime.fromisoformat(schedule['scheduled_time'].replace('Z', '+00:00')) - now
-            ).total_seconds() / 3600
-        })
+            'hours_until': (schedule['scheduled_time'] - now).total_seconds() / 3600
+        }
+        for schedule in schedules
+    ]
     
     return {"schedules": enriched, "count": len(enriched)}
 
@@ -438,6 +439,15 @@ async def analytics_recommendations(uuid: str = Depends(authorize)):
     return await application_analytics_dao.generate_recommendations(uuid)
 
 
+@workflow_router.get("/analytics/dashboard")
+async def analytics_dashboard(
+    uuid: str = Depends(authorize),
+    days: int = Query(90, description="Number of days to look back")
+):
+    """Every analytics dashboard section in one aggregation"""
+    return await application_analytics_dao.get_dashboard(uuid, days)
+
+
 # ================================================================
 # UC-121: PERSONAL RESPONSE TIME TRACKING
 # ================================================================
@@ -629,15 +639,11 @@ async def send_schedule_reminder_email(
         if isinstance(company_name, dict):
             company_name = company_name.get("name", "Unknown Company")
         
-        scheduled_time = schedule.get("scheduled_time") or schedule.get("run_at")
-        try:
-            scheduled_dt = datetime.fromisoformat(scheduled_time.replace('Z', '+00:00'))
-            now = datetime.now(timezone.utc)
-            hours_until = int((scheduled_dt - now).total_seconds() / 3600)
-        except:
-            hours_until = 0
+        scheduled_dt = parse_schedule_time(schedule.get("scheduled_time") or schedule.get("run_at"))
+        scheduled_time = scheduled_dt.isoformat() if scheduled_dt else ""
+        hours_until = int((scheduled_dt - datetime.now(timezone.utc)).total_seconds() / 3600) if scheduled_dt else 0
         
-        result = scheduling_service.send_scheduled_submission_reminder(
+        result = await scheduling_service.send_scheduled_submission_reminder(
             recipient_email=recipient_email,
             job_title=job.get("title", "Position"),
             company=company_name,
@@ -691,7 +697,7 @@ async def send_job_deadline_reminder(
         except:
             days_until = 0
         
-        result = scheduling_service.send_deadline_reminder(
+        result = await scheduling_service.send_deadline_reminder(
             recipient_email=recipient_email,
             job_title=job.get("title", "Position"),
             company=company_name,
@@ -744,7 +750,7 @@ async def notify_scheduled_submission(
         if isinstance(company_name, dict):
             company_name = company_name.get("name", "Unknown Company")
         
-        result = scheduling_service.send_submission_success_notification(
+        result = await scheduling_service.send_submission_success_notification(
             recipient_email=recipient_email,
             job_title=job.get("title", "Position"),
             company=company_name,
@@ -775,41 +781,34 @@ async def notify_scheduled_submission(
 async def get_submission_timing_analytics(uuid: str = Depends(authorize)):
     """Get analytics about application submission timing"""
     try:
-        jobs = await jobs_dao.get_all_jobs(uuid)
+        submissions = await jobs_dao.get_submissions(uuid)
         
         day_of_week_stats = {}
         hour_of_day_stats = {}
         response_rates_by_day = {}
         response_rates_by_hour = {}
         
-        for job in jobs:
-            submitted_at = job.get("submitted_at")
-            if not submitted_at:
-                continue
+        for submission in submissions:
+            dt = submission["submitted_at"]
+            day_name = dt.strftime("%A")
+            hour = dt.hour
             
-            try:
-                dt = datetime.fromisoformat(submitted_at.replace('Z', '+00:00'))
-                day_name = dt.strftime("%A")
-                hour = dt.hour
-                
-                day_of_week_stats[day_name] = day_of_week_stats.get(day_name, 0) + 1
-                hour_of_day_stats[hour] = hour_of_day_stats.get(hour, 0) + 1
-                
-                has_response = job.get("status") not in [None, "Applied", "Wishlist"]
-                
-                if day_name not in response_rates_by_day:
-                    response_rates_by_day[day_name] = {"total": 0, "responses": 0}
-                response_rates_by_day[day_name]["total"] += 1
-                if has_response:
-                    response_rates_by_day[day_name]["responses"] += 1
-                
-                if hour not in response_rates_by_hour:
-                    response_rates_by_hour[hour] = {"total": 0, "responses": 0}
-                response_rates_by_hour[hour]["total"] += 1
-                if has_response:
-                    response_rates_by_hour[hour]["responses"] += 1
-            except:
-                continue
+            day_of_week_stats[day_name] = day_of_week_stats.get(day_name, 0) + 1
+            hour_of_day_stats[hour] = hour_of_day_stats.get(hour, 0) + 1
+            
+            has_response = submission.get("status") not in [None, "Applied", "Wishlist"]
+            
+            if day_name not in response_rates_by_day:
+                response_rates_by_day[day_name] = {"total": 0, "responses": 0}
+            response_rates_by_day[day_name]["total"] += 1
+            if has_response:
+                response_rates_by_day[day_name]["responses"] += 1
+            
+            if hour not in response_rates_by_hour:
+                response_rates_by_hour[hour] = {"total": 0, "responses": 0}
+            response_rates_by_hour[hour]["total"] += 1
+            if has_response:
+                response_rates_by_hour[hour]["responses"] += 1
         
         day_response_rates = {}
         for day, stats in response_rates_by_day.items():
@@ -849,7 +848,7 @@ async def get_submission_timing_analytics(uuid: str = Depends(authorize)):
                 "submissions_by_hour": hour_of_day_stats,
                 "response_rate_by_day": day_response_rates,
                 "response_rate_by_hour": hour_response_rates,
-                "total_submissions": len([j for j in jobs if j.get("submitted_at")])
+                "total_submissions": len(submissions)
             },
             "best_practices": best_practices,
             "insights": generate_timing_insights(
@@ -901,37 +900,34 @@ async def get_calendar_view(
         start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
         end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
         
-        schedules = await application_workflow_dao.get_scheduled_applications(uuid)
-        jobs = await jobs_dao.get_all_jobs(uuid)
+        schedules = await application_workflow_dao.get_schedules_with_details(
+            uuid,
+            start_time=parse_schedule_time(start_dt),
+            end_time=parse_schedule_time(end_dt),
+            statuses=ACTIVE_SCHEDULE_STATUSES
+        )
         
         calendar_events = []
         
         for schedule in schedules:
-            scheduled_time = schedule.get("scheduled_time")
-            if not scheduled_time:
+            job = schedule.get("job")
+            if not job:
                 continue
             
-            try:
-                dt = datetime.fromisoformat(scheduled_time.replace('Z', '+00:00'))
-                if start_dt <= dt <= end_dt:
-                    job = await jobs_dao.get_job(schedule["job_id"])
-                    if job:
-                        company = job.get("company")
-                        if isinstance(company, dict):
-                            company = company.get("name", "Unknown")
-                        
-                        calendar_events.append({
-                            "id": str(schedule.get("_id")),
-                            "type": "scheduled",
-                            "title": f"📅 {job.get('title', 'Application')}",
-                            "company": company,
-                            "date": scheduled_time,
-                            "status": schedule.get("status", "scheduled"),
-                            "job_id": schedule["job_id"],
-                            "schedule_id": str(schedule.get("_id"))
-                        })
-            except:
-                continue
+            company = job.get("company")
+            if isinstance(company, dict):
+                company = company.get("name", "Unknown")
+            
+            calendar_events.append({
+                "id": schedule["_id"],
+                "type": "scheduled",
+                "title": f"📅 {job.get('title', 'Application')}",
+                "company": company,
+                "date": schedule["scheduled_time"].isoformat(),
+                "status": schedule.get("status", "scheduled"),
+                "job_id": schedule["job_id"],
+                "schedule_id": schedule["_id"]
+            })
         
         calendar_events.sort(key=lambda x: x["date"])
         
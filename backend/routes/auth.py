@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Body, Depends, HTTPException, Request, BackgroundTasks
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Request, BackgroundTasks
 from fastapi.responses import JSONResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -118,7 +118,7 @@ async def register(request: Request, info: RegistInfo, background_tasks: Backgro
     # Queue contact creation as background task - DON'T BLOCK LOGIN
     background_tasks.add_task(ensure_user_contact, uuid, info.email.lower())
     
-    session_token = session_manager.begin_session(uuid)
+    session_token = await session_manager.begin_session(uuid)
     return {"detail": "Sucessfully registered user", "uuid": uuid, "session_token": session_token}
 
 
@@ -139,15 +139,17 @@ async def login(request: Request, credentials: LoginCred, background_tasks: Back
         # Queue contact sync as background task - FAST LOGIN
         background_tasks.add_task(ensure_user_contact, uuid, credentials.email.lower())
         
-        session_token = session_manager.begin_session(uuid)
+        session_token = await session_manager.begin_session(uuid)
         return {"detail": "Successfully logged in", "uuid": uuid, "session_token": session_token}
     else:
         raise HTTPException(401, "Invalid email or password.")
 
 
 @auth_router.post("/logout", tags = ["profiles"])
-async def logout(uuid: str = Depends(authorize)):
-    if session_manager.kill_session(uuid):
+async def logout(uuid: str = Depends(authorize), authorization: str = Header(None)):
+    # Only end the session this request was made with; other devices stay logged in
+    session_token = authorization.removeprefix("Bearer ").strip() if authorization else None
+    if await session_manager.kill_session(uuid, session_token):
         return {"detail": "Successfully logged out"}
     else:
         raise HTTPException(400, "Session not found")
@@ -193,7 +195,7 @@ async def update_password(token: str = Body(...), password: str = Body(...), old
         await auth_dao.update_password(token, old_data)
         fp = ForgotPassword()
         await fp.delete_link(old_token)
-        session_token = session_manager.begin_session(token)
+        session_token = await session_manager.begin_session(token)
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": f"Something went wrong {str(e)}"})
     return JSONResponse(status_code=200, content={"detail": "Sucessful Registration", "uuid": token, "session_token": session_token})
@@ -226,7 +228,7 @@ async def verify_google_token(token: dict = Body(...), background_tasks: Backgro
         # Queue contact sync as background task
         background_tasks.add_task(ensure_user_contact, uuid, idinfo["email"].lower(), idinfo)
         
-        session_token = session_manager.begin_session(uuid)
+        session_token = await session_manager.begin_session(uuid)
         return {
             "detail": "success",
             "uuid": uuid,
@@ -302,7 +304,7 @@ async def verify_microsoft_token(request: Request, background_tasks: BackgroundT
     
     # Queue contact sync as background task
     background_tasks.add_task(ensure_user_contact, uuid, email.lower(), claims)
-    session_token = session_manager.begin_session(uuid)
+    session_token = await session_manager.begin_session(uuid)
 
     return JSONResponse(
         status_code=200,
@@ -403,7 +405,7 @@ async def verify_linkedin_token(request: Request, background_tasks: BackgroundTa
     
     # Queue contact sync as background task
     background_tasks.add_task(ensure_user_contact, uuid, email.lower(), linkedin_data)
-    session_token = session_manager.begin_session(uuid)
+    session_token = await session_manager.begin_session(uuid)
     
     return JSONResponse(
         status_code=200,
@@ -10,14 +10,12 @@ from typing import List, Optional
 from datetime import datetime
 import os
 import httpx
-import base64
-
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 
 from sessions.session_authorizer import authorize
 from mongo.linked_emails_dao import linked_emails_dao
 from mongo.gmail_tokens_dao import gmail_tokens_dao
+from mongo.gmail_messages_dao import gmail_messages_dao
+from services.gmail_ingestion import GmailError, get_message_body, search_messages
 
 emails_router = APIRouter(prefix="/emails")
 
@@ -61,46 +59,6 @@ class UpdateEmailNotesRequest(BaseModel):
 # Helper Functions
 # ============================================================================
 
-async def get_gmail_service(uuid: str):
-    """Get authenticated Gmail service for a user"""
-    tokens = await gmail_tokens_dao.get_tokens(uuid)
-    
-    if not tokens or not tokens.get("access_token"):
-        raise HTTPException(401, "Gmail not connected")
-    
-    credentials = Credentials(
-        token=tokens["access_token"],
-        refresh_token=tokens.get("refresh_token"),
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=os.getenv("GOOGLE_CLIENT_ID"),
-        client_secret=os.getenv("GOOGLE_CLIENT_SECRET")
-    )
-    
-    service = build('gmail', 'v1', credentials=credentials)
-    return service
-
-
-def parse_email(message):
-    """Parse Gmail API message into simplified format"""
-    headers = message['payload']['headers']
-    
-    subject = next((h['value'] for h in headers if h['name'].lower() == 'subject'), 'No Subject')
-    from_header = next((h['value'] for h in headers if h['name'].lower() == 'from'), 'Unknown')
-    date = next((h['value'] for h in headers if h['name'].lower() == 'date'), '')
-    
-    # Get snippet
-    snippet = message.get('snippet', '')
-    
-    return {
-        'id': message['id'],
-        'thread_id': message.get('threadId', ''),
-        'subject': subject,
-        'from': from_header,
-        'date': date,
-        'snippet': snippet
-    }
-
-
 def detect_status_from_email(subject: str, snippet: str) -> Optional[str]:
     """Detect application status from email content"""
     content = (subject + " " + snippet).lower()
@@ -117,23 +75,19 @@ def detect_status_from_email(subject: str, snippet: str) -> Optional[str]:
         return None
 
 
-def get_email_body(payload):
-    """Extract email body from Gmail API payload"""
-    if 'parts' in payload:
-        for part in payload['parts']:
-            if part['mimeType'] == 'text/plain':
-                data = part['body'].get('data', '')
-                if data:
-                    return base64.urlsafe_b64decode(data).decode('utf-8')
-            elif 'parts' in part:
-                result = get_email_body(part)
-                if result:
-                    return result
-    else:
-        data = payload['body'].get('data', '')
-        if data:
-            return base64.urlsafe_b64decode(data).decode('utf-8')
-    return ''
+async def search_and_classify(uuid: str, query: str, max_results: int = 20) -> dict:
+    """Run a Gmail search through the cached ingestion layer and tag detected statuses"""
+    try:
+        messages = await search_messages(uuid, query, max_results)
+    except GmailError as e:
+        raise HTTPException(e.status_code, e.message)
+
+    emails = []
+    for message in messages:
+        email = {key: message.get(key, "") for key in ("id", "thread_id", "subject", "from", "date", "snippet")}
+        email['detected_status'] = detect_status_from_email(email['subject'], email['snippet'])
+        emails.append(email)
+    return {"emails": emails, "count": len(emails)}
 
 
 # ============================================================================
@@ -285,6 +239,7 @@ async def disconnect_gmail(uuid: str = Depends(authorize)):
     """
     try:
         success = await gmail_tokens_dao.delete_tokens(uuid)
+        await gmail_messages_dao.delete_user_messages(uuid)
         
         if success:
             return {"detail": "Gmail access revoked successfully"}
@@ -308,34 +263,10 @@ async def search_emails_by_company(
 ):
     """Search emails by company name"""
     try:
-        service = await get_gmail_service(uuid)
-        
         # Build search query
         query = f'from:*{company_name}* OR to:*{company_name}* OR subject:{company_name}'
         
-        # Search emails
-        results = service.users().messages().list(
-            userId='me',
-            q=query,
-            maxResults=20
-        ).execute()
-        
-        messages = results.get('messages', [])
-        
-        # Get full message details
-        emails = []
-        for msg in messages:
-            full_msg = service.users().messages().get(
-                userId='me',
-                id=msg['id'],
-                format='full'
-            ).execute()
-            
-            email = parse_email(full_msg)
-            email['detected_status'] = detect_status_from_email(email['subject'], email['snippet'])
-            emails.append(email)
-        
-        return {"emails": emails, "count": len(emails)}
+        return await search_and_classify(uuid, query)
         
     except HTTPException:
         raise
@@ -352,35 +283,11 @@ async def search_emails_by_keywords(
 ):
     """Search emails by keywords"""
     try:
-        service = await get_gmail_service(uuid)
-        
         # Build search query from keywords
         query_parts = [f'({kw})' for kw in keywords if kw]
         query = ' OR '.join(query_parts)
         
-        # Search emails
-        results = service.users().messages().list(
-            userId='me',
-            q=query,
-            maxResults=20
-        ).execute()
-        
-        messages = results.get('messages', [])
-        
-        # Get full message details
-        emails = []
-        for msg in messages:
-            full_msg = service.users().messages().get(
-                userId='me',
-                id=msg['id'],
-                format='full'
-            ).execute()
-            
-            email = parse_email(full_msg)
-            email['detected_status'] = detect_status_from_email(email['subject'], email['snippet'])
-            emails.append(email)
-        
-        return {"emails": emails, "count": len(emails)}
+        return await search_and_classify(uuid, query)
         
     except HTTPException:
         raise
@@ -396,31 +303,7 @@ async def search_emails_custom(
 ):
     """Search emails with custom query"""
     try:
-        service = await get_gmail_service(uuid)
-        
-        # Search emails
-        results = service.users().messages().list(
-            userId='me',
-            q=request.query,
-            maxResults=request.max_results
-        ).execute()
-        
-        messages = results.get('messages', [])
-        
-        # Get full message details
-        emails = []
-        for msg in messages:
-            full_msg = service.users().messages().get(
-                userId='me',
-                id=msg['id'],
-                format='full'
-            ).execute()
-            
-            email = parse_email(full_msg)
-            email['detected_status'] = detect_status_from_email(email['subject'], email['snippet'])
-            emails.append(email)
-        
-        return {"emails": emails, "count": len(emails)}
+        return await search_and_classify(uuid, request.query, request.max_results)
         
     except HTTPException:
         raise
@@ -436,22 +319,13 @@ async def get_email_body_endpoint(
 ):
     """Get full email body text"""
     try:
-        service = await get_gmail_service(uuid)
-        
-        # Get message with full body
-        message = service.users().messages().get(
-            userId='me',
-            id=email_id,
-            format='full'
-        ).execute()
-        
-        # Extract body
-        body = get_email_body(message['payload'])
+        # Loaded from Gmail the first time, then served from the message cache
+        body = await get_message_body(uuid, email_id)
         
         return {"body": body or "No text content available"}
         
-    except HTTPException:
-        raise
+    except GmailError as e:
+        raise HTTPException(e.status_code, e.message)
     except Exception as e:
         print(f"Error getting email body: {e}")
         raise HTTPException(500, f"Failed to get email body: {str(e)}")
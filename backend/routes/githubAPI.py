@@ -7,13 +7,23 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel, HttpUrl
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
 import os
 import httpx
 
 from sessions.session_authorizer import authorize
 from mongo.github_tokens_dao import github_tokens_dao
 from mongo.github_repos_dao import github_repos_dao
+from services.job_queue import job_queue
+from services.github_sync import (
+    GitHubError,
+    enqueue_github_sync,
+    get_access_token,
+    github_client,
+    refresh_commit_activity,
+    summarize_commit_activity,
+    sync_task_key,
+    sync_user_repositories,
+)
 
 github_router = APIRouter(prefix="/github")
 
@@ -68,63 +78,22 @@ class UpdateRepoNotesRequest(BaseModel):
 # Helper Functions
 # ============================================================================
 
-async def get_github_headers(uuid: str) -> Dict[str, str]:
-    """Get authenticated headers for GitHub API requests"""
-    tokens = await github_tokens_dao.get_tokens(uuid)
-    
-    if not tokens or not tokens.get("access_token"):
-        raise HTTPException(401, "GitHub not connected")
-    
-    return {
-        "Authorization": f"Bearer {tokens['access_token']}",
-        "Accept": "application/vnd.github.v3+json",
-        "X-GitHub-Api-Version": "2022-11-28"
-    }
-
-
-async def fetch_github_data(url: str, headers: Dict[str, str]) -> Any:
-    """Fetch data from GitHub API"""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, timeout=30.0)
-        
-        if response.status_code == 401:
-            raise HTTPException(401, "GitHub token expired or invalid")
-        elif response.status_code == 403:
-            raise HTTPException(403, "GitHub API rate limit exceeded")
-        elif response.status_code != 200:
-            raise HTTPException(response.status_code, f"GitHub API error: {response.text}")
-        
-        return response.json()
-
-
-async def get_repository_languages(repo_full_name: str, headers: Dict[str, str]) -> Dict[str, int]:
-    """Fetch languages used in a repository"""
-    url = f"https://api.github.com/repos/{repo_full_name}/languages"
+async def fetch_github_data(url: str, uuid: str) -> Any:
+    """Fetch data from GitHub API through the shared client"""
     try:
-        return await fetch_github_data(url, headers)
-    except:
-        return {}
+        token = await get_access_token(uuid)
+        response = await github_client.get(url, token)
+    except GitHubError as e:
+        raise HTTPException(e.status_code, e.message)
+    return response.data if response.data is not None else []
 
 
-async def get_commit_activity(repo_full_name: str, headers: Dict[str, str]) -> Dict[str, Any]:
-    """Fetch commit activity for a repository"""
-    url = f"https://api.github.com/repos/{repo_full_name}/stats/commit_activity"
-    try:
-        data = await fetch_github_data(url, headers)
-        if not data:
-            return {"total_commits": 0, "recent_commits": 0}
-        
-        # Calculate total and recent (last 4 weeks) commits
-        total = sum(week.get("total", 0) for week in data)
-        recent = sum(week.get("total", 0) for week in data[-4:]) if len(data) >= 4 else total
-        
-        return {
-            "total_commits": total,
-            "recent_commits": recent,
-            "weekly_data": data
-        }
-    except:
-        return {"total_commits": 0, "recent_commits": 0}
+def filter_repositories(repos: List[Dict], include_forks: bool, include_archived: bool) -> List[Dict]:
+    return [
+        r for r in repos
+        if (include_forks or not r.get("is_fork", False))
+        and (include_archived or not r.get("is_archived", False))
+    ]
 
 
 # ============================================================================
@@ -312,83 +281,22 @@ async def get_user_repositories(
     Can fetch from cache or refresh from GitHub API
     """
     try:
-        # Check if we should use cached data
-        if not refresh:
-            cached_repos = await github_repos_dao.get_user_repos(uuid)
-            if cached_repos:
-                # Filter based on parameters
-                filtered = [
-                    r for r in cached_repos
-                    if (include_forks or not r.get("is_fork", False))
-                    and (include_archived or not r.get("is_archived", False))
-                ]
-                return {
-                    "repositories": filtered,
-                    "count": len(filtered),
-                    "cached": True
-                }
-        
-        # Fetch fresh data from GitHub
-        headers = await get_github_headers(uuid)
-        
-        # Get user's repositories
-        repos_url = "https://api.github.com/user/repos?per_page=100&sort=updated"
-        repos_data = await fetch_github_data(repos_url, headers)
-        
-        # Process repositories
-        repositories = []
-        for repo in repos_data:
-            # Skip private repos (only public for free tier)
-            if repo.get("private", False):
-                continue
-            
-            # Get languages for each repo
-            languages = await get_repository_languages(repo["full_name"], headers)
-            
-            repo_data = {
-                "repo_id": repo["id"],
-                "name": repo["name"],
-                "full_name": repo["full_name"],
-                "description": repo.get("description"),
-                "html_url": repo["html_url"],
-                "homepage": repo.get("homepage"),
-                "language": repo.get("language"),
-                "languages": languages,
-                "stargazers_count": repo.get("stargazers_count", 0),
-                "forks_count": repo.get("forks_count", 0),
-                "watchers_count": repo.get("watchers_count", 0),
-                "open_issues_count": repo.get("open_issues_count", 0),
-                "size": repo.get("size", 0),
-                "created_at": repo.get("created_at", ""),
-                "updated_at": repo.get("updated_at", ""),
-                "pushed_at": repo.get("pushed_at"),
-                "topics": repo.get("topics", []),
-                "is_private": repo.get("private", False),
-                "is_fork": repo.get("fork", False),
-                "is_archived": repo.get("archived", False),
-                "is_featured": False,
-                "linked_skills": [],
-                "notes": "",
-                "last_synced": datetime.utcnow().isoformat()
-            }
-            
-            repositories.append(repo_data)
-        
-        # Store in database
-        print("SHOULD BE STORING")
-        await github_repos_dao.store_repos(uuid, repositories)
-        
-        # Filter based on parameters
-        filtered = [
-            r for r in repositories
-            if (include_forks or not r.get("is_fork", False))
-            and (include_archived or not r.get("is_archived", False))
-        ]
-        
+        repos = None if refresh else await github_repos_dao.get_user_repos(uuid)
+        # Never synced (first load after connecting): fetch now rather than show nothing
+        synced = refresh or (not repos and not await github_repos_dao.get_sync_state(uuid))
+        if synced:
+            # Incremental: only changed listing pages and pushed repos are re-fetched
+            try:
+                await sync_user_repositories(uuid)
+            except GitHubError as e:
+                raise HTTPException(e.status_code, e.message)
+            repos = await github_repos_dao.get_user_repos(uuid)
+        
+        filtered = filter_repositories(repos, include_forks, include_archived)
         return {
             "repositories": filtered,
             "count": len(filtered),
-            "cached": False
+            "cached": not synced
         }
         
     except HTTPException:
@@ -432,11 +340,17 @@ async def get_repository_details(
         if not repo:
             raise HTTPException(404, "Repository not found")
         
-        # Optionally fetch commit activity
+        # Commit activity is stored by the sync; revalidate it with a conditional request
         if include_commits:
-            headers = await get_github_headers(uuid)
-            commit_activity = await get_commit_activity(repo["full_name"], headers)
-            repo["commit_activity"] = commit_activity
+            try:
+                token = await get_access_token(uuid)
+                repo["commit_activity"] = await refresh_commit_activity(uuid, repo, token)
+            except GitHubError as e:
+                if e.status_code == 401:
+                    raise HTTPException(401, e.message)
+                repo["commit_activity"] = repo.get("commit_activity") or summarize_commit_activity(None)
+        for field in ("_id", "languages_etag", "commit_activity_etag"):
+            repo.pop(field, None)
         
         return repo
         
@@ -455,16 +369,16 @@ async def get_contribution_activity(
     Get user's overall GitHub contribution activity
     """
     try:
-        headers = await get_github_headers(uuid)
         tokens = await github_tokens_dao.get_tokens(uuid)
+        if not tokens or not tokens.get("access_token"):
+            raise HTTPException(401, "GitHub not connected")
         username = tokens.get("username")
         
         if not username:
             raise HTTPException(400, "GitHub username not found")
         
         # Get user events (contributions)
-        events_url = f"https://api.github.com/users/{username}/events/public?per_page=100"
-        events = await fetch_github_data(events_url, headers)
+        events = await fetch_github_data(f"/users/{username}/events/public?per_page=100", uuid)
         
         # Process contribution stats
         contribution_stats = {
@@ -602,24 +516,41 @@ async def update_repository_notes(
 @github_router.post("/sync", tags=["github"])
 async def sync_repositories(uuid: str = Depends(authorize)):
     """
-    Manually trigger a sync of repository data from GitHub
+    Queue a background sync of repository data from GitHub
+    Poll /github/sync/status for the outcome
     """
     try:
-        # This just calls get_repositories with refresh=True
-        return await get_user_repositories(
-            include_forks=True,
-            include_archived=True,
-            refresh=True,
-            uuid=uuid
-        )
+        await get_access_token(uuid)
+        task = await enqueue_github_sync(uuid)
+        return {"detail": "Sync queued", "status": task.get("status")}
         
-    except HTTPException:
-        raise
+    except GitHubError as e:
+        raise HTTPException(e.status_code, e.message)
     except Exception as e:
         print(f"Error syncing repositories: {e}")
         raise HTTPException(500, f"Failed to sync repositories: {str(e)}")
 
 
+@github_router.get("/sync/status", tags=["github"])
+async def get_sync_status(uuid: str = Depends(authorize)):
+    """
+    Status of the latest queued sync and the summary of the last completed one
+    """
+    try:
+        task = await job_queue.get_status(sync_task_key(uuid))
+        state = await github_repos_dao.get_sync_state(uuid) or {}
+        return {
+            "status": task.get("status") if task else None,
+            "error": task.get("last_error") if task else None,
+            "last_synced": state.get("last_synced"),
+            "last_sync": state.get("last_sync"),
+        }
+        
+    except Exception as e:
+        print(f"Error getting sync status: {e}")
+        raise HTTPException(500, f"Failed to get sync status: {str(e)}")
+
+
 # ============================================================================
 # Statistics Endpoints
 # ============================================================================
@@ -3,7 +3,8 @@ Fixed Interview Router - Datetime Comparison Fix
 Handles both timezone-aware and timezone-naive datetime objects properly
 """
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
+import json
 from datetime import datetime, timezone, timedelta
 from typing import Optional
 
@@ -18,11 +19,10 @@ from mongo.writing_practice_dao import WritingPracticeDAO
 from services.calendar_service import calendar_service
 from services.PreparationTaskGenerator import PreparationTaskGenerator
 from services.followup_service import followup_service
-from services.company_research_service import company_research_service
+from services.company_research_service import company_research_service, RESEARCH_SECTIONS
 from services.writing_practice_service import WritingPracticeService
 from mongo.dao_setup import db_client
 from sessions.session_authorizer import authorize
-import services.reminder_scheduler
 
 # Initialize router
 interview_router = APIRouter(prefix="/interview", tags=["interview"])
@@ -306,7 +306,7 @@ async def mark_template_sent(template_id: str, request: Request):
         
         # Send the actual email using the follow-up service with final content
         try:
-            email_result = followup_service.send_followup_email(
+            email_result = await followup_service.send_followup_email(
                 recipient_email=recipient_email,
                 sender_name=user_name,
                 subject=final_subject,
@@ -1477,7 +1477,7 @@ async def mark_template_sent(template_id: str, request: Request):
         
         # Send the actual email using the follow-up service with edited content
         try:
-            email_result = followup_service.send_followup_email(
+            email_result = await followup_service.send_followup_email(
                 recipient_email=recipient_email,
                 sender_name=user_name,
                 subject=final_subject,      # Use edited subject
@@ -1558,6 +1558,44 @@ async def mark_response_received(
 # COMPANY RESEARCH ENDPOINTS (UC-074)
 # ============================================================================
 
+async def _company_research_inputs(interview: dict) -> dict:
+    """Collect company/job context for research generation from an interview and its job application"""
+    company_name = interview.get("company_name", "Unknown Company")
+    job_role = interview.get("scenario_name", "Position")
+    industry = interview.get("industry", "Technology")
+    job_application_uuid = interview.get("job_application_uuid")
+
+    # Fetch job application for more context
+    job_description = None
+    company_website = None
+    company_size = None
+
+    try:
+        if job_application_uuid:
+            job = await jobs_dao.get_job(job_application_uuid)
+            if job:
+                job_description = job.get("description")
+                company_data = job.get("company", {})
+                if isinstance(company_data, dict):
+                    company_website = company_data.get("website")
+                    company_size = company_data.get("size")
+                    if not company_name or company_name == "Unknown Company":
+                        company_name = company_data.get("name", company_name)
+    except Exception as e:
+        print(f"Could not fetch job details: {e}")
+
+    return {
+        "company_name": company_name,
+        "job_role": job_role,
+        "job_description": job_description,
+        "industry": industry,
+        "company_website": company_website,
+        "company_info": {
+            "size": company_size,
+            "industry": industry
+        },
+    }
+
 @interview_router.post("/research/generate")
 async def generate_company_research(
     request_data: GenerateCompanyResearchRequest,
@@ -1584,42 +1622,10 @@ async def generate_company_research(
                 "research": existing_research
             }
 
-        # Extract interview information
-        company_name = interview.get("company_name", "Unknown Company")
-        job_role = interview.get("scenario_name", "Position")
-        industry = interview.get("industry", "Technology")
-        job_application_uuid = interview.get("job_application_uuid")
-
-        # Fetch job application for more context
-        job_description = None
-        company_website = None
-        company_size = None
-
-        try:
-            if job_application_uuid:
-                job = await jobs_dao.get_job(job_application_uuid)
-                if job:
-                    job_description = job.get("description")
-                    company_data = job.get("company", {})
-                    if isinstance(company_data, dict):
-                        company_website = company_data.get("website")
-                        company_size = company_data.get("size")
-                        if not company_name or company_name == "Unknown Company":
-                            company_name = company_data.get("name", company_name)
-        except Exception as e:
-            print(f"Could not fetch job details: {e}")
-
         # Generate research using the service
+        research_inputs = await _company_research_inputs(interview)
         research_report = await company_research_service.generate_company_research(
-            company_name=company_name,
-            job_role=job_role,
-            job_description=job_description,
-            industry=industry,
-            company_website=company_website,
-            company_info={
-                "size": company_size,
-                "industry": industry
-            },
+            **research_inputs,
             custom_prompt=request_data.custom_prompt
         )
 
@@ -1641,6 +1647,50 @@ async def generate_company_research(
         raise HTTPException(500, f"Failed to generate research: {str(e)}")
 
 
+@interview_router.post("/research/generate/stream")
+async def stream_company_research(
+    request_data: GenerateCompanyResearchRequest,
+    request: Request
+):
+    """
+    Generate company research and stream each section as soon as it is ready.
+
+    Response is newline-delimited JSON:
+        {"section": "<name>", "data": ...}   one line per section, in completion order
+        {"section": "done", "research": {...}} final line with the saved report
+    """
+    uuid_val = get_uuid_from_headers(request)
+
+    interview = await schedule_dao.get_schedule(request_data.interview_id)
+
+    if not interview:
+        raise HTTPException(404, "Interview not found")
+
+    if interview.get("uuid") != uuid_val:
+        raise HTTPException(403, "Unauthorized")
+
+    research_inputs = await _company_research_inputs(interview)
+
+    async def section_events():
+        sections = {}
+        async for section, value in company_research_service.stream_company_research(
+            **research_inputs,
+            custom_prompt=request_data.custom_prompt
+        ):
+            sections[section] = value
+            yield json.dumps({"section": section, "data": value}, default=str) + "\n"
+
+        research_report = {section: sections[section] for section in RESEARCH_SECTIONS}
+        research_report["generated_at"] = datetime.now(timezone.utc)
+        await schedule_dao.update_schedule(
+            request_data.interview_id,
+            {"research": research_report}
+        )
+        yield json.dumps({"section": "done", "research": research_report}, default=str) + "\n"
+
+    return StreamingResponse(section_events(), media_type="application/x-ndjson")
+
+
 @interview_router.get("/research/{schedule_id}")
 async def get_company_research(
     schedule_id: str,
@@ -1707,42 +1757,10 @@ async def regenerate_company_research(
         if interview.get("uuid") != uuid_val:
             raise HTTPException(403, "Unauthorized")
 
-        # Extract interview information
-        company_name = interview.get("company_name", "Unknown Company")
-        job_role = interview.get("scenario_name", "Position")
-        industry = interview.get("industry", "Technology")
-        job_application_uuid = interview.get("job_application_uuid")
-
-        # Fetch job application for more context
-        job_description = None
-        company_website = None
-        company_size = None
-
-        try:
-            if job_application_uuid:
-                job = await jobs_dao.get_job(job_application_uuid)
-                if job:
-                    job_description = job.get("description")
-                    company_data = job.get("company", {})
-                    if isinstance(company_data, dict):
-                        company_website = company_data.get("website")
-                        company_size = company_data.get("size")
-                        if not company_name or company_name == "Unknown Company":
-                            company_name = company_data.get("name", company_name)
-        except Exception as e:
-            print(f"Could not fetch job details: {e}")
-
         # Generate research using the service
+        research_inputs = await _company_research_inputs(interview)
         research_report = await company_research_service.generate_company_research(
-            company_name=company_name,
-            job_role=job_role,
-            job_description=job_description,
-            industry=industry,
-            company_website=company_website,
-            company_info={
-                "size": company_size,
-                "industry": industry
-            },
+            **research_inputs,
             custom_prompt=custom_prompt
         )
 
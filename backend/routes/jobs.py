@@ -1,14 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, Body, UploadFile, File
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import StreamingResponse
 from pymongo.errors import DuplicateKeyError
 from datetime import datetime, timezone
-import smtplib, os, tempfile
+import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from io import BytesIO
 import traceback
 
-from mongo.jobs_dao import jobs_dao
+from mongo.jobs_dao import jobs_dao, LIST_VIEW_EXCLUDED_FIELDS
 from mongo.media_dao import media_dao
 from mongo.resumes_dao import resumes_dao
 from mongo.cover_letters_dao import cover_letters_dao
@@ -17,8 +17,15 @@ from mongo.progress_sharing_dao import progress_sharing_dao
 from sessions.session_authorizer import authorize
 from schema.Job import Job, UrlBody
 from services.html_pdf_generator import HTMLPDFGenerator
-from services.company_research import run_company_research
-from services.company_news import run_company_news
+from services.render_cache import render_cache, render_key, etag_for, not_modified
+from services.notification_dispatcher import notification_dispatcher
+from services.job_queue import job_queue
+from services.job_research_pipeline import (
+    enqueue_job_research,
+    job_company_name,
+    research_status,
+    research_task_key,
+)
 from services.job_requirements_extractor import (
     extract_skills,
     extract_years_experience,
@@ -26,8 +33,6 @@ from services.job_requirements_extractor import (
 )
 from mongo.job_requirements_extractor_dao import job_requirements_extractor_dao
 
-
-from services.salary_research import generate_job_salary_negotiation
 from services.automation_engine import process_automation_for_job
 
 
@@ -38,7 +43,7 @@ from webscrape.job_scraper import job_from_url, URLScrapeError
 jobs_router = APIRouter(prefix="/jobs")
 
 
-def send_deadline_reminder_email(recipient_email: str, job_title: str, company: str, deadline: str, days_until: int):
+async def send_deadline_reminder_email(recipient_email: str, job_title: str, company: str, deadline: str, days_until: int):
     """Send a deadline reminder email to the user"""
     sender_email = os.getenv("GMAIL_SENDER")
     sender_password = os.getenv("GMAIL_APP_PASSWORD")
@@ -186,9 +191,7 @@ This is an automated reminder from your Job Opportunities Tracker.
     
     # Send email
     try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(sender_email, sender_password)
-            server.sendmail(sender_email, recipient_email, message.as_string())
+        await notification_dispatcher.send(message, recipient_email, sender=sender_email)
         return True
     except Exception as e:
         print(f"Failed to send email: {e}")
@@ -363,47 +366,17 @@ async def add_job(job: Job, uuid: str = Depends(authorize)):
         except Exception as e:
             print(f"⚠️ Failed to save requirements snapshot: {str(e)}")
 
-        # PHASE 2: Add research data asynchronously (non-blocking)
-        # If this fails, the job still exists
+        # PHASE 2: Queue research (company profile, news, salary prep) for the
+        # background workers; the frontend polls /{job_id}/research-status
+        research_state = "not_started"
         if company_name:
             try:
-                print(f"🔍 Starting automated research for company: {company_name}")
-                
-                # Run company research
-                research_result = await run_company_research(company_name)
-                
-                # Run company news
-                news_result = await run_company_news(company_name)
-                
-                # Run salary negotiation research
-                salary_negotiation = None
-                try:
-                    salary_negotiation = await generate_job_salary_negotiation(
-                        job_title=model.get("title", ""),
-                        company=company_name,
-                        location=model.get("location", ""),
-                        company_size=research_result.get("basic_info", {}).get("size") if research_result else None
-                    )
-                except Exception as e:
-                    print(f"⚠️ Failed to generate salary negotiation: {str(e)}")
-                
-                # Update job with research data
-                research_update = {}
-                if research_result:
-                    research_update["company_research"] = research_result
-                if news_result:
-                    research_update["company_news"] = news_result
-                if salary_negotiation:
-                    research_update["salary_negotiation"] = salary_negotiation
-                
-                if research_update:
-                    await jobs_dao.update_job(job_id, research_update)
-                    print(f"✅ Research data added to job {job_id}")
-                
-            except Exception as research_error:
-                # Log the error but don't fail the job creation
-                print(f"⚠️ Research failed for job {job_id}: {str(research_error)}")
-                print(f"Job was still created successfully")
+                task = await enqueue_job_research(job_id)
+                research_state = task.get("status")
+                print(f"🔍 Research queued for job {job_id} ({company_name})")
+            except Exception as e:
+                # The job still exists; research can be retried later
+                print(f"⚠️ Could not queue research for job {job_id}: {str(e)}")
 
         # Fetch the created job to return full object
         created_job = await jobs_dao.get_job(job_id)
@@ -419,7 +392,8 @@ async def add_job(job: Job, uuid: str = Depends(authorize)):
         return {
             "detail": "Successfully added job",
             "job_id": job_id,
-            "job": created_job
+            "job": created_job,
+            "research_status": research_state
         }
         
     except DuplicateKeyError:
@@ -431,69 +405,25 @@ async def add_job(job: Job, uuid: str = Depends(authorize)):
         traceback.print_exc()
         raise HTTPException(500, "Encountered internal server error")
         
-# NEW ENDPOINT: Retry research for an existing job
 @jobs_router.post("/{job_id}/retry-research", tags=["jobs"])
 async def retry_job_research(job_id: str, uuid: str = Depends(authorize)):
-    """Retry automated research for a job that failed during creation"""
+    """Re-queue automated research for a job"""
     try:
         job = await jobs_dao.get_job(job_id)
-        if not job:
+        if not job or job.get("uuid") != uuid:
             raise HTTPException(404, "Job not found")
-        
-        # Extract company name
-        company_name = None
-        if isinstance(job.get("company"), str):
-            company_name = job["company"]
-        elif isinstance(job.get("company"), dict):
-            company_name = job["company"].get("name")
-        
-        if not company_name:
+
+        if not job_company_name(job):
             raise HTTPException(400, "Job has no company name")
-        
-        print(f"🔄 Retrying research for job {job_id}, company: {company_name}")
-        
-        research_update = {}
-        
-        # Run company research
-        try:
-            research_result = await run_company_research(company_name)
-            if research_result:
-                research_update["company_research"] = research_result
-        except Exception as e:
-            print(f"⚠️ Company research failed: {str(e)}")
-        
-        # Run company news
-        try:
-            news_result = await run_company_news(company_name)
-            if news_result:
-                research_update["company_news"] = news_result
-        except Exception as e:
-            print(f"⚠️ Company news failed: {str(e)}")
-        
-        # Run salary negotiation
-        try:
-            salary_negotiation = await generate_job_salary_negotiation(
-                job_title=job.get("title", ""),
-                company=company_name,
-                location=job.get("location", ""),
-                company_size=research_update.get("company_research", {}).get("basic_info", {}).get("size") if research_update.get("company_research") else None
-            )
-            if salary_negotiation:
-                research_update["salary_negotiation"] = salary_negotiation
-        except Exception as e:
-            print(f"⚠️ Salary negotiation failed: {str(e)}")
-        
-        if not research_update:
-            raise HTTPException(500, "All research attempts failed")
-        
-        # Update job with research data
-        await jobs_dao.update_job(job_id, research_update)
-        
+
+        task = await enqueue_job_research(job_id, force=True)
+        print(f"🔄 Research re-queued for job {job_id}")
+
         return {
-            "detail": "Research completed successfully",
-            "updated_fields": list(research_update.keys())
+            "detail": "Research queued",
+            "research_status": research_status(task)
         }
-        
+
     except HTTPException:
         raise
     except Exception as e:
@@ -501,6 +431,23 @@ async def retry_job_research(job_id: str, uuid: str = Depends(authorize)):
         traceback.print_exc()
         raise HTTPException(500, f"Failed to retry research: {str(e)}")
 
+@jobs_router.get("/{job_id}/research-status", tags=["jobs"])
+async def get_job_research_status(job_id: str, uuid: str = Depends(authorize)):
+    """Poll the background research task for a job"""
+    try:
+        job = await jobs_dao.get_job(job_id)
+        if not job or job.get("uuid") != uuid:
+            raise HTTPException(404, "Job not found")
+
+        task = await job_queue.get_status(research_task_key(job_id))
+        return research_status(task)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error fetching research status: {e}")
+        raise HTTPException(500, "Encountered internal server error")
+
 @jobs_router.get("", tags=["jobs"])
 async def get_job(job_id: str, uuid: str = Depends(authorize)):
     try:
@@ -546,34 +493,16 @@ async def get_job(job_id: str, uuid: str = Depends(authorize)):
 
 
 @jobs_router.get("/me", tags=["jobs"])
-async def get_all_jobs(uuid: str = Depends(authorize)):
+async def get_all_jobs(summary: bool = False, uuid: str = Depends(authorize)):
+    """
+    All jobs for the user with linked material names resolved.
+    summary=true leaves out company research, news and salary prep (fetch
+    them per job via GET /jobs?job_id=...).
+    """
     try:
-        results = await jobs_dao.get_all_jobs(uuid)
-        
-        for job in results:
-            if job.get("materials"):
-                materials = job["materials"]
-                
-                if materials.get("resume_id"):
-                    try:
-                        resume = await resumes_dao.get_resume(materials["resume_id"])
-                        if resume:
-                            materials["resume_name"] = resume.get("name", "Unnamed Resume")
-                            materials["resume_version"] = resume.get("version_name", "Version 1")
-                    except Exception as e:
-                        print(f"Error fetching resume details: {e}")
-                
-                if materials.get("cover_letter_id"):
-                    try:
-                        cover_letter = await cover_letters_dao.get_cover_letter(
-                            materials["cover_letter_id"], uuid
-                        )
-                        if cover_letter:
-                            materials["cover_letter_name"] = cover_letter.get("title", "Unnamed Cover Letter")
-                            materials["cover_letter_version"] = cover_letter.get("version_name", "Version 1")
-                    except Exception as e:
-                        print(f"Error fetching cover letter details: {e}")
-        
+        projection = {field: 0 for field in LIST_VIEW_EXCLUDED_FIELDS} if summary else None
+        results = await jobs_dao.get_all_jobs(uuid, projection)
+        await jobs_dao.attach_material_details(results, uuid)
     except Exception as e:
         raise HTTPException(500, str(e))
     
@@ -808,7 +737,7 @@ async def send_deadline_reminder(
 ):
     """Send a deadline reminder email immediately"""
     try:
-        send_deadline_reminder_email(
+        await send_deadline_reminder_email(
             recipient_email=email,
             job_title=jobTitle,
             company=company,
@@ -868,11 +797,9 @@ async def get_job_materials(job_id: str, uuid: str = Depends(authorize)):
 
 # NEW ENDPOINT: Download linked resume as PDF
 @jobs_router.get("/{job_id}/materials/resume/pdf", tags=["jobs"])
-async def download_linked_resume_pdf(job_id: str, uuid: str = Depends(authorize)):
+async def download_linked_resume_pdf(job_id: str, request: Request, uuid: str = Depends(authorize)):
     """Download the resume linked to this job as PDF"""
     try:
-        import requests
-        
         job = await jobs_dao.get_job(job_id)
         if not job:
             raise HTTPException(404, "Job not found")
@@ -882,7 +809,7 @@ async def download_linked_resume_pdf(job_id: str, uuid: str = Depends(authorize)
             raise HTTPException(404, "No resume linked to this job")
         
         # Get resume data
-        resume = await resumes_dao.get_resume(resume_id)
+        resume = await resumes_dao.get_resume(resume_id, uuid)
         if not resume:
             raise HTTPException(404, "Resume not found")
         
@@ -893,28 +820,22 @@ async def download_linked_resume_pdf(job_id: str, uuid: str = Depends(authorize)
             resume.get('colors'), 
             resume.get('fonts')
         )
-        
-        # Generate PDF using external service (same as cover letters)
-        response = requests.post(
-            'https://api.html2pdf.app/v1/generate',
-            json={'html': full_html},
-            timeout=30
+
+        key = render_key(resume_id, "pdf", full_html, resume.get("templateId") or resume.get("template"))
+        cached = not_modified(request, key)
+        if cached:
+            return cached
+
+        pdf_bytes = await render_cache.get_or_render(
+            resume_id, key, "pdf", lambda: HTMLPDFGenerator.generate_pdf_from_html(full_html)
         )
         
-        if response.status_code != 200:
-            raise HTTPException(500, "PDF generation failed")
-        
         filename = f"{resume.get('name', 'resume')}.pdf"
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-            tmp.write(response.content)
-            tmp_path = tmp.name
-        
-        return FileResponse(
-            tmp_path,
+        return StreamingResponse(
+            BytesIO(pdf_bytes),
             media_type='application/pdf',
-            filename=filename,
-            headers={"Content-Disposition": f"attachment; filename=\"{filename}\""}
+            headers={"Content-Disposition": f"attachment; filename=\"{filename}\"", "ETag": etag_for(key)}
         )
         
     except HTTPException:
@@ -926,11 +847,9 @@ async def download_linked_resume_pdf(job_id: str, uuid: str = Depends(authorize)
 
 # NEW ENDPOINT: Download linked cover letter as PDF
 @jobs_router.get("/{job_id}/materials/cover-letter/pdf", tags=["jobs"])
-async def download_linked_cover_letter_pdf(job_id: str, uuid: str = Depends(authorize)):
+async def download_linked_cover_letter_pdf(job_id: str, request: Request, uuid: str = Depends(authorize)):
     """Download the cover letter linked to this job as PDF"""
     try:
-        import requests
-        
         job = await jobs_dao.get_job(job_id)
         if not job:
             raise HTTPException(404, "Job not found")
@@ -947,28 +866,22 @@ async def download_linked_cover_letter_pdf(job_id: str, uuid: str = Depends(auth
         html_content = cover_letter.get("content", "")
         if not html_content:
             raise HTTPException(400, "Cover letter has no content")
-        
-        filename = f"{cover_letter.get('title', 'cover_letter')}.pdf"
-        
-        # Use external PDF service
-        response = requests.post(
-            'https://api.html2pdf.app/v1/generate',
-            json={'html': html_content},
-            timeout=30
+
+        key = render_key(cover_letter_id, "pdf", html_content, cover_letter.get("template_type"))
+        cached = not_modified(request, key)
+        if cached:
+            return cached
+
+        pdf_bytes = await render_cache.get_or_render(
+            cover_letter_id, key, "pdf", lambda: HTMLPDFGenerator.generate_pdf_from_html(html_content)
         )
         
-        if response.status_code != 200:
-            raise HTTPException(500, "PDF generation failed")
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-            tmp.write(response.content)
-            tmp_path = tmp.name
+        filename = f"{cover_letter.get('title', 'cover_letter')}.pdf"
         
-        return FileResponse(
-            tmp_path,
+        return StreamingResponse(
+            BytesIO(pdf_bytes),
             media_type='application/pdf',
-            filename=filename,
-            headers={"Content-Disposition": f"attachment; filename=\"{filename}\""}
+            headers={"Content-Disposition": f"attachment; filename=\"{filename}\"", "ETag": etag_for(key)}
         )
         
     except HTTPException:
@@ -2,11 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import statistics
-from bson import ObjectId
 import math
 
 from sessions.session_authorizer import authorize
-from mongo.dao_setup import db_client, AUTH, JOBS, INFORMATIONAL_INTERVIEWS, SALARY, SKILLS, EMPLOYMENT
+from mongo.dao_setup import db_client, JOBS, INFORMATIONAL_INTERVIEWS, SALARY, SKILLS, EMPLOYMENT
+from services.peer_benchmarks import get_cohort_benchmarks, percentile_of
 
 router = APIRouter(prefix="/performance-analytics", tags=["performance-analytics"])
 performance_analytics_router = router
@@ -28,19 +28,20 @@ async def get_competitive_analysis(
         user_salaries = await db_client[SALARY].find({"uuid": user_id}).to_list(None)
         user_skills = await db_client[SKILLS].find({"uuid": user_id}).to_list(None)
         
-        # Get peer data (anonymous benchmarks)
+        # Get peer data (precomputed anonymous cohort benchmarks)
         peer_data = await get_peer_benchmarks(user_id)
         
         # Calculate competitive metrics
         analysis = {
-            "job_search_performance": analyze_job_search_performance(user_applications, peer_data["applications"]),
-            "competitive_positioning": await analyze_competitive_positioning(user_id, user_skills, peer_data["skills"]),
-            "industry_standards": analyze_industry_standards(user_applications, peer_data["applications"]),
-            "career_progression": analyze_career_progression(user_applications, user_interviews, peer_data["career_data"]),
-            "skill_gap_analysis": analyze_skill_gaps(user_skills, peer_data["skills"]),
+            "job_search_performance": analyze_job_search_performance(user_applications, peer_data),
+            "competitive_positioning": await analyze_competitive_positioning(user_id, user_skills, peer_data),
+            "industry_standards": analyze_industry_standards(user_applications, peer_data),
+            "career_progression": analyze_career_progression(user_applications, user_interviews, peer_data),
+            "skill_gap_analysis": analyze_skill_gaps(user_skills, peer_data),
             "recommendations": generate_competitive_recommendations(user_id, user_applications, user_skills, peer_data),
-            "market_positioning": analyze_market_positioning(user_id, user_salaries, peer_data["salaries"]),
-            "differentiation_strategies": generate_differentiation_strategies(user_skills, peer_data["skills"])
+            "market_positioning": analyze_market_positioning(user_id, user_salaries, peer_data),
+            "differentiation_strategies": generate_differentiation_strategies(user_skills, peer_data),
+            "peer_group": {"cohort": peer_data["_id"], "size": peer_data["users"], "updated_at": peer_data["updated_at"]}
         }
         
         return {
@@ -88,54 +89,13 @@ async def get_performance_prediction(
         raise HTTPException(status_code=500, detail=f"Error generating performance predictions: {str(e)}")
 
 async def get_peer_benchmarks(user_id):
-    """Get anonymous peer benchmark data"""
-    try:
-        # Get users with similar profiles (same industry, experience level)
-        peer_users = await db_client[AUTH].find({
-            "_id": {"$ne": ObjectId(user_id)},
-            # Add criteria for similar profiles (industry, experience level, etc.)
-            # This is simplified - would use actual profile matching
-        }).limit(100).to_list(None)
-        
-        peer_data = {
-            "applications": [],
-            "interviews": [],
-            "salaries": [],
-            "skills": [],
-            "career_data": []
-        }
-        
-        for peer in peer_users:
-            peer_id = str(peer["_id"])
-            peer_applications = await db_client[JOBS].find({"uuid": peer_id}).to_list(None)
-            peer_interviews = await db_client[INFORMATIONAL_INTERVIEWS].find({"uuid": peer_id}).to_list(None)
-            peer_salaries = await db_client[SALARY].find({"uuid": peer_id}).to_list(None)
-            peer_skills = await db_client[SKILLS].find({"uuid": peer_id}).to_list(None)
-            
-            peer_data["applications"].extend(peer_applications)
-            peer_data["interviews"].extend(peer_interviews)
-            peer_data["salaries"].extend(peer_salaries)
-            peer_data["skills"].extend(peer_skills)
-            
-            # Career progression data
-            career_entry = {
-                "total_applications": len(peer_applications),
-                "total_interviews": len(peer_interviews),
-                "success_rate": len([app for app in peer_applications if app.get("status") == "Offer"]) / len(peer_applications) if peer_applications else 0,
-                "interview_rate": len(peer_interviews) / len(peer_applications) if peer_applications else 0
-            }
-            peer_data["career_data"].append(career_entry)
-        
-        return peer_data
-        
-    except Exception as e:
-        print(f"Error getting peer benchmarks: {e}")
-        return {"applications": [], "interviews": [], "salaries": [], "skills": [], "career_data": []}
+    """Get anonymous peer benchmark data (cohort row maintained by services/peer_benchmarks.py)"""
+    return await get_cohort_benchmarks(user_id)
 
-def analyze_job_search_performance(user_applications, peer_applications):
+def analyze_job_search_performance(user_applications, peer_data):
     """Compare job search performance against peers"""
     user_stats = calculate_application_stats(user_applications)
-    peer_stats = calculate_application_stats(peer_applications)
+    peer_stats = peer_data["applications"]
     
     return {
         "user_performance": user_stats,
@@ -143,8 +103,7 @@ def analyze_job_search_performance(user_applications, peer_applications):
             "average_applications_per_month": peer_stats["avg_applications_per_month"],
             "average_success_rate": peer_stats["success_rate"],
             "average_interview_rate": peer_stats["interview_rate"],
-            "percentile_ranking": calculate_percentile_ranking(user_stats["success_rate"], 
-                                                             [app["success_rate"] for app in peer_stats["individual_stats"]])
+            "percentile_ranking": percentile_of(user_stats["success_rate"], peer_data["career"]["success_rate_quantiles"])
         },
         "performance_vs_peers": {
             "applications_volume": "above_average" if user_stats["avg_applications_per_month"] > peer_stats["avg_applications_per_month"] else "below_average",
@@ -153,21 +112,19 @@ def analyze_job_search_performance(user_applications, peer_applications):
         }
     }
 
-async def analyze_competitive_positioning(user_id, user_skills, peer_skills):
+async def analyze_competitive_positioning(user_id, user_skills, peer_data):
     """Analyze competitive positioning based on skills and experience"""
     user_skill_count = len(user_skills) if user_skills else 0
-    peer_skill_counts = [len(skills) for skills in peer_skills] if peer_skills else [0]
     
     # Skill categories analysis
     user_categories = set(skill.get("category") for skill in user_skills) if user_skills else set()
-    peer_categories = [set(skill.get("category") for skill in skills) for skills in peer_skills] if peer_skills else [set()]
     
     return {
         "skills_competitiveness": {
             "total_skills": user_skill_count,
-            "peer_average": statistics.mean(peer_skill_counts) if peer_skill_counts else 0,
+            "peer_average": peer_data["skills"]["average_count"],
             "skill_diversity": len(user_categories),
-            "peer_average_diversity": statistics.mean([len(cats) for cats in peer_categories]) if peer_categories else 0
+            "peer_average_diversity": peer_data["skills"]["average_diversity"]
         },
         "experience_positioning": {
             "years_experience": await calculate_years_experience(user_id),
@@ -179,10 +136,11 @@ async def analyze_competitive_positioning(user_id, user_skills, peer_skills):
         }
     }
 
-def analyze_industry_standards(user_applications, peer_applications):
+def analyze_industry_standards(user_applications, peer_data):
     """Monitor industry standards for application volume and success rates"""
     user_industry_stats = {}
-    peer_industry_stats = {}
+    peer_industry_stats = {entry["name"]: entry for entry in peer_data["industries"]}
+    industry_average_volume = statistics.mean([entry["applications"] for entry in peer_data["industries"]]) if peer_data["industries"] else 0
     
     # Group by industry
     for app in user_applications:
@@ -191,27 +149,21 @@ def analyze_industry_standards(user_applications, peer_applications):
             user_industry_stats[industry] = []
         user_industry_stats[industry].append(app)
     
-    for app in peer_applications:
-        industry = app.get("company_industry") or "Unknown"
-        if industry not in peer_industry_stats:
-            peer_industry_stats[industry] = []
-        peer_industry_stats[industry].append(app)
-    
     industry_analysis = {}
     for industry in user_industry_stats:
         user_apps = user_industry_stats[industry]
-        peer_apps = peer_industry_stats.get(industry, [])
+        peer_industry = peer_industry_stats.get(industry)
         
         industry_analysis[industry] = {
             "user_success_rate": len([app for app in user_apps if app.get("status") == "Offer"]) / len(user_apps) if user_apps else 0,
-            "industry_success_rate": len([app for app in peer_apps if app.get("status") == "Offer"]) / len(peer_apps) if peer_apps else 0,
+            "industry_success_rate": peer_industry["offers"] / peer_industry["applications"] if peer_industry else 0,
             "user_application_volume": len(user_apps),
-            "industry_average_volume": statistics.mean([len(peer_industry_stats.get(ind, [])) for ind in peer_industry_stats]) if peer_industry_stats else 0
+            "industry_average_volume": industry_average_volume
         }
     
     return industry_analysis
 
-def analyze_career_progression(user_applications, user_interviews, peer_career_data):
+def analyze_career_progression(user_applications, user_interviews, peer_data):
     """Track performance against successful career progression patterns"""
     user_progression = {
         "total_applications": len(user_applications),
@@ -221,9 +173,9 @@ def analyze_career_progression(user_applications, user_interviews, peer_career_d
     }
     
     peer_success_patterns = {
-        "average_success_rate": statistics.mean([data["success_rate"] for data in peer_career_data]) if peer_career_data else 0,
-        "average_interview_rate": statistics.mean([data["interview_rate"] for data in peer_career_data]) if peer_career_data else 0,
-        "top_performers_success_rate": statistics.quantile([data["success_rate"] for data in peer_career_data], 0.9) if peer_career_data else 0
+        "average_success_rate": peer_data["career"]["average_success_rate"],
+        "average_interview_rate": peer_data["career"]["average_interview_rate"],
+        "top_performers_success_rate": peer_data["career"]["top_performers_success_rate"]
     }
     
     return {
@@ -233,25 +185,20 @@ def analyze_career_progression(user_applications, user_interviews, peer_career_d
         "time_to_success": calculate_time_to_success(user_applications)
     }
 
-def analyze_skill_gaps(user_skills, peer_skills):
+def analyze_skill_gaps(user_skills, peer_data):
     """Include skill gap analysis compared to top performers"""
     user_skill_names = set(skill.get("name", "").lower() for skill in user_skills) if user_skills else set()
     
-    # Find most common skills among peers
-    all_peer_skills = []
-    for skills in peer_skills:
-        all_peer_skills.extend([skill.get("name", "").lower() for skill in skills])
-    
-    skill_frequency = {}
-    for skill in all_peer_skills:
-        skill_frequency[skill] = skill_frequency.get(skill, 0) + 1
+    # Most common skills among peers, as the number of peers holding each
+    peers_with_skills = peer_data["skills"]["users"]
+    skill_frequency = {entry["name"]: entry["users"] for entry in peer_data["skills"]["frequencies"]}
     
     # Identify missing skills
-    common_peer_skills = set(skill for skill, freq in skill_frequency.items() if freq > len(peer_skills) * 0.3)  # Skills held by 30%+ of peers
+    common_peer_skills = set(skill for skill, freq in skill_frequency.items() if freq > peers_with_skills * 0.3)  # Skills held by 30%+ of peers
     missing_skills = common_peer_skills - user_skill_names
     
     # Identify in-demand skills
-    in_demand_skills = set(skill for skill, freq in skill_frequency.items() if freq > len(peer_skills) * 0.5)  # Skills held by 50%+ of peers
+    in_demand_skills = set(skill for skill, freq in skill_frequency.items() if freq > peers_with_skills * 0.5)  # Skills held by 50%+ of peers
     
     return {
         "current_skills": list(user_skill_names),
@@ -276,7 +223,7 @@ def generate_competitive_recommendations(user_id, user_applications, user_skills
         })
     
     # Skill development recommendations
-    skill_gaps = analyze_skill_gaps(user_skills, peer_data["skills"])
+    skill_gaps = analyze_skill_gaps(user_skills, peer_data)
     if len(skill_gaps["missing_common_skills"]) > 3:
         recommendations.append({
             "type": "skill_development",
@@ -296,24 +243,23 @@ def generate_competitive_recommendations(user_id, user_applications, user_skills
     
     return recommendations
 
-def analyze_market_positioning(user_id, user_salaries, peer_salaries):
+def analyze_market_positioning(user_id, user_salaries, peer_data):
     """Provide insights on market positioning optimization"""
     user_salary_data = analyze_salary_progression(user_salaries) if user_salaries else {}
-    peer_salary_data = analyze_salary_progression(peer_salaries) if peer_salaries else {}
+    peer_salary_data = {"average_salary": peer_data["salaries"]["average"]}
     
     return {
         "salary_positioning": {
             "current_salary_range": user_salary_data.get("current_salary", 0),
-            "peer_average": peer_salary_data.get("average_salary", 0),
-            "market_percentile": calculate_salary_percentile(user_salary_data.get("current_salary", 0), 
-                                                          [salary.get("current_salary", 0) for salary in peer_salary_data.get("individual_salaries", [])])
+            "peer_average": peer_salary_data["average_salary"],
+            "market_percentile": percentile_of(user_salary_data.get("current_salary", 0), peer_data["salaries"]["quantiles"])
         },
         "positioning_suggestions": generate_positioning_suggestions(user_id, user_salary_data, peer_salary_data)
     }
 
-def generate_differentiation_strategies(user_skills, peer_skills):
+def generate_differentiation_strategies(user_skills, peer_data):
     """Provide differentiation strategies and unique value propositions"""
-    user_unique_skills = find_unique_skills(user_skills, peer_skills)
+    user_unique_skills = find_unique_skills(user_skills, peer_data)
     
     strategies = []
     
@@ -596,14 +542,6 @@ def calculate_application_stats(applications):
         "individual_stats": []  # Would contain individual user stats for percentile calculation
     }
 
-def calculate_percentile_ranking(user_value, peer_values):
-    if not peer_values:
-        return 50  # Default to 50th percentile
-    
-    sorted_values = sorted(peer_values)
-    rank = sum(1 for val in sorted_values if val <= user_value)
-    return (rank / len(sorted_values)) * 100
-
 async def calculate_years_experience(user_id):
     try:
         # Calculate from employment history
@@ -651,12 +589,10 @@ def calculate_time_to_success(applications):
     time_to_success = [(datetime.utcnow() - parse_date_created(app)).days for app in successful_apps]
     return statistics.mean(time_to_success)
 
-def find_unique_skills(user_skills, peer_skills):
+def find_unique_skills(user_skills, peer_data):
     user_skill_names = set(skill.get("name", "").lower() for skill in user_skills) if user_skills else set()
     
-    all_peer_skills = set()
-    for skills in peer_skills:
-        all_peer_skills.update([skill.get("name", "").lower() for skill in skills])
+    all_peer_skills = set(entry["name"] for entry in peer_data["skills"]["frequencies"])
     
     return list(user_skill_names - all_peer_skills)
 
@@ -673,14 +609,6 @@ def analyze_salary_progression(salaries):
         "individual_salaries": [{"current_salary": salary.get("base_salary", 0)} for salary in salaries]
     }
 
-def calculate_salary_percentile(user_salary, peer_salaries):
-    if not peer_salaries:
-        return 50
-    
-    sorted_salaries = sorted(peer_salaries)
-    rank = sum(1 for salary in sorted_salaries if salary <= user_salary)
-    return (rank / len(sorted_salaries)) * 100
-
 def generate_positioning_suggestions(user_id, user_salary_data, peer_salary_data):
     suggestions = []
     
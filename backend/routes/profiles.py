@@ -125,7 +125,7 @@ async def delete_profile(passSchema: DeletePassword, uuid: str = Depends(authori
         for eng in engagements:
             await advisors_dao.delete_engagement(eng.get("_id"))
 
-        session_manager.kill_session(uuid)
+        await session_manager.kill_session(uuid)
 
         await auth_dao.delete_user(uuid)
     except Exception as e:
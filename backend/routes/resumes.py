@@ -3,8 +3,6 @@ from fastapi.responses import FileResponse
 from pymongo.errors import DuplicateKeyError
 import tempfile
 import requests
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from utils.sanitize import sanitize_dict
 
 from mongo.resumes_dao import resumes_dao
@@ -14,6 +12,7 @@ from schema.Resume import Resume, ResumeVersion, ResumeFeedback, ResumeShare,App
 from services.resume_validator import ResumeValidator
 from services.ai_generator import AIGenerator
 from services.html_pdf_generator import HTMLPDFGenerator
+from services.render_cache import render_cache, render_key, etag_for, not_modified
 
 resumes_router = APIRouter(prefix = "/resumes")
 
@@ -117,6 +116,7 @@ async def update_resume(resume_id: str, resume: Resume, uuid: str = Depends(auth
     if updated == 0:
         raise HTTPException(400, "Resume not found")
     else:
+        await render_cache.invalidate(resume_id)
         return {"detail": "Successfully updated resume"}
 
 @resumes_router.delete("", tags = ["resumes"])
@@ -239,7 +239,7 @@ async def generate_resume_content(resume_id: str, request: Request, uuid: str =
             raise HTTPException(400, f"Invalid request body: {str(e)}")
 
         # Generate content using AI
-        result = AIGenerator.generate_ai_content(resume, job_posting)
+        result = await AIGenerator.generate_ai_content(resume, job_posting)
 
         return result
 
@@ -299,7 +299,7 @@ async def optimize_resume_skills(resume_id: str, request: Request, uuid: str = D
             raise HTTPException(400, f"Invalid request body: {str(e)}")
 
         # Optimize skills using AI
-        result = AIGenerator.optimize_skills(resume, job_posting)
+        result = await AIGenerator.optimize_skills(resume, job_posting)
 
         return result
 
@@ -366,7 +366,7 @@ async def tailor_resume_experience(resume_id: str, request: Request, uuid: str =
             raise HTTPException(400, f"Invalid request body: {str(e)}")
 
         # Tailor experience using AI
-        result = AIGenerator.tailor_experience(resume, job_posting)
+        result = await AIGenerator.tailor_experience(resume, job_posting)
 
         return result
 
@@ -407,6 +407,7 @@ async def restore_resume_version(resume_id: str, version_id: str, uuid: str = De
     if updated == 0:
         raise HTTPException(400, "Version or resume not found")
     else:
+        await render_cache.invalidate(resume_id)
         return {"detail": "Successfully restored version"}
 
 @resumes_router.delete("/{resume_id}/versions/{version_id}", tags = ["resumes"])
@@ -520,44 +521,18 @@ async def revoke_share_link(resume_id: str, uuid: str = Depends(authorize)):
         return {"detail": "Share link revoked successfully"}
 
 # ============================================
-# EXPORT RESUME AS PDF (Windows-compatible)
+# EXPORT RESUME AS PDF
 # ============================================
 
-def _generate_pdf_sync(html_content: str) -> bytes:
-    """Synchronous wrapper for Playwright PDF generation (Windows-compatible)"""
-    import asyncio
-    from playwright.sync_api import sync_playwright
-    
-    try:
-        print(f"[PDF Sync] Starting synchronous PDF generation...")
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.set_content(html_content)
-            
-            # Generate PDF
-            pdf_bytes = page.pdf(
-                format='Letter',
-                margin={'top': '0.5in', 'right': '0.5in', 'bottom': '0.5in', 'left': '0.5in'},
-            )
-            
-            browser.close()
-            print(f"[PDF Sync] PDF generated successfully, size: {len(pdf_bytes)} bytes")
-            return pdf_bytes
-    except Exception as e:
-        print(f"[PDF Sync] ERROR: {type(e).__name__}: {str(e)}")
-        raise
-
-
 @resumes_router.post("/{resume_id}/export-pdf", tags=["resumes"])
-async def export_resume_pdf(resume_id: str, uuid: str = Depends(authorize)):
-    """Export resume as PDF using Playwright (Windows-compatible version)"""
+async def export_resume_pdf(resume_id: str, request: Request, uuid: str = Depends(authorize)):
+    """Export resume as PDF using the shared Playwright browser pool"""
     tmp_path = None
     try:
         print(f"[PDF Export] Starting export for resume_id: {resume_id}")
         
         # Get resume data
-        resume = await resumes_dao.get_resume(resume_id)
+        resume = await resumes_dao.get_resume(resume_id, uuid)
         if not resume:
             print(f"[PDF Export] Resume not found: {resume_id}")
             raise HTTPException(404, "Resume not found")
@@ -579,12 +554,17 @@ async def export_resume_pdf(resume_id: str, uuid: str = Depends(authorize)):
         )
         
         print(f"[PDF Export] HTML built, length: {len(full_html)} chars")
-        print(f"[PDF Export] Generating PDF with Playwright (sync mode)...")
+
+        key = render_key(resume_id, "pdf", full_html, resume.get("templateId") or resume.get("template"))
+        cached = not_modified(request, key)
+        if cached:
+            return cached
+
+        print(f"[PDF Export] Generating PDF with Playwright...")
         
-        # Run synchronous Playwright in a thread pool to avoid Windows asyncio issues
-        loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            pdf_bytes = await loop.run_in_executor(executor, _generate_pdf_sync, full_html)
+        pdf_bytes = await render_cache.get_or_render(
+            resume_id, key, "pdf", lambda: HTMLPDFGenerator.generate_pdf_from_html(full_html)
+        )
         
         print(f"[PDF Export] PDF generated successfully, size: {len(pdf_bytes)} bytes")
         
@@ -602,7 +582,7 @@ async def export_resume_pdf(resume_id: str, uuid: str = Depends(authorize)):
             tmp_path,
             media_type='application/pdf',
             filename=filename,
-            headers={"Content-Disposition": f"attachment; filename=\"{filename}\""}
+            headers={"Content-Disposition": f"attachment; filename=\"{filename}\"", "ETag": etag_for(key)}
         )
         
     except HTTPException:
@@ -6,17 +6,23 @@ Related to UC-053: Export Resume
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import StreamingResponse, FileResponse, JSONResponse
+import asyncio
 import io
 
 from mongo.resumes_dao import resumes_dao
 from sessions.session_authorizer import authorize
 from services.html_pdf_generator import HTMLPDFGenerator
 from services.docx_generator import DOCXGenerator
+from services.render_cache import render_cache, render_key, resume_content, etag_for, not_modified
 
 pdf_router = APIRouter(prefix="/resumes")
 
 
+def _template_id(resume: dict):
+    return resume.get("templateId") or resume.get("template")
+
+
 @pdf_router.post("/{resume_id}/generate-pdf", tags=["resumes"])
 async def generate_resume_pdf(resume_id: str, request: Request, uuid: str = Depends(authorize)):
     """
@@ -26,7 +32,7 @@ async def generate_resume_pdf(resume_id: str, request: Request, uuid: str = Depe
     """
     try:
         # Fetch resume to verify ownership
-        resume = await resumes_dao.get_resume(resume_id)
+        resume = await resumes_dao.get_resume(resume_id, uuid)
 
         if not resume:
             raise HTTPException(404, "Resume not found")
@@ -56,15 +62,22 @@ async def generate_resume_pdf(resume_id: str, request: Request, uuid: str = Depe
             raise HTTPException(400, f"Error parsing request body: {parse_err}")
 
         # Generate PDF from HTML
+        key = render_key(resume_id, "pdf", html, _template_id(resume))
+        cached = not_modified(request, key)
+        if cached:
+            return cached
+
         print(f"[PDF Generate] Generating PDF from HTML ({len(html)} chars)")
-        print(f"[PDF Generate] HTML type: {type(html)}, first 100 chars: {html[:100]}")
-        pdf_bytes = await HTMLPDFGenerator.generate_pdf_from_html(html)
+        pdf_bytes = await render_cache.get_or_render(
+            resume_id, key, "pdf", lambda: HTMLPDFGenerator.generate_pdf_from_html(html)
+        )
 
         return StreamingResponse(
             io.BytesIO(pdf_bytes),
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename={resume.get('name', 'resume')}.pdf"
+                "Content-Disposition": f"attachment; filename={resume.get('name', 'resume')}.pdf",
+                "ETag": etag_for(key),
             }
         )
 
@@ -87,7 +100,7 @@ async def preview_resume_pdf(resume_id: str, request: Request, uuid: str = Depen
         print(f"[Preview PDF] Starting preview for resume_id={resume_id}, uuid={uuid}")
 
         # Fetch original resume to verify ownership
-        resume = await resumes_dao.get_resume(resume_id)
+        resume = await resumes_dao.get_resume(resume_id, uuid)
 
         if not resume:
             raise HTTPException(404, "Resume not found")
@@ -116,15 +129,24 @@ async def preview_resume_pdf(resume_id: str, request: Request, uuid: str = Depen
             raise HTTPException(400, f"Error parsing request body: {parse_err}")
 
         # Generate PDF from HTML
+        key = render_key(resume_id, "pdf", html, _template_id(resume))
+        cached = not_modified(request, key)
+        if cached:
+            return cached
+
         print(f"[Preview PDF] Generating PDF from HTML ({len(html)} chars)")
-        print(f"[Preview PDF] HTML type: {type(html)}, first 100 chars: {html[:100]}")
-        pdf_bytes = await HTMLPDFGenerator.generate_pdf_from_html(html)
+        pdf_bytes = await render_cache.get_or_render(
+            resume_id, key, "pdf", lambda: HTMLPDFGenerator.generate_pdf_from_html(html)
+        )
 
-        return {
-            "success": True,
-            "message": "PDF preview generated successfully",
-            "pdf": pdf_bytes.hex(),  # Return as hex string for JSON
-        }
+        return JSONResponse(
+            {
+                "success": True,
+                "message": "PDF preview generated successfully",
+                "pdf": pdf_bytes.hex(),  # Return as hex string for JSON
+            },
+            headers={"ETag": etag_for(key)}
+        )
 
     except HTTPException as http:
         print(f"[Preview PDF] HTTP Exception: {http.status_code} - {http.detail}")
@@ -136,7 +158,7 @@ async def preview_resume_pdf(resume_id: str, request: Request, uuid: str = Depen
 
 
 @pdf_router.post("/{resume_id}/export-pdf", tags=["resumes"])
-async def export_resume_pdf(resume_id: str, uuid: str = Depends(authorize)):
+async def export_resume_pdf(resume_id: str, request: Request, uuid: str = Depends(authorize)):
     """
     Export resume as PDF from stored resume data
     Used by ExportResumePage - doesn't require HTML from frontend
@@ -144,7 +166,7 @@ async def export_resume_pdf(resume_id: str, uuid: str = Depends(authorize)):
     """
     try:
         # Fetch resume to verify ownership
-        resume = await resumes_dao.get_resume(resume_id)
+        resume = await resumes_dao.get_resume(resume_id, uuid)
 
         if not resume:
             raise HTTPException(404, "Resume not found")
@@ -160,15 +182,23 @@ async def export_resume_pdf(resume_id: str, uuid: str = Depends(authorize)):
         # Wrap with full HTML document and styles (include colors and fonts)
         full_html = HTMLPDFGenerator.wrap_resume_html(resume_html, resume.get('colors'), resume.get('fonts'))
 
+        key = render_key(resume_id, "pdf", full_html, _template_id(resume))
+        cached = not_modified(request, key)
+        if cached:
+            return cached
+
         # Generate PDF from HTML
         print(f"[Export PDF] Generating PDF from resume data")
-        pdf_bytes = await HTMLPDFGenerator.generate_pdf_from_html(full_html)
+        pdf_bytes = await render_cache.get_or_render(
+            resume_id, key, "pdf", lambda: HTMLPDFGenerator.generate_pdf_from_html(full_html)
+        )
 
         return StreamingResponse(
             io.BytesIO(pdf_bytes),
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename={resume.get('name', 'resume')}.pdf"
+                "Content-Disposition": f"attachment; filename={resume.get('name', 'resume')}.pdf",
+                "ETag": etag_for(key),
             }
         )
 
@@ -189,7 +219,7 @@ async def export_resume_html(resume_id: str, uuid: str = Depends(authorize)):
     """
     try:
         # Fetch resume to verify ownership
-        resume = await resumes_dao.get_resume(resume_id)
+        resume = await resumes_dao.get_resume(resume_id, uuid)
 
         if not resume:
             raise HTTPException(404, "Resume not found")
@@ -233,7 +263,7 @@ async def generate_resume_docx(resume_id: str, request: Request, uuid: str = Dep
     """
     try:
         # Fetch resume to verify ownership
-        resume = await resumes_dao.get_resume(resume_id)
+        resume = await resumes_dao.get_resume(resume_id, uuid)
 
         if not resume:
             raise HTTPException(404, "Resume not found")
@@ -242,15 +272,25 @@ async def generate_resume_docx(resume_id: str, request: Request, uuid: str = Dep
         if resume.get("uuid") != uuid:
             raise HTTPException(403, "Not authorized to access this resume")
 
+        key = render_key(resume_id, "docx", resume_content(resume), _template_id(resume))
+        cached = not_modified(request, key)
+        if cached:
+            return cached
+
         # Generate DOCX from resume data
         print(f"[DOCX Generate] Generating DOCX for resume_id={resume_id}")
-        docx_bytes = DOCXGenerator.generate_docx_from_resume(resume)
+
+        async def render_docx():
+            return await asyncio.to_thread(DOCXGenerator.generate_docx_from_resume, resume)
+
+        docx_bytes = await render_cache.get_or_render(resume_id, key, "docx", render_docx)
 
         return StreamingResponse(
             io.BytesIO(docx_bytes),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             headers={
-                "Content-Disposition": f"attachment; filename={resume.get('name', 'resume')}.docx"
+                "Content-Disposition": f"attachment; filename={resume.get('name', 'resume')}.docx",
+                "ETag": etag_for(key),
             }
         )
 
@@ -18,7 +18,7 @@ async def authorize_optional(uuid: str = Header(None), authorization: str = Head
     if not uuid or not authorization:
         return None
     try:
-        if authorization.startswith("Bearer ") and session_manager.authenticate_session(uuid, authorization.removeprefix("Bearer ").strip()):
+        if authorization.startswith("Bearer ") and await session_manager.authenticate_session(uuid, authorization.removeprefix("Bearer ").strip()):
             return uuid
     except:
         pass
@@ -0,0 +1,183 @@
+"""
+Audit: explain() the hottest production queries against a live database
+
+For each query shape below, a real value for every filter field is sampled
+from the collection, the query is run through explain("executionStats"),
+and the winning plan is summarized: which index was used (or COLLSCAN),
+keys/documents examined versus documents returned, and server time.
+Timestamp fields are queried as a "since" range, the way the dashboards
+read them.
+
+--all additionally explains every query path the DAO scanner finds
+(mongo/query_paths.py), which is slow on a big database but catches plans
+that the registry test cannot (e.g. an index that exists but is not picked).
+
+Usage:
+    python scripts/audit_indexes.py
+    python scripts/audit_indexes.py --all --fail-on-collscan
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mongo.dao_setup import (
+    db_client, JOBS, RESUMES, TEAMS, NETWORKS, API_CALL_LOGS, COVER_LETTERS, SKILLS,
+    PROFILES, BACKGROUND_TASKS, SESSIONS,
+)
+
+# (label, collection, filter fields, sort)
+HOT_QUERIES: List[Tuple[str, str, Sequence[str], Sequence[Tuple[str, int]]]] = [
+    ("jobs list", JOBS, ["uuid"], [("date_created", -1)]),
+    ("resumes list", RESUMES, ["uuid"], []),
+    ("resume versions", "resume_versions", ["resume_id"], [("date_created", -1)]),
+    ("cover letters list", COVER_LETTERS, ["uuid"], [("created_at", -1)]),
+    ("skills", SKILLS, ["uuid"], []),
+    ("team membership", TEAMS, ["members.uuid"], []),
+    ("contact by email", NETWORKS, ["email"], []),
+    ("user contacts", NETWORKS, ["associated_users.uuid"], []),
+    ("api usage window", API_CALL_LOGS, ["timestamp"], []),
+    ("recent api errors", API_CALL_LOGS, ["success"], [("timestamp", -1)]),
+    ("practiced questions", "user_practiced_questions", ["user_uuid"], []),
+    ("mock interviews", "mock_interview_sessions", ["user_uuid"], [("date_created", -1)]),
+    ("profile by email", PROFILES, ["email"], []),
+    ("user sessions", SESSIONS, ["uuid"], []),
+    ("queue claim", BACKGROUND_TASKS, ["kind", "status"], [("run_at", 1)]),
+]
+
+
+def _value_at(doc: Any, path: str) -> Any:
+    for part in path.split("."):
+        if isinstance(doc, list):
+            doc = doc[0] if doc else None
+        if not isinstance(doc, dict):
+            return None
+        doc = doc.get(part)
+    if isinstance(doc, list):
+        return doc[0] if doc else None
+    return doc
+
+
+async def sample_filter(collection: str, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """Equality filter built from a real document (ranges for timestamps)"""
+    doc = await db_client[collection].find_one({field: {"$exists": True} for field in fields})
+    if doc is None:
+        return None
+    query: Dict[str, Any] = {}
+    for field in fields:
+        value = _value_at(doc, field)
+        query[field] = {"$gte": value} if isinstance(value, datetime) else value
+    return query
+
+
+def _stages(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    stages = [plan]
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages.extend(_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_stages(child))
+    return stages
+
+
+async def explain(collection: str, query: Dict[str, Any], sort: Sequence[Tuple[str, int]],
+                  limit: int) -> Dict[str, Any]:
+    command: Dict[str, Any] = {"find": collection, "filter": query, "limit": limit}
+    if sort:
+        command["sort"] = dict(sort)
+    result = await db_client.command({"explain": command, "verbosity": "executionStats"})
+
+    stages = _stages(result["queryPlanner"]["winningPlan"])
+    stats = result.get("executionStats", {})
+    indexes = [s["indexName"] for s in stages if s.get("indexName")]
+    returned = stats.get("nReturned", 0)
+    docs_examined = stats.get("totalDocsExamined", 0)
+    return {
+        "plan": "COLLSCAN" if any(s.get("stage") == "COLLSCAN" for s in stages) else ",".join(indexes) or "?",
+        "in_memory_sort": any(s.get("stage") == "SORT" for s in stages),
+        "returned": returned,
+        "keys_examined": stats.get("totalKeysExamined", 0),
+        "docs_examined": docs_examined,
+        "ms": stats.get("executionTimeMillis", 0),
+        # More than 10 documents read per document returned
+        "inefficient": docs_examined > 10 * max(returned, 1),
+    }
+
+
+async def audit(queries, limit: int) -> List[Dict[str, Any]]:
+    rows = []
+    for label, collection, fields, sort in queries:
+        query = await sample_filter(collection, fields)
+        if query is None:
+            rows.append({"label": label, "collection": collection, "plan": "(no data)"})
+            continue
+        try:
+            row = await explain(collection, query, sort, limit)
+        except Exception as e:
+            row = {"plan": f"(error: {e})"}
+        rows.append({"label": label, "collection": collection, **row})
+    return rows
+
+
+def _scanned_queries():
+    from mongo.index_registry import import_dao_modules
+    from mongo.query_paths import scan_query_paths
+
+    import_dao_modules()
+    seen = set()
+    for path in scan_query_paths():
+        if not path.fields or "_id" in path.fields:
+            continue
+        key = (path.collection, path.fields, path.sort)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield path.location, path.collection, list(path.fields), [(field, 1) for field in path.sort]
+
+
+def print_rows(rows: List[Dict[str, Any]]) -> None:
+    header = f"{'query':<42} {'collection':<26} {'plan':<36} {'ret':>6} {'keys':>8} {'docs':>8} {'ms':>6}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        flags = []
+        if row.get("in_memory_sort"):
+            flags.append("in-memory sort")
+        if row.get("inefficient"):
+            flags.append("docs >> returned")
+        print(
+            f"{row['label'][:42]:<42} {row['collection'][:26]:<26} {row['plan'][:36]:<36} "
+            f"{row.get('returned', ''):>6} {row.get('keys_examined', ''):>8} "
+            f"{row.get('docs_examined', ''):>8} {row.get('ms', ''):>6}"
+            + (f"  <- {', '.join(flags)}" if flags else "")
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--all", action="store_true", help="Also explain every scanned DAO query path")
+    parser.add_argument("--limit", type=int, default=50, help="Limit applied to each explained query")
+    parser.add_argument("--fail-on-collscan", action="store_true", help="Exit 1 if any query scans")
+    args = parser.parse_args()
+
+    queries = list(HOT_QUERIES)
+    if args.all:
+        queries.extend(_scanned_queries())
+
+    rows = await audit(queries, args.limit)
+    print_rows(rows)
+
+    scans = [row for row in rows if row["plan"] == "COLLSCAN"]
+    print(f"\n{len(rows)} queries explained, {len(scans)} collection scans")
+    if scans and args.fail_on_collscan:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
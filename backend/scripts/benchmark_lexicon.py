@@ -0,0 +1,203 @@
+"""
+Benchmark: text analyzers on the shared lexicon engine vs per-phrase substring scans
+
+Builds a synthetic corpus of job descriptions and resumes / written answers
+(10,000 documents by default) from the analyzers' own vocabularies mixed
+with look-alike words ("javascript", "html", "also", "sandwich") that the
+old substring scans miscounted. Each analyzer is timed twice over the same
+corpus:
+
+  substring  one `phrase in text` / `text.count(phrase)` per dictionary entry,
+             the way the analyzers used to scan
+  lexicon    the current implementation (one compiled pass per dictionary)
+
+and the number of documents where the two disagree is reported, which is
+the substring scans' false positives. A last table scans the corpus with
+synthetic dictionaries of growing size: a substring scan costs one pass
+per term, the lexicon one pass per text.
+
+No database or network is touched.
+
+Usage:
+    python scripts/benchmark_lexicon.py --documents 10000 --seed 7
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from services.interview_coaching_service import WeakLanguageDetector
+from services.job_requirements_extractor import EDUCATION_KEYWORDS, extract_skills, extract_education_level
+from services.resume_validator import ResumeValidator
+from services.skill_taxonomy import DEFAULT_TAXONOMY
+from services.writing_practice_service import FILLER_WORDS, FIRST_PERSON, WritingPracticeService
+from utils.lexicon import Lexicon
+
+SKILL_KEYWORDS = {entry["name"]: [entry["name"], *entry["aliases"]] for entry in DEFAULT_TAXONOMY}
+
+LOOKALIKES = [
+    "javascript", "html", "xml", "github", "reactive", "nodes", "also", "adjust", "goodwill",
+    "sandwich", "bijust", "thingsboard", "ownership", "didactic", "kindof", "mlops", "gotham",
+]
+COMMON = (
+    "the team we our and to of for with in on a is will be you work build develop customers product "
+    "platform data services features quality years experience degree role responsibilities"
+).split()
+
+
+def _vocabulary():
+    words = [kw for kws in SKILL_KEYWORDS.values() for kw in kws]
+    words += [kw for kws in EDUCATION_KEYWORDS.values() for kw in kws]
+    words += list(WeakLanguageDetector.WEAK_LANGUAGE_REPLACEMENTS) + WeakLanguageDetector.FILLER_WORDS
+    words += list(ResumeValidator.COMMON_MISSPELLINGS) + sorted(ResumeValidator.ACTION_VERBS)
+    return words
+
+
+def build_corpus(documents: int, seed: int, words_per_document: int = 250):
+    rng = random.Random(seed)
+    vocabulary = _vocabulary()
+    corpus = []
+    for _ in range(documents):
+        words = [
+            rng.choice(vocabulary) if roll < 0.15 else rng.choice(LOOKALIKES) if roll < 0.25 else rng.choice(COMMON)
+            for roll in (rng.random() for _ in range(words_per_document))
+        ]
+        sentences = [" ".join(words[i:i + 15]).capitalize() + "." for i in range(0, len(words), 15)]
+        corpus.append(" ".join(sentences))
+    return corpus
+
+
+# ----------------------------------------------------------------------------
+# The scans the analyzers used to run
+# ----------------------------------------------------------------------------
+
+def substring_skills(text):
+    text_lower = text.lower()
+    return [canonical for canonical, kws in SKILL_KEYWORDS.items() if any(kw in text_lower for kw in kws)]
+
+
+def substring_education(text):
+    text_lower = text.lower()
+    for level, kws in EDUCATION_KEYWORDS.items():
+        if any(kw in text_lower for kw in kws):
+            return level
+    return None
+
+
+def substring_weak_language(text):
+    text_lower = text.lower()
+    weak = {p: text_lower.count(p) for p in WeakLanguageDetector.WEAK_LANGUAGE_REPLACEMENTS if p in text_lower}
+    fillers = {f: text_lower.count(f) for f in WeakLanguageDetector.FILLER_WORDS if f in text_lower}
+    return weak, fillers
+
+
+def substring_resume(text):
+    text_lower = text.lower()
+    misspellings = [m for m in ResumeValidator.COMMON_MISSPELLINGS if m in text_lower]
+    keywords = sum(1 for kw in ResumeValidator.ATS_KEYWORDS if kw in text_lower)
+    return misspellings, keywords
+
+
+def substring_writing(text):
+    text_lower = text.lower()
+    fillers = sum(text_lower.count(w) for w in ['very', 'really', 'just', 'actually', 'basically', 'literally'])
+    first_person = sum(text_lower.count(w) for w in ['i ', ' i ', 'my ', 'me '])
+    return fillers, first_person
+
+
+# ----------------------------------------------------------------------------
+# The same questions through the current analyzers
+# ----------------------------------------------------------------------------
+
+def lexicon_skills(text):
+    return [s["name"] for s in extract_skills(text)]
+
+
+def lexicon_weak_language(text):
+    result = WeakLanguageDetector.detect_weak_language(text)
+    return (
+        {w["weak_phrase"]: w["count"] for w in result["weak_phrases"]},
+        {f["filler"]: f["count"] for f in result["filler_words"]},
+    )
+
+
+def lexicon_resume(text):
+    found = {hit.term for hit in ResumeValidator.MISSPELLING_LEXICON.finditer(text)}
+    misspellings = [m for m in ResumeValidator.COMMON_MISSPELLINGS if m in found]
+    return misspellings, len(ResumeValidator.ATS_KEYWORD_LEXICON.labels(text))
+
+
+def lexicon_writing(text):
+    return FILLER_WORDS.count(text), FIRST_PERSON.count(text)
+
+
+ANALYZERS = [
+    ("skills", substring_skills, lexicon_skills),
+    ("education", substring_education, extract_education_level),
+    ("weak language", substring_weak_language, lexicon_weak_language),
+    ("resume checks", substring_resume, lexicon_resume),
+    ("writing scores", substring_writing, lexicon_writing),
+]
+
+
+def _synthetic_terms(count: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        " ".join("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.choice((1, 1, 2))))
+        for _ in range(count)
+    ]
+
+
+def _time(fn, corpus):
+    start = time.perf_counter()
+    results = [fn(text) for text in corpus]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.documents, args.seed)
+    print(f"Corpus: {len(corpus)} documents, {sum(len(t) for t in corpus) / 1e6:.1f} MB\n")
+    print(f"{'analyzer':<16}{'substring s':>13}{'lexicon s':>12}{'speedup':>10}{'docs differing':>17}")
+
+    total_substring = total_lexicon = 0.0
+    for name, substring, lexicon in ANALYZERS:
+        substring_time, expected = _time(substring, corpus)
+        lexicon_time, actual = _time(lexicon, corpus)
+        differing = sum(1 for a, b in zip(expected, actual) if a != b)
+        total_substring += substring_time
+        total_lexicon += lexicon_time
+        print(f"{name:<16}{substring_time:>13.3f}{lexicon_time:>12.3f}"
+              f"{substring_time / lexicon_time:>9.1f}x{differing:>17}")
+
+    print(f"{'total':<16}{total_substring:>13.3f}{total_lexicon:>12.3f}{total_substring / total_lexicon:>9.1f}x")
+
+    # Full analyzers end to end, as the routes call them
+    start = time.perf_counter()
+    for text in corpus:
+        WritingPracticeService.analyze_response_quality(text, "behavioral")
+        ResumeValidator.validate_resume({"summary": text, "experience": [{"description": text}]})
+    print(f"\nanalyze_response_quality + validate_resume: {time.perf_counter() - start:.2f}s for {len(corpus)} documents")
+
+    print(f"\n{'terms':<16}{'substring s':>13}{'lexicon s':>12}{'speedup':>10}")
+    for size in (25, 250, 2500):
+        terms = _synthetic_terms(size, args.seed)
+        lexicon = Lexicon(terms)
+        substring_time, _ = _time(lambda text: [t for t in terms if t in text.lower()], corpus)
+        lexicon_time, _ = _time(lexicon.labels, corpus)
+        print(f"{size:<16}{substring_time:>13.3f}{lexicon_time:>12.3f}{substring_time / lexicon_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
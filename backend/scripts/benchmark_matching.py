@@ -0,0 +1,114 @@
+"""
+Benchmark: batch job matching vs scoring one job at a time
+
+Builds a synthetic profile and N jobs (1,000 by default) from the skill
+taxonomy and times two ways of scoring them:
+
+  per job  compute_match_for_job in a loop, re-encoding the profile for
+           every job, with one match-history insert per job
+  batch    score_jobs, which encodes the profile once, with one
+           insert_many for the batch
+
+History writes go to an in-memory recorder that sleeps --write-ms per
+round trip (default 1ms, a same-region Mongo insert), so the numbers show
+where the time goes without touching a database.
+
+Usage:
+    python scripts/benchmark_matching.py --jobs 1000 --seed 7
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mongo.matching_service import compute_match_for_job, score_jobs
+from services.skill_taxonomy import skill_taxonomy
+
+
+class EngineRun:
+    """Scoring time and simulated history round trips of one engine"""
+
+    def __init__(self, write_seconds: float):
+        self.write_seconds = write_seconds
+        self.round_trips = 0
+        self.documents = 0
+        self.scoring_seconds = 0.0
+
+    async def insert(self, count: int) -> None:
+        self.round_trips += 1
+        self.documents += count
+        await asyncio.sleep(self.write_seconds)
+
+
+def build(jobs: int, seed: int):
+    rng = random.Random(seed)
+    names = list(skill_taxonomy.index.ids_by_alias)
+    profile = {
+        "skills": [{"name": name, "level": rng.randint(1, 4)} for name in rng.sample(names, 20)],
+        "educationLevel": "bachelor",
+        "totalYearsExperience": 4.5,
+        "matchingPreferences": {},
+    }
+    batch = [
+        {
+            "_id": f"job{i}",
+            "title": rng.choice(["Software Engineer", "Data Analyst", "Senior Developer", "Intern"]),
+            "requiredSkills": [{"name": name, "level": rng.randint(1, 4)} for name in rng.sample(names, 8)],
+            "minYearsExperience": rng.choice([None, 1, 3, 5, 8]),
+            "educationLevel": rng.choice([None, "bachelor", "masters"]),
+        }
+        for i in range(jobs)
+    ]
+    return profile, batch
+
+
+async def per_job(profile, jobs, run: EngineRun):
+    results = []
+    for job in jobs:
+        start = time.perf_counter()
+        match = await compute_match_for_job("bench", job, profile)
+        run.scoring_seconds += time.perf_counter() - start
+        results.append(match)
+        await run.insert(1)
+    return results
+
+
+async def batch(profile, jobs, run: EngineRun):
+    start = time.perf_counter()
+    results = score_jobs(profile, jobs)
+    run.scoring_seconds += time.perf_counter() - start
+    await run.insert(len(results))
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--write-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    profile, jobs = build(args.jobs, args.seed)
+    print(f"{args.jobs} jobs x 8 required skills, profile with 20 skills\n")
+    print(f"{'engine':<10}{'scoring ms':>12}{'total ms':>12}{'writes':>9}")
+
+    scores = {}
+    for name, engine in (("per job", per_job), ("batch", batch)):
+        run = EngineRun(args.write_ms / 1000)
+        start = time.perf_counter()
+        results = await engine(profile, jobs, run)
+        total = time.perf_counter() - start
+        scores[name] = [m["overallScore"] for m in results]
+        print(f"{name:<10}{run.scoring_seconds * 1000:>12.1f}{total * 1000:>12.1f}{run.round_trips:>9}")
+
+    print(f"\nidentical scores: {scores['per job'] == scores['batch']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
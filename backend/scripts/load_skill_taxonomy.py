@@ -0,0 +1,70 @@
+"""
+Load the skill taxonomy into Mongo
+
+Replaces the stored taxonomy with the entries of a JSON file and bumps its
+version; running API processes pick it up within
+SKILL_TAXONOMY_REFRESH_SECONDS. The file is a list of
+{"id": int, "name": str, "aliases": [str], "parent": id or name or null}.
+Keep ids stable across loads: skills and jobs store the id they resolved
+to (entries whose id disappears fall back to matching by name).
+
+Usage:
+    python scripts/load_skill_taxonomy.py taxonomy.json
+    python scripts/load_skill_taxonomy.py taxonomy.json --check   # validate only
+    python scripts/load_skill_taxonomy.py --defaults              # built-in taxonomy
+    python scripts/load_skill_taxonomy.py --export taxonomy.json  # dump the stored one
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mongo.skill_taxonomy_dao import skill_taxonomy_dao
+from services.skill_taxonomy import DEFAULT_TAXONOMY, parse_entries
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("path", nargs="?", help="JSON file to load")
+    parser.add_argument("--defaults", action="store_true", help="load the built-in taxonomy")
+    parser.add_argument("--check", action="store_true", help="validate the file without writing")
+    parser.add_argument("--export", metavar="PATH", help="write the stored taxonomy to PATH")
+    args = parser.parse_args()
+
+    if args.export:
+        entries = await skill_taxonomy_dao.get_all()
+        with open(args.export, "w") as f:
+            json.dump(entries, f, indent=2)
+        print(f"Exported {len(entries)} entries (version {await skill_taxonomy_dao.get_version()})")
+        return 0
+
+    if args.defaults:
+        raw = DEFAULT_TAXONOMY
+    elif args.path:
+        with open(args.path) as f:
+            raw = json.load(f)
+    else:
+        parser.error("give a JSON file, --defaults or --export")
+
+    try:
+        entries = parse_entries(raw)
+    except ValueError as e:
+        print(f"Invalid taxonomy: {e}")
+        return 1
+    aliases = sum(len(e["aliases"]) for e in entries)
+    print(f"{len(entries)} entries, {aliases} aliases")
+    if args.check:
+        return 0
+
+    version = await skill_taxonomy_dao.replace_all(entries)
+    print(f"Stored as version {version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
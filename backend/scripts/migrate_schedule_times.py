@@ -0,0 +1,46 @@
+"""
+Convert application_schedules.scheduled_time from ISO strings to datetimes
+
+Schedules created through the API used to store scheduled_time as the ISO
+string the client sent. The DAO now stores and queries real datetimes, so
+string rows are invisible to the due-schedule job and the upcoming /
+calendar endpoints until converted. Run once after deploying; safe to
+re-run (only string values are touched). Unparseable values are reported
+and left as they are.
+
+Usage:
+    python scripts/migrate_schedule_times.py
+"""
+
+import asyncio
+import os
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pymongo import UpdateOne
+
+from mongo.application_workflow_dao import application_workflow_dao, parse_schedule_time
+
+
+async def main() -> None:
+    schedules = application_workflow_dao.schedules_collection
+    updates = []
+    unparseable = []
+    async for doc in schedules.find({"scheduled_time": {"$type": "string"}}, {"scheduled_time": 1}):
+        scheduled = parse_schedule_time(doc["scheduled_time"])
+        if scheduled is None:
+            unparseable.append(doc["_id"])
+            continue
+        updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"scheduled_time": scheduled}}))
+
+    if updates:
+        await schedules.bulk_write(updates, ordered=False)
+    print(f"Converted {len(updates)} schedules")
+    if unparseable:
+        print(f"Left {len(unparseable)} with unparseable times: {', '.join(map(str, unparseable))}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
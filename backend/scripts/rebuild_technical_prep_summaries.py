@@ -0,0 +1,34 @@
+"""
+Rebuild technical prep leaderboards and per-user progress counters
+
+Recomputes challenge_leaderboards and technical_prep_user_stats from the full
+challenge_attempts history. Run once after deploying the summaries, and
+whenever attempts were changed outside the DAO (imports, manual fixes).
+Safe to re-run; rows are overwritten, not incremented.
+
+Usage:
+    python scripts/rebuild_technical_prep_summaries.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mongo.technical_prep_dao import technical_prep_dao
+
+
+async def main() -> None:
+    started = time.perf_counter()
+    print("Rebuilding technical prep summaries from challenge_attempts...")
+    counts = await technical_prep_dao.rebuild_summaries()
+    print(f"Leaderboard rows: {counts['leaderboard_rows']}")
+    print(f"User stats rows:  {counts['user_stats_rows']}")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
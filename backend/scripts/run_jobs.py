@@ -0,0 +1,99 @@
+"""
+Run the periodic background jobs in their own process
+
+Use with JOB_RUNNER=off on the API so web workers only serve requests. Any
+number of these processes (and embedded runners) can run side by side; the
+Mongo lease in scheduled_jobs makes each job run once per cluster.
+
+Usage:
+    python scripts/run_jobs.py                       # run every job until interrupted
+    python scripts/run_jobs.py --only event_reminders,referral_reminders
+    python scripts/run_jobs.py --status              # last run, lag and failures per job
+    python scripts/run_jobs.py --run-now peer_benchmark_rollup
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+# Add backend to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.job_runner import JobRunner, job_runner
+from services.scheduled_jobs import register_jobs
+
+
+def _fmt(value) -> str:
+    if value is None:
+        return "-"
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value)
+
+
+async def print_status(runner: JobRunner) -> None:
+    header = f"{'job':<28} {'next run (UTC)':<20} {'owner':<24} {'runs':>6} {'fails':>5} {'ms':>9} {'lag ms':>9} {'items':>6}"
+    print(header)
+    print("-" * len(header))
+    for row in await runner.status():
+        last = row["last_run"] or {}
+        print(
+            f"{row['name'][:28]:<28} {_fmt(row['next_run_at']):<20} {_fmt(row['owner'])[:24]:<24} "
+            f"{row['runs']:>6} {row['consecutive_failures']:>5} {_fmt(last.get('duration_ms')):>9} "
+            f"{_fmt(last.get('lag_ms')):>9} {_fmt(last.get('items')):>6}"
+            + (f"  <- {last['error']}" if last.get("error") else "")
+        )
+
+
+async def run_forever(runner: JobRunner) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C raises KeyboardInterrupt instead
+
+    from services.notification_dispatcher import notification_dispatcher
+
+    notification_dispatcher.start()
+    await runner.start()
+    try:
+        await stop.wait()
+    finally:
+        print("[JobRunner] Stopping...")
+        await runner.stop()
+        await notification_dispatcher.stop()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--only", help="Comma-separated job names to run (default: all)")
+    parser.add_argument("--status", action="store_true", help="Print job status and exit")
+    parser.add_argument("--run-now", metavar="JOB", help="Make JOB due immediately and exit")
+    args = parser.parse_args()
+
+    runner = register_jobs(JobRunner() if args.only else job_runner)
+    if args.only:
+        wanted = {name.strip() for name in args.only.split(",")}
+        unknown = wanted - set(runner.jobs)
+        if unknown:
+            parser.error(f"Unknown job(s): {', '.join(sorted(unknown))}. Known: {', '.join(runner.jobs)}")
+        for name in set(runner.jobs) - wanted:
+            runner.unregister(name)
+
+    if args.status:
+        await print_status(runner)
+    elif args.run_now:
+        if args.run_now not in runner.jobs:
+            parser.error(f"Unknown job: {args.run_now}. Known: {', '.join(runner.jobs)}")
+        await runner.run_now(args.run_now)
+        print(f"{args.run_now} is due; a running job runner will pick it up within a tick")
+    else:
+        await run_forever(runner)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
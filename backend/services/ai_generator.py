@@ -12,7 +12,7 @@ import re
 from typing import Dict, List, Any
 import cohere
 from services.prompt_templates import PromptTemplates
-from services.tracked_ai_clients import TrackedCohereClient
+from services.tracked_ai_clients import AsyncTrackedCohereClient
 
 
 class AIGenerator:
@@ -23,10 +23,10 @@ class AIGenerator:
 
     @classmethod
     def get_client(cls):
-        """Get or create Tracked Cohere client"""
+        """Get or create async Tracked Cohere client"""
         if cls._client is None:
-            # Use TrackedCohereClient for automatic logging and fallback
-            cls._client = TrackedCohereClient()
+            # Use AsyncTrackedCohereClient for automatic logging and fallback without blocking the event loop
+            cls._client = AsyncTrackedCohereClient()
         return cls._client
 
     @staticmethod
@@ -51,7 +51,7 @@ class AIGenerator:
             raise ValueError(f"Failed to parse AI response as JSON: {str(e)}")
 
     @classmethod
-    def generate_ai_content(cls, resume_data: Dict[str, Any], job_posting: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_ai_content(cls, resume_data: Dict[str, Any], job_posting: Dict[str, Any]) -> Dict[str, Any]:
         """
         UC-047: Generate AI resume content based on job posting
 
@@ -91,7 +91,7 @@ class AIGenerator:
 
             # Call Cohere API
             print(f"[AIGenerator] Calling Cohere for content generation...")
-            response = client.chat(
+            response = await client.chat(
                 model="command-a-03-2025",
                 messages=[
                     {"role": "system", "content": "You are an expert resume writer. Respond with valid JSON only."},
@@ -122,7 +122,7 @@ class AIGenerator:
             raise ValueError(f"Failed to generate content: {str(e)}")
 
     @classmethod
-    def optimize_skills(cls, resume_data: Dict[str, Any], job_posting: Dict[str, Any]) -> Dict[str, Any]:
+    async def optimize_skills(cls, resume_data: Dict[str, Any], job_posting: Dict[str, Any]) -> Dict[str, Any]:
         """
         UC-049: Optimize skills based on job posting
 
@@ -154,7 +154,7 @@ class AIGenerator:
 
             # Call Cohere API
             print(f"[AIGenerator] Calling Cohere for skills optimization...")
-            response = client.chat(
+            response = await client.chat(
                 model="command-a-03-2025",
                 messages=[
                     {"role": "system", "content": "You are an ATS expert. Respond with valid JSON only."},
@@ -185,7 +185,7 @@ class AIGenerator:
             raise ValueError(f"Failed to optimize skills: {str(e)}")
 
     @classmethod
-    def tailor_experience(cls, resume_data: Dict[str, Any], job_posting: Dict[str, Any]) -> Dict[str, Any]:
+    async def tailor_experience(cls, resume_data: Dict[str, Any], job_posting: Dict[str, Any]) -> Dict[str, Any]:
         """
         UC-050: Generate tailored experience descriptions
 
@@ -222,7 +222,7 @@ class AIGenerator:
 
             # Call Cohere API
             print(f"[AIGenerator] Calling Cohere for experience tailoring...")
-            response = client.chat(
+            response = await client.chat(
                 model="command-a-03-2025",
                 messages=[
                     {"role": "system", "content": "You are a career coach. Respond with valid JSON only."},
@@ -4,13 +4,13 @@ Wraps all external API calls with logging, metrics tracking, and fallback handli
 """
 import time
 import asyncio
-from datetime import datetime, timezone
 from typing import Any, Callable, Optional
-from openai import OpenAI
+from openai import AsyncOpenAI
 import cohere
 
 from services.api_key_manager import api_key_manager
 from mongo.api_metrics_dao import api_metrics_dao
+from services.api_telemetry import api_telemetry
 
 
 class APICallWrapper:
@@ -110,8 +110,8 @@ class APICallWrapper:
             # Determine provider for logging
             provider = "openai" if key_owner == "openai_fallback" else "cohere"
 
-            # Log the API call
-            await api_metrics_dao.log_api_call(
+            # Queue the log + quota increment; the telemetry buffer writes them in batches
+            api_telemetry.record(
                 provider=provider,
                 endpoint=endpoint,
                 key_owner=key_owner,
@@ -121,17 +121,6 @@ class APICallWrapper:
                 tokens_used=tokens_used
             )
 
-            # Update usage quotas
-            current_month = datetime.now(timezone.utc).strftime("%Y-%m")
-            await api_metrics_dao.increment_usage(
-                provider=provider,
-                key_owner=key_owner,
-                period=current_month,
-                calls=1,
-                tokens=tokens_used,
-                errors=0 if success else 1
-            )
-
         if not success:
             raise Exception(error_message)
 
@@ -213,8 +202,8 @@ class APICallWrapper:
             # Calculate duration
             duration_ms = (time.time() - start_time) * 1000
 
-            # Log the API call
-            await api_metrics_dao.log_api_call(
+            # Queue the log + quota increment; the telemetry buffer writes them in batches
+            api_telemetry.record(
                 provider="openai",
                 endpoint=endpoint,
                 key_owner=key_owner,
@@ -224,17 +213,6 @@ class APICallWrapper:
                 tokens_used=tokens_used
             )
 
-            # Update usage quotas
-            current_month = datetime.now(timezone.utc).strftime("%Y-%m")
-            await api_metrics_dao.increment_usage(
-                provider="openai",
-                key_owner=key_owner,
-                period=current_month,
-                calls=1,
-                tokens=tokens_used,
-                errors=0 if success else 1
-            )
-
         if not success:
             raise Exception(error_message)
 
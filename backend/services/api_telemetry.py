@@ -0,0 +1,179 @@
+"""
+API Telemetry Buffer
+
+Shared in-process sink for API call metrics (UC-117). Callers record a call
+synchronously (safe from worker threads and from the event loop); a single
+background task flushes the buffer to Mongo with one insert_many for
+api_call_logs and one bulk_write of pre-aggregated $inc updates for
+api_usage_quotas.
+
+A flush happens every FLUSH_INTERVAL seconds, or sooner once BATCH_SIZE
+calls are waiting. stop() drains whatever is left at shutdown.
+
+Usage:
+    from services.api_telemetry import api_telemetry
+
+    api_telemetry.record(provider="cohere", endpoint="chat", key_owner="team",
+                         duration_ms=812.4, success=True, tokens_used=950)
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+FLUSH_INTERVAL = 5.0
+BATCH_SIZE = 200
+# Hard cap so a Mongo outage cannot grow the buffer without bound
+MAX_BUFFERED = 10000
+
+
+class APITelemetryBuffer:
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL, batch_size: int = BATCH_SIZE,
+                 max_buffered: int = MAX_BUFFERED):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffered = max_buffered
+
+        self._lock = threading.Lock()
+        self._logs: List[Dict] = []
+        self._usage: Dict[Tuple[str, str, str], Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "tokens": 0, "errors": 0}
+        )
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+        self.dropped = 0
+        self.flushed = 0
+
+    def record(
+        self,
+        provider: str,
+        endpoint: str,
+        key_owner: str,
+        duration_ms: float,
+        success: bool,
+        error_message: Optional[str] = None,
+        tokens_used: int = 0,
+    ) -> None:
+        """Queue one API call for logging. Never blocks on I/O."""
+        now = datetime.now(timezone.utc)
+        entry = {
+            "timestamp": now,
+            "provider": provider,
+            "endpoint": endpoint,
+            "key_owner": key_owner,
+            "duration_ms": duration_ms,
+            "success": success,
+            "error_message": error_message,
+            "tokens_used": tokens_used or 0,
+        }
+
+        with self._lock:
+            if len(self._logs) >= self.max_buffered:
+                self._logs.pop(0)
+                self.dropped += 1
+            self._logs.append(entry)
+
+            counters = self._usage[(provider, key_owner, now.strftime("%Y-%m"))]
+            counters["calls"] += 1
+            counters["tokens"] += tokens_used or 0
+            counters["errors"] += 0 if success else 1
+
+            pending = len(self._logs)
+
+        if pending >= self.batch_size:
+            self._request_flush()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._logs)
+
+    def _request_flush(self) -> None:
+        loop, wake = self._loop, self._wake
+        if loop and wake and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+
+    def _take(self):
+        with self._lock:
+            logs, self._logs = self._logs, []
+            usage = dict(self._usage)
+            self._usage.clear()
+        return logs, usage
+
+    def _restore(self, logs: List[Dict], usage: Dict[Tuple[str, str, str], Dict[str, int]]) -> None:
+        """Put a failed batch back at the front of the buffer"""
+        with self._lock:
+            room = max(self.max_buffered - len(self._logs), 0)
+            self.dropped += max(len(logs) - room, 0)
+            self._logs = logs[-room:] + self._logs if room else self._logs
+            for key, counters in usage.items():
+                merged = self._usage[key]
+                for field, value in counters.items():
+                    merged[field] += value
+
+    async def flush(self) -> int:
+        """Write everything buffered so far. Returns the number of call logs written."""
+        # Imported lazily so recording works without a configured database
+        from mongo.api_metrics_dao import api_metrics_dao
+
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            logs, usage = self._take()
+            if not logs and not usage:
+                return 0
+            written = len(logs)
+            try:
+                await api_metrics_dao.insert_call_logs(logs)
+                logs = []
+                await api_metrics_dao.bulk_increment_usage(usage)
+            except Exception as e:
+                print(f"[APITelemetry] Flush failed, will retry: {e}")
+                self._restore(logs, usage)
+                return 0
+
+            self.flushed += written
+            return written
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flusher on the running event loop"""
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = self._loop.create_task(self._run())
+        print("[APITelemetry] Flusher started")
+
+    async def stop(self) -> None:
+        """Stop the flusher and drain the buffer"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self._loop = None
+        self._wake = None
+        print(f"[APITelemetry] Flusher stopped ({self.flushed} calls logged, {self.dropped} dropped)")
+
+
+# Global instance
+api_telemetry = APITelemetryBuffer()
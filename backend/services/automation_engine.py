@@ -295,6 +295,7 @@ async def process_due_schedules(time_window_minutes: int = 5):
       - update schedule status to 'sent'
     """
     due_schedules = await application_workflow_dao.get_due_applications(time_window_minutes)
+    submitted = 0
 
     for sched in due_schedules:
         try:
@@ -317,9 +318,12 @@ async def process_due_schedules(time_window_minutes: int = 5):
             await application_workflow_dao.update_schedule_status(schedule_id, "sent")
 
             print(f"[Automation] Auto-submitted job {job_id} from schedule {schedule_id}")
+            submitted += 1
 
         except Exception as e:
             print(f"[Automation] Failed processing schedule {sched.get('_id')}: {e}")
 
+    return submitted
+
 
 
@@ -1,9 +1,12 @@
 """
 Background Scheduler Service
-Automatically processes scheduled application submissions
+Processing for scheduled application submissions.
+
+Not scheduled on its own: due schedules are submitted by the
+"workflow_auto_submit" job (services/scheduled_jobs.py), which would race
+with _process_scheduled_applications over the same 'scheduled' rows.
 """
 
-import asyncio
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any
 import logging
@@ -18,32 +21,6 @@ logger = logging.getLogger(__name__)
 class BackgroundScheduler:
     """Service to check and process scheduled applications"""
     
-    def __init__(self):
-        self.is_running = False
-        self.check_interval = 60  # Check every 60 seconds
-        
-    async def start(self):
-        """Start the background scheduler"""
-        if self.is_running:
-            logger.warning("Scheduler already running")
-            return
-        
-        self.is_running = True
-        logger.info("Background scheduler started")
-        
-        while self.is_running:
-            try:
-                await self._process_scheduled_applications()
-                await asyncio.sleep(self.check_interval)
-            except Exception as e:
-                logger.error(f"Error in scheduler loop: {e}")
-                await asyncio.sleep(self.check_interval)
-    
-    async def stop(self):
-        """Stop the background scheduler"""
-        self.is_running = False
-        logger.info("Background scheduler stopped")
-    
     async def _process_scheduled_applications(self):
         """Check for scheduled applications that are due"""
         try:
@@ -163,13 +140,3 @@ class BackgroundScheduler:
 # Singleton instance
 background_scheduler = BackgroundScheduler()
 
-
-# FastAPI startup/shutdown hooks
-async def start_scheduler():
-    """Start the background scheduler on app startup"""
-    asyncio.create_task(background_scheduler.start())
-
-
-async def stop_scheduler():
-    """Stop the background scheduler on app shutdown"""
-    await background_scheduler.stop()
\ No newline at end of file
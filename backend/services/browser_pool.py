@@ -0,0 +1,233 @@
+"""
+Browser Pool
+
+One long-lived headless Chromium shared by PDF export and the job scrapers.
+Launching Chromium dominates the cost of both, so the browser is started once
+and every request gets its own isolated BrowserContext (separate cookies,
+storage and cache) that is closed as soon as the request is done.
+
+Playwright runs on a dedicated thread with its own event loop. That keeps the
+API loop free of browser pipe traffic and works on Windows, where the server
+loop may not support subprocesses (the reason the old code used
+sync_playwright in executors).
+
+- At most MAX_CONCURRENCY contexts are open at once; extra requests wait.
+- The browser is recycled after MAX_CONTEXTS_PER_BROWSER contexts (Chromium
+  slowly leaks memory) and relaunched automatically if it crashes. A retired
+  browser is closed once its in-flight contexts finish.
+
+Usage:
+    from services.browser_pool import browser_pool
+
+    async def render(context, html):
+        page = await context.new_page()
+        await page.set_content(html)
+        return await page.pdf(format="Letter")
+
+    pdf_bytes = await browser_pool.run(render, html)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+MAX_CONCURRENCY = int(os.getenv("BROWSER_POOL_CONCURRENCY", "4"))
+MAX_CONTEXTS_PER_BROWSER = int(os.getenv("BROWSER_POOL_RECYCLE_AFTER", "200"))
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+]
+
+
+class BrowserPool:
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY,
+                 max_contexts_per_browser: int = MAX_CONTEXTS_PER_BROWSER):
+        self.max_concurrency = max_concurrency
+        self.max_contexts_per_browser = max_contexts_per_browser
+
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Owned by the pool loop
+        self._playwright = None
+        self._browser = None
+        self._browser_uses = 0
+        self._active: Dict[Any, int] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+
+        self.launches = 0
+        self.contexts_served = 0
+        self.crashes = 0
+
+    # ------------------------------------------------------------------
+    # Public API (called from any event loop)
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the pool thread. Safe to call more than once."""
+        with self._thread_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target=self._thread_main, args=(ready,), name="browser-pool", daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+        print(f"[BrowserPool] Started (max {self.max_concurrency} contexts)")
+
+    async def warm(self) -> None:
+        """Launch the browser ahead of the first request"""
+        await self._submit(self._get_browser())
+
+    async def run(self, fn: Callable[..., Awaitable[Any]], *args,
+                  context_options: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Run `await fn(context, *args)` with a fresh isolated browser context.
+
+        fn executes on the pool thread, so it must only use Playwright
+        objects it receives and return plain data (bytes, str, dicts).
+        """
+        return await self._submit(self._run(fn, args, context_options or {}))
+
+    async def stop(self) -> None:
+        """Close the browser and stop the pool thread"""
+        if not self._loop:
+            return
+        try:
+            await self._submit(self._shutdown())
+        finally:
+            loop, thread = self._loop, self._thread
+            loop.call_soon_threadsafe(loop.stop)
+            await asyncio.to_thread(thread.join, 10)
+            self._loop = None
+            self._thread = None
+        print(f"[BrowserPool] Stopped ({self.contexts_served} contexts served, "
+              f"{self.launches} launches, {self.crashes} crashes)")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "browser_connected": bool(self._browser and self._browser.is_connected()),
+            "contexts_in_use": sum(self._active.values()),
+            "contexts_on_current_browser": self._browser_uses,
+            "contexts_served": self.contexts_served,
+            "launches": self.launches,
+            "crashes": self.crashes,
+        }
+
+    # ------------------------------------------------------------------
+    # Pool thread
+    # ------------------------------------------------------------------
+
+    def _thread_main(self, ready: threading.Event) -> None:
+        # Proactor is the loop that supports subprocesses on Windows
+        loop = asyncio.ProactorEventLoop() if sys.platform == "win32" else asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        self._launch_lock = asyncio.Lock()
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    async def _submit(self, coro: Awaitable[Any]) -> Any:
+        if not self._loop:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Caller went away (client disconnect); stop the work on the pool side too
+            future.cancel()
+            raise
+
+    async def _launch_browser(self):
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+    def _on_disconnected(self, browser) -> None:
+        if browser is self._browser:
+            self.crashes += 1
+            print("[BrowserPool] Browser disconnected unexpectedly; relaunching on next request")
+            self._browser = None
+        self._active.pop(browser, None)
+
+    async def _get_browser(self):
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            try:
+                browser = await self._launch_browser()
+            except NotImplementedError:
+                raise ValueError("Playwright browser launch failed. Run: python -m playwright install")
+            browser.on("disconnected", self._on_disconnected)
+            self._browser = browser
+            self._browser_uses = 0
+            self._active[browser] = 0
+            self.launches += 1
+            return browser
+
+    async def _retire(self, browser) -> None:
+        """Close a recycled browser once nothing is using it"""
+        if browser is self._browser or self._active.get(browser, 0) > 0:
+            return
+        self._active.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:
+            print(f"[BrowserPool] Error closing retired browser: {e}")
+
+    async def _run(self, fn, args, context_options) -> Any:
+        async with self._semaphore:
+            browser = await self._get_browser()
+            self._browser_uses += 1
+            self._active[browser] = self._active.get(browser, 0) + 1
+            if self._browser_uses >= self.max_contexts_per_browser:
+                # Recycle: later requests launch a fresh browser, this one drains
+                self._browser = None
+
+            context = None
+            try:
+                context = await browser.new_context(**context_options)
+                return await fn(context, *args)
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+                self.contexts_served += 1
+                if browser in self._active:
+                    self._active[browser] -= 1
+                await self._retire(browser)
+
+    async def _shutdown(self) -> None:
+        browsers = list(self._active)
+        if self._browser is not None and self._browser not in browsers:
+            browsers.append(self._browser)
+        self._browser = None
+        for browser in browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._active.clear()
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+# Global instance
+browser_pool = BrowserPool()
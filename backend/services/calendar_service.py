@@ -10,13 +10,14 @@ from datetime import datetime, timedelta, timezone
 import os
 from typing import Optional, Dict, Any, List
 import msal
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import uuid
 import secrets
 import pytz
 
+from services.notification_dispatcher import notification_dispatcher
+
 class CalendarService:
     """Unified calendar sync and reminder service"""
     
@@ -164,7 +165,7 @@ class CalendarService:
     # EMAIL REMINDERS
     # ============================================================================
     
-    def send_email_reminder(
+    async def send_email_reminder(
         self,
         recipient_email: str,
         interview_data: Dict[str, Any],
@@ -243,9 +244,7 @@ View details: {self.frontend_url}/interview/details/{interview_data.get('schedul
         message.attach(part2)
         
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, recipient_email, message.as_string())
+            await notification_dispatcher.send(message, recipient_email, sender=self.sender_email)
             return True
         except Exception as e:
             print(f"Failed to send reminder email: {e}")
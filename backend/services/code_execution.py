@@ -0,0 +1,1099 @@
+"""
+Code Execution
+
+Runs technical prep submissions against their test cases on this machine
+instead of asking a model what the code would print.
+
+- Every test case runs in its own short-lived process, so one test cannot
+  leak state into the next. Up to MAX_PARALLEL of them run at once, shared
+  across all submissions in this process.
+- Each test gets CPU_SECONDS of CPU per process, MEMORY_MB of memory in
+  total across everything it forks, at most MAX_PROCESSES processes and
+  threads, a 1 MB file size cap and no core dumps. A wall-clock
+  TIMEOUT_SECONDS kills the whole process group, including anything the
+  code forked.
+- Each test runs under a small supervisor that gives it its own PID, mount,
+  network, IPC and UTS namespaces and drops it to an unprivileged uid of its
+  own (from CODE_EXEC_SANDBOX_UID up) with an empty environment. It
+  cannot see the API process or its /proc entry, cannot reach the network,
+  and sees the application directory, the API's working directory, the home
+  directory and the temp directory (plus CODE_EXEC_HIDDEN_PATHS) as empty
+  read-only mounts, so .env and other submissions' files are out of reach.
+  Only its own work directory and the language runtime are mounted back in.
+  Compiled languages build in the same sandbox; the compiler reads a shared
+  cache through a private overlay, so one build cannot plant objects in the
+  next.
+- Setting this up needs root with CAP_SYS_ADMIN, and mount()/unshare()
+  allowed by the container's seccomp and AppArmor profiles; without it
+  every test comes back as "sandbox_unavailable" rather than running
+  unconfined. See the Dockerfile for the docker run flags.
+- A small per-language harness loads the submission, calls its entry
+  function with the test's arguments and writes what it returned or raised
+  to fd 3. That is all the sandbox reports, and it is the submission's own
+  result anyway. Pass/fail is decided here by comparing it with the
+  expected output, which never enters the sandbox; runtime (CPU time) and
+  peak memory come from the supervisor's wait4(); stdout is only shown to
+  the user. Nothing the submission prints can pose as a result.
+
+Python always runs. JavaScript (node) and Go run when their toolchains are
+installed; other languages come back as "unsupported_language".
+
+Usage:
+    from services.code_execution import code_executor
+
+    outcomes = await code_executor.run(code, "python", test_cases)
+    outcomes[0]["status"], outcomes[0]["runtime_ms"], outcomes[0]["memory_kb"]
+"""
+
+import asyncio
+import contextlib
+import fcntl
+import json
+import math
+import os
+import re
+import resource
+import shutil
+import signal
+import stat
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+TIMEOUT_SECONDS = float(os.getenv("CODE_EXEC_TIMEOUT_SECONDS", "5"))
+CPU_SECONDS = int(os.getenv("CODE_EXEC_CPU_SECONDS", "2"))
+MEMORY_MB = int(os.getenv("CODE_EXEC_MEMORY_MB", "256"))
+MAX_PARALLEL = int(os.getenv("CODE_EXEC_MAX_PARALLEL", "0")) or os.cpu_count() or 2
+# Every running test (or build) gets a uid of its own from this range, so
+# RLIMIT_NPROC counts its processes and threads and nothing else
+SANDBOX_UID = int(os.getenv("CODE_EXEC_SANDBOX_UID", "64000"))
+SANDBOX_UIDS = int(os.getenv("CODE_EXEC_SANDBOX_UIDS", "256"))
+SANDBOX_GID = int(os.getenv("CODE_EXEC_SANDBOX_GID", str(SANDBOX_UID)))
+MAX_PROCESSES = int(os.getenv("CODE_EXEC_MAX_PROCESSES", "64"))
+# Extra directories submissions must not see (os.pathsep-separated)
+HIDDEN_PATHS = [p for p in os.getenv("CODE_EXEC_HIDDEN_PATHS", "").split(os.pathsep) if p]
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUILD_TIMEOUT_SECONDS = 60
+BUILD_MEMORY_MB = int(os.getenv("CODE_EXEC_BUILD_MEMORY_MB", "1024"))
+BUILD_MAX_PROCESSES = 256
+BUILD_FILE_SIZE_LIMIT = 64 * 1024 * 1024
+BUILD_OPEN_FILES_LIMIT = 1024
+# Size of the throwaway layer a build writes its compiler cache entries to
+BUILD_CACHE_LAYER_MB = 512
+FILE_SIZE_LIMIT = 1024 * 1024
+OPEN_FILES_LIMIT = 64
+# How often the supervisor totals the sandbox's memory
+MEMORY_POLL_SECONDS = 0.01
+# Root-only: uid lock files, and compiler caches builds see through an overlay
+UID_LOCK_DIR = os.path.join(tempfile.gettempdir(), "code-exec-uids")
+BUILD_CACHE_DIR = os.path.join(tempfile.gettempdir(), "code-exec-cache")
+# Tail of stdout kept per test, and the most of a harness report read
+OUTPUT_LIMIT = 256 * 1024
+STDOUT_SHOWN = 2000
+ERROR_SHOWN = 2000
+
+# Outcome statuses
+PASSED = "passed"
+WRONG_ANSWER = "wrong_answer"
+RUNTIME_ERROR = "runtime_error"
+TIME_LIMIT_EXCEEDED = "time_limit_exceeded"
+MEMORY_LIMIT_EXCEEDED = "memory_limit_exceeded"
+COMPILE_ERROR = "compile_error"
+UNSUPPORTED_LANGUAGE = "unsupported_language"
+SANDBOX_UNAVAILABLE = "sandbox_unavailable"
+
+LANGUAGE_ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "node": "javascript",
+    "golang": "go",
+}
+
+
+# ----------------------------------------------------------------------
+# Sandbox
+# ----------------------------------------------------------------------
+
+# Runs as root with the JSON config in argv[1]. It moves into new
+# namespaces, hides the configured directories, then forks the test
+# process, which mounts a fresh /proc, applies the rlimits, drops to the
+# sandbox uid and execs the harness. While it runs, the supervisor totals
+# the memory of every process in the new PID namespace and kills it past
+# the limit. The harness's fd 3 report plus the exit status, rusage and
+# peak memory go to the verdict file, which was opened before the fork
+# and is closed on exec.
+SANDBOX_SUPERVISOR = r'''
+import ctypes
+import json
+import os
+import resource
+import select
+import sys
+import time
+
+CLONE_NEWNS = 0x00020000
+CLONE_NEWUTS = 0x04000000
+CLONE_NEWIPC = 0x08000000
+CLONE_NEWPID = 0x20000000
+CLONE_NEWNET = 0x40000000
+MS_RDONLY = 0x1
+MS_NOSUID = 0x2
+MS_NODEV = 0x4
+MS_NOEXEC = 0x8
+MS_REMOUNT = 0x20
+MS_BIND = 0x1000
+MS_REC = 0x4000
+MS_PRIVATE = 0x40000
+PR_SET_PDEATHSIG = 1
+PR_SET_NO_NEW_PRIVS = 38
+SIGKILL = 9
+
+libc = ctypes.CDLL(None, use_errno=True)
+
+
+def check(result, what):
+    if result != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, f"{what}: {os.strerror(errno)}")
+
+
+def mount(source, target, fstype, flags, data=None):
+    encode = lambda text: text.encode() if text is not None else None
+    check(libc.mount(encode(source), encode(target), encode(fstype), flags, encode(data)), f"mount {target}")
+
+
+def mount_overlays(config):
+    """A private writable layer over a shared directory; writes land in a tmpfs and vanish"""
+    for overlay in config["overlays"]:
+        scratch = overlay["scratch"]
+        mount("tmpfs", scratch, "tmpfs", MS_NOSUID | MS_NODEV, f"mode=700,size={overlay['size_mb']}m")
+        upper, work = os.path.join(scratch, "upper"), os.path.join(scratch, "work")
+        os.mkdir(upper)
+        os.mkdir(work)
+        os.chown(upper, config["uid"], config["gid"])
+        options = f"lowerdir={overlay['lower']},upperdir={upper},workdir={work}"
+        mount("overlay", overlay["target"], "overlay", MS_NOSUID | MS_NODEV, options)
+
+
+def hide_filesystem(config):
+    mount(None, "/", None, MS_REC | MS_PRIVATE)
+    # Before the shared directories are hidden; carried along by the bind mounts below
+    mount_overlays(config)
+    # Opened before the empty mounts cover them, bound back in afterwards
+    exposed = [(path, writable, os.open(path, os.O_PATH | os.O_DIRECTORY)) for path, writable in config["expose"]]
+    for path in config["hide"]:
+        mount("tmpfs", path, "tmpfs", MS_NOSUID | MS_NODEV, "mode=755,size=64k")
+    for path, writable, fd in exposed:
+        os.makedirs(path, exist_ok=True)
+        mount(f"/proc/self/fd/{fd}", path, None, MS_BIND | MS_REC)
+        mount(None, path, None, MS_REMOUNT | MS_BIND | MS_NOSUID | MS_NODEV | (0 if writable else MS_RDONLY))
+        os.close(fd)
+    for path in config["hide"]:
+        mount(None, path, None, MS_REMOUNT | MS_RDONLY | MS_NOSUID | MS_NODEV)
+
+
+def exec_test(config, result_fd):
+    """In the forked child: pid 1 of the new PID namespace"""
+    mount("proc", "/proc", "proc", MS_NOSUID | MS_NODEV | MS_NOEXEC)
+    os.dup2(result_fd, 3)
+    os.chdir(config["cwd"])
+    for limit, value in config["rlimits"]:
+        resource.setrlimit(limit, (value, value))
+    os.setgroups([])
+    os.setgid(config["gid"])
+    os.setuid(config["uid"])
+    # After setuid, which would clear it: dies with the supervisor
+    check(libc.prctl(PR_SET_PDEATHSIG, SIGKILL, 0, 0, 0), "prctl")
+    check(libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0), "prctl")
+    os.execve(config["argv"][0], config["argv"], config["env"])
+
+
+def read_all(fd, limit, data=b""):
+    os.set_blocking(fd, True)
+    while chunk := os.read(fd, 65536):
+        data += chunk[:max(limit - len(data), 0)]
+    os.close(fd)
+    return data
+
+
+def namespace_memory_kb():
+    """Proportional set size of every process in the sandbox (this /proc is its PID namespace)"""
+    total = 0
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/smaps_rollup", "rb") as f:
+                for line in f:
+                    if line.startswith((b"Pss:", b"SwapPss:")):
+                        total += int(line.split()[1])
+        except (OSError, ValueError):
+            # Exited while being read
+            pass
+    return total
+
+
+def main():
+    config = json.loads(sys.argv[1])
+    verdict = os.open(config["verdict"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+    def report(**fields):
+        os.write(verdict, json.dumps(fields).encode())
+
+    try:
+        check(libc.unshare(CLONE_NEWNS | CLONE_NEWPID | CLONE_NEWNET | CLONE_NEWIPC | CLONE_NEWUTS), "unshare")
+        hide_filesystem(config)
+    except OSError as e:
+        return report(sandbox_error=str(e))
+
+    result_r, result_w = os.pipe()
+    errors_r, errors_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(result_r)
+            exec_test(config, result_w)
+        except BaseException as e:
+            os.write(errors_w, str(e).encode())
+        os._exit(127)
+
+    os.close(result_w)
+    os.close(errors_w)
+    # errors_w is closed on exec, so this returns as soon as the harness starts
+    setup_error = read_all(errors_r, 4096).decode(errors="replace")
+    if setup_error:
+        os.wait4(pid, 0)
+        return report(sandbox_error=setup_error)
+
+    # Per-process rlimits cannot see forks, so memory is totalled over the
+    # whole namespace; killing PID 1 takes every other process with it
+    os.set_blocking(result_r, False)
+    result, reading, peak_kb, exceeded = b"", True, 0, False
+    while True:
+        if not reading:
+            time.sleep(config["poll_seconds"])
+        elif select.select([result_r], [], [], config["poll_seconds"])[0]:
+            chunk = os.read(result_r, 65536)
+            reading = bool(chunk)
+            result += chunk[:max(config["result_limit"] - len(result), 0)]
+        done, status, usage = os.wait4(pid, os.WNOHANG)
+        if done:
+            break
+        peak_kb = max(peak_kb, namespace_memory_kb())
+        if peak_kb > config["memory_limit_kb"] and not exceeded:
+            exceeded = True
+            os.kill(pid, SIGKILL)
+    result = read_all(result_r, config["result_limit"], result)
+    report(
+        returncode=os.waitstatus_to_exitcode(status),
+        cpu_ms=(usage.ru_utime + usage.ru_stime) * 1000,
+        memory_kb=max(peak_kb, usage.ru_maxrss),
+        memory_exceeded=exceeded,
+        result=result.decode(errors="replace") if result else None,
+    )
+
+
+main()
+'''
+
+
+def _within(path: str, parent: str) -> bool:
+    return path == parent or path.startswith(parent.rstrip("/") + "/")
+
+
+def _outermost(paths: List[str]) -> List[str]:
+    """Real paths, parents first, with any path inside another one dropped"""
+    kept = []
+    for path in sorted({os.path.realpath(p) for p in paths}):
+        if path != "/" and not any(_within(path, parent) for parent in kept):
+            kept.append(path)
+    return kept
+
+
+def hidden_paths() -> List[str]:
+    """Directories that show up empty inside the sandbox"""
+    candidates = [APP_DIR, os.getcwd(), os.path.expanduser("~"), tempfile.gettempdir(), *HIDDEN_PATHS]
+    return _outermost([p for p in candidates if os.path.isdir(p)])
+
+
+def _claim_uid() -> Optional[Tuple[int, int]]:
+    """
+    (uid, lock fd) for a sandbox uid no other test is running as, in this or
+    any other worker process; closing the fd gives it back
+    """
+    os.makedirs(UID_LOCK_DIR, mode=0o700, exist_ok=True)
+    for uid in range(SANDBOX_UID, SANDBOX_UID + SANDBOX_UIDS):
+        fd = os.open(os.path.join(UID_LOCK_DIR, str(uid)), os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return uid, fd
+        except BlockingIOError:
+            os.close(fd)
+    return None
+
+
+# ----------------------------------------------------------------------
+# Harnesses
+# ----------------------------------------------------------------------
+
+PYTHON_HARNESS = r'''
+import json
+import sys
+import traceback
+
+
+def jsonable(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+
+def describe(error):
+    line = ""
+    for frame in traceback.extract_tb(error.__traceback__):
+        if frame.filename == "solution.py":
+            line = f" (line {frame.lineno})"
+    message = f": {error}" if str(error) else ""
+    return f"{type(error).__name__}{message}{line}"
+
+
+def main():
+    payload = json.load(sys.stdin)
+    result = {"ok": False}
+    try:
+        namespace = {"__name__": "solution"}
+        with open("solution.py") as f:
+            exec(compile(f.read(), "solution.py", "exec"), namespace)
+        func = namespace[payload["entry"]]
+        if payload.get("method"):
+            func = getattr(namespace["Solution"](), payload["entry"])
+        value = func(*payload["args"])
+        result["ok"] = True
+        result["value"] = value
+    except SyntaxError as e:
+        result["error"] = f"SyntaxError: {e.msg} (line {e.lineno})"
+    except BaseException as e:
+        result["error"] = describe(e)
+    try:
+        out = json.dumps(result, default=jsonable)
+    except (TypeError, ValueError):
+        result["value"] = repr(result.get("value"))
+        out = json.dumps(result)
+    sys.stdout.flush()
+    with open(3, "w") as report:
+        report.write(out)
+
+
+main()
+'''
+
+JAVASCRIPT_HARNESS = r'''
+const fs = require("fs");
+
+function jsonable(key, value) {
+  if (value instanceof Set) return [...value];
+  if (value instanceof Map) return Object.fromEntries(value);
+  if (typeof value === "bigint") return Number(value);
+  return value;
+}
+
+(async () => {
+  const payload = JSON.parse(fs.readFileSync(0, "utf8"));
+  const result = { ok: false };
+  try {
+    const { entry } = require("./solution.js");
+    if (typeof entry !== "function") throw new Error(`${payload.entry} is not a function`);
+    let value = entry(...payload.args);
+    if (value instanceof Promise) value = await value;
+    result.ok = true;
+    result.value = value === undefined ? null : value;
+  } catch (e) {
+    result.error = e instanceof Error ? `${e.name}: ${e.message}` : String(e);
+  }
+  let out;
+  try {
+    out = JSON.stringify(result, jsonable);
+  } catch (e) {
+    result.value = String(result.value);
+    out = JSON.stringify(result);
+  }
+  fs.writeFileSync(3, out);
+  process.stdout.write("", () => process.exit(0));
+})();
+'''
+
+GO_HARNESS = r'''
+package main
+
+import (
+	"encoding/json"
+	"fmt"
+	"os"
+	"reflect"
+)
+
+func main() {
+	result := map[string]interface{}{"ok": false}
+	defer func() {
+		if r := recover(); r != nil {
+			result["ok"] = false
+			result["error"] = fmt.Sprintf("panic: %v", r)
+			delete(result, "value")
+		}
+		out, err := json.Marshal(result)
+		if err != nil {
+			result["value"] = fmt.Sprintf("%v", result["value"])
+			out, _ = json.Marshal(result)
+		}
+		os.NewFile(3, "report").Write(out)
+	}()
+
+	var payload struct {
+		Args []json.RawMessage `json:"args"`
+	}
+	if err := json.NewDecoder(os.Stdin).Decode(&payload); err != nil {
+		panic(err)
+	}
+	fn := reflect.ValueOf(__ENTRY__)
+	signature := fn.Type()
+	if signature.NumIn() != len(payload.Args) {
+		result["error"] = fmt.Sprintf("__ENTRY__ takes %d arguments, the test passes %d", signature.NumIn(), len(payload.Args))
+		return
+	}
+	in := make([]reflect.Value, signature.NumIn())
+	for i := range in {
+		arg := reflect.New(signature.In(i))
+		if err := json.Unmarshal(payload.Args[i], arg.Interface()); err != nil {
+			result["error"] = fmt.Sprintf("argument %d: %v", i+1, err)
+			return
+		}
+		in[i] = arg.Elem()
+	}
+	out := fn.Call(in)
+	result["ok"] = true
+	if len(out) > 0 {
+		result["value"] = out[0].Interface()
+	}
+}
+'''
+
+
+# ----------------------------------------------------------------------
+# Entry points
+# ----------------------------------------------------------------------
+
+@dataclass
+class Entrypoint:
+    name: str
+    params: List[str]
+    # Python/JavaScript `class Solution` style: call on a fresh instance
+    method: bool = False
+
+
+def split_params(text: str) -> List[str]:
+    """Split a parameter list on top-level commas (annotations can contain commas)"""
+    parts, depth, current = [], 0, ""
+    for char in text:
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    names = []
+    for part in parts:
+        match = re.match(r"\s*(?:\.\.\.|\*{1,2})?([A-Za-z_]\w*)", part)
+        if match and match.group(1) != "self":
+            names.append(match.group(1))
+    return names
+
+
+_PY_FUNCTION = re.compile(r"^def\s+(\w+)\s*\(([^)]*)\)", re.M)
+_PY_METHOD = re.compile(r"^[ \t]+def\s+(\w+)\s*\(\s*self\s*,?([^)]*)\)", re.M)
+_JS_FUNCTION = re.compile(r"^(?:async\s+)?function\s*\*?\s*(\w+)\s*\(([^)]*)\)", re.M)
+_JS_ASSIGNED = re.compile(
+    r"^(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?(?:function\s*\w*\s*\(([^)]*)\)|\(([^)]*)\)\s*=>|(\w+)\s*=>)",
+    re.M,
+)
+_JS_METHOD = re.compile(r"^[ \t]+(?:async\s+)?(?!(?:if|for|while|switch|catch|function|return)\b)(\w+)\s*\(([^)]*)\)\s*\{", re.M)
+_GO_FUNCTION = re.compile(r"^func\s+(\w+)\s*\(([^)]*)\)", re.M)
+
+
+def _candidates(code: str, language: str) -> List[Entrypoint]:
+    found = []
+    if language == "python":
+        found += [Entrypoint(m.group(1), split_params(m.group(2))) for m in _PY_FUNCTION.finditer(code)]
+        if re.search(r"^class\s+Solution\b", code, re.M):
+            found += [Entrypoint(m.group(1), split_params(m.group(2)), method=True) for m in _PY_METHOD.finditer(code)]
+    elif language == "javascript":
+        found += [Entrypoint(m.group(1), split_params(m.group(2))) for m in _JS_FUNCTION.finditer(code)]
+        for m in _JS_ASSIGNED.finditer(code):
+            params = next((g for g in m.groups()[1:] if g is not None), "")
+            found.append(Entrypoint(m.group(1), split_params(params)))
+        if re.search(r"^class\s+Solution\b", code, re.M):
+            found += [Entrypoint(m.group(1), split_params(m.group(2)), method=True) for m in _JS_METHOD.finditer(code)]
+    elif language == "go":
+        found += [Entrypoint(m.group(1), split_params(m.group(2))) for m in _GO_FUNCTION.finditer(code)]
+    return [e for e in found if not e.name.startswith("_") and e.name not in ("main", "constructor", "init")]
+
+
+def find_entrypoint(code: str, language: str, arg_names: List[str]) -> Optional[Entrypoint]:
+    """
+    The function a test calls: the one whose parameters are the test input's
+    keys, else the first taking that many arguments, else the first defined.
+    """
+    candidates = _candidates(code, language)
+    if not candidates:
+        return None
+    for entry in candidates:
+        if arg_names and sorted(entry.params) == sorted(arg_names):
+            return entry
+    for entry in candidates:
+        if len(entry.params) == len(arg_names):
+            return entry
+    return candidates[0]
+
+
+def python_syntax_error(code: str) -> Optional[str]:
+    """Why the code does not parse (compiling runs nothing), or None"""
+    try:
+        compile(code, "solution.py", "exec")
+    except SyntaxError as e:
+        return f"SyntaxError: {e.msg} (line {e.lineno})"
+    except ValueError as e:
+        return f"SyntaxError: {e}"
+    return None
+
+
+def call_args(entry: Entrypoint, test_input: Any) -> List[Any]:
+    """Positional arguments for a test, matched to parameters by name when the names line up"""
+    if isinstance(test_input, dict):
+        if sorted(entry.params) == sorted(test_input):
+            return [test_input[name] for name in entry.params]
+        return list(test_input.values())
+    if isinstance(test_input, list):
+        return test_input
+    return [test_input]
+
+
+# ----------------------------------------------------------------------
+# Comparison
+# ----------------------------------------------------------------------
+
+def outputs_match(actual: Any, expected: Any) -> bool:
+    """Structural equality; floats within 1e-6, JSON-encoded expected strings decoded"""
+    if isinstance(expected, str) and not isinstance(actual, str):
+        try:
+            expected = json.loads(expected)
+        except ValueError:
+            return False
+    if isinstance(expected, bool) or isinstance(actual, bool):
+        return actual is expected
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        return math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-6)
+    if isinstance(expected, list) and isinstance(actual, list):
+        return len(actual) == len(expected) and all(outputs_match(a, e) for a, e in zip(actual, expected))
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return actual.keys() == expected.keys() and all(outputs_match(actual[k], expected[k]) for k in expected)
+    return actual == expected
+
+
+# ----------------------------------------------------------------------
+# Languages
+# ----------------------------------------------------------------------
+
+@dataclass
+class Language:
+    name: str
+    run: List[str]
+    # Files to write into the work directory for a submission
+    files: Callable[[str, Entrypoint], Dict[str, str]]
+    build: Optional[List[str]] = None
+    build_env: Dict[str, str] = field(default_factory=dict)
+    run_env: Dict[str, str] = field(default_factory=dict)
+    # Which rlimit caps memory. V8 and the Go runtime reserve far more address
+    # space than they use, so node gets a heap cap instead and Go a data limit.
+    memory_rlimit: Optional[int] = resource.RLIMIT_AS
+    # Install directories the run (and build) command needs, mounted back in if hidden
+    runtime_paths: List[str] = field(default_factory=list)
+    # Environment variable naming the compiler's cache, and a trusted program
+    # compiled once outside the sandbox to fill the shared copy of it
+    build_cache_env: Optional[str] = None
+    warm_code: Optional[str] = None
+
+
+def _install_prefix(executable: str) -> str:
+    """/opt/node for /opt/node/bin/node, following symlinks"""
+    return os.path.dirname(os.path.dirname(os.path.realpath(executable)))
+
+
+def _python_files(code: str, entry: Entrypoint) -> Dict[str, str]:
+    return {"solution.py": code, "harness.py": PYTHON_HARNESS}
+
+
+def _javascript_files(code: str, entry: Entrypoint) -> Dict[str, str]:
+    if entry.method:
+        export = f"module.exports = {{ entry: (...args) => new Solution().{entry.name}(...args) }};"
+    else:
+        export = f"module.exports = {{ entry: typeof {entry.name} === 'function' ? {entry.name} : undefined }};"
+    return {"solution.js": f"{code}\n;{export}\n", "harness.js": JAVASCRIPT_HARNESS}
+
+
+# Uses the packages solutions commonly import, so they are compiled once
+# into the shared build cache instead of in every submission's build
+GO_WARM_CODE = r'''
+package main
+
+import (
+	"container/heap"
+	"container/list"
+	"math"
+	"sort"
+	"strconv"
+	"strings"
+	"unicode"
+)
+
+var _ = []interface{}{heap.Init, list.New, math.Max, sort.Ints, strconv.Itoa, strings.Split, unicode.IsDigit}
+
+func warm() {}
+'''
+
+
+def _go_files(code: str, entry: Entrypoint) -> Dict[str, str]:
+    if not re.search(r"^\s*package\s+\w+", code, re.M):
+        code = "package main\n\n" + code
+    return {"solution.go": code, "main.go": GO_HARNESS.replace("__ENTRY__", entry.name)}
+
+
+def available_languages() -> Dict[str, Language]:
+    languages = {
+        "python": Language(
+            "python",
+            [sys.executable, "-I", "harness.py"],
+            _python_files,
+            runtime_paths=[sys.prefix, sys.base_prefix],
+        ),
+    }
+    node = shutil.which("node")
+    if node:
+        languages["javascript"] = Language(
+            "javascript",
+            [node, f"--max-old-space-size={MEMORY_MB}", "harness.js"],
+            _javascript_files,
+            memory_rlimit=None,
+            runtime_paths=[_install_prefix(node)],
+        )
+    go = shutil.which("go")
+    if go:
+        languages["go"] = Language(
+            "go",
+            ["./solution"],
+            _go_files,
+            build=[go, "build", "-o", "solution", "main.go", "solution.go"],
+            build_env={
+                "PATH": os.path.dirname(go) + ":/usr/bin:/bin",
+                "CGO_ENABLED": "0",
+                "GOTOOLCHAIN": "local",
+                # Parallel compiles would eat into the build's process limit
+                "GOMAXPROCS": "2",
+            },
+            run_env={"GOMAXPROCS": "1"},
+            memory_rlimit=resource.RLIMIT_DATA,
+            runtime_paths=[_install_prefix(go)],
+            build_cache_env="GOCACHE",
+            warm_code=GO_WARM_CODE,
+        )
+    return languages
+
+
+def normalize_language(language: str) -> str:
+    language = (language or "").strip().lower()
+    return LANGUAGE_ALIASES.get(language, language)
+
+
+# ----------------------------------------------------------------------
+# Processes
+# ----------------------------------------------------------------------
+
+def _rlimits(cpu_seconds: int, memory_rlimit: Optional[int] = None, memory_bytes: int = 0,
+             processes: int = MAX_PROCESSES, file_size: int = FILE_SIZE_LIMIT,
+             open_files: int = OPEN_FILES_LIMIT) -> List[List[int]]:
+    """[resource, limit] pairs the supervisor applies to the test process"""
+    # The test process is PID 1 of its namespace, which ignores SIGXCPU, so
+    # the CPU limit is a hard one (SIGKILL). The uid is the test's alone, so
+    # RLIMIT_NPROC caps its processes and threads.
+    limits = [
+        [resource.RLIMIT_CPU, cpu_seconds],
+        [resource.RLIMIT_FSIZE, file_size],
+        [resource.RLIMIT_NOFILE, open_files],
+        [resource.RLIMIT_CORE, 0],
+        [resource.RLIMIT_NPROC, processes],
+    ]
+    if memory_rlimit is not None:
+        limits.append([memory_rlimit, memory_bytes])
+    return limits
+
+
+def _supervisor_command(config: Dict[str, Any]) -> List[str]:
+    return [sys.executable, "-I", "-S", "-c", SANDBOX_SUPERVISOR, json.dumps(config)]
+
+
+def _copy_build_output(builddir: str, workdir: str, filename: str) -> bool:
+    """
+    Copy a build's output into work/, root-owned and read-only to the tests.
+    The build directory belongs to the sandbox, so only a regular file is
+    taken: a symlink there could point at anything root can read.
+    """
+    try:
+        fd = os.open(os.path.join(builddir, filename), os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK)
+    except OSError:
+        return False
+    with os.fdopen(fd, "rb") as source:
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            return False
+        with open(os.path.join(workdir, filename), "wb") as target:
+            shutil.copyfileobj(source, target)
+    os.chmod(os.path.join(workdir, filename), 0o755)
+    return True
+
+
+def _read_verdict(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+async def _read_tail(stream: asyncio.StreamReader, limit: int) -> bytes:
+    """Drain a pipe, keeping only its last `limit` bytes"""
+    buffer = bytearray()
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return bytes(buffer)
+        buffer += chunk
+        if len(buffer) > limit:
+            del buffer[:-limit]
+
+
+async def _feed(process: asyncio.subprocess.Process, data: bytes) -> None:
+    try:
+        process.stdin.write(data)
+        await process.stdin.drain()
+        process.stdin.close()
+    except (BrokenPipeError, ConnectionResetError):
+        # Exited before reading its input; the exit status says why
+        pass
+
+
+def _kill_group(process: asyncio.subprocess.Process) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+@dataclass
+class ProcessResult:
+    returncode: Optional[int]
+    stdout: str
+    stderr: str
+    timed_out: bool
+    elapsed_ms: float
+
+
+def outcome(status: str, value: Any = None, error: Optional[str] = None, stdout: str = "",
+            runtime_ms: Optional[float] = None, memory_kb: Optional[int] = None) -> Dict[str, Any]:
+    return {
+        "status": status,
+        "value": value,
+        "error": error,
+        "stdout": stdout[-STDOUT_SHOWN:],
+        "runtime_ms": round(runtime_ms, 3) if runtime_ms is not None else None,
+        "memory_kb": memory_kb,
+    }
+
+
+class CodeExecutor:
+    def __init__(self, max_parallel: int = MAX_PARALLEL, timeout_seconds: float = TIMEOUT_SECONDS,
+                 cpu_seconds: int = CPU_SECONDS, memory_mb: int = MEMORY_MB):
+        self.timeout_seconds = timeout_seconds
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.languages = available_languages()
+        self._slots = asyncio.Semaphore(max_parallel)
+        self._cache_lock = asyncio.Lock()
+
+    @property
+    def supported_languages(self) -> List[str]:
+        return sorted(self.languages)
+
+    async def sandbox_available(self) -> bool:
+        """Whether submissions can run here at all (a trivial Python test passes)"""
+        outcomes = await self.run("def f():\n    return 1", "python", [{"input": [], "expected_output": 1}])
+        return outcomes[0]["status"] == PASSED
+
+    async def run(self, code: str, language: str, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run every test case in parallel; one outcome per test, in order"""
+        if not test_cases:
+            return []
+        spec = self.languages.get(normalize_language(language))
+        if spec is None:
+            message = (f"Running {language} submissions is not supported on this server "
+                       f"(supported: {', '.join(self.supported_languages)})")
+            return [outcome(UNSUPPORTED_LANGUAGE, error=message) for _ in test_cases]
+
+        first_input = test_cases[0].get("input", {})
+        entry = find_entrypoint(code, spec.name, list(first_input) if isinstance(first_input, dict) else [])
+        if entry is None:
+            syntax_error = python_syntax_error(code) if spec.name == "python" else None
+            if syntax_error:
+                return [outcome(COMPILE_ERROR, error=syntax_error) for _ in test_cases]
+            message = f"No {spec.name} function found to call; define one that takes the test's inputs"
+            return [outcome(RUNTIME_ERROR, error=message) for _ in test_cases]
+
+        # The run directory stays root-only; the sandbox sees just work/
+        run_dir = tempfile.mkdtemp(prefix="code-exec-")
+        workdir = os.path.join(run_dir, "work")
+        try:
+            os.mkdir(workdir)
+            os.chmod(workdir, 0o755)
+            for filename, content in spec.files(code, entry).items():
+                path = os.path.join(workdir, filename)
+                with open(path, "w") as f:
+                    f.write(content)
+                os.chmod(path, 0o644)
+
+            if spec.build:
+                failure = await self._build(spec, run_dir, workdir)
+                if failure is not None:
+                    return [dict(failure) for _ in test_cases]
+
+            return list(await asyncio.gather(*(
+                self._run_test(spec, workdir, os.path.join(run_dir, f"verdict-{i}.json"), entry, test)
+                for i, test in enumerate(test_cases)
+            )))
+        finally:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    @contextlib.asynccontextmanager
+    async def _sandbox_uid(self) -> AsyncIterator[int]:
+        """A parallelism slot and a sandbox uid nothing else is running as"""
+        async with self._slots:
+            while (claimed := _claim_uid()) is None:
+                await asyncio.sleep(0.05)
+            uid, lock = claimed
+            try:
+                yield uid
+            finally:
+                os.close(lock)
+
+    async def _build(self, spec: Language, run_dir: str, workdir: str) -> Optional[Dict[str, Any]]:
+        """
+        Compile in the sandbox, in a writable copy of the work directory; only
+        the binary is copied back. Returns the outcome every test gets if it fails.
+        """
+        builddir = os.path.join(run_dir, "build")
+        shutil.copytree(workdir, builddir)
+        env = {"HOME": builddir, "TMPDIR": builddir, "GOPATH": os.path.join(builddir, ".go"), **spec.build_env}
+        overlays = []
+        if spec.build_cache_env:
+            target = os.path.join(builddir, ".cache")
+            scratch = os.path.join(run_dir, "build-cache")
+            os.mkdir(target)
+            os.mkdir(scratch)
+            env[spec.build_cache_env] = target
+            overlays.append({
+                "target": target,
+                "lower": await self._shared_build_cache(spec),
+                "scratch": scratch,
+                "size_mb": BUILD_CACHE_LAYER_MB,
+            })
+
+        verdict_path = os.path.join(run_dir, "verdict-build.json")
+        rlimits = _rlimits(BUILD_TIMEOUT_SECONDS, processes=BUILD_MAX_PROCESSES,
+                           file_size=BUILD_FILE_SIZE_LIMIT, open_files=BUILD_OPEN_FILES_LIMIT)
+        async with self._sandbox_uid() as uid:
+            os.chown(builddir, uid, SANDBOX_GID)
+            os.chmod(builddir, 0o700)
+            config = self._sandbox_config(spec.build, builddir, env, uid, verdict_path, rlimits,
+                                          BUILD_MEMORY_MB, spec.runtime_paths, writable=True, overlays=overlays)
+            result = await self._exec(_supervisor_command(config), builddir, {}, b"", BUILD_TIMEOUT_SECONDS)
+        verdict = _read_verdict(verdict_path)
+
+        if result.timed_out:
+            return outcome(COMPILE_ERROR, error=f"Compilation took longer than {BUILD_TIMEOUT_SECONDS}s")
+        if not verdict or verdict.get("sandbox_error"):
+            reason = verdict.get("sandbox_error") or result.stderr.strip()[-ERROR_SHOWN:]
+            print(f"[CodeExecution] Sandbox unavailable: {reason}")
+            return outcome(SANDBOX_UNAVAILABLE, error="Code execution is not available on this server")
+        if verdict.get("memory_exceeded"):
+            return outcome(COMPILE_ERROR, error=f"Compilation exceeded the {BUILD_MEMORY_MB} MB memory limit")
+        if verdict.get("returncode") != 0 or not _copy_build_output(builddir, workdir, "solution"):
+            error = (result.stderr or result.stdout).strip()[-ERROR_SHOWN:] or "Compilation failed"
+            return outcome(COMPILE_ERROR, error=error)
+        return None
+
+    async def _shared_build_cache(self, spec: Language) -> str:
+        """
+        The compiler cache builds read through their overlay. Filled once by
+        compiling spec.warm_code, which is ours, outside the sandbox; sandboxed
+        builds only ever write to their own throwaway layer on top of it.
+        """
+        cache = os.path.join(BUILD_CACHE_DIR, spec.name)
+        ready = f"{cache}.ready"
+        async with self._cache_lock:
+            if os.path.exists(ready):
+                return cache
+            os.makedirs(BUILD_CACHE_DIR, mode=0o700, exist_ok=True)
+            os.chmod(BUILD_CACHE_DIR, 0o700)
+            os.makedirs(cache, exist_ok=True)
+            with tempfile.TemporaryDirectory(prefix="code-exec-warm-") as warmdir:
+                for filename, content in spec.files(spec.warm_code or "", Entrypoint("warm", [])).items():
+                    with open(os.path.join(warmdir, filename), "w") as f:
+                        f.write(content)
+                env = {"HOME": warmdir, "GOPATH": os.path.join(warmdir, ".go"), **spec.build_env,
+                       spec.build_cache_env: cache}
+                result = await self._exec(spec.build, warmdir, env, b"", BUILD_TIMEOUT_SECONDS)
+            if result.returncode != 0:
+                # Builds still work from an empty cache, just slower
+                print(f"[CodeExecution] Could not warm the {spec.name} build cache: {result.stderr.strip()[-ERROR_SHOWN:]}")
+                return cache
+            # Sandbox uids add entries through their overlay, which checks
+            # these modes; only root can reach the directory itself
+            for root, dirs, _ in os.walk(cache):
+                for name in dirs:
+                    os.chmod(os.path.join(root, name), 0o777)
+            os.chmod(cache, 0o777)
+            open(ready, "w").close()
+        return cache
+
+    def _sandbox_config(self, argv: List[str], cwd: str, env: Dict[str, str], uid: int, verdict_path: str,
+                        rlimits: List[List[int]], memory_mb: int, runtime_paths: List[str],
+                        writable: bool = False, overlays: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        hide = hidden_paths()
+        expose = [p for p in _outermost([cwd, *runtime_paths]) if any(_within(p, h) for h in hide)]
+        return {
+            "argv": argv,
+            "env": env,
+            "cwd": cwd,
+            "uid": uid,
+            "gid": SANDBOX_GID,
+            "rlimits": rlimits,
+            "memory_limit_kb": memory_mb * 1024,
+            "poll_seconds": MEMORY_POLL_SECONDS,
+            "hide": hide,
+            # Only the build directory is ever writable
+            "expose": [[p, writable and p == os.path.realpath(cwd)] for p in expose],
+            "overlays": overlays or [],
+            "verdict": verdict_path,
+            "result_limit": OUTPUT_LIMIT,
+        }
+
+    async def _run_test(self, spec: Language, workdir: str, verdict_path: str, entry: Entrypoint,
+                        test: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {"entry": entry.name, "method": entry.method, "args": call_args(entry, test.get("input", {}))}
+        env = {"PATH": "/usr/bin:/bin", "HOME": workdir, "LANG": "C.UTF-8", **spec.run_env}
+        rlimits = _rlimits(self.cpu_seconds, spec.memory_rlimit, self.memory_mb * 1024 * 1024)
+        async with self._sandbox_uid() as uid:
+            config = self._sandbox_config(spec.run, workdir, env, uid, verdict_path, rlimits, self.memory_mb,
+                                          spec.runtime_paths)
+            result = await self._exec(_supervisor_command(config), workdir, {}, json.dumps(payload).encode(),
+                                      self.timeout_seconds)
+        return self._judge(result, _read_verdict(verdict_path), test.get("expected_output"))
+
+    async def _exec(self, command: List[str], workdir: str, env: Dict[str, str], stdin: bytes,
+                    timeout: float) -> ProcessResult:
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=workdir,
+            env=env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        timed_out = False
+        stdout = stderr = b""
+        try:
+            stdout, stderr, _ = await asyncio.wait_for(asyncio.gather(
+                _read_tail(process.stdout, OUTPUT_LIMIT),
+                _read_tail(process.stderr, OUTPUT_LIMIT),
+                _feed(process, stdin),
+            ), timeout)
+            await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+        finally:
+            # Killing the supervisor takes the sandboxed process (its death
+            # signal) and with it everything else in its PID namespace
+            _kill_group(process)
+            await process.wait()
+        return ProcessResult(
+            returncode=process.returncode,
+            stdout=stdout.decode(errors="replace"),
+            stderr=stderr.decode(errors="replace"),
+            timed_out=timed_out,
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    def _judge(self, result: ProcessResult, verdict: Dict[str, Any], expected: Any) -> Dict[str, Any]:
+        user_stdout = result.stdout.rstrip("\n")
+
+        if result.timed_out:
+            return outcome(TIME_LIMIT_EXCEEDED, error=f"Exceeded the {self.timeout_seconds:g}s time limit",
+                           stdout=user_stdout, runtime_ms=result.elapsed_ms)
+        if not verdict or verdict.get("sandbox_error"):
+            reason = verdict.get("sandbox_error") or result.stderr.strip()[-ERROR_SHOWN:]
+            print(f"[CodeExecution] Sandbox unavailable: {reason}")
+            return outcome(SANDBOX_UNAVAILABLE, error="Code execution is not available on this server")
+
+        runtime_ms, memory_kb = verdict.get("cpu_ms"), verdict.get("memory_kb")
+        if verdict.get("memory_exceeded"):
+            return outcome(MEMORY_LIMIT_EXCEEDED, error=f"Exceeded the {self.memory_mb} MB memory limit",
+                           stdout=user_stdout, memory_kb=memory_kb)
+        if verdict.get("result") is None:
+            return self._crashed(verdict.get("returncode"), result.stderr, user_stdout, runtime_ms)
+
+        try:
+            report = json.loads(verdict["result"])
+            if not isinstance(report, dict):
+                raise ValueError
+        except ValueError:
+            return outcome(RUNTIME_ERROR, error="Could not read the program's result", stdout=user_stdout)
+
+        if not report.get("ok"):
+            error = str(report.get("error") or "Runtime error")
+            status = MEMORY_LIMIT_EXCEEDED if error.startswith("MemoryError") else RUNTIME_ERROR
+            return outcome(status, error=error, stdout=user_stdout, memory_kb=memory_kb)
+
+        value = report.get("value")
+        status = PASSED if outputs_match(value, expected) else WRONG_ANSWER
+        return outcome(status, value=value, stdout=user_stdout, runtime_ms=runtime_ms, memory_kb=memory_kb)
+
+    def _crashed(self, returncode: Optional[int], stderr: str, user_stdout: str,
+                 runtime_ms: Optional[float]) -> Dict[str, Any]:
+        """The process died before the harness could report"""
+        stderr = stderr.strip()
+        if returncode in (-signal.SIGXCPU, -signal.SIGKILL):
+            return outcome(TIME_LIMIT_EXCEEDED, error=f"Exceeded the {self.cpu_seconds}s CPU limit",
+                           stdout=user_stdout, runtime_ms=runtime_ms)
+        if "out of memory" in stderr or "MemoryError" in stderr:
+            return outcome(MEMORY_LIMIT_EXCEEDED, error=f"Exceeded the {self.memory_mb} MB memory limit",
+                           stdout=user_stdout)
+        error = stderr[-ERROR_SHOWN:] or f"Exited with status {returncode}"
+        return outcome(RUNTIME_ERROR, error=error, stdout=user_stdout)
+
+
+# Global instance
+code_executor = CodeExecutor()
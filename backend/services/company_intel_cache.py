@@ -0,0 +1,245 @@
+"""
+Company Intelligence Cache
+
+Cross-user cache for generated company research. Every user who adds a job at
+"Google", "Google LLC" or "google, inc." shares one entry per research
+section, so popular employers are researched once per TTL instead of once
+per job.
+
+Each section has its own freshness window (news goes stale in hours, company
+history in weeks) followed by a stale window. Within the stale window the
+cached value is served immediately and a single background refresh is started
+(stale-while-revalidate); past it the entry is treated as a miss. Concurrent
+misses for the same entry in one process share a single generation.
+
+Hit/miss counters are exposed at GET /api/metrics/company-cache.
+
+Usage:
+    from services.company_intel_cache import company_intel_cache
+
+    profile = await company_intel_cache.get_or_compute(
+        "Google LLC", "job_company_research", lambda: _generate_research("Google LLC")
+    )
+"""
+
+import asyncio
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# section -> (fresh seconds, additional seconds a stale copy may still be served)
+SECTION_TTLS: Dict[str, Tuple[int, int]] = {
+    "company_news": (6 * HOUR, 1 * DAY),
+    "recent_news": (6 * HOUR, 1 * DAY),
+    "job_company_research": (7 * DAY, 14 * DAY),
+    "company_profile": (7 * DAY, 14 * DAY),
+    "leadership_team": (7 * DAY, 14 * DAY),
+    "funding": (7 * DAY, 14 * DAY),
+    "competition": (14 * DAY, 30 * DAY),
+    "market_position": (14 * DAY, 30 * DAY),
+    "mission_and_values": (30 * DAY, 60 * DAY),
+    "history": (30 * DAY, 90 * DAY),
+}
+DEFAULT_TTL = (1 * DAY, 3 * DAY)
+
+# How long one worker holds the refresh lock on a stale entry
+REFRESH_LOCK_SECONDS = 300
+
+_LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co",
+    "company", "plc", "gmbh", "ag", "sa", "nv", "bv", "lp", "llp", "pty", "holdings",
+}
+
+
+def normalize_company_name(name: Optional[str]) -> str:
+    """
+    Canonical company identity: case, accents, punctuation, a leading "the"
+    and trailing legal suffixes are ignored ("The Walt Disney Company" and
+    "walt disney" map to the same key).
+    """
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    # "S.A." -> "sa", "A.T." -> "at"
+    text = text.replace("&", " and ").replace(".", "")
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+
+    if len(words) > 1 and words[0] == "the":
+        words = words[1:]
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words = words[:-1]
+    return " ".join(words)
+
+
+def is_cacheable(value: Any) -> bool:
+    """Default guard: never cache empty results or generator error payloads"""
+    if not value:
+        return False
+    if isinstance(value, dict) and "error" in value:
+        return False
+    return True
+
+
+class CompanyIntelCache:
+    def __init__(self, section_ttls: Dict[str, Tuple[int, int]] = SECTION_TTLS):
+        self.section_ttls = section_ttls
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshing: Set[asyncio.Task] = set()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+        )
+        self._started_at = datetime.now(timezone.utc)
+
+    def ttl_for(self, section: str) -> Tuple[int, int]:
+        return self.section_ttls.get(section, DEFAULT_TTL)
+
+    async def get_or_compute(
+        self,
+        company_name: str,
+        section: str,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = is_cacheable,
+    ) -> Any:
+        """
+        Return the cached section for this company, generating it with
+        compute() on a miss. Results rejected by cacheable() are returned
+        but not stored. Cache failures never fail the caller.
+        """
+        # Imported lazily so the helpers above work without a configured database
+        from mongo.company_intel_dao import company_intel_dao
+
+        company_key = normalize_company_name(company_name)
+        if not company_key:
+            return await compute()
+
+        stats = self._stats[section]
+        entry = None
+        try:
+            entry = await company_intel_dao.get_entry(company_key, section)
+        except Exception as e:
+            stats["errors"] += 1
+            print(f"[CompanyIntelCache] Lookup failed for {company_key}/{section}: {e}")
+
+        now = datetime.now(timezone.utc)
+        if entry:
+            if _as_utc(entry["fresh_until"]) > now:
+                stats["hits"] += 1
+                return entry["data"]
+            if _as_utc(entry["stale_until"]) > now:
+                stats["stale_hits"] += 1
+                self._schedule_refresh(company_name, company_key, section, compute, cacheable)
+                return entry["data"]
+
+        stats["misses"] += 1
+        return await self._single_flight(company_name, company_key, section, compute, cacheable)
+
+    async def _single_flight(self, company_name, company_key, section, compute, cacheable) -> Any:
+        key = f"{company_key}:{section}"
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._generate_and_store(company_name, company_key, section, compute, cacheable)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures don't log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _generate_and_store(self, company_name, company_key, section, compute, cacheable) -> Any:
+        from mongo.company_intel_dao import company_intel_dao
+
+        value = await compute()
+        if cacheable(value):
+            fresh, stale = self.ttl_for(section)
+            try:
+                await company_intel_dao.put_entry(company_key, section, value, fresh, stale, company_name)
+            except Exception as e:
+                self._stats[section]["errors"] += 1
+                print(f"[CompanyIntelCache] Store failed for {company_key}/{section}: {e}")
+        return value
+
+    def _schedule_refresh(self, company_name, company_key, section, compute, cacheable) -> None:
+        key = f"{company_key}:{section}"
+        if key in self._inflight:
+            return
+        task = asyncio.get_running_loop().create_task(
+            self._refresh(company_name, company_key, section, compute, cacheable)
+        )
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+
+    async def _refresh(self, company_name, company_key, section, compute, cacheable) -> None:
+        from mongo.company_intel_dao import company_intel_dao
+
+        try:
+            # Only one worker across all processes regenerates a stale entry
+            if not await company_intel_dao.try_begin_refresh(company_key, section, REFRESH_LOCK_SECONDS):
+                return
+            self._stats[section]["refreshes"] += 1
+            value = await self._single_flight(company_name, company_key, section, compute, cacheable)
+            if not cacheable(value):
+                # Keep serving the stale copy; let the next request try again
+                await company_intel_dao.end_refresh(company_key, section)
+        except Exception as e:
+            self._stats[section]["errors"] += 1
+            print(f"[CompanyIntelCache] Background refresh failed for {company_key}/{section}: {e}")
+
+    async def invalidate(self, company_name: str, section: Optional[str] = None) -> int:
+        from mongo.company_intel_dao import company_intel_dao
+
+        company_key = normalize_company_name(company_name)
+        query = {"company_key": company_key}
+        if section:
+            query["section"] = section
+        result = await company_intel_dao.collection.delete_many(query)
+        return result.deleted_count
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-section and overall counters for this process"""
+        totals = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+        sections = {}
+        for section, counters in self._stats.items():
+            served = counters["hits"] + counters["stale_hits"]
+            lookups = served + counters["misses"]
+            sections[section] = {
+                **counters,
+                "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            }
+            for field, value in counters.items():
+                totals[field] += value
+
+        lookups = totals["hits"] + totals["stale_hits"] + totals["misses"]
+        return {
+            "since": self._started_at.isoformat(),
+            "totals": {
+                **totals,
+                "hit_rate": round((totals["hits"] + totals["stale_hits"]) / lookups, 4) if lookups else 0.0,
+            },
+            "sections": sections,
+        }
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Mongo returns naive datetimes unless the client is tz_aware
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# Global instance
+company_intel_cache = CompanyIntelCache()
@@ -1,15 +1,17 @@
+import asyncio
 import os
-from services.tracked_ai_clients import TrackedCohereClient
+from services.tracked_ai_clients import AsyncTrackedCohereClient
 import json
 import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
+from services.company_intel_cache import company_intel_cache
 from datetime import datetime, timedelta
 import re
 from dateutil import parser as dateparser
 
 load_dotenv()
-co = TrackedCohereClient()
+co = AsyncTrackedCohereClient()
 
 
 # ============================================================
@@ -88,7 +90,9 @@ async def scrape_news(company_name: str):
     query = company_name.replace(" ", "+")
     url = f"https://www.bing.com/news/search?q={query}&sortby=date"
 
-    html = requests.get(url, timeout=10).text
+    # requests is blocking; keep it off the event loop
+    response = await asyncio.to_thread(requests.get, url, timeout=10)
+    html = response.text
     soup = BeautifulSoup(html, "html.parser")
 
     articles = []
@@ -122,6 +126,13 @@ async def scrape_news(company_name: str):
 # SUMMARIZE WITH COHERE
 # ============================================================
 async def run_company_news(company_name: str):
+    """Summarized recent news, shared across users through the company intel cache."""
+    return await company_intel_cache.get_or_compute(
+        company_name, "company_news", lambda: _summarize_company_news(company_name)
+    )
+
+
+async def _summarize_company_news(company_name: str):
     articles = await scrape_news(company_name)
 
     if not articles:
@@ -164,7 +175,7 @@ Rules:
 - relevance_score: 1–100.
 """
 
-    response = co.chat(
+    response = await co.chat(
         model="command-a-03-2025",
         messages=[{"role": "user", "content": prompt}]
     )
@@ -1,15 +1,23 @@
 import os
-from services.tracked_ai_clients import TrackedCohereClient
+from services.tracked_ai_clients import AsyncTrackedCohereClient
 import json
 from dotenv import load_dotenv
+from services.company_intel_cache import company_intel_cache
 
 load_dotenv()
-co = TrackedCohereClient()
+co = AsyncTrackedCohereClient()
 
 async def run_company_research(company_name: str):
-    """Generate detailed structured company research for a company."""
+    """Structured company research, shared across users through the company intel cache."""
     if not company_name:
         return None
+    return await company_intel_cache.get_or_compute(
+        company_name, "job_company_research", lambda: _generate_company_research(company_name)
+    )
+
+
+async def _generate_company_research(company_name: str):
+    """Generate detailed structured company research for a company."""
 
     prompt = f"""
     Create a comprehensive company research profile for: {company_name}
@@ -64,7 +72,7 @@ async def run_company_research(company_name: str):
     - ONLY return clean JSON.
     """
 
-    response = co.chat(
+    response = await co.chat(
         model="command-a-03-2025",
         messages=[{"role": "user", "content": prompt}]
     )
@@ -98,9 +106,3 @@ async def run_company_research(company_name: str):
             "raw": text,
             "cleaned_attempt": clean
         }
-
-
-
-
-
-
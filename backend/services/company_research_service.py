@@ -9,24 +9,67 @@ import json
 import os
 import asyncio
 import traceback
+from contextvars import ContextVar
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
-from concurrent.futures import ThreadPoolExecutor
-from services.tracked_ai_clients import TrackedOpenAIClient
+from typing import Dict, List, Optional, Any, AsyncIterator, Awaitable, Callable, Tuple
+from services.tracked_ai_clients import AsyncTrackedOpenAIClient
+from services.company_intel_cache import company_intel_cache
+
+# Report sections in the order they are presented
+RESEARCH_SECTIONS = [
+    "company_profile",
+    "history",
+    "mission_and_values",
+    "leadership_team",
+    "recent_news",
+    "funding",
+    "competition",
+    "market_position",
+    "talking_points",
+    "intelligent_questions",
+]
+
+# Sections that only depend on the company, so one copy is shared by every
+# user (talking points and questions are tailored to the job and never shared)
+SHARED_SECTIONS = {
+    "company_profile",
+    "history",
+    "mission_and_values",
+    "leadership_team",
+    "recent_news",
+    "funding",
+    "competition",
+    "market_position",
+}
+
+# Set when a model call fails, so a section's built-in fallback text is
+# returned to the caller but never written to the shared cache
+_ai_call_failed: ContextVar[bool] = ContextVar("_ai_call_failed", default=False)
+
+# At most this many model calls in flight per report
+MAX_CONCURRENT_SECTIONS = int(os.getenv("COMPANY_RESEARCH_CONCURRENCY", "5"))
+# A section that takes longer than this falls back to its deterministic output
+SECTION_TIMEOUT_SECONDS = float(os.getenv("COMPANY_RESEARCH_SECTION_TIMEOUT", "45"))
 
 
 class CompanyResearchService:
     """Service for generating company research reports for interviews"""
 
-    # Thread pool for running sync OpenAI calls
-    _executor = ThreadPoolExecutor(max_workers=3)
+    # Shared async client (one connection pool for every section call)
+    _client = None
+
+    @classmethod
+    def _get_client(cls) -> AsyncTrackedOpenAIClient:
+        if cls._client is None:
+            cls._client = AsyncTrackedOpenAIClient()
+        return cls._client
 
     @staticmethod
-    def _call_openai(prompt: str, system_message: str = "") -> str:
-        """Call OpenAI API with the given prompt and system message (synchronous)"""
+    async def _call_openai_async(prompt: str, system_message: str = "") -> str:
+        """Call OpenAI API with the given prompt and system message"""
         try:
-            client = TrackedOpenAIClient()
-            response = client.chat.completions.create(
+            client = CompanyResearchService._get_client()
+            response = await client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": system_message or "You are a helpful research assistant providing company insights for interview preparation."},
@@ -37,21 +80,7 @@ class CompanyResearchService:
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
-            raise Exception(f"OpenAI API error: {str(e)}")
-
-    @staticmethod
-    async def _call_openai_async(prompt: str, system_message: str = "") -> str:
-        """Call OpenAI API asynchronously by running sync call in thread pool"""
-        try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                CompanyResearchService._executor,
-                CompanyResearchService._call_openai,
-                prompt,
-                system_message
-            )
-            return response
-        except Exception as e:
+            _ai_call_failed.set(True)
             raise Exception(f"OpenAI API error: {str(e)}")
 
     @staticmethod
@@ -67,6 +96,9 @@ class CompanyResearchService:
         """
         Generate comprehensive company research report.
 
+        Sections are generated concurrently (see stream_company_research);
+        a section that fails or times out falls back on its own.
+
         Args:
             company_name: Name of the company
             job_role: Job title/position
@@ -79,53 +111,21 @@ class CompanyResearchService:
         Returns:
             Dictionary containing company research report
         """
-
-        # Prepare data for AI
-        company_context = CompanyResearchService._prepare_context(
-            company_name=company_name,
-            job_role=job_role,
-            job_description=job_description,
-            industry=industry,
-            company_website=company_website,
-            company_info=company_info,
-        )
-
         try:
-            # Generate research sections
-            research_report = {
-                "company_profile": await CompanyResearchService._generate_company_profile(
-                    company_name, company_context, custom_prompt
-                ),
-                "history": await CompanyResearchService._generate_company_history(
-                    company_name, company_context, custom_prompt
-                ),
-                "mission_and_values": await CompanyResearchService._generate_mission_values(
-                    company_name, company_context, custom_prompt
-                ),
-                "leadership_team": await CompanyResearchService._generate_leadership_team(
-                    company_name, company_context, custom_prompt
-                ),
-                "recent_news": await CompanyResearchService._generate_recent_news(
-                    company_name, company_context, custom_prompt
-                ),
-                "funding": await CompanyResearchService._generate_funding_info(
-                    company_name, industry, company_context, custom_prompt
-                ),
-                "competition": await CompanyResearchService._generate_competition(
-                    company_name, industry, company_context, custom_prompt
-                ),
-                "market_position": await CompanyResearchService._generate_market_position(
-                    company_name, industry, company_context, custom_prompt
-                ),
-                "talking_points": await CompanyResearchService._generate_talking_points(
-                    company_name, job_role, job_description, company_context, custom_prompt
-                ),
-                "intelligent_questions": await CompanyResearchService._generate_intelligent_questions(
-                    company_name, job_role, industry, company_context, custom_prompt
-                ),
-                "generated_at": datetime.now(timezone.utc),
-            }
+            sections = {}
+            async for section, value in CompanyResearchService.stream_company_research(
+                company_name=company_name,
+                job_role=job_role,
+                job_description=job_description,
+                industry=industry,
+                company_website=company_website,
+                company_info=company_info,
+                custom_prompt=custom_prompt,
+            ):
+                sections[section] = value
 
+            research_report = {section: sections[section] for section in RESEARCH_SECTIONS}
+            research_report["generated_at"] = datetime.now(timezone.utc)
             return research_report
 
         except Exception as e:
@@ -144,6 +144,120 @@ class CompanyResearchService:
                 company_info=company_info,
             )
 
+    @staticmethod
+    async def stream_company_research(
+        company_name: str,
+        job_role: Optional[str] = None,
+        job_description: Optional[str] = None,
+        industry: Optional[str] = None,
+        company_website: Optional[str] = None,
+        company_info: Optional[Dict[str, Any]] = None,
+        custom_prompt: Optional[str] = None,
+        max_concurrency: int = MAX_CONCURRENT_SECTIONS,
+        section_timeout: float = SECTION_TIMEOUT_SECONDS,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate every report section concurrently and yield (section, value)
+        pairs in completion order.
+
+        At most max_concurrency model calls run at once. A section that raises
+        or exceeds section_timeout yields its deterministic fallback instead,
+        so one slow or failing call never costs the whole report.
+        """
+        context = CompanyResearchService._prepare_context(
+            company_name=company_name,
+            job_role=job_role,
+            job_description=job_description,
+            industry=industry,
+            company_website=company_website,
+            company_info=company_info,
+        )
+        fallback = CompanyResearchService._generate_fallback_research(
+            company_name=company_name,
+            job_role=job_role,
+            job_description=job_description,
+            industry=industry,
+            company_website=company_website,
+            company_info=company_info,
+        )
+        generators = CompanyResearchService._section_generators(
+            company_name, job_role, job_description, industry, context, custom_prompt
+        )
+        if not custom_prompt:
+            # Custom prompts produce one-off text; everything else is shareable
+            generators = {
+                section: CompanyResearchService._shared_section(company_name, section, generate)
+                if section in SHARED_SECTIONS else generate
+                for section, generate in generators.items()
+            }
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_section(section: str, generate: Callable[[], Awaitable[Any]]) -> Tuple[str, Any]:
+            async with semaphore:
+                try:
+                    return section, await asyncio.wait_for(generate(), timeout=section_timeout)
+                except asyncio.TimeoutError:
+                    print(f"[UC-074 WARN] Section {section} timed out after {section_timeout}s for {company_name}")
+                except Exception as e:
+                    print(f"[UC-074 WARN] Section {section} failed for {company_name}: {str(e)}")
+                return section, fallback[section]
+
+        tasks = [asyncio.create_task(run_section(section, generate)) for section, generate in generators.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client disconnected mid-stream: don't leave model calls running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _shared_section(
+        company_name: str, section: str, generate: Callable[[], Awaitable[Any]]
+    ) -> Callable[[], Awaitable[Any]]:
+        """Wrap a section generator with the cross-user company intel cache"""
+        degraded = False
+
+        async def compute() -> Any:
+            nonlocal degraded
+            _ai_call_failed.set(False)
+            value = await generate()
+            degraded = _ai_call_failed.get()
+            return value
+
+        return lambda: company_intel_cache.get_or_compute(
+            company_name, section, compute, cacheable=lambda value: bool(value) and not degraded
+        )
+
+    @staticmethod
+    def _section_generators(
+        company_name: str,
+        job_role: Optional[str],
+        job_description: Optional[str],
+        industry: Optional[str],
+        context: Dict[str, Any],
+        custom_prompt: Optional[str],
+    ) -> Dict[str, Callable[[], Awaitable[Any]]]:
+        """Map each report section to a zero-argument coroutine factory"""
+        svc = CompanyResearchService
+        return {
+            "company_profile": lambda: svc._generate_company_profile(company_name, context, custom_prompt),
+            "history": lambda: svc._generate_company_history(company_name, context, custom_prompt),
+            "mission_and_values": lambda: svc._generate_mission_values(company_name, context, custom_prompt),
+            "leadership_team": lambda: svc._generate_leadership_team(company_name, context, custom_prompt),
+            "recent_news": lambda: svc._generate_recent_news(company_name, context, custom_prompt),
+            "funding": lambda: svc._generate_funding_info(company_name, industry, context, custom_prompt),
+            "competition": lambda: svc._generate_competition(company_name, industry, context, custom_prompt),
+            "market_position": lambda: svc._generate_market_position(company_name, industry, context, custom_prompt),
+            "talking_points": lambda: svc._generate_talking_points(
+                company_name, job_role, job_description, context, custom_prompt
+            ),
+            "intelligent_questions": lambda: svc._generate_intelligent_questions(
+                company_name, job_role, industry, context, custom_prompt
+            ),
+        }
+
     @staticmethod
     def _prepare_context(
         company_name: str,
@@ -10,6 +10,8 @@ from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional, List, Any
 
+from services.notification_dispatcher import notification_dispatcher
+
 
 class FollowUpService:
     """Service for generating interview follow-up templates and sending emails"""
@@ -18,8 +20,6 @@ class FollowUpService:
         """Initialize email configuration"""
         self.sender_email = os.getenv("GMAIL_SENDER")
         self.sender_password = os.getenv("GMAIL_APP_PASSWORD")
-        self.smtp_host = "smtp.gmail.com"
-        self.smtp_port = 465
     
     # ========================================================================
     # EMAIL SENDING METHODS
@@ -85,7 +85,7 @@ class FollowUpService:
 </html>
 """
     
-    def send_followup_email(
+    async def send_followup_email(
         self,
         recipient_email: str,
         sender_name: str,
@@ -129,9 +129,7 @@ class FollowUpService:
         
         # Send email
         try:
-            with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, recipient_email, message.as_string())
+            await notification_dispatcher.send(message, recipient_email, sender=self.sender_email)
             
             return {
                 "success": True,
@@ -147,7 +145,7 @@ class FollowUpService:
         except Exception as e:
             raise Exception(f"Failed to send email: {str(e)}")
     
-    def send_interview_reminder(
+    async def send_interview_reminder(
         self,
         recipient_email: str,
         recipient_name: str,
@@ -204,7 +202,7 @@ Best regards,
 Metamorphosis Interview Manager
 """
         
-        return self.send_followup_email(
+        return await self.send_followup_email(
             recipient_email=recipient_email,
             sender_name="Metamorphosis",
             subject=subject,
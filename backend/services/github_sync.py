@@ -0,0 +1,339 @@
+"""
+GitHub Sync
+
+Keeps a user's stored repositories (github_repositories) in step with GitHub
+while spending as little of their API rate limit as possible.
+
+- One pooled httpx client for every GitHub call in the process, so requests
+  reuse warm TLS connections instead of opening one per call.
+- The repository listing is walked page by page (Link: next) rather than
+  stopping at the first 100 repos.
+- Every request is conditional: the ETag from the last response goes out as
+  If-None-Match, and a 304 (which GitHub does not count against the rate
+  limit) means the stored copy is still current. Unchanged listing pages are
+  skipped entirely.
+- Languages and commit activity are only re-fetched for repos that are new
+  or whose pushed_at moved (or whose activity GitHub was still computing),
+  at most CONCURRENCY requests at a time.
+- Repos that disappeared from the listing (deleted or made private) are
+  removed; featured flags, notes and linked skills survive a sync.
+
+POST /github/sync queues a "github_sync" task on the job queue; the
+repository list runs the same sync inline for refresh=true and for a user
+who has never been synced.
+
+Usage:
+    from services.github_sync import sync_user_repositories, enqueue_github_sync
+
+    summary = await sync_user_repositories(uuid)
+    task = await enqueue_github_sync(uuid)
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from mongo.github_repos_dao import github_repos_dao
+from mongo.github_tokens_dao import github_tokens_dao
+from services.job_queue import job_queue
+
+GITHUB_API = "https://api.github.com"
+CONCURRENCY = int(os.getenv("GITHUB_SYNC_CONCURRENCY", "8"))
+PER_PAGE = 100
+# 5,000 repositories; a listing longer than that is cut off, not looped over
+MAX_PAGES = 50
+REQUEST_TIMEOUT = 30.0
+
+GITHUB_SYNC = "github_sync"
+
+
+class GitHubError(Exception):
+    def __init__(self, status_code: int, message: str, rate_limited: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.rate_limited = rate_limited
+
+
+@dataclass
+class GitHubResponse:
+    status: int
+    data: Any = None
+    etag: Optional[str] = None
+    next_url: Optional[str] = None
+
+
+class GitHubClient:
+    """Shared, pooled client for the GitHub REST API"""
+
+    def __init__(self, base_url: str = GITHUB_API, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        # Requests sent / answered 304 since start, and the last rate limit GitHub reported
+        self.requests = 0
+        self.not_modified = 0
+        self.rate_limit_remaining: Optional[int] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=REQUEST_TIMEOUT,
+                limits=httpx.Limits(max_connections=CONCURRENCY * 2, max_keepalive_connections=CONCURRENCY * 2),
+                headers={"Accept": "application/vnd.github.v3+json", "X-GitHub-Api-Version": "2022-11-28"},
+                transport=self._transport,
+            )
+        return self._client
+
+    async def get(self, url: str, token: str, etag: Optional[str] = None) -> GitHubResponse:
+        """GET a path or absolute URL; 304/202/204 come back as a status without data"""
+        headers = {"Authorization": f"Bearer {token}"}
+        if etag:
+            headers["If-None-Match"] = etag
+
+        response = await self._http().get(url, headers=headers)
+        self.requests += 1
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+
+        if response.status_code == 304:
+            self.not_modified += 1
+            return GitHubResponse(304, etag=etag)
+        if response.status_code == 401:
+            raise GitHubError(401, "GitHub token expired or invalid")
+        if response.status_code in (403, 429) and (remaining == "0" or response.status_code == 429):
+            raise GitHubError(403, "GitHub API rate limit exceeded", rate_limited=True)
+        if response.status_code in (202, 204):
+            # 202: statistics are still being computed; 204: empty repository
+            return GitHubResponse(response.status_code)
+        if response.status_code != 200:
+            raise GitHubError(response.status_code, f"GitHub API error: {response.text}")
+
+        return GitHubResponse(
+            200,
+            data=response.json(),
+            etag=response.headers.get("ETag"),
+            next_url=response.links.get("next", {}).get("url"),
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global instance
+github_client = GitHubClient()
+
+
+async def get_access_token(uuid: str) -> str:
+    tokens = await github_tokens_dao.get_tokens(uuid)
+    if not tokens or not tokens.get("access_token"):
+        raise GitHubError(401, "GitHub not connected")
+    return tokens["access_token"]
+
+
+def summarize_commit_activity(weeks: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Total and last-4-weeks commits from /stats/commit_activity"""
+    if not weeks:
+        return {"total_commits": 0, "recent_commits": 0}
+    total = sum(week.get("total", 0) for week in weeks)
+    recent = sum(week.get("total", 0) for week in weeks[-4:]) if len(weeks) >= 4 else total
+    return {"total_commits": total, "recent_commits": recent, "weekly_data": weeks}
+
+
+def repository_fields(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """Stored fields for one repo from the listing (languages and activity are fetched separately)"""
+    return {
+        "repo_id": repo["id"],
+        "name": repo["name"],
+        "full_name": repo["full_name"],
+        "description": repo.get("description"),
+        "html_url": repo["html_url"],
+        "homepage": repo.get("homepage"),
+        "language": repo.get("language"),
+        "stargazers_count": repo.get("stargazers_count", 0),
+        "forks_count": repo.get("forks_count", 0),
+        "watchers_count": repo.get("watchers_count", 0),
+        "open_issues_count": repo.get("open_issues_count", 0),
+        "size": repo.get("size", 0),
+        "created_at": repo.get("created_at", ""),
+        "updated_at": repo.get("updated_at", ""),
+        "pushed_at": repo.get("pushed_at"),
+        "topics": repo.get("topics", []),
+        "is_private": repo.get("private", False),
+        "is_fork": repo.get("fork", False),
+        "is_archived": repo.get("archived", False),
+    }
+
+
+async def fetch_languages(full_name: str, token: str, etag: Optional[str] = None) -> Dict[str, Any]:
+    """Fields to $set for a repo's languages; empty when unchanged"""
+    response = await github_client.get(f"/repos/{full_name}/languages", token, etag=etag)
+    if response.status != 200:
+        return {}
+    return {"languages": response.data or {}, "languages_etag": response.etag}
+
+
+async def fetch_commit_activity(full_name: str, token: str, etag: Optional[str] = None) -> Dict[str, Any]:
+    """Fields to $set for a repo's commit activity; empty when unchanged"""
+    response = await github_client.get(f"/repos/{full_name}/stats/commit_activity", token, etag=etag)
+    if response.status == 304:
+        return {}
+    if response.status == 202:
+        # GitHub is computing the statistics; ask again next sync
+        return {"commit_activity_pending": True}
+    return {
+        "commit_activity": summarize_commit_activity(response.data),
+        "commit_activity_etag": response.etag,
+        "commit_activity_pending": False,
+    }
+
+
+async def refresh_commit_activity(uuid: str, repo: Dict[str, Any], token: str) -> Dict[str, Any]:
+    """Conditionally re-fetch one stored repo's commit activity; returns the current summary"""
+    fields = await fetch_commit_activity(repo["full_name"], token, etag=repo.get("commit_activity_etag"))
+    if fields:
+        await github_repos_dao.update_repo_fields(uuid, repo["repo_id"], fields)
+    return fields.get("commit_activity") or repo.get("commit_activity") or summarize_commit_activity(None)
+
+
+async def _guarded(fetch, repo: Dict[str, Any], etag: Optional[str], token: str,
+                   slots: asyncio.Semaphore, skipped: List[str]) -> Dict[str, Any]:
+    """
+    One per-repo detail request. A bad token or the rate limit stops the sync;
+    anything else (including a 403 for just this repo) skips the repo and is
+    recorded in skipped.
+    """
+    async with slots:
+        try:
+            return await fetch(repo["full_name"], token, etag=etag)
+        except GitHubError as e:
+            if e.status_code == 401 or e.rate_limited:
+                raise
+            print(f"[GitHubSync] Skipping details for {repo['full_name']}: {e.message}")
+            skipped.append(repo["full_name"])
+            return {}
+
+
+async def _fetch_details(repo: Dict[str, Any], known: Dict[str, Any], token: str,
+                         slots: asyncio.Semaphore, skipped: List[str]) -> Dict[str, Any]:
+    languages, activity = await asyncio.gather(
+        _guarded(fetch_languages, repo, known.get("languages_etag"), token, slots, skipped),
+        _guarded(fetch_commit_activity, repo, known.get("commit_activity_etag"), token, slots, skipped),
+    )
+    return {**languages, **activity}
+
+
+async def sync_user_repositories(uuid: str) -> Dict[str, Any]:
+    """Bring a user's stored repositories up to date with GitHub. Returns what the sync did."""
+    token = await get_access_token(uuid)
+    requests_before, not_modified_before = github_client.requests, github_client.not_modified
+
+    state = await github_repos_dao.get_sync_state(uuid) or {}
+    cached_pages = {page["url"]: page for page in state.get("pages", [])}
+    known = await github_repos_dao.get_sync_index(uuid)
+
+    pages: List[Dict[str, Any]] = []
+    listed_ids: List[int] = []
+    changed: List[Dict[str, Any]] = []
+    url: Optional[str] = f"/user/repos?per_page={PER_PAGE}&sort=updated"
+    complete = False
+
+    for _ in range(MAX_PAGES):
+        cached = cached_pages.get(url)
+        response = await github_client.get(url, token, etag=cached["etag"] if cached else None)
+        if response.status == 304:
+            pages.append(cached)
+            listed_ids.extend(cached["repo_ids"])
+            url = cached.get("next")
+        else:
+            # Only public repositories are shown (free tier)
+            repos = [repository_fields(r) for r in (response.data or []) if not r.get("private", False)]
+            changed.extend(repos)
+            page_ids = [r["repo_id"] for r in repos]
+            listed_ids.extend(page_ids)
+            pages.append({"url": url, "etag": response.etag, "repo_ids": page_ids, "next": response.next_url})
+            url = response.next_url
+        if not url:
+            complete = True
+            break
+
+    # Languages only change with a push; activity also when GitHub had not finished computing it
+    slots = asyncio.Semaphore(CONCURRENCY)
+    skipped: List[str] = []
+    stale = [
+        r for r in changed
+        if r["repo_id"] not in known
+        or known[r["repo_id"]].get("pushed_at") != r["pushed_at"]
+        or known[r["repo_id"]].get("commit_activity_pending")
+    ]
+    details = await asyncio.gather(*(_fetch_details(r, known.get(r["repo_id"], {}), token, slots, skipped) for r in stale))
+    for repo, fields in zip(stale, details):
+        repo.update(fields)
+
+    # Pending activity on a listing page that came back 304 is retried on its own
+    changed_ids = {r["repo_id"] for r in changed}
+    pending = [
+        known[repo_id] for repo_id in set(listed_ids) - changed_ids
+        if repo_id in known and known[repo_id].get("commit_activity_pending")
+    ]
+    activity = await asyncio.gather(*(
+        _guarded(fetch_commit_activity, r, r.get("commit_activity_etag"), token, slots, skipped) for r in pending
+    ))
+
+    synced_at = datetime.now(timezone.utc).isoformat()
+    # The page ETags are only saved once their repos are stored; otherwise the
+    # next sync would get 304s for pages whose repos never made it in
+    if changed and not await github_repos_dao.store_repos(uuid, changed):
+        raise RuntimeError(f"Storing {len(changed)} repositories for {uuid} failed")
+    for repo, fields in zip(pending, activity):
+        if fields:
+            await github_repos_dao.update_repo_fields(uuid, repo["repo_id"], fields)
+    removed = await github_repos_dao.delete_repos_except(uuid, listed_ids) if complete else 0
+    await github_repos_dao.mark_synced(uuid, synced_at)
+
+    summary = {
+        "repositories": len(set(listed_ids)),
+        "updated": len(changed),
+        "details_fetched": len(stale) + len(pending),
+        "removed": removed,
+        # Repos whose details could not be fetched (e.g. 403 for that repo alone)
+        "skipped": sorted(set(skipped)),
+        "requests": github_client.requests - requests_before,
+        "not_modified": github_client.not_modified - not_modified_before,
+        "rate_limit_remaining": github_client.rate_limit_remaining,
+        "complete": complete,
+    }
+    await github_repos_dao.save_sync_state(uuid, {"pages": pages, "last_synced": synced_at, "last_sync": summary})
+    print(f"[GitHubSync] {uuid}: {summary['repositories']} repos, {summary['updated']} updated, "
+          f"{summary['not_modified']}/{summary['requests']} requests not modified")
+    return summary
+
+
+def sync_task_key(uuid: str) -> str:
+    return f"{GITHUB_SYNC}:{uuid}"
+
+
+async def enqueue_github_sync(uuid: str) -> Dict:
+    """Queue a background sync; at most one per user is pending at a time"""
+    return await job_queue.enqueue(GITHUB_SYNC, sync_task_key(uuid), {"uuid": uuid}, max_attempts=3, force=True)
+
+
+async def handle_github_sync(payload: Dict) -> Dict:
+    try:
+        return await sync_user_repositories(payload["uuid"])
+    except GitHubError as e:
+        if e.status_code == 401:
+            # Retrying cannot fix a missing or revoked token
+            return {"skipped": e.message}
+        raise
+
+
+job_queue.register(GITHUB_SYNC, handle_github_sync)
@@ -0,0 +1,227 @@
+"""
+Gmail Ingestion
+
+Fetches and caches the Gmail messages behind the email search endpoints.
+
+- The Google client is blocking, so every Gmail call runs in a worker thread
+  instead of on the event loop.
+- A search lists matching ids, serves what is already in the gmail_messages
+  cache and fetches only the rest, as metadata (headers + snippet) in Gmail
+  batch requests of up to BATCH_SIZE messages: 20 new results cost two HTTP
+  round trips instead of 21.
+- Before each search the mailbox history since the cached historyId is
+  replayed; messages whose labels changed or that were deleted are dropped
+  from the cache and re-fetched on demand. If Gmail no longer has that much
+  history, the user's cache is rebuilt from scratch. A fresh cache starts
+  from the mailbox's current historyId, read before listing, never from a
+  message's historyId, which can predate the history Gmail keeps.
+- Bodies are never part of a search. get_body loads one the first time it is
+  opened and caches it with the message.
+
+Usage:
+    from services.gmail_ingestion import search_messages, get_message_body
+
+    emails = await search_messages(uuid, "from:acme", max_results=20)
+    body = await get_message_body(uuid, email_id)
+"""
+
+import asyncio
+import base64
+import os
+from typing import Any, Dict, List, Optional, Set
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+from mongo.gmail_messages_dao import gmail_messages_dao
+from mongo.gmail_tokens_dao import gmail_tokens_dao
+
+# Gmail rejects batches over 100 and throttles large ones; 50 is Google's recommendation
+BATCH_SIZE = 50
+METADATA_HEADERS = ["Subject", "From", "To", "Date"]
+HISTORY_TYPES = ["labelAdded", "labelRemoved", "messageDeleted"]
+# Replaying more history than this costs more than re-fetching the results
+MAX_HISTORY_PAGES = 10
+
+
+class GmailError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+async def get_gmail_client(uuid: str):
+    """Authenticated Gmail API client for a user"""
+    tokens = await gmail_tokens_dao.get_tokens(uuid)
+    if not tokens or not tokens.get("access_token"):
+        raise GmailError(401, "Gmail not connected")
+
+    credentials = Credentials(
+        token=tokens["access_token"],
+        refresh_token=tokens.get("refresh_token"),
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id=os.getenv("GOOGLE_CLIENT_ID"),
+        client_secret=os.getenv("GOOGLE_CLIENT_SECRET")
+    )
+    return await asyncio.to_thread(build, "gmail", "v1", credentials=credentials, cache_discovery=False)
+
+
+def parse_metadata(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Gmail metadata-format message -> cached email fields"""
+    headers = {h["name"].lower(): h["value"] for h in message.get("payload", {}).get("headers", [])}
+    return {
+        "id": message["id"],
+        "thread_id": message.get("threadId", ""),
+        "history_id": message.get("historyId"),
+        "subject": headers.get("subject", "No Subject"),
+        "from": headers.get("from", "Unknown"),
+        "to": headers.get("to", ""),
+        "date": headers.get("date", ""),
+        "snippet": message.get("snippet", ""),
+        "labels": message.get("labelIds", []),
+    }
+
+
+def extract_body(payload: Dict[str, Any]) -> str:
+    """First text/plain part of a full-format payload"""
+    if "parts" in payload:
+        for part in payload["parts"]:
+            if part["mimeType"] == "text/plain":
+                data = part["body"].get("data", "")
+                if data:
+                    return base64.urlsafe_b64decode(data).decode("utf-8")
+            elif "parts" in part:
+                result = extract_body(part)
+                if result:
+                    return result
+    else:
+        data = payload["body"].get("data", "")
+        if data:
+            return base64.urlsafe_b64decode(data).decode("utf-8")
+    return ""
+
+
+# ============================================================================
+# Blocking Gmail calls (run via asyncio.to_thread)
+# ============================================================================
+
+def _list_message_ids(service, query: str, max_results: int) -> List[str]:
+    results = service.users().messages().list(userId="me", q=query, maxResults=max_results).execute()
+    return [m["id"] for m in results.get("messages", [])]
+
+
+def _fetch_metadata(service, message_ids: List[str]) -> Dict[str, Dict]:
+    """Metadata for many messages, BATCH_SIZE per HTTP request"""
+    fetched: Dict[str, Dict] = {}
+
+    def collect(request_id, response, exception):
+        if exception is not None:
+            # Deleted between list and get, or a transient per-message error
+            print(f"[GmailIngestion] Skipping message {request_id}: {exception}")
+            return
+        fetched[request_id] = response
+
+    for start in range(0, len(message_ids), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=collect)
+        for message_id in message_ids[start:start + BATCH_SIZE]:
+            batch.add(
+                service.users().messages().get(
+                    userId="me", id=message_id, format="metadata", metadataHeaders=METADATA_HEADERS
+                ),
+                request_id=message_id
+            )
+        batch.execute()
+    return fetched
+
+
+def _history_changes(service, start_history_id: str) -> Optional[tuple]:
+    """(ids changed since start_history_id, current historyId), or None when that history is gone"""
+    changed: Set[str] = set()
+    page_token = None
+    try:
+        for _ in range(MAX_HISTORY_PAGES):
+            response = service.users().history().list(
+                userId="me",
+                startHistoryId=start_history_id,
+                historyTypes=HISTORY_TYPES,
+                pageToken=page_token,
+                maxResults=500
+            ).execute()
+            for record in response.get("history", []):
+                for key in ("labelsAdded", "labelsRemoved", "messagesDeleted"):
+                    changed.update(item["message"]["id"] for item in record.get(key, []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return changed, response.get("historyId", start_history_id)
+    except HttpError as e:
+        if e.resp.status == 404:
+            return None
+        raise
+    return None
+
+
+def _current_history_id(service) -> str:
+    return service.users().getProfile(userId="me").execute()["historyId"]
+
+
+def _fetch_full(service, message_id: str) -> Dict[str, Any]:
+    return service.users().messages().get(userId="me", id=message_id, format="full").execute()
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+async def _apply_history(uuid: str, service) -> Optional[str]:
+    """Drop cached messages changed since the last search; returns the historyId the cache is now current as of"""
+    history_id = await gmail_messages_dao.get_history_id(uuid)
+    if not history_id:
+        return None
+
+    delta = await asyncio.to_thread(_history_changes, service, history_id)
+    if delta is None:
+        print(f"[GmailIngestion] History for {uuid} expired, rebuilding cache")
+        await gmail_messages_dao.delete_user_messages(uuid)
+        return None
+
+    changed, current = delta
+    await gmail_messages_dao.invalidate(uuid, changed)
+    return current
+
+
+async def search_messages(uuid: str, query: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    """Messages matching a Gmail query, newest first, from cache where possible"""
+    service = await get_gmail_client(uuid)
+    history_id = await _apply_history(uuid, service)
+    if history_id is None:
+        # Read before listing, so whatever changes from here on is in the next replay
+        history_id = await asyncio.to_thread(_current_history_id, service)
+
+    message_ids = await asyncio.to_thread(_list_message_ids, service, query, max_results)
+    cached = await gmail_messages_dao.get_messages(uuid, message_ids)
+
+    missing = [message_id for message_id in message_ids if message_id not in cached]
+    if missing:
+        fetched = await asyncio.to_thread(_fetch_metadata, service, missing)
+        parsed = [parse_metadata(message) for message in fetched.values()]
+        await gmail_messages_dao.store_messages(uuid, parsed)
+        cached.update((message["id"], message) for message in parsed)
+
+    await gmail_messages_dao.save_history_id(uuid, history_id)
+
+    return [cached[message_id] for message_id in message_ids if message_id in cached]
+
+
+async def get_message_body(uuid: str, message_id: str) -> str:
+    """Plain-text body of one message, fetched from Gmail the first time it is opened"""
+    body = await gmail_messages_dao.get_body(uuid, message_id)
+    if body is not None:
+        return body
+
+    service = await get_gmail_client(uuid)
+    message = await asyncio.to_thread(_fetch_full, service, message_id)
+    body = extract_body(message["payload"])
+    await gmail_messages_dao.store_body(uuid, message_id, body)
+    return body
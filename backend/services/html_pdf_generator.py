@@ -4,7 +4,15 @@ Converts HTML resume to PDF using Playwright
 Renders the exact same styling as the React frontend
 """
 
-from playwright.async_api import async_playwright
+from services.browser_pool import browser_pool
+
+PDF_MARGIN = {'top': '0.5in', 'right': '0.5in', 'bottom': '0.5in', 'left': '0.5in'}
+
+
+async def _render_pdf(context, html_content: str) -> bytes:
+    page = await context.new_page()
+    await page.set_content(html_content)
+    return await page.pdf(format='Letter', margin=PDF_MARGIN)
 
 
 class HTMLPDFGenerator:
@@ -13,7 +21,7 @@ class HTMLPDFGenerator:
     @staticmethod
     async def generate_pdf_from_html_async(html_content: str) -> bytes:
         """
-        Generate PDF from HTML content using Playwright
+        Generate PDF from HTML content using the shared browser pool
 
         Args:
             html_content: Complete HTML string with inline styles
@@ -25,35 +33,8 @@ class HTMLPDFGenerator:
         if not isinstance(html_content, str):
             raise TypeError(f"html_content must be a string, got {type(html_content).__name__}")
 
-        browser = None
         try:
-            async with async_playwright() as p:
-                try:
-                    browser = await p.chromium.launch(headless=True)
-                except NotImplementedError as e:
-                    print(f"[HTMLPDFGenerator] NotImplementedError (Windows asyncio): {e}")
-                    raise ValueError("Playwright browser launch failed. Run: python -m playwright install")
-                except Exception as e:
-                    print(f"[HTMLPDFGenerator] Failed to launch browser: {e}")
-                    raise
-
-                page = None
-                try:
-                    page = await browser.new_page()
-                    await page.set_content(html_content)
-
-                    # Generate PDF
-                    pdf_bytes = await page.pdf(
-                        format='Letter',
-                        margin={'top': '0.5in', 'right': '0.5in', 'bottom': '0.5in', 'left': '0.5in'},
-                    )
-
-                    return pdf_bytes
-                finally:
-                    if page:
-                        await page.close()
-                    if browser:
-                        await browser.close()
+            return await browser_pool.run(_render_pdf, html_content)
         except Exception as e:
             print(f"[HTMLPDFGenerator] Error in generate_pdf_from_html_async: {e}")
             raise
@@ -10,6 +10,7 @@ import random
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 from mongo.interview_ai_dao import interview_ai_dao
+from utils.lexicon import Lexicon
 import os
 
 # ============================================================================
@@ -27,6 +28,13 @@ USE_DUMMY_AI_COACHING = os.getenv("USE_DUMMY_AI_COACHING", "false").lower() == "
 class STARFrameworkAnalyzer:
     """Analyzes responses for STAR (Situation, Task, Action, Result) compliance"""
 
+    STAR_INDICATORS = Lexicon.from_groups({
+        "situation": ["at my previous", "in my role", "when i was", "during", "worked at", "situation:", "faced"],
+        "task": ["my task", "responsible for", "needed to", "tasked with", "my responsibility", "task:", "had to"],
+        "action": ["i took", "i implemented", "i led", "i created", "i developed", "action:", "i did", "i worked"],
+        "result": ["resulted in", "outcome", "the result", "improved", "increased", "delivered", "achieved", "result:"],
+    })
+
     @staticmethod
     def analyze_star_framework(response_text: str, is_behavioral: bool = True) -> Dict[str, Any]:
         """
@@ -46,19 +54,12 @@ class STARFrameworkAnalyzer:
                 "reason": "STAR framework only applies to behavioral questions"
             }
 
-        # Tokenize response for analysis
-        response_lower = response_text.lower()
-
-        # Simple keyword-based detection for STAR elements
-        situation_indicators = ["at my previous", "in my role", "when i was", "during", "worked at", "situation:", "faced"]
-        task_indicators = ["my task", "responsible for", "needed to", "tasked with", "my responsibility", "task:", "had to"]
-        action_indicators = ["i took", "i implemented", "i led", "i created", "i developed", "action:", "i did", "i worked"]
-        result_indicators = ["resulted in", "outcome", "the result", "improved", "increased", "delivered", "achieved", "result:"]
-
-        has_situation = any(indicator in response_lower for indicator in situation_indicators)
-        has_task = any(indicator in response_lower for indicator in task_indicators)
-        has_action = any(indicator in response_lower for indicator in action_indicators)
-        has_result = any(indicator in response_lower for indicator in result_indicators)
+        # Simple keyword-based detection for STAR elements, in one pass over the response
+        elements = STARFrameworkAnalyzer.STAR_INDICATORS.labels(response_text)
+        has_situation = "situation" in elements
+        has_task = "task" in elements
+        has_action = "action" in elements
+        has_result = "result" in elements
 
         # Calculate STAR score
         star_elements_present = sum([has_situation, has_task, has_action, has_result])
@@ -125,6 +126,10 @@ class WeakLanguageDetector:
 
     FILLER_WORDS = ["um", "uh", "like", "you know", "so", "well", "anyway", "i mean"]
 
+    # Compiled once; whole words, so "just" is not counted inside "adjust" nor "so" inside "also"
+    WEAK_LANGUAGE_LEXICON = Lexicon(WEAK_LANGUAGE_REPLACEMENTS)
+    FILLER_LEXICON = Lexicon(FILLER_WORDS)
+
     @staticmethod
     def detect_weak_language(response_text: str) -> Dict[str, Any]:
         """
@@ -136,12 +141,13 @@ class WeakLanguageDetector:
         Returns:
             Dict with weak language analysis
         """
-        response_lower = response_text.lower()
+        weak_counts = WeakLanguageDetector.WEAK_LANGUAGE_LEXICON.term_counts(response_text)
+        filler_counts = WeakLanguageDetector.FILLER_LEXICON.term_counts(response_text)
 
         # Count instances of weak phrases
         weak_phrases_found = []
         for weak_phrase, strong_alternative in WeakLanguageDetector.WEAK_LANGUAGE_REPLACEMENTS.items():
-            count = response_lower.count(weak_phrase)
+            count = weak_counts[weak_phrase]
             if count > 0:
                 weak_phrases_found.append({
                     "weak_phrase": weak_phrase,
@@ -153,7 +159,7 @@ class WeakLanguageDetector:
         # Detect filler words
         fillers_found = []
         for filler in WeakLanguageDetector.FILLER_WORDS:
-            count = response_lower.count(filler)
+            count = filler_counts[filler]
             if count > 0:
                 fillers_found.append({
                     "filler": filler,
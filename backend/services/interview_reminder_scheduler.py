@@ -5,15 +5,12 @@ Monitors scheduled informational interviews and sends reminders at strategic int
 - 24 hours before: Preparation reminder
 - 1 hour before: Urgent action reminder (attend now)
 
-Uses APScheduler to check every 1 minute for upcoming interviews.
+Runs every minute as the "interview_reminders" job (services/scheduled_jobs.py).
 """
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime, timezone, timedelta
 import logging
 
-scheduler = None
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -40,7 +37,7 @@ async def check_and_send_interview_reminders():
         interviews = await informational_interviews_dao.collection.find({}).to_list(None)
 
         if not interviews:
-            return
+            return 0
 
         reminders_sent = 0
 
@@ -177,47 +174,8 @@ async def check_and_send_interview_reminders():
         print("\n" + "=" * 80)
         print(f"✅ INTERVIEW REMINDER CHECK COMPLETE - Sent {reminders_sent} reminder(s)")
         print("=" * 80 + "\n")
+        return reminders_sent
 
     except Exception as e:
         print(f"\n❌ Error in interview reminder scheduler: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
-
-
-def start_interview_reminder_scheduler():
-    """Initialize and start the interview reminder scheduler"""
-    global scheduler
-    try:
-        scheduler = AsyncIOScheduler()
-
-        # Add job to check every 1 minute
-        scheduler.add_job(
-            check_and_send_interview_reminders,
-            "interval",
-            minutes=1,
-            id="interview_reminder_job",
-            replace_existing=True,
-        )
-
-        scheduler.start()
-        print("✅ INTERVIEW REMINDER SCHEDULER STARTED")
-    except Exception as e:
-        print(f"❌ Error starting interview reminder scheduler: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
-
-
-def stop_interview_reminder_scheduler():
-    """Stop the interview reminder scheduler"""
-    global scheduler
-    try:
-        if scheduler and scheduler.running:
-            scheduler.shutdown(wait=False)
-            print("✅ Interview reminder scheduler stopped")
-    except Exception as e:
-        print(f"❌ Error stopping interview reminder scheduler: {str(e)}")
-        import traceback
-
-        traceback.print_exc()
+        raise
@@ -13,13 +13,13 @@ from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 import os
 
+from services.notification_dispatcher import notification_dispatcher
+
 
 class InterviewReminderService:
     """Generates and sends informational interview reminder emails"""
 
     def __init__(self):
-        self.smtp_host = "smtp.gmail.com"
-        self.smtp_port = 465
         self.sender_email = os.getenv("GMAIL_SENDER")
         self.sender_password = os.getenv("GMAIL_APP_PASSWORD")
 
@@ -72,9 +72,7 @@ class InterviewReminderService:
             message.attach(MIMEText(text_content, "plain"))
             message.attach(MIMEText(html_content, "html"))
 
-            with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, recipient_email, message.as_string())
+            await notification_dispatcher.send(message, recipient_email, sender=self.sender_email)
 
             return {"success": True, "message": f"Interview reminder sent to {recipient_email}"}
 
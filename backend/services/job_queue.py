@@ -0,0 +1,173 @@
+"""
+Job Queue
+
+Durable, Mongo-backed work queue for slow post-request work (company research,
+news scraping, salary negotiation). Tasks live in the background_tasks
+collection, so they survive restarts and can be shared by several API
+processes; each process runs a few worker coroutines that claim tasks
+atomically and lease them for LEASE_SECONDS. While a handler runs its lease
+is renewed every LEASE_SECONDS / 3, so long tasks are not handed to a second
+worker; a worker that dies mid-task simply lets the lease lapse and another
+worker picks the task up again. Only the worker holding the lease can record
+the outcome.
+
+Failed tasks are retried with exponential backoff (plus jitter) until
+max_attempts is reached, then marked failed.
+
+Usage:
+    from services.job_queue import job_queue
+
+    job_queue.register("job_research", handle_job_research)
+    await job_queue.enqueue("job_research", f"job_research:{job_id}", {"job_id": job_id})
+"""
+
+import asyncio
+import os
+import random
+import socket
+import traceback
+from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from mongo.background_tasks_dao import background_tasks_dao
+
+NUM_WORKERS = int(os.getenv("JOB_QUEUE_WORKERS", "2"))
+POLL_INTERVAL = 2.0
+LEASE_SECONDS = 300
+BACKOFF_BASE_SECONDS = 10
+BACKOFF_MAX_SECONDS = 900
+
+Handler = Callable[[Dict], Awaitable[Optional[Dict]]]
+
+
+def backoff_delay(attempts: int, base: float = BACKOFF_BASE_SECONDS, cap: float = BACKOFF_MAX_SECONDS) -> float:
+    """Exponential backoff with full jitter for the given (1-based) attempt number"""
+    return random.uniform(0, min(cap, base * (2 ** max(attempts - 1, 0))))
+
+
+class JobQueue:
+    def __init__(self, poll_interval: float = POLL_INTERVAL, lease_seconds: int = LEASE_SECONDS):
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = lease_seconds / 3
+
+        self._handlers: Dict[str, Handler] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """Register the coroutine that processes tasks of this kind"""
+        self._handlers[kind] = handler
+
+    async def enqueue(
+        self,
+        kind: str,
+        idempotency_key: str,
+        payload: Dict,
+        max_attempts: int = 5,
+        force: bool = False
+    ) -> Dict:
+        """Persist a task and nudge the local workers. Returns the stored task."""
+        task = await background_tasks_dao.enqueue(
+            kind, idempotency_key, payload, max_attempts=max_attempts, force=force
+        )
+        if self._wake:
+            self._wake.set()
+        return task
+
+    async def get_status(self, idempotency_key: str) -> Optional[Dict]:
+        return await background_tasks_dao.get_by_key(idempotency_key)
+
+    async def _heartbeat(self, task: Dict) -> None:
+        """Keep renewing the task's lease until cancelled or the lease is lost"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                held = await background_tasks_dao.extend_lease(task["_id"], task["worker_id"], self.lease_seconds)
+            except Exception as e:
+                print(f"[JobQueue] Could not renew the lease on {task['idempotency_key']}: {e}")
+                continue
+            if not held:
+                print(f"[JobQueue] Lost the lease on {task['idempotency_key']}; another worker has it")
+                return
+
+    async def _run_handler(self, handler: Handler, task: Dict) -> Optional[Dict]:
+        heartbeat = asyncio.create_task(self._heartbeat(task))
+        try:
+            return await handler(task["payload"])
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def run_task(self, task: Dict) -> None:
+        """Run one claimed task and record the outcome"""
+        handler = self._handlers.get(task["kind"])
+        worker_id = task["worker_id"]
+        try:
+            if handler is None:
+                raise RuntimeError(f"No handler registered for '{task['kind']}'")
+            result = await self._run_handler(handler, task)
+            recorded = await background_tasks_dao.complete(task["_id"], worker_id, result)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            attempts = task.get("attempts", 1)
+            if attempts >= task.get("max_attempts", 1):
+                print(f"[JobQueue] {task['idempotency_key']} failed permanently after {attempts} attempts: {error}")
+                recorded = await background_tasks_dao.fail(task["_id"], worker_id, error)
+            else:
+                delay = backoff_delay(attempts)
+                print(f"[JobQueue] {task['idempotency_key']} attempt {attempts} failed, retrying in {delay:.0f}s: {error}")
+                run_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                recorded = await background_tasks_dao.retry_later(task["_id"], worker_id, error, run_at)
+        if not recorded:
+            print(f"[JobQueue] {task['idempotency_key']} outcome discarded: {worker_id} no longer holds the task")
+
+    async def _worker(self, worker_id: str) -> None:
+        while True:
+            try:
+                task = await background_tasks_dao.claim_next(
+                    worker_id, list(self._handlers), self.lease_seconds
+                )
+            except Exception as e:
+                print(f"[JobQueue] {worker_id} could not claim a task: {e}")
+                task = None
+
+            if task is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.run_task(task)
+            except Exception:
+                # Outcome could not be recorded; the lease will expire and the task is retried
+                traceback.print_exc()
+
+    async def start(self, num_workers: int = NUM_WORKERS) -> None:
+        """Start worker coroutines on the running event loop"""
+        if self._workers:
+            return
+        self._wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._workers = [
+            loop.create_task(self._worker(f"{self._worker_prefix}:{i}"))
+            for i in range(num_workers)
+        ]
+        print(f"[JobQueue] Started {num_workers} workers for {sorted(self._handlers)}")
+
+    async def stop(self) -> None:
+        """Cancel the workers. Tasks they were running are re-claimed once their lease expires."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._wake = None
+        print("[JobQueue] Workers stopped")
+
+
+# Global instance
+job_queue = JobQueue()
@@ -4,7 +4,7 @@
 Tools for extracting job requirements from raw job descriptions.
 
 Extracts:
-- requiredSkills      → [{ name, level, weight }]
+- requiredSkills      → [{ name, taxonomyId, level, weight }]
 - minYearsExperience  → float
 - educationLevel      → str
 """
@@ -12,36 +12,19 @@ Extracts:
 import re
 from typing import List, Dict, Any
 
+from services.skill_taxonomy import skill_taxonomy
+from utils.lexicon import Lexicon
+
 
 # ============================================================
-# 1. SKILL DICTIONARY (expandable)
+# 1. SKILLS (resolved against the skill taxonomy)
 # ============================================================
 
-SKILL_KEYWORDS = {
-    "python": ["python"],
-    "java": ["java"],
-    "c++": ["c++", "cpp"],
-    "javascript": ["javascript", "js", "node", "node.js"],
-    "react": ["react", "react.js", "reactjs"],
-    "sql": ["sql", "postgres", "mysql", "mongodb"],
-    "html": ["html"],
-    "css": ["css"],
-    "aws": ["aws", "amazon web services"],
-    "azure": ["azure", "microsoft azure"],
-    "git": ["git"],
-    "docker": ["docker"],
-    "kubernetes": ["kubernetes", "k8s"],
-    "machine learning": ["machine learning", "ml", "deep learning"],
-    "data analysis": ["data analysis", "analytics"],
-    "communication": ["communication", "written communication", "verbal communication"]
-}
-
-
 def extract_skills(text: str) -> List[Dict[str, Any]]:
     """
     Returns a list of:
     [
-      { name: "Python", level: 1, weight: 1.0 },
+      { name: "python", taxonomyId: 1, level: 1, weight: 1.0 },
       ...
     ]
     """
@@ -49,20 +32,16 @@ def extract_skills(text: str) -> List[Dict[str, Any]]:
     if not text:
         return []
 
-    text_lower = text.lower()
-    found = []
-
-    for canonical, keywords in SKILL_KEYWORDS.items():
-        for kw in keywords:
-            if kw in text_lower:
-                found.append({
-                    "name": canonical,
-                    "level": 1,      # simple model: level unknown → assume basic
-                    "weight": 1.0    # future: weight based on frequency
-                })
-                break
-
-    return found
+    index = skill_taxonomy.index
+    return [
+        {
+            "name": index.name(skill_id),
+            "taxonomyId": skill_id,
+            "level": 1,      # simple model: level unknown → assume basic
+            "weight": 1.0    # future: weight based on frequency
+        }
+        for skill_id in index.extract(text)
+    ]
 
 
 # ============================================================
@@ -106,11 +85,13 @@ def extract_years_experience(text: str) -> float | None:
 EDUCATION_KEYWORDS = {
     "highschool": ["high school diploma", "hs diploma"],
     "associate": ["associate", "aas", "as degree"],
-    "bachelor": ["bachelor", "bs degree", "ba degree", "undergraduate"],
-    "master": ["master", "ms degree", "graduate degree"],
+    "bachelor": ["bachelor", "bachelors", "bs degree", "ba degree", "undergraduate"],
+    "master": ["master", "masters", "ms degree", "graduate degree"],
     "phd": ["phd", "doctorate"]
 }
 
+EDUCATION_LEXICON = Lexicon.from_groups(EDUCATION_KEYWORDS)
+
 
 def extract_education_level(text: str) -> str | None:
     """
@@ -125,14 +106,9 @@ def extract_education_level(text: str) -> str | None:
     if not text:
         return None
 
-    text_lower = text.lower()
-
-    for level, keywords in EDUCATION_KEYWORDS.items():
-        for kw in keywords:
-            if kw in text_lower:
-                return level
-
-    return None
+    # First level in dictionary order that the text mentions
+    levels = EDUCATION_LEXICON.labels(text)
+    return levels[0] if levels else None
 
 
 # ============================================================
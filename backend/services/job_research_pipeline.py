@@ -0,0 +1,108 @@
+"""
+Job Research Pipeline
+
+Background handler that enriches a saved job with company research, recent
+company news and salary negotiation prep. POST /jobs and
+/jobs/{job_id}/retry-research only enqueue a "job_research" task keyed by the
+job id; the job queue workers run this handler and retry it with backoff if
+every research step fails.
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+from mongo.jobs_dao import jobs_dao
+from services.company_research import run_company_research
+from services.company_news import run_company_news
+from services.salary_research import generate_job_salary_negotiation
+from services.job_queue import job_queue
+
+JOB_RESEARCH = "job_research"
+
+
+def research_task_key(job_id: str) -> str:
+    return f"{JOB_RESEARCH}:{job_id}"
+
+
+def job_company_name(job: Dict) -> Optional[str]:
+    company = job.get("company")
+    if isinstance(company, str):
+        return company or None
+    if isinstance(company, dict):
+        return company.get("name") or company.get("company")
+    return None
+
+
+async def enqueue_job_research(job_id: str, force: bool = False) -> Dict:
+    """Queue research for a job; at most one task per job is ever pending"""
+    return await job_queue.enqueue(JOB_RESEARCH, research_task_key(job_id), {"job_id": job_id}, force=force)
+
+
+def research_status(task: Optional[Dict]) -> Dict:
+    """Frontend-facing view of a research task"""
+    if not task:
+        return {"state": "not_started"}
+    return {
+        "state": task.get("status"),
+        "attempts": task.get("attempts", 0),
+        "max_attempts": task.get("max_attempts"),
+        "last_error": task.get("last_error"),
+        "next_attempt_at": task.get("run_at") if task.get("status") == "queued" else None,
+        "updated_at": task.get("updated_at"),
+        "updated_fields": (task.get("result") or {}).get("updated_fields"),
+    }
+
+
+async def handle_job_research(payload: Dict) -> Dict:
+    job_id = payload["job_id"]
+    job = await jobs_dao.get_job(job_id)
+    if not job:
+        return {"skipped": "job not found"}
+
+    company_name = job_company_name(job)
+    if not company_name:
+        return {"skipped": "job has no company name"}
+
+    print(f"[JobResearch] Researching {company_name} for job {job_id}")
+
+    # Research and news are independent; salary prep uses the company size from research
+    research_result, news_result = await asyncio.gather(
+        run_company_research(company_name),
+        run_company_news(company_name),
+        return_exceptions=True
+    )
+
+    research_update = {}
+    if isinstance(research_result, Exception):
+        print(f"[JobResearch] Company research failed for job {job_id}: {research_result}")
+    elif research_result:
+        research_update["company_research"] = research_result
+
+    if isinstance(news_result, Exception):
+        print(f"[JobResearch] Company news failed for job {job_id}: {news_result}")
+    elif news_result:
+        research_update["company_news"] = news_result
+
+    try:
+        company_research = research_update.get("company_research") or {}
+        salary_negotiation = await generate_job_salary_negotiation(
+            job_title=job.get("title", ""),
+            company=company_name,
+            location=job.get("location", ""),
+            company_size=company_research.get("basic_info", {}).get("size") if company_research else None
+        )
+        if salary_negotiation:
+            research_update["salary_negotiation"] = salary_negotiation
+    except Exception as e:
+        print(f"[JobResearch] Salary negotiation failed for job {job_id}: {e}")
+
+    if not research_update:
+        # Let the queue retry with backoff
+        raise RuntimeError("All research attempts failed")
+
+    await jobs_dao.update_job(job_id, research_update)
+    print(f"[JobResearch] Research data added to job {job_id}")
+    return {"updated_fields": list(research_update.keys())}
+
+
+job_queue.register(JOB_RESEARCH, handle_job_research)
@@ -0,0 +1,270 @@
+"""
+Job Runner
+
+Runs the periodic background jobs (reminder checks, scheduled submissions,
+peer benchmark rollup) exactly once per cluster, however many API workers
+or job processes are up. Every job has a document in scheduled_jobs holding
+its next due time and a lease; each tick every runner tries to claim its due
+jobs with one conditional update, and only the winner runs the job. A
+runner that dies mid-run simply lets the lease lapse and the job is picked
+up again on the next tick.
+
+- Runs are spaced by the job's interval plus/minus JITTER so replicas that
+  start together do not hammer Mongo in lockstep.
+- A failing job backs off exponentially (capped at MAX_BACKOFF_SECONDS)
+  instead of retrying every interval.
+- Leases are renewed while a long job is still running.
+- Each run records duration, items processed (the job's return value) and
+  lag (how late after its due time it started) on the job's document.
+
+JOB_RUNNER=embedded (default) runs the jobs inside the API process;
+JOB_RUNNER=off leaves them to a separate process (scripts/run_jobs.py).
+
+Usage:
+    from services.job_runner import job_runner
+
+    job_runner.register("event_reminders", check_and_send_event_reminders, interval_seconds=60)
+    await job_runner.start()
+"""
+
+import asyncio
+import os
+import random
+import socket
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from mongo.scheduled_jobs_dao import scheduled_jobs_dao
+
+TICK_SECONDS = float(os.getenv("JOB_RUNNER_TICK_SECONDS", "5"))
+JITTER = 0.1
+MAX_BACKOFF_SECONDS = 3600
+# Renewed every third of this while the job runs; bounds recovery after a crash
+DEFAULT_LEASE_SECONDS = 300
+
+JobFunc = Callable[[], Awaitable[Any]]
+
+
+def embedded_runner_enabled() -> bool:
+    return (os.getenv("JOB_RUNNER") or "embedded").lower() != "off"
+
+
+def items_processed(result: Any) -> Optional[int]:
+    """A job reports its work by returning a count (or a dict with "items")"""
+    if isinstance(result, bool):
+        return None
+    if isinstance(result, int):
+        return result
+    if isinstance(result, dict) and isinstance(result.get("items"), int):
+        return result["items"]
+    return None
+
+
+@dataclass
+class Job:
+    name: str
+    func: JobFunc
+    interval_seconds: float
+    lease_seconds: float
+    jitter: float = JITTER
+
+    def next_delay(self, failures: int) -> float:
+        """Seconds until the next run after `failures` consecutive failures (0 after a success)"""
+        delay = self.interval_seconds
+        if failures:
+            delay = min(max(self.interval_seconds, MAX_BACKOFF_SECONDS), self.interval_seconds * 2 ** min(failures, 10))
+        return max(0.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+
+class JobRunner:
+    def __init__(self, dao=scheduled_jobs_dao, tick_seconds: float = TICK_SECONDS):
+        self.dao = dao
+        self.tick_seconds = tick_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._jobs: Dict[str, Job] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._ensured: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        # In-process counters since start, per job
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, name: str, func: JobFunc, interval_seconds: float,
+                 lease_seconds: Optional[float] = None, jitter: float = JITTER) -> None:
+        """Register a coroutine function to run every interval_seconds (cluster-wide)"""
+        self._jobs[name] = Job(
+            name=name,
+            func=func,
+            interval_seconds=interval_seconds,
+            lease_seconds=lease_seconds or DEFAULT_LEASE_SECONDS,
+            jitter=jitter,
+        )
+        self.metrics.setdefault(name, {"runs": 0, "failures": 0, "items": 0, "last_duration_ms": None,
+                                       "last_lag_ms": None, "lease_lost": 0})
+
+    def unregister(self, name: str) -> None:
+        self._jobs.pop(name, None)
+        self.metrics.pop(name, None)
+
+    @property
+    def jobs(self) -> List[str]:
+        return sorted(self._jobs)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    async def tick(self) -> List[str]:
+        """Claim and start every due job this process is not already running. Returns the names started."""
+        started = []
+        now = datetime.now(timezone.utc)
+        for name, job in self._jobs.items():
+            if name in self._running:
+                continue
+            try:
+                if name not in self._ensured:
+                    await self.dao.ensure(name, now)
+                    self._ensured.add(name)
+                claimed = await self.dao.claim(name, self.owner, now, job.lease_seconds)
+            except Exception as e:
+                print(f"[JobRunner] Could not claim {name}: {e}")
+                continue
+            if claimed is None:
+                continue
+            task = asyncio.get_running_loop().create_task(self.run_claimed(job, claimed, now))
+            self._running[name] = task
+            task.add_done_callback(lambda _, name=name: self._running.pop(name, None))
+            started.append(name)
+        return started
+
+    async def run_claimed(self, job: Job, claimed: Dict[str, Any], claimed_at: datetime) -> None:
+        """Run a job this process holds the lease for and record the outcome"""
+        due_at = claimed.get("next_run_at") or claimed_at
+        if due_at.tzinfo is None:
+            due_at = due_at.replace(tzinfo=timezone.utc)
+        lag_ms = max(0.0, (claimed_at - due_at).total_seconds() * 1000)
+        failures = claimed.get("failures", 0)
+
+        heartbeat = asyncio.get_running_loop().create_task(self._heartbeat(job))
+        started = datetime.now(timezone.utc)
+        error = None
+        result = None
+        try:
+            result = await job.func()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        finally:
+            heartbeat.cancel()
+        finished = datetime.now(timezone.utc)
+
+        failures = failures + 1 if error else 0
+        duration_ms = (finished - started).total_seconds() * 1000
+        items = items_processed(result)
+        last_run = {
+            "owner": self.owner,
+            "started_at": started,
+            "finished_at": finished,
+            "duration_ms": round(duration_ms, 1),
+            "lag_ms": round(lag_ms, 1),
+            "items": items,
+            "error": error,
+        }
+
+        metrics = self.metrics[job.name]
+        metrics["runs"] += 1
+        metrics["failures"] += 1 if error else 0
+        metrics["items"] += items or 0
+        metrics["last_duration_ms"] = last_run["duration_ms"]
+        metrics["last_lag_ms"] = last_run["lag_ms"]
+
+        next_run_at = finished + timedelta(seconds=job.next_delay(failures))
+        if error:
+            print(f"[JobRunner] {job.name} failed ({failures} in a row), next try at {next_run_at:%H:%M:%S}: {error}")
+        try:
+            await self.dao.finish(job.name, self.owner, next_run_at, last_run, failed=bool(error))
+        except Exception as e:
+            # Lease lapses on its own and the job is retried
+            print(f"[JobRunner] Could not record {job.name} run: {e}")
+
+    async def _heartbeat(self, job: Job) -> None:
+        interval = job.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            lease_until = datetime.now(timezone.utc) + timedelta(seconds=job.lease_seconds)
+            try:
+                if not await self.dao.renew(job.name, self.owner, lease_until):
+                    self.metrics[job.name]["lease_lost"] += 1
+                    print(f"[JobRunner] Lost the lease on {job.name}; another process may run it too")
+                    return
+            except Exception as e:
+                print(f"[JobRunner] Could not renew lease on {job.name}: {e}")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception:
+                traceback.print_exc()
+            await asyncio.sleep(self.tick_seconds * random.uniform(1 - JITTER, 1 + JITTER))
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start ticking on the running event loop"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        print(f"[JobRunner] Started as {self.owner} with {len(self._jobs)} jobs: {', '.join(self.jobs)}")
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Stop claiming and give running jobs a moment to finish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        running = list(self._running.values())
+        if running:
+            _, pending = await asyncio.wait(running, timeout=timeout)
+            for task in pending:
+                # Lease expires and another process picks the job up
+                task.cancel()
+
+    async def run_now(self, name: str) -> bool:
+        """Make a job due immediately; the next tick of any runner picks it up"""
+        if name not in self._jobs:
+            raise KeyError(name)
+        now = datetime.now(timezone.utc)
+        await self.dao.ensure(name, now)
+        return await self.dao.run_now(name, now)
+
+    async def status(self) -> List[Dict[str, Any]]:
+        """Persisted state of every job plus this process's counters"""
+        docs = {doc["_id"]: doc for doc in await self.dao.get_all()}
+        rows = []
+        for name in sorted(set(docs) | set(self._jobs)):
+            doc = docs.get(name, {})
+            rows.append({
+                "name": name,
+                "registered": name in self._jobs,
+                "next_run_at": doc.get("next_run_at"),
+                "owner": doc.get("owner"),
+                "lease_until": doc.get("lease_until"),
+                "runs": doc.get("runs", 0),
+                "consecutive_failures": doc.get("failures", 0),
+                "last_run": doc.get("last_run"),
+                "local": self.metrics.get(name),
+            })
+        return rows
+
+
+# Global instance
+job_runner = JobRunner()
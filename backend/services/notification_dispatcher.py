@@ -0,0 +1,387 @@
+"""
+Notification Dispatcher
+
+Single outbound path for reminder and notification emails (interview, mock
+interview, event, referral, follow-up, application deadline and
+scheduled-submission reminders). Callers hand over a
+built message and await the outcome; the SMTP work happens off the event loop.
+
+- Messages wait in an in-process queue; one worker coroutine drains up to
+  BATCH_SIZE of them at a time and sends the batch over a single connection.
+- The SMTP connection is persistent: it is opened once, reused across
+  batches, checked with NOOP after IDLE_SECONDS of silence and reopened if
+  the server dropped it. It lives on a dedicated one-thread executor, so TLS
+  handshakes and socket writes never block the API loop.
+- At most RECIPIENT_LIMIT messages go to one recipient per RECIPIENT_WINDOW
+  seconds; extra messages are held back, not dropped.
+- Transient failures (disconnects, 4xx replies, socket errors) are retried
+  with exponential backoff up to MAX_ATTEMPTS. Permanent failures (bad
+  credentials, refused recipient, 5xx) and exhausted retries are written to
+  the notification_dead_letters collection and raised to the caller.
+
+NOTIFICATION_TRANSPORT=memory swaps SMTP for an in-process stand-in that
+records messages instead of sending them (local runs and tests).
+
+Usage:
+    from services.notification_dispatcher import notification_dispatcher
+
+    result = await notification_dispatcher.send(message, recipient_email)
+    result["sent_at"]
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import smtplib
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.message import Message
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from services.job_queue import backoff_delay
+
+BATCH_SIZE = 20
+MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "4"))
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 60
+RECIPIENT_LIMIT = int(os.getenv("NOTIFICATION_RECIPIENT_LIMIT", "10"))
+RECIPIENT_WINDOW = float(os.getenv("NOTIFICATION_RECIPIENT_WINDOW_SECONDS", "60"))
+IDLE_SECONDS = 60
+SMTP_TIMEOUT = 30
+
+# Outcome of one message in a batch: None when accepted, else the exception
+SendResult = Optional[BaseException]
+
+
+def is_permanent(error: BaseException) -> bool:
+    """Whether retrying the same message can never succeed"""
+    if isinstance(error, (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused,
+                          smtplib.SMTPSenderRefused)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    # Disconnects, timeouts and other socket errors are worth another try
+    return not isinstance(error, (smtplib.SMTPException, OSError))
+
+
+class SmtpTransport:
+    """One persistent SMTP_SSL connection; only ever used from the dispatcher's thread"""
+
+    def __init__(self, host: str = "smtp.gmail.com", port: int = 465,
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 idle_seconds: float = IDLE_SECONDS):
+        self.host = host
+        self.port = port
+        self.username = username if username is not None else os.getenv("GMAIL_SENDER")
+        self.password = password if password is not None else os.getenv("GMAIL_APP_PASSWORD")
+        self.idle_seconds = idle_seconds
+
+        self._server: Optional[smtplib.SMTP_SSL] = None
+        self._last_used = 0.0
+        self.connections_opened = 0
+
+    @property
+    def sender(self) -> Optional[str]:
+        return self.username
+
+    def _connect(self) -> smtplib.SMTP_SSL:
+        server = smtplib.SMTP_SSL(self.host, self.port, timeout=SMTP_TIMEOUT)
+        try:
+            server.login(self.username, self.password)
+        except BaseException:
+            server.close()
+            raise
+        self.connections_opened += 1
+        return server
+
+    def _connection(self) -> smtplib.SMTP_SSL:
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_seconds:
+            # Servers drop idle sessions; check before trusting it with a batch
+            try:
+                if self._server.noop()[0] != 250:
+                    self.close()
+            except (smtplib.SMTPException, OSError):
+                self.close()
+        if self._server is None:
+            self._server = self._connect()
+        return self._server
+
+    def send_batch(self, messages: List[Tuple[str, str, str]]) -> List[SendResult]:
+        """Send (sender, recipient, raw message) tuples over the shared connection"""
+        results: List[SendResult] = []
+        for sender, recipient, raw in messages:
+            try:
+                try:
+                    self._connection().sendmail(sender, recipient, raw)
+                except smtplib.SMTPServerDisconnected:
+                    # Dropped between messages: one fresh connection, same message
+                    self.close()
+                    self._connection().sendmail(sender, recipient, raw)
+                results.append(None)
+            except BaseException as e:
+                if not isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+                    # Connection state unknown; start clean for the next message
+                    self.close()
+                results.append(e)
+            self._last_used = time.monotonic()
+        return results
+
+    def close(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+
+
+class MemoryTransport:
+    """
+    Local stand-in for SMTP. Records every accepted message in `sent`;
+    `fail` may return an exception to simulate a failure for a message.
+    """
+
+    def __init__(self, sender: str = "notifications@localhost",
+                 fail: Optional[Callable[[str, str], SendResult]] = None):
+        self.sender = sender
+        self.fail = fail
+        self.sent: List[Dict[str, str]] = []
+        self.batches: List[int] = []
+
+    def send_batch(self, messages: List[Tuple[str, str, str]]) -> List[SendResult]:
+        self.batches.append(len(messages))
+        results: List[SendResult] = []
+        for sender, recipient, raw in messages:
+            error = self.fail(recipient, raw) if self.fail else None
+            if error is None:
+                self.sent.append({"sender": sender, "recipient": recipient, "raw": raw})
+            results.append(error)
+        return results
+
+    def close(self) -> None:
+        pass
+
+
+def make_transport():
+    if (os.getenv("NOTIFICATION_TRANSPORT") or "smtp").lower() == "memory":
+        return MemoryTransport(os.getenv("GMAIL_SENDER") or "notifications@localhost")
+    return SmtpTransport()
+
+
+@dataclass(order=True)
+class _Outbound:
+    not_before: float
+    seq: int
+    recipient: str = field(compare=False)
+    sender: str = field(compare=False)
+    message: Message = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+
+
+class NotificationDispatcher:
+    def __init__(self, transport=None, batch_size: int = BATCH_SIZE, max_attempts: int = MAX_ATTEMPTS,
+                 recipient_limit: int = RECIPIENT_LIMIT, recipient_window: float = RECIPIENT_WINDOW,
+                 backoff_base: float = BACKOFF_BASE_SECONDS, backoff_max: float = BACKOFF_MAX_SECONDS,
+                 dead_letters=None):
+        self._transport = transport
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.recipient_limit = recipient_limit
+        self.recipient_window = recipient_window
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._dead_letters = dead_letters
+
+        self._pending: List[_Outbound] = []
+        self._seq = itertools.count()
+        self._recent: Dict[str, Deque[float]] = defaultdict(deque)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight = 0
+
+        self.sent = 0
+        self.retried = 0
+        self.dead_lettered = 0
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            self._transport = make_transport()
+        return self._transport
+
+    @property
+    def dead_letters(self):
+        if self._dead_letters is None:
+            from mongo.notification_dead_letters_dao import notification_dead_letters_dao
+            self._dead_letters = notification_dead_letters_dao
+        return self._dead_letters
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the worker on the running loop. Safe to call more than once."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._wake = asyncio.Event()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp")
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Send what is already due, then close the connection"""
+        if self._task is not None:
+            if not self._task.done():
+                await self._drain()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for item in self._pending:
+            if not item.future.done():
+                item.future.set_exception(RuntimeError("Notification dispatcher stopped before sending"))
+        self._pending.clear()
+        if self._executor is not None:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.transport.close)
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def send(self, message: Message, recipient: str, sender: Optional[str] = None) -> Dict:
+        """
+        Queue one message and wait until it is accepted by the server.
+        Raises the last delivery error once the message is dead-lettered.
+        """
+        self.start()
+        item = _Outbound(
+            not_before=time.monotonic(),
+            seq=next(self._seq),
+            recipient=recipient,
+            sender=sender or self.transport.sender,
+            message=message,
+            future=self._loop.create_future(),
+        )
+        heapq.heappush(self._pending, item)
+        self._wake.set()
+        return await item.future
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._pending),
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+        }
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    async def _drain(self, timeout: float = 10.0) -> None:
+        """Wait (bounded) for due messages and the batch in flight; backed-off retries are not waited for"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and (
+            self._in_flight or any(item.not_before <= time.monotonic() for item in self._pending)
+        ):
+            await asyncio.sleep(0.05)
+
+    def _rate_limited_until(self, recipient: str, now: float) -> float:
+        recent = self._recent[recipient]
+        while recent and recent[0] <= now - self.recipient_window:
+            recent.popleft()
+        if len(recent) < self.recipient_limit:
+            return 0.0
+        return recent[0] + self.recipient_window
+
+    def _take_batch(self) -> List[_Outbound]:
+        now = time.monotonic()
+        batch: List[_Outbound] = []
+        deferred: List[_Outbound] = []
+        while self._pending and self._pending[0].not_before <= now and len(batch) < self.batch_size:
+            item = heapq.heappop(self._pending)
+            if item.future.done():
+                continue  # caller went away
+            until = self._rate_limited_until(item.recipient, now)
+            if until:
+                item.not_before = until
+                deferred.append(item)
+                continue
+            self._recent[item.recipient].append(now)
+            batch.append(item)
+        for item in deferred:
+            heapq.heappush(self._pending, item)
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                self._wake.clear()
+                timeout = self._pending[0].not_before - time.monotonic() if self._pending else None
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._in_flight = len(batch)
+            try:
+                await self._send_batch(batch)
+            except Exception as e:
+                print(f"[NotificationDispatcher] Batch failed: {e}")
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+            finally:
+                self._in_flight = 0
+
+    async def _send_batch(self, batch: List[_Outbound]) -> None:
+        raw = [(item.sender, item.recipient, item.message.as_string()) for item in batch]
+        results = await self._loop.run_in_executor(self._executor, self.transport.send_batch, raw)
+        for item, error in zip(batch, results):
+            item.attempts += 1
+            if error is None:
+                self.sent += 1
+                if not item.future.done():
+                    item.future.set_result({
+                        "sent_to": item.recipient,
+                        "sent_at": datetime.now(timezone.utc).isoformat(),
+                        "attempts": item.attempts,
+                    })
+            elif is_permanent(error) or item.attempts >= self.max_attempts:
+                await self._dead_letter(item, error)
+            else:
+                self.retried += 1
+                item.not_before = time.monotonic() + backoff_delay(item.attempts, self.backoff_base, self.backoff_max)
+                heapq.heappush(self._pending, item)
+
+    async def _dead_letter(self, item: _Outbound, error: BaseException) -> None:
+        self.dead_lettered += 1
+        print(f"[NotificationDispatcher] Giving up on email to {item.recipient} after {item.attempts} attempt(s): {error}")
+        try:
+            await self.dead_letters.add(
+                recipient=item.recipient,
+                sender=item.sender,
+                subject=item.message.get("Subject"),
+                raw=item.message.as_string(),
+                error=f"{type(error).__name__}: {error}",
+                attempts=item.attempts,
+            )
+        except Exception as e:
+            print(f"[NotificationDispatcher] Could not record dead letter: {e}")
+        if not item.future.done():
+            item.future.set_exception(error)
+
+
+# Global instance
+notification_dispatcher = NotificationDispatcher()
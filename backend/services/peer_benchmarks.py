@@ -0,0 +1,419 @@
+"""
+Peer Benchmarks Rollup (UC-104)
+
+Competitive analysis compares a user against anonymous peers. Instead of
+reading every peer's jobs, skills and salaries on each request, a periodic
+rollup materializes the statistics once:
+
+1. Member rows: each user's contribution (application/offer counts by
+   industry, skill names, salaries) keyed by uuid, tagged with a cohort
+   derived from the profile's industry and experience level.
+2. Cohort rows: per-cohort aggregates rebuilt from the member rows, i.e.
+   pooled success/interview rates, per-user success-rate quantiles, skill
+   frequencies, application volume by industry and the salary distribution.
+   Each row also keeps the additive totals it was computed from, so the
+   ALL_COHORT row (every member; backs small cohorts) is the sum of the
+   cohort rows, and a user is shown their cohort with their own data taken
+   out.
+
+Runs are incremental: only users with a job, skill, salary or informational
+interview modified since the last watermark are recomputed, and only the
+cohorts they belong (or belonged) to are rebuilt. Profile edits do not touch
+date_updated on those sources, so a full rebuild runs once a day.
+
+Usage:
+    from services.peer_benchmarks import peer_benchmark_rollup, get_cohort_benchmarks
+
+    await peer_benchmark_rollup.run()              # incremental
+    await peer_benchmark_rollup.run(full=True)     # rebuild everything
+    benchmarks = await get_cohort_benchmarks(uuid)  # two indexed reads
+"""
+
+import asyncio
+import os
+from collections import Counter
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from mongo.peer_benchmarks_dao import peer_benchmarks_dao
+
+ALL_COHORT = "all"
+# Below this many members a cohort falls back to ALL_COHORT
+MIN_COHORT_SIZE = int(os.getenv("PEER_BENCHMARK_MIN_COHORT", "5"))
+ROLLUP_INTERVAL_MINUTES = int(os.getenv("PEER_BENCHMARK_ROLLUP_MINUTES", "60"))
+FULL_REBUILD_EVERY = timedelta(days=1)
+# Re-read a little before the watermark so writes racing the last run are not lost
+WATERMARK_OVERLAP = timedelta(minutes=5)
+BATCH_SIZE = 200
+# Skill frequency table kept per cohort
+MAX_SKILLS = 500
+# success_rate / salary quantiles are stored at 5% steps
+QUANTILE_POINTS = 21
+# Bump when the cohort row layout changes so the next run rebuilds every row
+ROLLUP_VERSION = 2
+
+
+# --------------------------------------------
+# Pure rollup math
+# --------------------------------------------
+
+def cohort_key(profile: Optional[Dict[str, Any]]) -> str:
+    profile = profile or {}
+    industry = (profile.get("industry") or "unknown").strip().lower() or "unknown"
+    level = (profile.get("experience_level") or "unknown").strip().lower() or "unknown"
+    return f"{industry}|{level}"
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def quantiles(values: Sequence[float], points: int = QUANTILE_POINTS) -> List[float]:
+    """Evenly spaced quantiles (linear interpolation), empty for no data"""
+    if not values:
+        return []
+    ordered = sorted(values)
+    result = []
+    for i in range(points):
+        position = (len(ordered) - 1) * i / (points - 1)
+        low = int(position)
+        high = min(low + 1, len(ordered) - 1)
+        result.append(ordered[low] + (ordered[high] - ordered[low]) * (position - low))
+    return result
+
+
+def percentile_of(value: float, qs: Sequence[float]) -> float:
+    """Approximate percentile of `value` within the distribution described by `qs`"""
+    if not qs:
+        return 50
+    if value < qs[0]:
+        return 0
+    if value >= qs[-1]:
+        return 100
+    i = max(j for j, q in enumerate(qs) if q <= value)
+    step = qs[i + 1] - qs[i]
+    fraction = (value - qs[i]) / step if step else 0
+    return round((i + fraction) / (len(qs) - 1) * 100, 1)
+
+
+def member_row(uuid: str, data: Dict[str, Any], now: datetime) -> Optional[Dict[str, Any]]:
+    """One user's contribution to their cohort, or None if they have no data"""
+    jobs, skills, salaries = data["jobs"], data["skills"], data["salaries"]
+    if not (jobs or skills or salaries or data["interviews"]):
+        return None
+
+    industries: Dict[str, Dict[str, int]] = {}
+    for job in jobs:
+        stats = industries.setdefault(job.get("company_industry") or "Unknown", {"applications": 0, "offers": 0})
+        stats["applications"] += 1
+        stats["offers"] += job.get("status") == "Offer"
+    dates = [d for d in (_as_utc(job.get("date_created")) for job in jobs) if d]
+
+    return {
+        "_id": uuid,
+        "cohort": cohort_key(data["profile"]),
+        "applications": len(jobs),
+        "offers": sum(1 for job in jobs if job.get("status") == "Offer"),
+        "interviews": sum(1 for job in jobs if job.get("status") == "Interview"),
+        "informational_interviews": data["interviews"],
+        "first_application": min(dates) if dates else None,
+        "last_application": max(dates) if dates else None,
+        "industries": [{"name": name, **stats} for name, stats in sorted(industries.items())],
+        "skills": sorted({(skill.get("name") or "").strip().lower() for skill in skills} - {""}),
+        "skill_count": len(skills),
+        "skill_categories": len({skill.get("category") for skill in skills}),
+        "salaries": [salary.get("base_salary") or 0 for salary in salaries],
+        "updated_at": now,
+    }
+
+
+def member_totals(member: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One member's contribution as additive totals. Totals of several members
+    are combined with merge_totals and turned into a cohort row by
+    cohort_row_from_totals, so cohorts can be summed and a member taken out
+    again without re-reading the other members.
+    """
+    applications = member["applications"]
+    success_rate = member["offers"] / applications if applications else 0
+    has_skills = bool(member["skill_count"])
+    first = _as_utc(member.get("first_application"))
+    last = _as_utc(member.get("last_application"))
+    return {
+        "users": 1,
+        "applications": applications,
+        "offers": member["offers"],
+        "interviews": member["interviews"],
+        "success_rate_sum": success_rate,
+        "interview_rate_sum": member["informational_interviews"] / applications if applications else 0,
+        # Value/count pairs rather than maps: names and rates are not valid Mongo keys
+        "success_rates": [[success_rate, 1]],
+        "skill_users": int(has_skills),
+        "skill_count_sum": member["skill_count"],
+        "skill_categories_sum": member["skill_categories"] if has_skills else 0,
+        "skills": [[name, 1] for name in member["skills"]] if has_skills else [],
+        "industries": [[e["name"], e["applications"], e["offers"], 1] for e in member["industries"]],
+        "salary_sum": sum(member["salaries"]),
+        "salaries": [[salary, count] for salary, count in Counter(member["salaries"]).items()],
+        # The two earliest / latest dates, enough to take any one member out again
+        "first_applications": [first] if first else [],
+        "last_applications": [last] if last else [],
+    }
+
+
+def _merge_counts(a: List[list], b: List[list], sign: int) -> List[list]:
+    counts = Counter({value: count for value, count in a})
+    for value, count in b:
+        counts[value] += sign * count
+    return [[value, count] for value, count in sorted(counts.items()) if count > 0]
+
+
+def _merge_extremes(a: List[Any], b: List[Any], sign: int, latest: bool) -> List[datetime]:
+    values = [_as_utc(v) for v in a]
+    if sign > 0:
+        return sorted(values + [_as_utc(v) for v in b], reverse=latest)[:2]
+    for value in b:
+        if _as_utc(value) in values:
+            values.remove(_as_utc(value))
+    return values
+
+
+def merge_totals(a: Dict[str, Any], b: Dict[str, Any], sign: int = 1) -> Dict[str, Any]:
+    """a + b, or a - b with sign=-1 (b must be part of a)"""
+    merged = {
+        field: a[field] + sign * b[field]
+        for field in ("users", "applications", "offers", "interviews", "success_rate_sum",
+                      "interview_rate_sum", "skill_users", "skill_count_sum", "skill_categories_sum", "salary_sum")
+    }
+    for field in ("success_rates", "skills", "salaries"):
+        merged[field] = _merge_counts(a[field], b[field], sign)
+
+    industries = {name: [apps, offers, users] for name, apps, offers, users in a["industries"]}
+    for name, apps, offers, users in b["industries"]:
+        stats = industries.setdefault(name, [0, 0, 0])
+        for i, value in enumerate((apps, offers, users)):
+            stats[i] += sign * value
+    merged["industries"] = [[name, *stats] for name, stats in sorted(industries.items()) if stats[2] > 0]
+
+    merged["first_applications"] = _merge_extremes(a["first_applications"], b["first_applications"], sign, latest=False)
+    merged["last_applications"] = _merge_extremes(a["last_applications"], b["last_applications"], sign, latest=True)
+    return merged
+
+
+def empty_totals() -> Dict[str, Any]:
+    return {
+        "users": 0, "applications": 0, "offers": 0, "interviews": 0,
+        "success_rate_sum": 0, "interview_rate_sum": 0, "success_rates": [],
+        "skill_users": 0, "skill_count_sum": 0, "skill_categories_sum": 0, "skills": [],
+        "industries": [], "salary_sum": 0, "salaries": [],
+        "first_applications": [], "last_applications": [],
+    }
+
+
+def combine_totals(parts) -> Dict[str, Any]:
+    totals = empty_totals()
+    for part in parts:
+        totals = merge_totals(totals, part)
+    return totals
+
+
+def quantiles_of_counts(counts: List[list], points: int = QUANTILE_POINTS) -> List[float]:
+    """quantiles() of the values a list of [value, count] pairs describes"""
+    n = sum(count for _, count in counts)
+    if not n:
+        return []
+
+    def nth(k: int) -> float:
+        for value, count in counts:
+            if k < count:
+                return value
+            k -= count
+        return counts[-1][0]
+
+    result = []
+    for i in range(points):
+        position = (n - 1) * i / (points - 1)
+        low = int(position)
+        low_value, high_value = nth(low), nth(min(low + 1, n - 1))
+        result.append(low_value + (high_value - low_value) * (position - low))
+    return result
+
+
+def cohort_row_from_totals(key: str, totals: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    users = totals["users"]
+    applications = totals["applications"]
+    firsts, lasts = totals["first_applications"], totals["last_applications"]
+    months = max(1, (_as_utc(lasts[0]) - _as_utc(firsts[0])).days / 30) if firsts and lasts else 1
+    success_quantiles = quantiles_of_counts(totals["success_rates"])
+    skill_users = totals["skill_users"]
+    salary_count = sum(count for _, count in totals["salaries"])
+
+    return {
+        "_id": key,
+        "users": users,
+        "applications": {
+            "total": applications,
+            "avg_applications_per_month": applications / months if applications else 0,
+            "success_rate": totals["offers"] / applications if applications else 0,
+            "interview_rate": totals["interviews"] / applications if applications else 0,
+        },
+        "career": {
+            "average_success_rate": totals["success_rate_sum"] / users if users else 0,
+            "average_interview_rate": totals["interview_rate_sum"] / users if users else 0,
+            "top_performers_success_rate": success_quantiles[-3] if success_quantiles else 0,  # p90
+            "success_rate_quantiles": success_quantiles,
+        },
+        "skills": {
+            "users": skill_users,
+            "average_count": totals["skill_count_sum"] / skill_users if skill_users else 0,
+            "average_diversity": totals["skill_categories_sum"] / skill_users if skill_users else 0,
+            # Names can contain "." so frequencies are stored as a list, most common first
+            "frequencies": [
+                {"name": name, "users": count}
+                for name, count in sorted(totals["skills"], key=lambda item: (-item[1], item[0]))[:MAX_SKILLS]
+            ],
+        },
+        "industries": [
+            {"name": name, "applications": apps, "offers": offers, "users": count}
+            for name, apps, offers, count in totals["industries"]
+        ],
+        "salaries": {
+            "count": salary_count,
+            "average": totals["salary_sum"] / salary_count if salary_count else 0,
+            "quantiles": quantiles_of_counts(totals["salaries"]),
+        },
+        "totals": totals,
+        "updated_at": now,
+    }
+
+
+def cohort_row(key: str, members: List[Dict[str, Any]], now: datetime) -> Dict[str, Any]:
+    return cohort_row_from_totals(key, combine_totals(member_totals(m) for m in members), now)
+
+
+def empty_cohort_row(key: str = ALL_COHORT) -> Dict[str, Any]:
+    return cohort_row(key, [], datetime.now(timezone.utc))
+
+
+def without_member(row: Dict[str, Any], member: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The cohort row with the member's own contribution taken out"""
+    if not member or "totals" not in row:
+        return row
+    # A member row saved after the cohort row was built is not in it yet
+    if _as_utc(member["updated_at"]) > _as_utc(row["updated_at"]):
+        return row
+    return cohort_row_from_totals(row["_id"], merge_totals(row["totals"], member_totals(member), -1), row["updated_at"])
+
+
+async def get_cohort_benchmarks(uuid: str) -> Dict[str, Any]:
+    """
+    The precomputed row for the user's cohort (two indexed reads) with the
+    user's own data taken out, falling back to ALL_COHORT when the rest of
+    the cohort is too small to be anonymous
+    """
+    member = await peer_benchmarks_dao.get_member(uuid)
+    key = member["cohort"] if member else None
+    rows = await peer_benchmarks_dao.get_cohorts([k for k in (key, ALL_COHORT) if k])
+    if key in rows and key != ALL_COHORT:
+        peers = without_member(rows[key], member)
+        if peers["users"] >= MIN_COHORT_SIZE:
+            return peers
+    if ALL_COHORT in rows:
+        return without_member(rows[ALL_COHORT], member)
+    return empty_cohort_row()
+
+
+# --------------------------------------------
+# Rollup job
+# --------------------------------------------
+
+class PeerBenchmarkRollup:
+    def __init__(self, dao=peer_benchmarks_dao, batch_size: int = BATCH_SIZE):
+        self.dao = dao
+        self.batch_size = batch_size
+        self._lock = asyncio.Lock()
+
+    async def run(self, full: bool = False) -> Dict[str, Any]:
+        if self._lock.locked():
+            print("[PeerBenchmarks] Rollup already running, skipping")
+            return {"skipped": True}
+        async with self._lock:
+            return await self._run(full)
+
+    async def _run(self, full: bool) -> Dict[str, Any]:
+        started = datetime.now(timezone.utc)
+        state = await self.dao.get_state()
+        watermark = _as_utc(state.get("watermark"))
+        last_full = _as_utc(state.get("last_full_run"))
+        full = (
+            full or watermark is None or last_full is None or started - last_full >= FULL_REBUILD_EVERY
+            or state.get("version") != ROLLUP_VERSION
+        )
+
+        if full:
+            users = await self.dao.all_users()
+        else:
+            users = await self.dao.changed_users(watermark - WATERMARK_OVERLAP)
+
+        touched = set()
+        ordered = sorted(users)
+        for i in range(0, len(ordered), self.batch_size):
+            batch = ordered[i:i + self.batch_size]
+            previous = await self.dao.get_member_cohorts(batch)
+            data = await self.dao.load_user_data(batch)
+            rows, gone = [], []
+            for uuid in batch:
+                row = member_row(uuid, data[uuid], started)
+                if row:
+                    rows.append(row)
+                else:
+                    gone.append(uuid)
+            await self.dao.save_members(rows)
+            await self.dao.delete_members([uuid for uuid in gone if uuid in previous])
+            touched.update(cohort for cohort in previous.values() if cohort)
+            touched.update(row["cohort"] for row in rows)
+
+        if full:
+            # Drop members whose data disappeared entirely since the last rebuild
+            stale = [m["_id"] for m in await self.dao.get_members() if m["_id"] not in users]
+            await self.dao.delete_members(stale)
+            touched.update(await self.dao.member_cohort_keys())
+            touched.update(await self.dao.cohort_keys() - {ALL_COHORT})
+
+        for key in sorted(touched):
+            members = await self.dao.get_members(key)
+            if members:
+                await self.dao.save_cohort(cohort_row(key, members, started))
+            else:
+                await self.dao.delete_cohort(key)
+        if touched or full:
+            # ALL_COHORT is the sum of the cohort rows, so no member rows are re-read for it
+            rows = await self.dao.get_cohorts(await self.dao.cohort_keys() - {ALL_COHORT})
+            totals = combine_totals(row["totals"] for row in rows.values())
+            await self.dao.save_cohort(cohort_row_from_totals(ALL_COHORT, totals, started))
+
+        stats = {"last_run_users": len(users), "last_run_cohorts": len(touched)}
+        if full:
+            stats["last_full_run"] = started
+            stats["version"] = ROLLUP_VERSION
+        await self.dao.save_state(started, **stats)
+        print(f"[PeerBenchmarks] {'Full' if full else 'Incremental'} rollup: "
+              f"{len(users)} users, {len(touched)} cohorts in {(datetime.now(timezone.utc) - started).total_seconds():.1f}s")
+        return {"full": full, "users": len(users), "cohorts": sorted(touched)}
+
+
+# Global instance
+peer_benchmark_rollup = PeerBenchmarkRollup()
+
+
+async def run_scheduled_rollup() -> int:
+    """The "peer_benchmark_rollup" job: incremental run, users recomputed"""
+    result = await peer_benchmark_rollup.run()
+    return result.get("users", 0)
@@ -9,11 +9,8 @@ Supports two follow-up types:
 - "thank_you": Thank you message
 """
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any
-import atexit
 
 from mongo.referrals_dao import referrals_dao
 from mongo.network_dao import network_dao
@@ -24,9 +21,6 @@ from mongo.dao_setup import db_client
 # Initialize DAOs
 profile_dao = UserDataDAO()
 
-# Scheduler instance
-referral_followup_scheduler = AsyncIOScheduler()
-
 
 def make_aware(dt):
     """Convert datetime to timezone-aware UTC if naive"""
@@ -97,14 +91,14 @@ async def check_and_send_followup_reminders():
                 all_referrals.append(doc)
         except Exception as e:
             print(f"❌ Error fetching referrals: {e}")
-            return
+            raise
         
         print(f"📊 Found {len(all_referrals)} total referrals")
         
         if len(all_referrals) == 0:
             print("⚠️  No referrals in database")
             print(f"{'='*80}\n")
-            return
+            return 0
         
         reminders_sent = 0
         
@@ -212,7 +206,7 @@ async def check_and_send_followup_reminders():
                             }
                             
                             # Send reminder email
-                            result = referral_followup_service.send_followup_reminder_email(
+                            result = await referral_followup_service.send_followup_reminder_email(
                                 recipient_email=user_email,
                                 followup_data={
                                     'type': followup_kind,
@@ -270,7 +264,7 @@ async def check_and_send_followup_reminders():
                             }
                             
                             # Send urgent reminder email
-                            result = referral_followup_service.send_followup_reminder_email(
+                            result = await referral_followup_service.send_followup_reminder_email(
                                 recipient_email=user_email,
                                 followup_data={
                                     'type': followup_kind,
@@ -315,55 +309,8 @@ async def check_and_send_followup_reminders():
         else:
             print(f"\033[92m✓ FOLLOW-UP REMINDER CHECK COMPLETE - No reminders sent\033[0m")
         print(f"{'='*80}\n")
+        return reminders_sent
             
     except Exception as e:
         print(f"❌ CRITICAL ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-
-
-def start_referral_followup_scheduler():
-    """Start the referral follow-up reminder scheduler - checks every 1 MINUTE"""
-    try:
-        if referral_followup_scheduler.running:
-            print("⚠️  Referral follow-up scheduler already running")
-            return
-            
-        referral_followup_scheduler.add_job(
-            check_and_send_followup_reminders,
-            trigger=IntervalTrigger(minutes=1),
-            id='referral_followup_reminders',
-            name='Referral Follow-Up Reminders',
-            replace_existing=True,
-            max_instances=1
-        )
-        
-        referral_followup_scheduler.start()
-        print("✅ REFERRAL FOLLOW-UP SCHEDULER STARTED")
-        print("   ⏰ Checking every 1 MINUTE")
-        print("   📧 Sends 24h reminder day before follow-up date")
-        print("   📧 Sends urgent reminder on follow-up date")
-        print("   📝 Supports: standard follow-ups & thank you messages")
-        
-    except Exception as e:
-        print(f"❌ Failed to start referral follow-up scheduler: {e}")
-
-
-def stop_referral_followup_scheduler():
-    """Stop the referral follow-up reminder scheduler"""
-    try:
-        if referral_followup_scheduler.running:
-            referral_followup_scheduler.shutdown(wait=False)
-            print("✅ Referral follow-up scheduler stopped")
-    except Exception as e:
-        print(f"⚠️  Error stopping referral follow-up scheduler: {e}")
-
-
-# AUTO-START
-try:
-    start_referral_followup_scheduler()
-except Exception as e:
-    print(f"⚠️  Could not auto-start referral follow-up scheduler: {e}")
-
-# AUTO-STOP
-atexit.register(stop_referral_followup_scheduler)
+        raise
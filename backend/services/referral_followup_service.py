@@ -14,6 +14,8 @@ from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional, Any, List
 import pytz
 
+from services.notification_dispatcher import notification_dispatcher
+
 
 class ReferralFollowUpService:
     """Service for generating and sending referral follow-up reminder emails"""
@@ -22,8 +24,6 @@ class ReferralFollowUpService:
         """Initialize email configuration"""
         self.sender_email = os.getenv("GMAIL_SENDER")
         self.sender_password = os.getenv("GMAIL_APP_PASSWORD")
-        self.smtp_host = "smtp.gmail.com"
-        self.smtp_port = 465
         self.frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
     
     # ========================================================================
@@ -364,7 +364,7 @@ Need help? Contact support or check our knowledge base.
     # EMAIL SENDING METHODS
     # ========================================================================
     
-    def send_followup_reminder_email(
+    async def send_followup_reminder_email(
         self,
         recipient_email: str,
         followup_data: Dict[str, Any],
@@ -425,9 +425,7 @@ Need help? Contact support or check our knowledge base.
         
         # Send email
         try:
-            with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, recipient_email, message.as_string())
+            await notification_dispatcher.send(message, recipient_email, sender=self.sender_email)
             
             return {
                 "success": True,
@@ -1,8 +1,12 @@
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+"""
+Mock Interview Reminder Scheduler
+
+Sends 24h and 2h email reminders for scheduled interviews. Runs every minute
+as the "scheduled_interview_reminders" job (services/scheduled_jobs.py).
+"""
+
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any
-import atexit
 
 from mongo.interview_schedule_dao import InterviewScheduleDAO
 from mongo.profiles_dao import UserDataDAO
@@ -13,10 +17,6 @@ from mongo.dao_setup import db_client
 schedule_dao = InterviewScheduleDAO()
 profile_dao = UserDataDAO()
 
-# Scheduler instance
-reminder_scheduler = AsyncIOScheduler()
-
-
 def make_aware(dt):
     """Convert datetime to timezone-aware UTC if naive"""
     if dt is None:
@@ -50,7 +50,7 @@ async def check_and_send_reminders():
         if len(all_scheduled) == 0:
             print("⚠️  No scheduled interviews in database")
             print(f"{'='*80}\n")
-            return
+            return 0
         
         reminders_sent = 0
         
@@ -150,11 +150,11 @@ async def check_and_send_reminders():
         else:
             print("\033[92m✓ INTERVIEW REMINDER CHECK COMPLETE - No reminders sent\033[0m")
         #print(f"{'='*80}\n")
+        return reminders_sent
             
     except Exception as e:
         print(f"❌ CRITICAL ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        raise
 
 
 async def send_reminder_email(interview: Dict[str, Any], hours_until: int):
@@ -202,7 +202,7 @@ async def send_reminder_email(interview: Dict[str, Any], hours_until: int):
         print(f"  📤 Sending {hours_until}h reminder...")
         
         # Send email
-        email_sent = calendar_service.send_email_reminder(
+        email_sent = await calendar_service.send_email_reminder(
             recipient_email=user_email,
             interview_data=interview_data,
             hours_until=hours_until
@@ -217,52 +217,3 @@ async def send_reminder_email(interview: Dict[str, Any], hours_until: int):
         print(f"  ❌ Error sending email: {e}")
         import traceback
         traceback.print_exc()
-
-
-def start_reminder_scheduler():
-    """Start the reminder scheduler - checks every 1 MINUTE"""
-    try:
-        if reminder_scheduler.running:
-            print("⚠️  Scheduler already running")
-            return
-            
-        reminder_scheduler.add_job(
-            check_and_send_reminders,
-            trigger=IntervalTrigger(minutes=1),
-            id='interview_reminders',
-            name='Interview Reminders',
-            replace_existing=True,
-            max_instances=1
-        )
-        
-        reminder_scheduler.start()
-    #    print("\n" + "="*80)
-        print("✅ REMINDER SCHEDULER STARTED")
-    #    print("="*80)
-    #    print("   ⏰ Checking every 1 MINUTE")
-    #    print("   📧 Sends 24h reminder when ≤24h away (but >2h)")
-    #    print("   📧 Sends 2h reminder when ≤2h away")
-    #    print("="*80 + "\n")
-        
-    except Exception as e:
-        print(f"❌ Failed to start scheduler: {e}")
-
-
-def stop_reminder_scheduler():
-    """Stop the reminder scheduler"""
-    try:
-        if reminder_scheduler.running:
-            reminder_scheduler.shutdown(wait=False)
-            print("✅ Scheduler stopped")
-    except Exception as e:
-        print(f"⚠️  Error stopping: {e}")
-
-
-# AUTO-START
-try:
-    start_reminder_scheduler()
-except Exception as e:
-    print(f"⚠️  Could not auto-start: {e}")
-
-# AUTO-STOP
-atexit.register(stop_reminder_scheduler)
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Render Cache
+
+Content-addressed cache for rendered documents (resume PDF/DOCX, cover letter
+PDF). The cache key is a SHA-256 of what actually determines the output: the
+document content (or the final HTML handed to Chromium), the template id and
+the output format. Identical input always maps to the same key, so a repeat
+preview or export is streamed from GridFS without touching Chromium, and the
+key doubles as a strong ETag for If-None-Match.
+
+Because a changed document produces a new key, stale renders are never
+served. Old renders are only kept around to save storage churn: each
+document keeps its newest MAX_RENDERS_PER_DOCUMENT renders per format, and
+invalidate() drops them all when a resume is updated or a version restored.
+
+Usage:
+    from services.render_cache import render_cache, render_key
+
+    key = render_key(resume_id, "pdf", content=full_html, template_id=resume.get("template"))
+    pdf_bytes = await render_cache.get_or_render(
+        resume_id, key, "pdf", lambda: HTMLPDFGenerator.generate_pdf_from_html(full_html)
+    )
+"""
+
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import Request, Response
+
+from mongo.index_registry import index_registry
+
+# Bump when renderer output changes (new PDF margins, DOCX layout, ...) so old
+# renders stop matching
+RENDERER_VERSION = "1"
+MAX_RENDERS_PER_DOCUMENT = 5
+
+RENDER_KIND = "render"
+
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+# Renders live in GridFS next to uploaded media
+index_registry.declare("fs.files", [("metadata.kind", 1), ("metadata.render_key", 1)])
+index_registry.declare("fs.files", [("metadata.kind", 1), ("metadata.parent_id", 1), ("uploadDate", -1)])
+
+# Bookkeeping fields that change without changing the rendered output
+_VOLATILE_FIELDS = {"_id", "uuid", "date_created", "date_updated", "default_resume", "approval_status"}
+
+
+def resume_content(resume: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a resume document that affect how it renders"""
+    return {key: value for key, value in resume.items() if key not in _VOLATILE_FIELDS}
+
+
+def render_key(document_id: str, fmt: str, content: Any, template_id: Optional[str] = None) -> str:
+    """
+    Hash of (document, format, template, content). content may be the final
+    HTML string or a document dict; dicts are hashed in canonical JSON form.
+    """
+    if isinstance(content, str):
+        body = content
+    else:
+        body = json.dumps(content, sort_keys=True, default=str, separators=(",", ":"))
+    digest = hashlib.sha256()
+    for part in (RENDERER_VERSION, document_id, fmt, str(template_id or ""), body):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def etag_for(key: str) -> str:
+    return f'"{key}"'
+
+
+def not_modified(request: Optional[Request], key: str) -> Optional[Response]:
+    """304 response when the client already holds this exact render"""
+    if request is None:
+        return None
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag_for(key) in tags or "*" in tags:
+        return Response(status_code=304, headers={"ETag": etag_for(key)})
+    return None
+
+
+class RenderCache:
+    def __init__(self, max_renders_per_document: int = MAX_RENDERS_PER_DOCUMENT):
+        self.max_renders_per_document = max_renders_per_document
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        from mongo.media_dao import media_dao
+
+        try:
+            media_ids = await media_dao.find_media_ids({"kind": RENDER_KIND, "render_key": key})
+            if media_ids:
+                media = await media_dao.get_media(media_ids[0])
+                if media:
+                    return media["contents"]
+        except Exception as e:
+            print(f"[RenderCache] Lookup failed for {key[:12]}: {e}")
+        return None
+
+    async def put(self, document_id: str, key: str, fmt: str, contents: bytes) -> None:
+        from mongo.media_dao import media_dao
+
+        try:
+            await media_dao.add_media(
+                document_id,
+                f"{document_id}-{key[:12]}.{fmt}",
+                contents,
+                content_type=CONTENT_TYPES.get(fmt, "application/octet-stream"),
+                extra_metadata={"kind": RENDER_KIND, "render_key": key, "format": fmt},
+            )
+            await self._prune(document_id, fmt)
+        except Exception as e:
+            print(f"[RenderCache] Store failed for {document_id}: {e}")
+
+    async def get_or_render(
+        self,
+        document_id: str,
+        key: str,
+        fmt: str,
+        render: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """Cached bytes for key, rendering and storing them on a miss"""
+        cached = await self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        contents = await render()
+        await self.put(document_id, key, fmt, contents)
+        return contents
+
+    async def _prune(self, document_id: str, fmt: str) -> None:
+        from mongo.media_dao import media_dao
+
+        media_ids = await media_dao.find_media_ids(
+            {"kind": RENDER_KIND, "parent_id": document_id, "format": fmt}
+        )
+        for media_id in media_ids[self.max_renders_per_document:]:
+            await media_dao.delete_media(media_id)
+
+    async def invalidate(self, document_id: str) -> int:
+        """Drop every cached render of a document"""
+        from mongo.media_dao import media_dao
+
+        try:
+            media_ids = await media_dao.find_media_ids({"kind": RENDER_KIND, "parent_id": document_id})
+            for media_id in media_ids:
+                await media_dao.delete_media(media_id)
+            return len(media_ids)
+        except Exception as e:
+            print(f"[RenderCache] Invalidation failed for {document_id}: {e}")
+            return 0
+
+
+# Global instance
+render_cache = RenderCache()
@@ -7,6 +7,8 @@ Related to UC-053: Resume Preview and Validation
 import re
 from typing import Dict, List, Tuple
 
+from utils.lexicon import Lexicon
+
 
 class ResumeValidator:
     """Validate resume data and provide feedback"""
@@ -48,6 +50,11 @@ class ResumeValidator:
         'facilitated', 'generated', 'influenced', 'initiated', 'innovated'
     }
 
+    # Compiled once; whole-word, so 'wich' is not flagged inside 'sandwich'
+    MISSPELLING_LEXICON = Lexicon(COMMON_MISSPELLINGS)
+    ATS_KEYWORD_LEXICON = Lexicon(sorted(ATS_KEYWORDS))
+    ACTION_VERB_LEXICON = Lexicon(sorted(ACTION_VERBS))
+
     @staticmethod
     def validate_resume(resume_data: dict) -> dict:
         """
@@ -220,16 +227,11 @@ class ResumeValidator:
             if exp.get('description'):
                 text_to_check.append(exp['description'])
 
-        # Check for misspellings
-        full_text = ' '.join(text_to_check).lower()
-        found_misspellings = []
+        # Check for misspellings (each reported once, in dictionary order)
+        found = {hit.term for hit in ResumeValidator.MISSPELLING_LEXICON.finditer(' '.join(text_to_check))}
 
-        for misspelling, correct in ResumeValidator.COMMON_MISSPELLINGS.items():
-            if misspelling in full_text:
-                found_misspellings.append((misspelling, correct))
-
-        if found_misspellings:
-            for misspelled, correct in found_misspellings:
+        for misspelled, correct in ResumeValidator.COMMON_MISSPELLINGS.items():
+            if misspelled in found:
                 warnings.append(f"Possible misspelling: '{misspelled}' → '{correct}'")
 
         return warnings
@@ -245,12 +247,10 @@ class ResumeValidator:
 
         weak_descriptions = []
         for idx, exp in enumerate(experience_items, 1):
-            desc = exp.get('description', '').lower()
-            if desc:
-                # Check if description starts with action verb
-                words = desc.split()
-                if words and words[0] not in ResumeValidator.ACTION_VERBS:
-                    weak_descriptions.append(idx)
+            desc = exp.get('description', '')
+            # Check if description starts with action verb (after any bullet)
+            if desc.strip() and not ResumeValidator.ACTION_VERB_LEXICON.starts_with(desc):
+                weak_descriptions.append(idx)
 
         if weak_descriptions:
             warnings.append(
@@ -371,9 +371,9 @@ class ResumeValidator:
             resume_data.get('summary', ''),
             str(resume_data.get('skills', [])).lower(),
             ' '.join([e.get('description', '') for e in resume_data.get('experience', [])])
-        ]).lower()
+        ])
 
-        keywords_found = sum(1 for keyword in ResumeValidator.ATS_KEYWORDS if keyword in text_content)
+        keywords_found = len(ResumeValidator.ATS_KEYWORD_LEXICON.labels(text_content))
         if keywords_found > 0:
             # 2 points per keyword found (max 20 bonus points)
             score = min(100, score + min(20, keywords_found * 2))
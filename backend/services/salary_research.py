@@ -1,18 +1,18 @@
 import json
 import os
-from services.tracked_ai_clients import TrackedOpenAIClient
+from services.tracked_ai_clients import AsyncTrackedOpenAIClient
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 # Use tracked client for metrics logging
-openai_client = TrackedOpenAIClient()
+openai_client = AsyncTrackedOpenAIClient()
 
 
 async def call_cohere_api(prompt: str) -> str:
     """Call OpenAI API (formerly Cohere) - same interface, better results"""
     try:
-        response = openai_client.chat.completions.create(
+        response = await openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "You are an expert salary negotiation coach with deep knowledge of compensation packages, market rates, and negotiation strategies."},
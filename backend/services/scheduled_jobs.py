@@ -0,0 +1,49 @@
+"""
+Scheduled Jobs
+
+The periodic background jobs, registered on the job runner. Imported lazily
+so loading the runner does not pull in every reminder service.
+
+Usage:
+    from services.scheduled_jobs import register_jobs
+
+    register_jobs()
+    await job_runner.start()
+"""
+
+from services.job_runner import JobRunner, job_runner
+
+MINUTE = 60
+DAY = 24 * 60 * MINUTE
+
+
+def register_jobs(runner: JobRunner = job_runner) -> JobRunner:
+    from services.automation_engine import process_due_schedules
+    from services.event_reminder_scheduler import backfill_event_reminder_times, check_and_send_event_reminders
+    from services.interview_reminder_scheduler import check_and_send_interview_reminders
+    from services.peer_benchmarks import ROLLUP_INTERVAL_MINUTES, run_scheduled_rollup
+    from services.reminder_scheduler import check_and_send_reminders
+    from services.referral_followup_scheduler import check_and_send_followup_reminders
+    from services.referral_reminder_scheduler import (
+        backfill_referral_reminder_times,
+        check_and_send_referral_reminders,
+    )
+
+    # Reminder emails
+    runner.register("referral_reminders", check_and_send_referral_reminders, interval_seconds=MINUTE)
+    runner.register("referral_followups", check_and_send_followup_reminders, interval_seconds=MINUTE)
+    runner.register("event_reminders", check_and_send_event_reminders, interval_seconds=MINUTE)
+    runner.register("interview_reminders", check_and_send_interview_reminders, interval_seconds=MINUTE)
+    runner.register("scheduled_interview_reminders", check_and_send_reminders, interval_seconds=MINUTE)
+
+    # next_reminder_at for documents written by older code
+    runner.register("event_reminder_backfill", backfill_event_reminder_times, interval_seconds=DAY)
+    runner.register("referral_reminder_backfill", backfill_referral_reminder_times, interval_seconds=DAY)
+
+    # Scheduled application submissions
+    runner.register("workflow_auto_submit", process_due_schedules, interval_seconds=MINUTE)
+
+    # Competitive analysis cohorts
+    runner.register("peer_benchmark_rollup", run_scheduled_rollup, interval_seconds=ROLLUP_INTERVAL_MINUTES * MINUTE)
+
+    return runner
@@ -5,12 +5,13 @@ Sends email notifications for scheduled applications and deadline reminders
 """
 
 import os
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 
+from services.notification_dispatcher import notification_dispatcher
+
 
 class SchedulingService:
     """Service for sending scheduling and reminder emails"""
@@ -19,8 +20,6 @@ class SchedulingService:
         """Initialize email configuration"""
         self.sender_email = os.getenv("GMAIL_SENDER")
         self.sender_password = os.getenv("GMAIL_APP_PASSWORD")
-        self.smtp_host = "smtp.gmail.com"
-        self.smtp_port = 465
         self.frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
     
     def _validate_credentials(self) -> None:
@@ -31,7 +30,7 @@ class SchedulingService:
                 "Please set GMAIL_SENDER and GMAIL_APP_PASSWORD environment variables."
             )
     
-    def _send_email(
+    async def _send_email(
         self,
         recipient_email: str,
         subject: str,
@@ -58,9 +57,7 @@ class SchedulingService:
         message.attach(part2)
         
         try:
-            with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port) as server:
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, recipient_email, message.as_string())
+            await notification_dispatcher.send(message, recipient_email, sender=self.sender_email)
             
             return {
                 "success": True,
@@ -70,7 +67,7 @@ class SchedulingService:
         except Exception as e:
             raise Exception(f"Failed to send email: {str(e)}")
     
-    def send_scheduled_submission_reminder(
+    async def send_scheduled_submission_reminder(
         self,
         recipient_email: str,
         job_title: str,
@@ -226,9 +223,9 @@ Job Opportunities Tracker - Metamorphosis
 </html>
 """
         
-        return self._send_email(recipient_email, subject, text, html)
+        return await self._send_email(recipient_email, subject, text, html)
     
-    def send_deadline_reminder(
+    async def send_deadline_reminder(
         self,
         recipient_email: str,
         job_title: str,
@@ -377,9 +374,9 @@ Job Opportunities Tracker - Metamorphosis
 </html>
 """
         
-        return self._send_email(recipient_email, subject, text, html)
+        return await self._send_email(recipient_email, subject, text, html)
     
-    def send_submission_success_notification(
+    async def send_submission_success_notification(
         self,
         recipient_email: str,
         job_title: str,
@@ -509,7 +506,7 @@ Job Opportunities Tracker - Metamorphosis
 </html>
 """
         
-        return self._send_email(recipient_email, subject, text, html)
+        return await self._send_email(recipient_email, subject, text, html)
 
 
 # Singleton instance
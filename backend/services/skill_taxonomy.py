@@ -0,0 +1,204 @@
+"""
+Skill Taxonomy
+
+Canonical skills with integer ids, their aliases and parent categories.
+The taxonomy lives in Mongo (skill_taxonomy) and every process compiles it
+into a SkillIndex at startup: a normalized alias -> id map, each id's
+ancestors, and a Lexicon that finds every alias in a text in one pass.
+Job requirement extraction, the skills DAO and job matching all resolve
+skills through it, so matching compares ids instead of strings.
+
+Hot reload: writes bump a version number in skill_taxonomy_state; each
+process polls it every SKILL_TAXONOMY_REFRESH_SECONDS and swaps in a newly
+compiled index when it moves. A taxonomy that fails to compile (unknown
+parent, cycle) is logged and the running index kept. Until the first load,
+and when Mongo is unreachable, the built-in DEFAULT_TAXONOMY is used; it
+also seeds an empty collection.
+
+Usage:
+    from services.skill_taxonomy import skill_taxonomy
+
+    await skill_taxonomy.refresh()   # at startup
+    skill_taxonomy.start()           # poll for new versions
+
+    index = skill_taxonomy.index     # one consistent snapshot
+    index.resolve("Node.js")         # -> 4
+    index.extract("Python and k8s")  # -> [1, 13]
+    index.expand({9})                # -> {9, 104}  (aws and its "cloud" category)
+
+scripts/load_skill_taxonomy.py loads a taxonomy from a JSON file.
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from mongo.skill_taxonomy_dao import skill_taxonomy_dao
+from utils.lexicon import Lexicon, normalize_term
+
+REFRESH_SECONDS = float(os.getenv("SKILL_TAXONOMY_REFRESH_SECONDS", "60"))
+
+# Ids are stored on skills and jobs, so an entry keeps its id for good
+DEFAULT_TAXONOMY: List[Dict[str, Any]] = [
+    {"id": 1, "name": "python", "aliases": [], "parent": 101},
+    {"id": 2, "name": "java", "aliases": [], "parent": 101},
+    {"id": 3, "name": "c++", "aliases": ["cpp"], "parent": 101},
+    {"id": 4, "name": "javascript", "aliases": ["js", "node", "node.js", "nodejs"], "parent": 101},
+    {"id": 5, "name": "react", "aliases": ["react.js", "reactjs"], "parent": 102},
+    {"id": 6, "name": "sql", "aliases": ["postgres", "postgresql", "mysql", "mongodb"], "parent": 103},
+    {"id": 7, "name": "html", "aliases": ["html5"], "parent": 102},
+    {"id": 8, "name": "css", "aliases": ["css3"], "parent": 102},
+    {"id": 9, "name": "aws", "aliases": ["amazon web services"], "parent": 104},
+    {"id": 10, "name": "azure", "aliases": ["microsoft azure"], "parent": 104},
+    {"id": 11, "name": "git", "aliases": [], "parent": 105},
+    {"id": 12, "name": "docker", "aliases": [], "parent": 105},
+    {"id": 13, "name": "kubernetes", "aliases": ["k8s"], "parent": 105},
+    {"id": 14, "name": "machine learning", "aliases": ["ml", "deep learning"], "parent": 106},
+    {"id": 15, "name": "data analysis", "aliases": ["analytics"], "parent": 106},
+    {"id": 16, "name": "communication", "aliases": ["written communication", "verbal communication"],
+     "parent": 107},
+    # Categories: requiring one is satisfied by any skill under it
+    {"id": 101, "name": "programming languages", "aliases": [], "parent": None},
+    {"id": 102, "name": "web development", "aliases": ["frontend", "front-end", "front end"], "parent": None},
+    {"id": 103, "name": "databases", "aliases": [], "parent": None},
+    {"id": 104, "name": "cloud", "aliases": ["cloud computing"], "parent": None},
+    {"id": 105, "name": "devops", "aliases": [], "parent": None},
+    {"id": 106, "name": "data science", "aliases": [], "parent": None},
+    {"id": 107, "name": "soft skills", "aliases": [], "parent": None},
+]
+
+
+class SkillIndex:
+    """A taxonomy compiled for lookups; immutable, so readers never see a half-built one"""
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], version: Optional[int] = None):
+        self.version = version
+        entries = sorted(entries, key=lambda e: e["id"])
+
+        self.names: Dict[int, str] = {}
+        self.parents: Dict[int, Optional[int]] = {}
+        for entry in entries:
+            if entry["id"] in self.names:
+                raise ValueError(f"Duplicate skill id {entry['id']}")
+            self.names[entry["id"]] = normalize_term(entry["name"])
+            self.parents[entry["id"]] = entry.get("parent")
+
+        # Canonical names first, so a name always beats another entry's alias
+        self.ids_by_alias: Dict[str, int] = {name: skill_id for skill_id, name in self.names.items()}
+        for entry in entries:
+            for alias in entry.get("aliases", []):
+                self.ids_by_alias.setdefault(normalize_term(alias), entry["id"])
+
+        self.ancestors: Dict[int, FrozenSet[int]] = {skill_id: self._walk(skill_id) for skill_id in self.names}
+        # Labels are ids, reported in id order
+        self.lexicon = Lexicon(self.ids_by_alias)
+
+    def _walk(self, skill_id: int) -> FrozenSet[int]:
+        seen: List[int] = []
+        parent = self.parents[skill_id]
+        while parent is not None:
+            if parent not in self.names:
+                raise ValueError(f"Skill {skill_id} ({self.names[skill_id]}) has unknown parent {parent}")
+            if parent == skill_id or parent in seen:
+                raise ValueError(f"Skill {skill_id} ({self.names[skill_id]}) is its own ancestor")
+            seen.append(parent)
+            parent = self.parents[parent]
+        return frozenset(seen)
+
+    def resolve(self, name: Optional[str]) -> Optional[int]:
+        """Id of a skill name or alias (any case or spacing), None if it is not in the taxonomy"""
+        if not isinstance(name, str):
+            return None
+        return self.ids_by_alias.get(normalize_term(name))
+
+    def name(self, skill_id: int) -> Optional[str]:
+        return self.names.get(skill_id)
+
+    def extract(self, text: str) -> List[int]:
+        """Ids of the skills a text mentions, whole words only"""
+        return self.lexicon.labels(text)
+
+    def expand(self, skill_ids: Iterable[int]) -> Set[int]:
+        """The ids plus every category above them"""
+        expanded = set()
+        for skill_id in skill_ids:
+            expanded.add(skill_id)
+            expanded |= self.ancestors.get(skill_id, frozenset())
+        return expanded
+
+
+def parse_entries(raw: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Validate a taxonomy as written by hand: [{id, name, aliases?, parent?}],
+    where parent is an id or another entry's name. Raises ValueError.
+    """
+    ids_by_name = {}
+    for entry in raw:
+        if not isinstance(entry.get("id"), int) or not isinstance(entry.get("name"), str) or not entry["name"].strip():
+            raise ValueError(f"Entry needs an integer id and a name: {entry}")
+        ids_by_name[normalize_term(entry["name"])] = entry["id"]
+
+    entries = []
+    for entry in raw:
+        parent = entry.get("parent")
+        if isinstance(parent, str):
+            if normalize_term(parent) not in ids_by_name:
+                raise ValueError(f"Skill {entry['name']!r} has unknown parent {parent!r}")
+            parent = ids_by_name[normalize_term(parent)]
+        entries.append({
+            "id": entry["id"],
+            "name": normalize_term(entry["name"]),
+            "aliases": [normalize_term(a) for a in entry.get("aliases", []) if a and a.strip()],
+            "parent": parent,
+        })
+    SkillIndex(entries)  # rejects duplicate ids, unknown parents and cycles
+    return entries
+
+
+class SkillTaxonomy:
+    """The process's current SkillIndex, reloaded when the stored taxonomy changes"""
+
+    def __init__(self, entries: List[Dict[str, Any]] = DEFAULT_TAXONOMY):
+        self.index = SkillIndex(entries)
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> bool:
+        """Load the stored taxonomy if its version moved (seeding an empty one). True if reloaded."""
+        version = await skill_taxonomy_dao.get_version()
+        if version is None:
+            version = await skill_taxonomy_dao.replace_all(DEFAULT_TAXONOMY)
+            print(f"[SkillTaxonomy] Seeded default taxonomy ({len(DEFAULT_TAXONOMY)} entries)")
+        if version == self.index.version:
+            return False
+
+        index = SkillIndex(await skill_taxonomy_dao.get_all(), version)
+        self.index = index
+        print(f"[SkillTaxonomy] Loaded version {version} ({len(index.names)} skills, {len(index.ids_by_alias)} aliases)")
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(REFRESH_SECONDS)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"[SkillTaxonomy] Warning: Could not reload taxonomy, keeping version {self.index.version}: {e}")
+
+    def start(self) -> None:
+        """Start polling for new taxonomy versions on the running event loop"""
+        if self._task and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global instance
+skill_taxonomy = SkillTaxonomy()
@@ -3,7 +3,8 @@ import random
 import os
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
-from services.tracked_ai_clients import TrackedOpenAIClient
+from services.tracked_ai_clients import AsyncTrackedOpenAIClient
+from services.code_execution import code_executor, PASSED, WRONG_ANSWER
 from mongo.technical_prep_dao import technical_prep_dao
 from schema.TechnicalChallenge import (
     TechnicalChallenge, CodingChallenge, TestCase, SolutionFramework,
@@ -1490,9 +1491,9 @@ VALIDATION CHECKLIST FOR EACH TEST CASE:
 
 Return ONLY the JSON array, nothing else. NO EXPLANATIONS."""
 
-            client = TrackedOpenAIClient()
+            client = AsyncTrackedOpenAIClient()
 
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {
@@ -1565,122 +1566,37 @@ Return ONLY the JSON array, nothing else. NO EXPLANATIONS."""
         ]
 
     async def _run_tests(self, challenge: Dict[str, Any], code: str, language: str) -> List[Dict[str, Any]]:
-        """Run tests against submitted code using OpenAI"""
+        """Run the submitted code against the challenge's test cases in sandboxed processes"""
         test_cases = []
 
         if challenge.get("challenge_type") == "coding":
             coding = challenge.get("coding_challenge", {})
             test_cases = coding.get("test_cases", [])
 
-        # Run tests
-        results = []
-        client = TrackedOpenAIClient()
-        rate_limited = False
-
-        for i, test in enumerate(test_cases):
-            try:
-                # If we hit rate limit, mark remaining tests as skipped
-                if rate_limited:
-                    results.append({
-                        "test_number": i + 1,
-                        "input": test.get("input", {}),
-                        "expected": test.get("expected_output"),
-                        "actual": "Skipped due to API rate limit",
-                        "passed": False,
-                        "description": test.get("description", f"Test {i + 1}")
-                    })
-                    continue
-
-                test_input = test.get("input", {})
-                expected_output = test.get("expected_output")
-
-                # Create prompt to execute code
-                execution_prompt = self._create_execution_prompt(code, language, test_input)
-
-                # Call OpenAI to execute code
-                response = client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are a code execution assistant. Execute the provided code with the given inputs and return ONLY the output value, nothing else."
-                        },
-                        {
-                            "role": "user",
-                            "content": execution_prompt
-                        }
-                    ],
-                    max_tokens=500,
-                    temperature=0,
-                )
-
-                actual_output_text = response.choices[0].message.content.strip()
-
-                # Try to parse and compare output
-                passed = self._compare_outputs(actual_output_text, expected_output, language)
+        outcomes = await code_executor.run(code, language, test_cases)
 
-                results.append({
-                    "test_number": i + 1,
-                    "input": test_input,
-                    "expected": expected_output,
-                    "actual": actual_output_text,
-                    "passed": passed,
-                    "description": test.get("description", f"Test {i + 1}")
-                })
-            except Exception as e:
-                error_str = str(e)
-                # Check if it's a rate limit error
-                if "429" in error_str or "rate_limit_exceeded" in error_str or "RateLimitError" in error_str:
-                    rate_limited = True
-                    error_msg = "API rate limit reached. Unable to execute remaining tests."
-                else:
-                    error_msg = f"Execution error: {error_str[:100]}"
-
-                results.append({
-                    "test_number": i + 1,
-                    "input": test.get("input", {}),
-                    "expected": test.get("expected_output"),
-                    "actual": error_msg,
-                    "passed": False,
-                    "description": test.get("description", f"Test {i + 1}")
-                })
+        results = []
+        for i, (test, outcome) in enumerate(zip(test_cases, outcomes)):
+            if outcome["status"] in (PASSED, WRONG_ANSWER):
+                actual = json.dumps(outcome["value"])
+            else:
+                actual = outcome["error"]
+
+            results.append({
+                "test_number": i + 1,
+                "input": test.get("input", {}),
+                "expected": test.get("expected_output"),
+                "actual": actual,
+                "passed": outcome["status"] == PASSED,
+                "status": outcome["status"],
+                "runtime_ms": outcome["runtime_ms"],
+                "memory_kb": outcome["memory_kb"],
+                "stdout": outcome["stdout"],
+                "description": test.get("description", f"Test {i + 1}")
+            })
 
         return results
 
-    def _create_execution_prompt(self, code: str, language: str, test_input: Dict[str, Any]) -> str:
-        """Create a prompt for OpenAI to execute code"""
-        # Convert test input to function arguments
-        if isinstance(test_input, dict):
-            args_str = ", ".join([f"{k}={json.dumps(v)}" for k, v in test_input.items()])
-        else:
-            args_str = str(test_input)
-
-        prompt = f"""Execute this {language.capitalize()} code and return ONLY the output value (no explanation):
-
-{code}
-
-Call the function with these inputs: {args_str}
-
-Output:"""
-        return prompt
-
-    def _compare_outputs(self, actual: str, expected: Any, language: str) -> bool:
-        """Compare actual output with expected output"""
-        try:
-            # Try to parse actual output as JSON if expected is complex type
-            if isinstance(expected, (list, dict)):
-                try:
-                    actual_parsed = json.loads(actual)
-                    return actual_parsed == expected
-                except:
-                    # If JSON parse fails, try string comparison
-                    return str(actual).strip() == str(expected).strip()
-            else:
-                # For simple types, compare as strings
-                return str(actual).strip() == str(expected).strip()
-        except:
-            return False
-
     async def get_user_progress(self, uuid: str) -> Dict[str, Any]:
         """Get user's technical prep progress"""
         stats = await technical_prep_dao.get_user_statistics(uuid)
@@ -1688,23 +1604,7 @@ Output:"""
 
     async def get_challenge_leaderboard(self, challenge_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get leaderboard for a challenge"""
-        attempts = await technical_prep_dao.get_challenge_attempts(challenge_id)
-
-        # Group by user and get best score
-        user_scores = {}
-        for attempt in attempts:
-            uuid = attempt.get("uuid")
-            score = attempt.get("score", 0)
-            if uuid not in user_scores or score > user_scores[uuid]:
-                user_scores[uuid] = score
-
-        # Sort and return
-        leaderboard = [
-            {"uuid": u, "score": s}
-            for u, s in sorted(user_scores.items(), key=lambda x: x[1], reverse=True)
-        ]
-
-        return leaderboard[:limit]
+        return await technical_prep_dao.get_leaderboard(challenge_id, limit=limit)
 
     async def generate_solution(self, challenge_id: str, language: str = "python") -> Dict[str, Any]:
         """Generate a solution for a challenge using Cohere"""
@@ -1746,8 +1646,8 @@ Solution:"""
 
             # Call OpenAI API with error handling
             try:
-                client = TrackedOpenAIClient()
-                response = client.chat.completions.create(
+                client = AsyncTrackedOpenAIClient()
+                response = await client.chat.completions.create(
                     model="gpt-4",
                     messages=[
                         {
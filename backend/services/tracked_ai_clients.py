@@ -1,13 +1,46 @@
 import time
-import os
-import certifi
-from datetime import datetime, timezone
 from typing import Any
 import cohere
-from openai import OpenAI
-from pymongo import MongoClient
+from openai import OpenAI, AsyncOpenAI
 
 from services.api_key_manager import api_key_manager
+from services.api_telemetry import api_telemetry
+
+
+def _cohere_tokens_used(result) -> int:
+    """Robust token extraction for Cohere responses (Fixes UsageTokens Crash)"""
+    if not (hasattr(result, 'usage') and result.usage):
+        return 0
+    usage = result.usage
+    # Check for V2 'total_tokens' attribute
+    if getattr(usage, 'total_tokens', None):
+        return usage.total_tokens
+    # Check for 'tokens' (Dict or Object)
+    if hasattr(usage, 'tokens') and usage.tokens:
+        t = usage.tokens
+        if isinstance(t, dict):
+            return t.get('input_tokens', 0) + t.get('output_tokens', 0)
+        return (getattr(t, 'input_tokens', 0) or 0) + (getattr(t, 'output_tokens', 0) or 0)
+    return 0
+
+
+def _openai_fallback_params(kwargs: dict) -> dict:
+    """Map Cohere chat() params onto an OpenAI chat.completions request"""
+    model = kwargs.get('model', 'gpt-4o-mini')
+    return {
+        "model": 'gpt-4o-mini' if not model.startswith('gpt') else model,
+        "messages": kwargs.get('messages', []),
+        "temperature": kwargs.get('temperature', 0.7),
+        "max_tokens": kwargs.get('max_tokens', 1500),
+    }
+
+
+class FallbackResponse:
+    """Cohere-like response object wrapping an OpenAI completion"""
+    def __init__(self, oa_resp):
+        self.message = type('obj', (), {'content': [type('obj', (), {'text': oa_resp.choices[0].message.content})()]})()
+        self.usage = oa_resp.usage
+
 
 class TrackedCohereClient:
     """
@@ -31,54 +64,20 @@ class TrackedCohereClient:
             self.openai_fallback = OpenAI(api_key=fallback_key)
         return self.openai_fallback
 
-    def _log_call_sync(self, provider, endpoint, key_owner, duration_ms, success, error_message, tokens_used):
+    def _log_call(self, provider, endpoint, key_owner, duration_ms, success, error_message, tokens_used):
         """
-        Synchronous wrapper to log API call.
-        Uses standard pymongo (Sync) to avoid complex asyncio event loop conflicts.
-        This is safe to run in threads AND on the main loop.
+        Queue the call on the shared telemetry buffer.
+        Never touches the network, so it is safe from threads and from the event loop.
         """
-        client = None
-        try:
-            mongo_url = os.getenv("MONGO_CONNECTION_STRING")
-            db_name = os.getenv("MONGO_APPLICATION_DATABASE")
-            
-            # Connect Synchronously (with 2s timeout to prevent hanging)
-            client = MongoClient(mongo_url, tls=True, tlsCAFile=certifi.where(), serverSelectionTimeoutMS=2000)
-            db = client.get_database(db_name)
-            
-            # 1. Log the API Call
-            db.api_call_logs.insert_one({
-                "timestamp": datetime.now(timezone.utc),
-                "provider": provider,
-                "endpoint": endpoint,
-                "key_owner": key_owner,
-                "duration_ms": duration_ms,
-                "success": success,
-                "error_message": error_message,
-                "tokens_used": tokens_used
-            })
-
-            # 2. Update Usage Quotas
-            current_month = datetime.now(timezone.utc).strftime("%Y-%m")
-            db.api_usage_quotas.update_one(
-                {"provider": provider, "key_owner": key_owner, "period": current_month},
-                {
-                    "$inc": {
-                        "calls": 1,
-                        "tokens": tokens_used,
-                        "errors": 0 if success else 1
-                    },
-                    "$set": {"updated_at": datetime.now(timezone.utc)}
-                },
-                upsert=True
-            )
-
-        except Exception as e:
-            # We silently catch logging errors so they don't crash the actual AI feature
-            print(f"[TrackedClient] Logging Error: {e}")
-        finally:
-            if client:
-                client.close()
+        api_telemetry.record(
+            provider=provider,
+            endpoint=endpoint,
+            key_owner=key_owner,
+            duration_ms=duration_ms,
+            success=success,
+            error_message=error_message,
+            tokens_used=tokens_used
+        )
 
     def chat(self, **kwargs):
         """Tracked version of Cohere chat() with OpenAI fallback"""
@@ -95,19 +94,8 @@ class TrackedCohereClient:
             result = self.client.chat(**kwargs)
             success = True
 
-            # --- 2. Robust Token Extraction (Fixes UsageTokens Crash) ---
-            if hasattr(result, 'usage') and result.usage:
-                usage = result.usage
-                # Check for V2 'total_tokens' attribute
-                if getattr(usage, 'total_tokens', None):
-                    tokens_used = usage.total_tokens
-                # Check for 'tokens' (Dict or Object)
-                elif hasattr(usage, 'tokens') and usage.tokens:
-                    t = usage.tokens
-                    if isinstance(t, dict):
-                        tokens_used = t.get('input_tokens', 0) + t.get('output_tokens', 0)
-                    else:
-                        tokens_used = (getattr(t, 'input_tokens', 0) or 0) + (getattr(t, 'output_tokens', 0) or 0)
+            # --- 2. Token Extraction ---
+            tokens_used = _cohere_tokens_used(result)
 
         except Exception as e:
             error_message = str(e)
@@ -118,22 +106,7 @@ class TrackedCohereClient:
                 print(f"[TrackedCohereClient] Initiating Fallback...")
                 openai_client = self._get_openai_fallback()
                 
-                # Map params
-                model = kwargs.get('model', 'gpt-4o-mini')
-                fallback_model = 'gpt-4o-mini' if not model.startswith('gpt') else model
-                
-                response = openai_client.chat.completions.create(
-                    model=fallback_model,
-                    messages=kwargs.get('messages', []),
-                    temperature=kwargs.get('temperature', 0.7),
-                    max_tokens=kwargs.get('max_tokens', 1500)
-                )
-
-                # Mock a Cohere-like response object
-                class FallbackResponse:
-                    def __init__(self, oa_resp):
-                        self.message = type('obj', (), {'content': [type('obj', (), {'text': oa_resp.choices[0].message.content})()]})()
-                        self.usage = oa_resp.usage
+                response = openai_client.chat.completions.create(**_openai_fallback_params(kwargs))
 
                 result = FallbackResponse(response)
                 success = True
@@ -149,7 +122,7 @@ class TrackedCohereClient:
         finally:
             # --- 4. Log Everything ---
             duration = (time.time() - start_time) * 1000
-            self._log_call_sync(provider, "chat", key_owner, duration, success, error_message, tokens_used)
+            self._log_call(provider, "chat", key_owner, duration, success, error_message, tokens_used)
 
         if not success:
             raise Exception(error_message)
@@ -169,45 +142,17 @@ class TrackedOpenAIClient:
         self.key_owner = key_owner
         self.client = OpenAI(api_key=api_key)
 
-    def _log_call_sync(self, endpoint, key_owner, duration_ms, success, error_message, tokens_used):
-        """Synchronous wrapper to log API call"""
-        client = None
-        try:
-            mongo_url = os.getenv("MONGO_CONNECTION_STRING")
-            db_name = os.getenv("MONGO_APPLICATION_DATABASE")
-            
-            client = MongoClient(mongo_url, tls=True, tlsCAFile=certifi.where(), serverSelectionTimeoutMS=2000)
-            db = client.get_database(db_name)
-            
-            db.api_call_logs.insert_one({
-                "timestamp": datetime.now(timezone.utc),
-                "provider": "openai",
-                "endpoint": endpoint,
-                "key_owner": key_owner,
-                "duration_ms": duration_ms,
-                "success": success,
-                "error_message": error_message,
-                "tokens_used": tokens_used
-            })
-
-            current_month = datetime.now(timezone.utc).strftime("%Y-%m")
-            db.api_usage_quotas.update_one(
-                {"provider": "openai", "key_owner": key_owner, "period": current_month},
-                {
-                    "$inc": {
-                        "calls": 1, 
-                        "tokens": tokens_used, 
-                        "errors": 0 if success else 1
-                    },
-                    "$set": {"updated_at": datetime.now(timezone.utc)}
-                },
-                upsert=True
-            )
-        except Exception as e:
-            print(f"[TrackedOpenAIClient] Logging failed: {e}")
-        finally:
-            if client:
-                client.close()
+    def _log_call(self, endpoint, key_owner, duration_ms, success, error_message, tokens_used):
+        """Queue the call on the shared telemetry buffer"""
+        api_telemetry.record(
+            provider="openai",
+            endpoint=endpoint,
+            key_owner=key_owner,
+            duration_ms=duration_ms,
+            success=success,
+            error_message=error_message,
+            tokens_used=tokens_used
+        )
 
     @property
     def chat(self):
@@ -247,11 +192,130 @@ class TrackedCompletionsInterface:
 
         finally:
             duration = (time.time() - start_time) * 1000
-            self.tracked_client._log_call_sync(
+            self.tracked_client._log_call(
                 "chat.completions", self.tracked_client.key_owner, duration, success, error_message, tokens_used
             )
 
         if not success:
             raise Exception(error_message)
 
-        return result
\ No newline at end of file
+        return result
+
+
+class AsyncTrackedCohereClient(TrackedCohereClient):
+    """
+    Async counterpart of TrackedCohereClient (cohere.AsyncClientV2 + AsyncOpenAI fallback).
+    Same fallback and metrics semantics, but awaiting chat() never blocks the event loop.
+    """
+
+    def __init__(self, api_key: str = None, key_owner: str = None):
+        if not api_key:
+            key_owner, api_key = api_key_manager.select_cohere_key()
+
+        self.api_key = api_key
+        self.key_owner = key_owner or api_key_manager.get_key_owner(api_key)
+        self.client = cohere.AsyncClientV2(api_key=api_key)
+        self.openai_fallback = None
+
+    def _get_openai_fallback(self):
+        """Lazy initialize async OpenAI fallback client"""
+        if not self.openai_fallback:
+            fallback_key = api_key_manager.get_openai_fallback_key()
+            self.openai_fallback = AsyncOpenAI(api_key=fallback_key)
+        return self.openai_fallback
+
+    async def chat(self, **kwargs):
+        """Tracked version of Cohere chat() with OpenAI fallback"""
+        start_time = time.time()
+        success = False
+        error_message = None
+        tokens_used = 0
+        result = None
+        provider = "cohere"
+        key_owner = self.key_owner
+
+        try:
+            result = await self.client.chat(**kwargs)
+            success = True
+            tokens_used = _cohere_tokens_used(result)
+
+        except Exception as e:
+            error_message = str(e)
+            print(f"[AsyncTrackedCohereClient] Primary API Failed: {error_message}")
+
+            try:
+                print(f"[AsyncTrackedCohereClient] Initiating Fallback...")
+                openai_client = self._get_openai_fallback()
+                response = await openai_client.chat.completions.create(**_openai_fallback_params(kwargs))
+
+                result = FallbackResponse(response)
+                success = True
+                provider = "openai"
+                key_owner = "openai_fallback"
+                tokens_used = response.usage.total_tokens
+                print(f"[AsyncTrackedCohereClient] Fallback Successful")
+
+            except Exception as fb_error:
+                error_message = f"Primary: {error_message} | Fallback: {str(fb_error)}"
+                print(f"[AsyncTrackedCohereClient] Fallback Failed: {fb_error}")
+
+        finally:
+            duration = (time.time() - start_time) * 1000
+            self._log_call(provider, "chat", key_owner, duration, success, error_message, tokens_used)
+
+        if not success:
+            raise Exception(error_message)
+
+        return result
+
+
+class AsyncTrackedOpenAIClient(TrackedOpenAIClient):
+    """
+    Async counterpart of TrackedOpenAIClient: await client.chat.completions.create(...)
+    """
+
+    def __init__(self, api_key: str = None, key_owner: str = "system"):
+        if not api_key:
+            api_key = api_key_manager.get_openai_fallback_key()
+        self.api_key = api_key
+        self.key_owner = key_owner
+        self.client = AsyncOpenAI(api_key=api_key)
+
+    @property
+    def chat(self):
+        return AsyncTrackedChatInterface(self)
+
+
+class AsyncTrackedChatInterface(TrackedChatInterface):
+    @property
+    def completions(self):
+        return AsyncTrackedCompletionsInterface(self.tracked_client)
+
+
+class AsyncTrackedCompletionsInterface(TrackedCompletionsInterface):
+    async def create(self, **kwargs):
+        start_time = time.time()
+        success = False
+        error_message = None
+        tokens_used = 0
+        result = None
+
+        try:
+            result = await self.client.chat.completions.create(**kwargs)
+            success = True
+            tokens_used = result.usage.total_tokens if hasattr(result, 'usage') else 0
+
+        except Exception as e:
+            error_message = str(e)
+            print(f"[AsyncTrackedOpenAIClient] Request Failed: {error_message}")
+
+        finally:
+            duration = (time.time() - start_time) * 1000
+            self.tracked_client._log_call(
+                "chat.completions", self.tracked_client.key_owner, duration, success, error_message, tokens_used
+            )
+
+        if not success:
+            raise Exception(error_message)
+
+        return result
@@ -8,8 +8,27 @@ import os
 import json
 from typing import Dict, List, Any
 from collections import Counter
-from services.tracked_ai_clients import TrackedOpenAIClient
+from services.tracked_ai_clients import AsyncTrackedOpenAIClient
 from pymongo.asynchronous.database import AsyncDatabase
+from utils.lexicon import Lexicon
+
+# Scorer dictionaries, compiled once (whole words: "so" is not counted inside "also")
+TRANSITION_WORDS = Lexicon([
+    'however', 'therefore', 'additionally', 'furthermore', 'moreover',
+    'consequently', 'meanwhile', 'subsequently', 'specifically', 'for example'
+])
+STAR_INDICATORS = Lexicon.from_groups({
+    'situation': ['situation', 'context', 'background', 'scenario'],
+    'task': ['task', 'goal', 'objective', 'responsibility', 'challenge'],
+    'action': ['action', 'did', 'implemented', 'developed', 'created', 'led'],
+    'result': ['result', 'outcome', 'achieved', 'improved', 'increased', 'impact']
+})
+INTRO_WORDS = Lexicon(['first', 'initially', 'to begin'])
+CONCLUSION_WORDS = Lexicon(['therefore', 'thus', 'in conclusion', 'overall'])
+FILLER_WORDS = Lexicon(['very', 'really', 'just', 'actually', 'basically', 'literally'])
+CONTRACTIONS = Lexicon(["don't", "can't", "won't", "shouldn't", "wouldn't", "isn't", "aren't"])
+INFORMAL_WORDS = Lexicon(['gonna', 'wanna', 'yeah', 'stuff', 'things', 'kinda', 'sorta'])
+FIRST_PERSON = Lexicon(['i', 'my', 'me'])
 
 
 class WritingPracticeService:
@@ -112,12 +131,7 @@ class WritingPracticeService:
             length_score = 100 - abs(avg_sentence_length - 17.5) * 3
         
         # Check for transition words
-        transition_words = [
-            'however', 'therefore', 'additionally', 'furthermore', 'moreover',
-            'consequently', 'meanwhile', 'subsequently', 'specifically', 'for example'
-        ]
-        text_lower = text.lower()
-        transition_count = sum(1 for word in transition_words if word in text_lower)
+        transition_count = len(TRANSITION_WORDS.labels(text))
         transition_score = min(100, transition_count * 20)
         
         # Weighted average
@@ -128,29 +142,17 @@ class WritingPracticeService:
     @staticmethod
     def _calculate_structure_score(text: str, question_category: str) -> float:
         """Calculate structure score, especially STAR framework for behavioral"""
-        text_lower = text.lower()
-        
         if question_category == "behavioral":
             # Check for STAR framework elements
-            star_indicators = {
-                'situation': ['situation', 'context', 'background', 'scenario'],
-                'task': ['task', 'goal', 'objective', 'responsibility', 'challenge'],
-                'action': ['action', 'did', 'implemented', 'developed', 'created', 'led'],
-                'result': ['result', 'outcome', 'achieved', 'improved', 'increased', 'impact']
-            }
-            
-            components_found = 0
-            for component, keywords in star_indicators.items():
-                if any(keyword in text_lower for keyword in keywords):
-                    components_found += 1
+            components_found = len(STAR_INDICATORS.labels(text))
             
             # Score based on STAR components present
             structure_score = (components_found / 4) * 100
         else:
             # For other questions, check for logical flow
             # Introduction, explanation, conclusion
-            has_intro = any(word in text_lower[:100] for word in ['first', 'initially', 'to begin'])
-            has_conclusion = any(word in text_lower[-100:] for word in ['therefore', 'thus', 'in conclusion', 'overall'])
+            has_intro = INTRO_WORDS.search(text[:100]) is not None
+            has_conclusion = CONCLUSION_WORDS.search(text[-100:]) is not None
             
             structure_score = 50  # Base score
             if has_intro:
@@ -176,9 +178,7 @@ class WritingPracticeService:
             conciseness_score = max(30, 100 - (word_count - 150) * 0.8)
         
         # Check for filler words
-        filler_words = ['very', 'really', 'just', 'actually', 'basically', 'literally']
-        text_lower = text.lower()
-        filler_count = sum(text_lower.count(word) for word in filler_words)
+        filler_count = FILLER_WORDS.count(text)
         
         # Penalize for excessive fillers
         filler_penalty = min(20, filler_count * 5)
@@ -193,18 +193,15 @@ class WritingPracticeService:
         score = 100
         
         # Check for contractions (reduce professionalism slightly)
-        contractions = ["don't", "can't", "won't", "shouldn't", "wouldn't", "isn't", "aren't"]
-        contraction_count = sum(text.lower().count(c) for c in contractions)
+        contraction_count = CONTRACTIONS.count(text)
         score -= min(15, contraction_count * 3)
         
         # Check for informal language
-        informal_words = ['gonna', 'wanna', 'yeah', 'stuff', 'things', 'kinda', 'sorta']
-        informal_count = sum(text.lower().count(word) for word in informal_words)
+        informal_count = INFORMAL_WORDS.count(text)
         score -= min(20, informal_count * 10)
         
         # Check for first-person pronouns (should have some, but not excessive)
-        first_person = ['i ', ' i ', 'my ', 'me ']
-        first_person_count = sum(text.lower().count(word) for word in first_person)
+        first_person_count = FIRST_PERSON.count(text)
         
         # Ideal: 5-15 first-person references
         if 5 <= first_person_count <= 15:
@@ -405,7 +402,7 @@ class WritingPracticeService:
         Falls back to manual analysis if AI fails
         """
         try:
-            client = TrackedOpenAIClient(api_key=os.getenv("OPENAI_API_KEY"))
+            client = AsyncTrackedOpenAIClient(api_key=os.getenv("OPENAI_API_KEY"))
 
             # Get manual analysis first (quick baseline)
             manual_analysis = WritingPracticeService.analyze_response_quality(response_text, question_category)
@@ -429,7 +426,7 @@ Provide analysis in JSON format with these exact fields:
   "engagement_level": <0-100>
 }}"""
 
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
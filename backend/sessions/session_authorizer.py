@@ -24,7 +24,7 @@ async def authorize(uuid: str = Header(None), authorization: str = Header(None))
     token = authorization.removeprefix("Bearer ").strip()
 
     # Authenticate session
-    if session_manager.authenticate_session(uuid, token):
+    if await session_manager.authenticate_session(uuid, token):
         print(f"[Authorize] Session authenticated for uuid={uuid}")
         return uuid
     else:
@@ -1,24 +1,113 @@
+import os
 import secrets
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from sessions.session_store import MemorySessionStore, RedisSessionStore, MongoSessionStore
+
+SESSION_TTL = timedelta(hours=int(os.getenv("SESSION_TTL_HOURS", "168")))
+# Sliding expiry is only written back once the session is this old, so an active
+# user costs at most one store write per interval instead of one per request
+SESSION_REFRESH_INTERVAL = timedelta(minutes=int(os.getenv("SESSION_REFRESH_MINUTES", "15")))
+# How long a validated session is trusted from the local cache before the shared
+# store is consulted again (bounds how long a logout on another worker can lag)
+LOCAL_CACHE_SECONDS = int(os.getenv("SESSION_LOCAL_CACHE_SECONDS", "30"))
+LOCAL_CACHE_SIZE = 10000
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _build_store():
+    backend = (os.getenv("SESSION_STORE") or "mongo").lower()
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "redis":
+        from redis_client import cache, InMemoryCache
+        if isinstance(cache.backend, InMemoryCache):
+            # A per-process cache would log users out whenever they hit another worker
+            raise RuntimeError("SESSION_STORE=redis needs REDIS_URL or UPSTASH_REDIS_REST_URL/TOKEN")
+        return RedisSessionStore(cache)
+    from mongo.dao_setup import db_client, SESSIONS
+    from mongo.index_registry import index_registry
+    index_registry.declare(SESSIONS, "expires_at", ttl_seconds=0)
+    index_registry.declare(SESSIONS, "uuid")
+    return MongoSessionStore(db_client.get_collection(SESSIONS))
+
+
 class SessionManager:
-    def __init__(self):
-        self.sessions: dict[str, dict[str, Any]] = {}
+    def __init__(self, store=None):
+        self.store = store or _build_store()
+        self.local_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
 
-    def authenticate_session(self, uuid: str, session_token: str) -> bool:
-        return uuid in self.sessions and session_token == self.sessions[uuid]["token"]
+    async def authenticate_session(self, uuid: str, session_token: str) -> bool:
+        if not uuid or not session_token:
+            return False
+        token_hash = _hash_token(session_token)
+        now = datetime.now(timezone.utc)
 
-    def begin_session(self, uuid: str) -> str:
-        self.sessions[uuid] = {
-            "token": secrets.token_urlsafe(32),
-            # "expiry": ... # expiry unused for now
-        }
-        return self.sessions[uuid]["token"]
+        cached = self.local_cache.get(token_hash)
+        if cached and cached["cached_until"] > now and cached["expires_at"] > now:
+            self.local_cache.move_to_end(token_hash)
+            return cached["uuid"] == uuid
 
-    def kill_session(self, uuid: str) -> bool:
-        return bool(self.sessions.pop(uuid, False))
+        session = await self.store.get(token_hash)
+        if not session:
+            self.local_cache.pop(token_hash, None)
+            return False
 
-    def clean_sessions(self):
-        pass # for wiping all sessions in one go, not required as of now
+        expires_at = session["expires_at"]
+        if (now + SESSION_TTL) - expires_at > SESSION_REFRESH_INTERVAL:
+            expires_at = now + SESSION_TTL
+            await self.store.touch(token_hash, expires_at)
+
+        self._cache_locally(token_hash, session["uuid"], expires_at, now)
+        return session["uuid"] == uuid
+
+    async def begin_session(self, uuid: str) -> str:
+        token = secrets.token_urlsafe(32)
+        now = datetime.now(timezone.utc)
+        expires_at = now + SESSION_TTL
+        token_hash = _hash_token(token)
+        await self.store.create(token_hash, uuid, expires_at)
+        self._cache_locally(token_hash, uuid, expires_at, now)
+        return token
+
+    async def kill_session(self, uuid: str, session_token: str | None = None) -> bool:
+        """
+        End one session (when a token is given) or every session the user holds.
+        """
+        if session_token:
+            token_hash = _hash_token(session_token)
+            session = await self.store.get(token_hash)
+            if not session or session["uuid"] != uuid:
+                return False
+            self.local_cache.pop(token_hash, None)
+            return await self.store.delete(token_hash)
+
+        hashes = await self.store.delete_user(uuid)
+        for token_hash in hashes:
+            self.local_cache.pop(token_hash, None)
+        return bool(hashes)
+
+    async def clean_sessions(self) -> int:
+        """Remove expired sessions from the store and the local cache"""
+        now = datetime.now(timezone.utc)
+        for token_hash in [h for h, s in self.local_cache.items() if s["expires_at"] <= now]:
+            self.local_cache.pop(token_hash, None)
+        return await self.store.purge_expired()
+
+    def _cache_locally(self, token_hash: str, uuid: str, expires_at: datetime, now: datetime):
+        self.local_cache[token_hash] = {
+            "uuid": uuid,
+            "expires_at": expires_at,
+            "cached_until": now + timedelta(seconds=LOCAL_CACHE_SECONDS),
+        }
+        self.local_cache.move_to_end(token_hash)
+        while len(self.local_cache) > LOCAL_CACHE_SIZE:
+            self.local_cache.popitem(last=False)
 
-session_manager = SessionManager()
\ No newline at end of file
+session_manager = SessionManager()
@@ -0,0 +1,200 @@
+"""
+Session Stores
+
+Pluggable backends for SessionManager. Every store is keyed by the SHA-256
+hash of the session token, so validating a request is a single key lookup
+and raw tokens are never persisted. A user may hold any number of sessions.
+
+Stores:
+- MemorySessionStore: per-process LRU with TTL (single worker / local dev)
+- RedisSessionStore:  shared through redis_client.cache (multi worker, multi node)
+- MongoSessionStore:  shared through a Mongo collection with a TTL index
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Mongo hands back naive datetimes (stored as UTC)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class MemorySessionStore:
+    """In-process LRU session store. Sessions are lost on restart and not shared between workers."""
+
+    def __init__(self, max_sessions: int = 50000):
+        self.max_sessions = max_sessions
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.by_user: Dict[str, set] = {}
+
+    async def create(self, token_hash: str, uuid: str, expires_at: datetime) -> None:
+        self.sessions[token_hash] = {"uuid": uuid, "expires_at": expires_at}
+        self.sessions.move_to_end(token_hash)
+        self.by_user.setdefault(uuid, set()).add(token_hash)
+        while len(self.sessions) > self.max_sessions:
+            old_hash, old = self.sessions.popitem(last=False)
+            self._unindex(old["uuid"], old_hash)
+
+    async def get(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        session = self.sessions.get(token_hash)
+        if not session:
+            return None
+        if session["expires_at"] <= _now():
+            await self.delete(token_hash)
+            return None
+        self.sessions.move_to_end(token_hash)
+        return dict(session)
+
+    async def touch(self, token_hash: str, expires_at: datetime) -> None:
+        if token_hash in self.sessions:
+            self.sessions[token_hash]["expires_at"] = expires_at
+
+    async def delete(self, token_hash: str) -> bool:
+        session = self.sessions.pop(token_hash, None)
+        if not session:
+            return False
+        self._unindex(session["uuid"], token_hash)
+        return True
+
+    async def delete_user(self, uuid: str) -> List[str]:
+        hashes = list(self.by_user.pop(uuid, set()))
+        for token_hash in hashes:
+            self.sessions.pop(token_hash, None)
+        return hashes
+
+    async def purge_expired(self) -> int:
+        now = _now()
+        expired = [h for h, s in self.sessions.items() if s["expires_at"] <= now]
+        for token_hash in expired:
+            await self.delete(token_hash)
+        return len(expired)
+
+    def _unindex(self, uuid: str, token_hash: str) -> None:
+        hashes = self.by_user.get(uuid)
+        if hashes is not None:
+            hashes.discard(token_hash)
+            if not hashes:
+                self.by_user.pop(uuid, None)
+
+
+class RedisSessionStore:
+    """
+    Redis-backed store. Each session is a key with a native TTL; a per-user
+    set holds the user's token hashes so "log out everywhere" is possible.
+    The set's TTL is only ever extended, so it outlives every session in it.
+    """
+
+    def __init__(self, cache, prefix: str = "session"):
+        self.cache = cache
+        self.prefix = prefix
+
+    def _key(self, token_hash: str) -> str:
+        return f"{self.prefix}:{token_hash}"
+
+    def _user_key(self, uuid: str) -> str:
+        return f"{self.prefix}_user:{uuid}"
+
+    def _ttl(self, expires_at: datetime) -> int:
+        return max(int((expires_at - _now()).total_seconds()), 1)
+
+    async def create(self, token_hash: str, uuid: str, expires_at: datetime) -> None:
+        ttl = self._ttl(expires_at)
+        await self.cache.set_json(
+            self._key(token_hash),
+            {"uuid": uuid, "expires_at": expires_at.isoformat()},
+            ex=ttl,
+        )
+        await self.cache.sadd(self._user_key(uuid), token_hash, ex=ttl)
+        await self._prune(uuid)
+
+    async def get(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        data = await self.cache.get_json(self._key(token_hash))
+        if not data:
+            return None
+        return {"uuid": data["uuid"], "expires_at": datetime.fromisoformat(data["expires_at"])}
+
+    async def touch(self, token_hash: str, expires_at: datetime) -> None:
+        session = await self.get(token_hash)
+        if session:
+            ttl = self._ttl(expires_at)
+            await self.cache.set_json(
+                self._key(token_hash),
+                {"uuid": session["uuid"], "expires_at": expires_at.isoformat()},
+                ex=ttl,
+            )
+            await self.cache.expire(self._user_key(session["uuid"]), ttl, gt=True)
+
+    async def delete(self, token_hash: str) -> bool:
+        session = await self.get(token_hash)
+        deleted = bool(await self.cache.delete(self._key(token_hash)))
+        if session:
+            await self.cache.srem(self._user_key(session["uuid"]), token_hash)
+        return deleted
+
+    async def delete_user(self, uuid: str) -> List[str]:
+        hashes = await self.cache.smembers(self._user_key(uuid))
+        await self.cache.delete(self._user_key(uuid), *[self._key(h) for h in hashes])
+        return hashes
+
+    async def purge_expired(self) -> int:
+        # Redis expires session keys natively; stale index entries are pruned on login
+        return 0
+
+    async def _prune(self, uuid: str) -> None:
+        # Drop hashes whose session key has already expired so the index stays bounded
+        hashes = await self.cache.smembers(self._user_key(uuid))
+        sessions = await self.cache.mget([self._key(h) for h in hashes])
+        expired = [h for h, session in zip(hashes, sessions) if session is None]
+        if expired:
+            await self.cache.srem(self._user_key(uuid), *expired)
+
+
+class MongoSessionStore:
+    """
+    Mongo-backed store. The token hash is the document _id (O(1) lookup) and
+    a TTL index on expires_at lets Mongo reap expired sessions on its own.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def create(self, token_hash: str, uuid: str, expires_at: datetime) -> None:
+        await self.collection.insert_one({
+            "_id": token_hash,
+            "uuid": uuid,
+            "created_at": _now(),
+            "expires_at": expires_at,
+        })
+
+    async def get(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        doc = await self.collection.find_one({"_id": token_hash}, {"uuid": 1, "expires_at": 1})
+        if not doc:
+            return None
+        expires_at = _as_utc(doc["expires_at"])
+        # The TTL monitor only runs once a minute, so double check here
+        if expires_at <= _now():
+            return None
+        return {"uuid": doc["uuid"], "expires_at": expires_at}
+
+    async def touch(self, token_hash: str, expires_at: datetime) -> None:
+        await self.collection.update_one({"_id": token_hash}, {"$set": {"expires_at": expires_at}})
+
+    async def delete(self, token_hash: str) -> bool:
+        result = await self.collection.delete_one({"_id": token_hash})
+        return result.deleted_count > 0
+
+    async def delete_user(self, uuid: str) -> List[str]:
+        hashes = [doc["_id"] async for doc in self.collection.find({"uuid": uuid}, {"_id": 1})]
+        if hashes:
+            await self.collection.delete_many({"_id": {"$in": hashes}})
+        return hashes
+
+    async def purge_expired(self) -> int:
+        result = await self.collection.delete_many({"expires_at": {"$lte": _now()}})
+        return result.deleted_count
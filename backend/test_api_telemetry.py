@@ -0,0 +1,51 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from services.api_telemetry import APITelemetryBuffer
+
+
+@pytest.fixture
+def metrics_dao(monkeypatch):
+    from mongo.api_metrics_dao import api_metrics_dao
+    monkeypatch.setattr(api_metrics_dao, "insert_call_logs", AsyncMock(return_value=0))
+    monkeypatch.setattr(api_metrics_dao, "bulk_increment_usage", AsyncMock(return_value=0))
+    return api_metrics_dao
+
+
+@pytest.mark.asyncio
+async def test_flush_batches_logs_and_aggregates_usage(metrics_dao):
+    buffer = APITelemetryBuffer()
+    buffer.record("cohere", "chat", "team", 10.0, True, tokens_used=5)
+    buffer.record("cohere", "chat", "team", 12.0, False, error_message="boom")
+    buffer.record("openai", "chat", "openai_fallback", 8.0, True, tokens_used=3)
+
+    assert await buffer.flush() == 3
+
+    logs = metrics_dao.insert_call_logs.await_args.args[0]
+    assert len(logs) == 3
+    usage = metrics_dao.bulk_increment_usage.await_args.args[0]
+    cohere_key = next(k for k in usage if k[0] == "cohere")
+    assert usage[cohere_key] == {"calls": 2, "tokens": 5, "errors": 1}
+    assert buffer.pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried(metrics_dao):
+    metrics_dao.insert_call_logs.side_effect = [RuntimeError("down"), 1]
+    buffer = APITelemetryBuffer()
+    buffer.record("cohere", "chat", "team", 10.0, True)
+
+    assert await buffer.flush() == 0
+    assert buffer.pending() == 1
+    assert await buffer.flush() == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_buffer(metrics_dao):
+    buffer = APITelemetryBuffer(flush_interval=60)
+    buffer.start()
+    buffer.record("cohere", "chat", "team", 10.0, True)
+    await buffer.stop()
+
+    metrics_dao.insert_call_logs.assert_awaited_once()
+    assert buffer.pending() == 0
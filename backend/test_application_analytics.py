@@ -0,0 +1,405 @@
+import os
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from bson import ObjectId
+
+from mongo.application_analytics_dao import (
+    ApplicationAnalyticsDAO,
+    _breakdown_result,
+    _funnel_result,
+    _recommendation_result,
+    _response_metrics_result,
+    _response_trend_result,
+    _trend_result,
+)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FacetCollection:
+    """Returns canned $facet output and records the pipeline it was given"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.pipelines = []
+
+    async def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        facets = pipeline[-1]["$facet"]
+        return FakeCursor([{name: self.rows.get(name, []) for name in facets}])
+
+
+def make_dao(rows):
+    dao = ApplicationAnalyticsDAO()
+    dao.jobs_collection = FacetCollection(rows)
+    return dao
+
+
+def test_funnel_result_matches_legacy_shape():
+    result = _funnel_result({"funnel": [
+        {"_id": "applied", "count": 6},
+        {"_id": "screening", "count": 2},
+        {"_id": "interview", "count": 1},
+        {"_id": "rejected", "count": 1},
+        {"_id": "interested", "count": 2},
+    ]})
+
+    assert result == {
+        "total_applications": 12,
+        "stage_counts": {"applied": 6, "screening": 2, "interview": 1, "offer": 0, "rejected": 1},
+        "conversion_rates": {
+            "applied_to_screening": 16.67,
+            "screening_to_interview": 50.0,
+            "interview_to_offer": 0,
+            "overall": 0.0,
+        },
+        "rejection_rate": 8.33,
+    }
+
+
+def test_empty_user_gets_empty_metrics():
+    assert _funnel_result({"funnel": []})["conversion_rates"] == {}
+    assert _response_metrics_result({"responded": [], "pending": [{"count": 3}]})["total_pending"] == 3
+    assert _trend_result({"trends_90_weekly": [], "trends_90_status": []}, 90)["weekly_average"] == 0.0
+
+
+def test_response_trend_direction():
+    weeks = [{"_id": f"2026-0{m}-01", "total": 40 if m <= 4 else 10, "count": 2} for m in range(8, 0, -1)]
+
+    result = _response_trend_result({"response_trends_90": weeks}, 90)
+
+    assert [w["average_days"] for w in result["weekly_data"]] == [20.0] * 4 + [5.0] * 4
+    assert result["trend_direction"] == "improving"
+    assert result["total_responses"] == 16
+
+
+def test_recommendations_fall_back_to_encouragement():
+    funnel = {"conversion_rates": {"applied_to_screening": 40}, "stage_counts": {"interview": 2}}
+
+    (recommendation,) = _recommendation_result(funnel, {}, {"weekly_average": 12})
+
+    assert recommendation["title"] == "Keep Up the Good Work!"
+
+
+def test_breakdowns_count_every_job():
+    result = _breakdown_result({
+        "by_industry_all": [{"_id": "Tech", "count": 3}, {"_id": "Unknown", "count": 1}],
+        "by_job_type_all": [{"_id": "Unknown", "count": 4}],
+        "by_status_all": [{"_id": "applied", "count": 3}, {"_id": "offer", "count": 1}],
+    })
+
+    assert result["total_jobs"] == 4
+    assert result["by_industry"] == {"Tech": 3, "Unknown": 1}
+
+
+@pytest.mark.asyncio
+async def test_dashboard_is_a_single_aggregation():
+    dao = make_dao({
+        "funnel": [{"_id": "applied", "count": 4}, {"_id": "offer", "count": 1}],
+        "success_rates": [{"_id": "overall", "total": 5, "offers": 1, "interviews": 2}],
+        "response_times": [{"_id": "overall", "total": 21.0, "count": 2, "min": 7.0, "max": 14.0}],
+        "by_status_all": [{"_id": "applied", "count": 5}],
+    })
+
+    dashboard = await dao.get_dashboard("u1", days=30)
+
+    (pipeline,) = dao.jobs_collection.pipelines
+    assert pipeline[0] == {"$match": {"uuid": "u1"}}
+    assert "trends_30_weekly" in pipeline[1]["$facet"]
+    assert dashboard["response_times"] == {"overall": {"average_days": 10.5, "min_days": 7, "max_days": 14, "sample_size": 2}}
+    assert dashboard["benchmarks"]["user_metrics"]["offer_rate"] == 20.0
+    assert dashboard["breakdowns"]["total_jobs"] == 5
+    assert set(dashboard) == {
+        "funnel", "response_times", "success_rates", "trends", "benchmarks", "recommendations",
+        "response_metrics", "response_trends", "breakdowns",
+    }
+
+
+# ----------------------------------------------------------------
+# Parity with the original per-document implementations. Needs a real
+# server for the aggregation operators: MONGO_TEST_URI=mongodb://...
+# ----------------------------------------------------------------
+
+def legacy_funnel(jobs):
+    stages = {"applied": 0, "screening": 0, "interview": 0, "offer": 0, "rejected": 0}
+    total = 0
+    for job in jobs:
+        status = job.get("status", "").lower()
+        if status in stages:
+            stages[status] += 1
+        total += 1
+    rates = {}
+    if total:
+        rates["applied_to_screening"] = round(stages["screening"] / total * 100, 2)
+        rates["screening_to_interview"] = round(stages["interview"] / stages["screening"] * 100, 2) if stages["screening"] else 0
+        rates["interview_to_offer"] = round(stages["offer"] / stages["interview"] * 100, 2) if stages["interview"] else 0
+        rates["overall"] = round(stages["offer"] / total * 100, 2)
+    return {
+        "total_applications": total,
+        "stage_counts": stages,
+        "conversion_rates": rates,
+        "rejection_rate": round(stages["rejected"] / total * 100, 2) if total else 0,
+    }
+
+
+def legacy_timestamp(value):
+    # The old code only parsed strings; datetimes pushed by bulk_apply made it raise
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def legacy_week(at):
+    return (at - timedelta(days=at.weekday())).strftime("%Y-%m-%d")
+
+
+def legacy_response_times(jobs, group_by=None):
+    times = defaultdict(list)
+    for job in jobs:
+        applied = responded = None
+        for entry in job.get("status_history", []):
+            if isinstance(entry, list) and len(entry) >= 2:
+                status, at = entry[0].lower(), legacy_timestamp(entry[1])
+                if status == "applied" and not applied:
+                    applied = at
+                elif status in ["screening", "interview", "offer", "rejected"] and not responded:
+                    responded = at
+                    break
+        if applied and responded:
+            if group_by == "company":
+                key = job.get("company", "Unknown")
+                key = key.get("name", "Unknown") if isinstance(key, dict) else key
+            elif group_by == "industry":
+                key = job.get("industry", "Unknown")
+            else:
+                key = "overall"
+            times[key].append((responded - applied).days)
+    return {
+        key: {"average_days": round(sum(v) / len(v), 1), "min_days": min(v), "max_days": max(v), "sample_size": len(v)}
+        for key, v in times.items()
+    }
+
+
+def legacy_success_rates(jobs, group_by=None):
+    groups = defaultdict(lambda: {"total": 0, "offers": 0, "interviews": 0})
+    for job in jobs:
+        if group_by == "materials":
+            materials = job.get("materials", {})
+            resume, cover = materials.get("resume_id"), materials.get("cover_letter_id")
+            key = ("Resume + Cover Letter" if resume and cover else "Resume Only" if resume
+                   else "Cover Letter Only" if cover else "No Materials")
+        elif group_by in ("industry", "job_type"):
+            key = job.get(group_by, "Unknown")
+        else:
+            key = "overall"
+        status = job.get("status", "").lower()
+        groups[key]["total"] += 1
+        groups[key]["offers"] += status == "offer"
+        groups[key]["interviews"] += status in ["interview", "offer"]
+    return {
+        key: {
+            "total_applications": g["total"],
+            "interview_rate": round(g["interviews"] / g["total"] * 100, 2),
+            "offer_rate": round(g["offers"] / g["total"] * 100, 2),
+            "interviews": g["interviews"],
+            "offers": g["offers"],
+        }
+        for key, g in groups.items()
+    }
+
+
+def legacy_trends(jobs, days=90):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    weekly, by_status = defaultdict(int), defaultdict(int)
+    for job in jobs:
+        created = legacy_timestamp(job["date_created"])
+        if created >= cutoff:
+            weekly[legacy_week(created)] += 1
+            by_status[job.get("status", "Unknown")] += 1
+    total = sum(weekly.values())
+    return {
+        "total_applications": total,
+        "time_period_days": days,
+        "weekly_average": round(total / (len(weekly) or 1), 1),
+        "weekly_breakdown": sorted(weekly.items()),
+        "by_status": dict(by_status),
+    }
+
+
+def legacy_personal_response_metrics(jobs):
+    times, by_industry, by_size = [], defaultdict(list), defaultdict(list)
+    fastest = slowest = None
+    pending = 0
+    for job in jobs:
+        tracking = job.get("response_tracking", {})
+        if tracking.get("responded_at") is None:
+            pending += 1
+            continue
+        days = tracking.get("response_days")
+        if days is None:
+            continue
+        times.append(days)
+        by_industry[job.get("industry", "Unknown")].append(days)
+        company_data = job.get("company_data", {})
+        by_size[company_data.get("size", "Unknown") if isinstance(company_data, dict) else "Unknown"].append(days)
+        company = job.get("company")
+        info = {
+            "job_id": str(job["_id"]),
+            "company": company if isinstance(company, str) else job.get("company", {}).get("name", "Unknown"),
+            "title": job.get("title", "Unknown"),
+            "days": days,
+        }
+        if fastest is None or days < fastest["days"]:
+            fastest = info
+        if slowest is None or days > slowest["days"]:
+            slowest = info
+    if not times:
+        return {
+            "average_response_days": 0, "median_response_days": 0, "fastest_response": None,
+            "slowest_response": None, "by_company_size": {}, "by_industry": {},
+            "total_responded": 0, "total_pending": pending,
+        }
+    ordered, n = sorted(times), len(times)
+    median = (ordered[n // 2 - 1] + ordered[n // 2]) / 2 if n % 2 == 0 else ordered[n // 2]
+    return {
+        "average_response_days": round(sum(times) / n, 1),
+        "median_response_days": round(median, 1),
+        "fastest_response": fastest,
+        "slowest_response": slowest,
+        "by_company_size": {k: round(sum(v) / len(v), 1) for k, v in by_size.items()},
+        "by_industry": {k: round(sum(v) / len(v), 1) for k, v in by_industry.items()},
+        "total_responded": n,
+        "total_pending": pending,
+    }
+
+
+def legacy_response_time_trends(jobs, days=90):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    weekly = defaultdict(list)
+    for job in jobs:
+        tracking = job.get("response_tracking", {})
+        responded_at, response_days = tracking.get("responded_at"), tracking.get("response_days")
+        if responded_at is None or response_days is None:
+            continue
+        responded_at = legacy_timestamp(responded_at)
+        if responded_at >= cutoff:
+            weekly[legacy_week(responded_at)].append(response_days)
+    averages = [
+        {"week": week, "average_days": round(sum(v) / len(v), 1), "count": len(v)}
+        for week, v in sorted(weekly.items())
+    ]
+    direction = "stable"
+    if len(averages) >= 2:
+        recent = sum(w["average_days"] for w in averages[-4:]) / min(4, len(averages[-4:]))
+        older = sum(w["average_days"] for w in averages[:4]) / min(4, len(averages[:4]))
+        if recent < older * 0.9:
+            direction = "improving"
+        elif recent > older * 1.1:
+            direction = "slowing"
+    return {
+        "time_period_days": days,
+        "weekly_data": averages,
+        "trend_direction": direction,
+        "total_responses": sum(w["count"] for w in averages),
+    }
+
+
+def seed_jobs(rng, uuid, count=150):
+    now = datetime.now(timezone.utc)
+    jobs = []
+    for _ in range(count):
+        created = now - timedelta(days=rng.randint(0, 200), hours=rng.randint(0, 23))
+        job = {"_id": ObjectId(), "uuid": uuid, "date_created": created}
+        if rng.random() < 0.9:
+            job["status"] = rng.choice(["Applied", "Screening", "Interview", "Offer", "Rejected", "applied", ""])
+        if rng.random() < 0.1:
+            job["archived"] = True
+        if rng.random() < 0.7:
+            job["industry"] = rng.choice(["Tech", "Finance"])
+        if rng.random() < 0.7:
+            job["job_type"] = rng.choice(["Full-time", "Contract"])
+        if rng.random() < 0.6:
+            job["company"] = rng.choice(["Acme", {"name": "Initech"}, {}])
+        if rng.random() < 0.6:
+            job["materials"] = {key: rng.choice(["id", "", None]) for key in ("resume_id", "cover_letter_id")}
+        if rng.random() < 0.5:
+            job["title"] = rng.choice(["Engineer", "Analyst"])
+        if rng.random() < 0.5:
+            job["company_data"] = rng.choice([{"size": "1-50"}, {"size": "1000+"}, {}])
+        if rng.random() < 0.7:
+            at, history = created, []
+            for status in rng.sample(["Interested", "Applied", "Screening", "Interview", "Offer", "Rejected"], rng.randint(0, 4)):
+                at += timedelta(days=rng.randint(0, 20), hours=rng.randint(0, 23))
+                # jobs_dao.set_status pushes isoformat() strings, bulk_apply pushes datetimes
+                history.append([status, at.isoformat() if rng.random() < 0.7 else at])
+            job["status_history"] = history
+        if rng.random() < 0.7:
+            tracking = {"submitted_at": created, "responded_at": None, "response_days": None}
+            if rng.random() < 0.6:
+                days = rng.randint(0, 40)
+                tracking["responded_at"] = created + timedelta(days=days, hours=rng.randint(0, 23))
+                tracking["response_days"] = days if rng.random() < 0.9 else None
+            job["response_tracking"] = tracking
+        jobs.append(job)
+    return jobs
+
+
+@pytest_asyncio.fixture
+async def seeded_jobs():
+    uri = os.getenv("MONGO_TEST_URI")
+    if not uri:
+        pytest.skip("MONGO_TEST_URI not set")
+    from pymongo import AsyncMongoClient
+
+    client = AsyncMongoClient(uri)
+    collection = client.get_database("analytics_parity_test").get_collection("jobs")
+    await collection.delete_many({})
+    jobs = seed_jobs(random.Random(7), "parity-user")
+    await collection.insert_many(jobs)
+
+    dao = ApplicationAnalyticsDAO()
+    dao.jobs_collection = collection
+    yield dao, [job for job in jobs if not job.get("archived")]
+
+    await client.drop_database("analytics_parity_test")
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_pipelines_match_legacy_implementation(seeded_jobs):
+    dao, active = seeded_jobs
+
+    assert await dao.get_application_funnel("parity-user") == legacy_funnel(active)
+    for group_by in (None, "company", "industry"):
+        assert await dao.calculate_response_times("parity-user", group_by) == legacy_response_times(active, group_by)
+    for group_by in (None, "industry", "job_type", "materials"):
+        assert await dao.analyze_success_rates("parity-user", group_by) == legacy_success_rates(active, group_by)
+
+    assert await dao.get_application_trends("parity-user") == legacy_trends(active)
+    assert await dao.get_application_trends("parity-user", 30) == legacy_trends(active, 30)
+    assert await dao.get_personal_response_metrics("parity-user") == legacy_personal_response_metrics(active)
+    assert await dao.get_response_time_trends("parity-user") == legacy_response_time_trends(active)
+
+    dashboard = await dao.get_dashboard("parity-user")
+    assert dashboard["funnel"] == legacy_funnel(active)
+    assert dashboard["response_times"] == legacy_response_times(active)
+    assert dashboard["success_rates"] == legacy_success_rates(active)
+    assert dashboard["trends"] == legacy_trends(active)
+    assert dashboard["response_metrics"] == legacy_personal_response_metrics(active)
+    assert dashboard["response_trends"] == legacy_response_time_trends(active)
@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+import pytest_asyncio
+
+from services.browser_pool import BrowserPool
+
+
+class FakeContext:
+    def __init__(self, browser, options):
+        self.browser = browser
+        self.options = options
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+        self.browser.open_contexts -= 1
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.open_contexts = 0
+        self.peak_contexts = 0
+        self._handlers = []
+
+    def on(self, event, handler):
+        self._handlers.append(handler)
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **options):
+        self.open_contexts += 1
+        self.peak_contexts = max(self.peak_contexts, self.open_contexts)
+        return FakeContext(self, options)
+
+    async def close(self):
+        self.closed = True
+        self.connected = False
+
+    def crash(self):
+        self.connected = False
+        for handler in self._handlers:
+            handler(self)
+
+
+@pytest_asyncio.fixture
+async def pool():
+    launched = []
+    pool = BrowserPool(max_concurrency=2, max_contexts_per_browser=3)
+
+    async def fake_launch():
+        browser = FakeBrowser()
+        launched.append(browser)
+        return browser
+
+    pool._launch_browser = fake_launch
+    pool.launched = launched
+    pool.start()
+    yield pool
+    await pool.stop()
+
+
+async def _describe(context, suffix):
+    await asyncio.sleep(0.01)
+    return f"{context.options.get('locale')}-{suffix}"
+
+
+@pytest.mark.asyncio
+async def test_contexts_share_one_browser(pool):
+    results = await asyncio.gather(*[
+        pool.run(_describe, i, context_options={"locale": "en-US"}) for i in range(2)
+    ])
+
+    assert results == ["en-US-0", "en-US-1"]
+    assert len(pool.launched) == 1
+    assert pool.launched[0].open_contexts == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped(pool):
+    await asyncio.gather(*[pool.run(_describe, i) for i in range(3)])
+
+    assert max(b.peak_contexts for b in pool.launched) <= 2
+
+
+@pytest.mark.asyncio
+async def test_browser_is_recycled_after_limit(pool):
+    for i in range(4):
+        await pool.run(_describe, i)
+
+    assert len(pool.launched) == 2
+    assert pool.launched[0].closed
+    assert not pool.launched[1].closed
+
+
+@pytest.mark.asyncio
+async def test_crashed_browser_is_relaunched(pool):
+    await pool.run(_describe, 0)
+    pool._loop.call_soon_threadsafe(pool.launched[0].crash)
+
+    assert await pool.run(_describe, 1) == "None-1"
+    assert len(pool.launched) == 2
+    assert pool.stats()["crashes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_and_close_the_context(pool):
+    async def boom(context):
+        raise RuntimeError("page failed")
+
+    with pytest.raises(RuntimeError, match="page failed"):
+        await pool.run(boom)
+    assert pool.launched[0].open_contexts == 0
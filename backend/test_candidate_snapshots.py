@@ -0,0 +1,182 @@
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+import mongo.candidate_snapshots_dao as snapshots_module
+import mongo.matching_service as matching_service
+from mongo.candidate_snapshots_dao import CandidateSnapshotsDAO
+
+
+class UpdateResult:
+    def __init__(self, matched_count):
+        self.matched_count = matched_count
+
+
+class FakeCollection:
+    """The slice of a Mongo collection the snapshots DAO uses, keyed by _id"""
+
+    def __init__(self):
+        self.docs = {}
+        self.reads = 0
+
+    async def find_one(self, query):
+        self.reads += 1
+        doc = self.docs.get(query["_id"])
+        return dict(doc) if doc else None
+
+    async def insert_one(self, doc):
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError("E11000")
+        self.docs[doc["_id"]] = dict(doc)
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        if doc is None or any(doc.get(k) != v for k, v in query.items()):
+            if not upsert or doc is not None:
+                return UpdateResult(0)
+            doc = self.docs[query["_id"]] = {"_id": query["_id"]}
+        for k, v in update.get("$inc", {}).items():
+            doc[k] = doc.get(k, 0) + v
+        doc.update(update.get("$set", {}))
+        return UpdateResult(1)
+
+
+class Source:
+    """A source DAO returning fixed rows and counting reads"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.reads = 0
+
+    async def get(self, uuid):
+        self.reads += 1
+        return self.rows
+
+
+@pytest.fixture
+def dao():
+    dao = CandidateSnapshotsDAO()
+    dao.collection = FakeCollection()
+    return dao
+
+
+@pytest.fixture
+def sources(monkeypatch, dao):
+    profile = Source({"_id": "u1", "experience_level": "mid", "matchingPreferences": {"skillsWeight": 1}})
+    skills = Source([{"name": "Python", "proficiency": "expert", "taxonomy_id": 1}])
+    education = Source([{"degree": "Bachelor"}, {"degree": "Masters"}])
+    employment = Source([{"start_date": "2020-01-01", "end_date": "2022-01-01"}])
+
+    monkeypatch.setattr(matching_service, "candidate_snapshots_dao", dao)
+    monkeypatch.setattr(matching_service.profiles_dao, "get_profile", profile.get)
+    monkeypatch.setattr(matching_service.skills_dao, "get_all_skills", skills.get)
+    monkeypatch.setattr(matching_service.education_dao, "get_all_education", education.get)
+    monkeypatch.setattr(matching_service.employment_dao, "get_all_employment", employment.get)
+    return {"profile": profile, "skills": skills, "education": education, "employment": employment}
+
+
+def reads(sources):
+    return sum(s.reads for s in sources.values())
+
+
+@pytest.mark.asyncio
+async def test_save_is_dropped_if_invalidated_while_building(dao):
+    version, snapshot = await dao.get("u1")
+    assert (version, snapshot) == (0, None)
+
+    await dao.invalidate("u1")
+    assert await dao.save("u1", version, {"skills": []}) is False
+
+    version, snapshot = await dao.get("u1")
+    assert (version, snapshot) == (1, None)
+    assert await dao.save("u1", version, {"skills": []}) is True
+    assert await dao.save("u1", 0, {"skills": ["stale"]}) is False
+    assert dao.collection.docs["u1"]["snapshot"] == {"skills": []}
+
+
+@pytest.mark.asyncio
+async def test_stale_save_is_not_cached_locally(dao):
+    await dao.invalidate("u1")
+    await dao.save("u1", 1, {"skills": ["old"]})
+    dao.local_cache.clear()
+
+    version, _ = await dao.get("u1")
+    dao.local_cache.clear()
+    # A write lands between get() and save()
+    await dao.invalidate("u1")
+
+    assert await dao.save("u1", version, {"skills": ["old"]}) is False
+    assert "u1" not in dao.local_cache
+    assert dao.collection.docs["u1"]["snapshot"] is None
+    assert await dao.get("u1") == (2, None)
+
+
+@pytest.mark.asyncio
+async def test_profile_built_during_a_write_is_not_kept(dao, sources, monkeypatch):
+    async def skills_written_mid_build(uuid):
+        rows = await sources["skills"].get(uuid)
+        await dao.invalidate(uuid)
+        return rows
+
+    monkeypatch.setattr(matching_service.skills_dao, "get_all_skills", skills_written_mid_build)
+
+    assert (await matching_service._get_profile("u1"))["skills"]
+    assert "u1" not in dao.local_cache
+    assert dao.collection.docs["u1"]["snapshot"] is None
+
+
+@pytest.mark.asyncio
+async def test_local_cache_serves_reads_until_invalidated(dao, monkeypatch):
+    await dao.save("u1", 0, {"skills": []})
+    dao.collection.reads = 0
+
+    assert await dao.get("u1") == (0, {"skills": []})
+    assert dao.collection.reads == 0
+
+    monkeypatch.setattr(snapshots_module, "LOCAL_CACHE_SECONDS", -1)
+    await dao.save("u2", 0, {"skills": []})
+    await dao.get("u2")
+    assert dao.collection.reads == 1
+
+    await dao.invalidate("u1")
+    assert "u1" not in dao.local_cache
+    assert await dao.get("u1") == (1, None)
+
+
+@pytest.mark.asyncio
+async def test_profile_is_built_once_and_served_from_the_snapshot(dao, sources):
+    profile = await matching_service._get_profile("u1")
+
+    assert profile["skills"] == [{"name": "python", "taxonomyId": 1, "level": 4, "weight": 1.0}]
+    assert (profile["educationLevel"], profile["educationRank"]) == ("Masters", 4)
+    assert profile["totalYearsExperience"] == 2.0
+    assert profile["matchingPreferences"] == {"skillsWeight": 1}
+    assert reads(sources) == 4
+
+    dao.local_cache.clear()
+    assert await matching_service._get_profile("u1") == profile
+    assert reads(sources) == 4 and dao.collection.reads == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_and_day_changes_rebuild_the_snapshot(dao, sources):
+    await matching_service._get_profile("u1")
+
+    sources["skills"].rows = []
+    await dao.invalidate("u1")
+    assert (await matching_service._get_profile("u1"))["skills"] == []
+    assert reads(sources) == 8
+
+    dao.collection.docs["u1"]["snapshot"]["asOf"] = "2000-01-01"
+    dao.local_cache.clear()
+    await matching_service._get_profile("u1")
+    assert reads(sources) == 12
+
+
+@pytest.mark.asyncio
+async def test_users_without_data_have_no_profile(dao, sources):
+    for source in ("skills", "education", "employment"):
+        sources[source].rows = []
+    sources["profile"].rows = None
+
+    assert await matching_service._get_profile("u1") is None
+    assert dao.collection.docs["u1"]["snapshot"]["skills"] == []
@@ -0,0 +1,337 @@
+import os
+import shutil
+import time
+
+import pytest
+
+import services.code_execution as code_execution_module
+from services import technical_prep_service as prep_module
+from services.code_execution import APP_DIR, CodeExecutor, call_args, find_entrypoint, outputs_match
+
+# Namespaces, mounts and the uid switch need root
+sandboxed = pytest.mark.skipif(os.geteuid() != 0, reason="the code execution sandbox needs root")
+
+TWO_SUM_TESTS = [
+    {"input": {"nums": [2, 7, 11, 15], "target": 9}, "expected_output": [0, 1], "description": "Basic"},
+    {"input": {"nums": [3, 2, 4], "target": 6}, "expected_output": [1, 2]},
+    {"input": {"nums": [3, 3], "target": 6}, "expected_output": "[0, 1]"},
+]
+
+PYTHON_TWO_SUM = """
+def twoSum(nums, target):
+    seen = {}
+    for i, n in enumerate(nums):
+        if target - n in seen:
+            print("found", i)
+            return [seen[target - n], i]
+        seen[n] = i
+"""
+
+
+def executor(**kwargs):
+    kwargs.setdefault("timeout_seconds", 3)
+    kwargs.setdefault("cpu_seconds", 1)
+    kwargs.setdefault("memory_mb", 128)
+    return CodeExecutor(**kwargs)
+
+
+def one_test(expected=1):
+    return [{"input": {"x": 1}, "expected_output": expected}]
+
+
+def test_entrypoint_matches_parameter_names():
+    code = "def helper(a):\n    return a\n\ndef solve(target, nums):\n    return helper(nums)\n"
+    entry = find_entrypoint(code, "python", ["nums", "target"])
+    assert entry.name == "solve"
+    assert call_args(entry, {"nums": [1], "target": 2}) == [2, [1]]
+
+    method = find_entrypoint("class Solution:\n    def twoSum(self, nums: List[int], t: Dict[str, int]) -> List[int]:\n        pass",
+                             "python", ["nums", "t"])
+    assert method.name == "twoSum" and method.method and method.params == ["nums", "t"]
+
+    assert find_entrypoint("const twoSum = (nums, target) => [];", "javascript", ["nums", "target"]).name == "twoSum"
+    assert find_entrypoint("func helper() {}\nfunc twoSum(nums []int, target int) []int { return nil }",
+                           "go", ["nums", "target"]).name == "twoSum"
+
+
+def test_outputs_match_is_structural():
+    assert outputs_match([0, 1], "[0, 1]")
+    assert outputs_match(0.1 + 0.2, 0.3)
+    assert outputs_match({"a": [1.0]}, {"a": [1]})
+    assert not outputs_match(1, True)
+    assert not outputs_match([1, 0], [0, 1])
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_python_submission_reports_value_runtime_and_memory():
+    outcomes = await executor().run(PYTHON_TWO_SUM, "python", TWO_SUM_TESTS)
+
+    assert [o["status"] for o in outcomes] == ["passed"] * 3
+    assert outcomes[0]["value"] == [0, 1]
+    assert outcomes[0]["stdout"] == "found 1"
+    assert all(o["runtime_ms"] >= 0 and o["memory_kb"] > 0 for o in outcomes)
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_wrong_answers_and_errors_are_told_apart():
+    runner = executor()
+
+    wrong = await runner.run("def f(x):\n    return x + 1", "python", one_test())
+    crash = await runner.run("def f(x):\n    return 1 / 0", "python", one_test())
+    broken = await runner.run("def f(x:\n", "python", one_test())
+    java = await runner.run("class Solution {}", "java", one_test())
+
+    assert wrong[0]["status"] == "wrong_answer" and wrong[0]["value"] == 2
+    assert crash[0]["status"] == "runtime_error"
+    assert crash[0]["error"] == "ZeroDivisionError: division by zero (line 2)"
+    assert broken[0]["status"] == "compile_error"
+    assert java[0]["status"] == "unsupported_language"
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_limits_stop_runaway_code():
+    runner = executor()
+
+    spin = await runner.run("def f(x):\n    while True:\n        pass", "python", one_test())
+    hog = await runner.run("def f(x):\n    data = [0] * 10**9\n    return 1", "python", one_test())
+    sleeper = await executor(timeout_seconds=0.5).run("import time\ndef f(x):\n    time.sleep(5)", "python", one_test())
+
+    assert spin[0]["status"] == "time_limit_exceeded"
+    assert hog[0]["status"] == "memory_limit_exceeded"
+    assert sleeper[0]["status"] == "time_limit_exceeded"
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_memory_limit_covers_forked_processes():
+    # Each child stays under the per-process cap; together they are far over it
+    code = """import os, time
+def f(x):
+    children = []
+    for _ in range(6):
+        pid = os.fork()
+        if pid == 0:
+            data = b"x" * (60 << 20)
+            time.sleep(2)
+            os._exit(0)
+        children.append(pid)
+    for pid in children:
+        os.waitpid(pid, 0)
+    return 1
+"""
+
+    outcomes = await executor().run(code, "python", one_test())
+
+    assert outcomes[0]["status"] == "memory_limit_exceeded"
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_forks_are_capped():
+    code = """import os, time
+def f(x):
+    forked = 0
+    try:
+        while True:
+            if os.fork() == 0:
+                time.sleep(2)
+                os._exit(0)
+            forked += 1
+    except OSError:
+        return forked
+"""
+
+    started = time.perf_counter()
+    outcomes = await executor().run(code, "python", one_test())
+
+    assert outcomes[0]["status"] == "wrong_answer"
+    assert 0 < outcomes[0]["value"] < code_execution_module.MAX_PROCESSES
+    assert time.perf_counter() - started < 2
+
+
+def test_concurrent_tests_get_their_own_uid():
+    first = code_execution_module._claim_uid()
+    second = code_execution_module._claim_uid()
+    os.close(first[1])
+    third = code_execution_module._claim_uid()
+    os.close(second[1])
+    os.close(third[1])
+
+    assert first[0] != second[0]
+    assert third[0] == first[0]
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_submissions_cannot_see_server_environment(monkeypatch):
+    monkeypatch.setenv("MONGO_CONNECTION_STRING", "mongodb://secret")
+    code = "import os\ndef f(x):\n    return os.environ.get('MONGO_CONNECTION_STRING')"
+
+    outcomes = await executor().run(code, "python", one_test(expected=None))
+
+    assert outcomes[0]["status"] == "passed"
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_submissions_cannot_reach_the_server(monkeypatch):
+    monkeypatch.setenv("MONGO_CONNECTION_STRING", "mongodb://secret")
+    code = f"""import os, socket
+
+def attempt(action):
+    try:
+        action()
+        return "allowed"
+    except OSError as e:
+        return type(e).__name__
+
+def f(x):
+    return [
+        attempt(lambda: open("/proc/%d/environ" % os.getppid()).read()),
+        attempt(lambda: open({os.path.join(APP_DIR, ".env.example")!r}).read()),
+        attempt(lambda: socket.create_connection(("1.1.1.1", 443), timeout=1)),
+        attempt(lambda: open("/tmp/scratch", "w")),
+        [p for p in os.listdir("/proc") if p.isdigit()],
+        os.getuid(),
+    ]
+"""
+
+    outcomes = await executor().run(code, "python", one_test())
+
+    assert outcomes[0]["value"] == [
+        "FileNotFoundError", "FileNotFoundError", "OSError", "OSError", ["1"], code_execution_module.SANDBOX_UID,
+    ]
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_printed_results_cannot_forge_a_verdict():
+    forged = '{"ok": true, "value": 1, "runtime_ms": 0.001, "memory_kb": 1}'
+    code = f"import os\ndef f(x):\n    print('\\n\\x1e__RESULT__' + {forged!r}, flush=True)\n    os._exit(0)"
+
+    outcomes = await executor().run(code, "python", one_test(expected=1))
+
+    assert outcomes[0]["status"] == "runtime_error"
+    assert outcomes[0]["error"] == "Exited with status 0"
+    assert "__RESULT__" in outcomes[0]["stdout"]
+
+    honest = await executor().run("def f(x):\n    print('{\"memory_kb\": 1}')\n    return 1", "python", one_test())
+    assert honest[0]["status"] == "passed" and honest[0]["memory_kb"] > 1
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_submissions_do_not_run_unconfined(monkeypatch):
+    monkeypatch.setattr(code_execution_module, "hidden_paths", lambda: ["/nonexistent/code-exec"])
+
+    outcomes = await executor().run("def f(x):\n    return 1", "python", one_test())
+
+    assert outcomes[0]["status"] == "sandbox_unavailable"
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_test_cases_run_in_parallel():
+    code = "import time\ndef f(x):\n    time.sleep(0.4)\n    return x"
+    tests = [{"input": {"x": i}, "expected_output": i} for i in range(4)]
+
+    started = time.perf_counter()
+    outcomes = await executor(max_parallel=4).run(code, "python", tests)
+
+    assert [o["status"] for o in outcomes] == ["passed"] * 4
+    assert time.perf_counter() - started < 1.4
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+async def test_javascript_submission():
+    code = """var twoSum = function(nums, target) {
+  const seen = new Map();
+  for (let i = 0; i < nums.length; i++) {
+    if (seen.has(target - nums[i])) return [seen.get(target - nums[i]), i];
+    seen.set(nums[i], i);
+  }
+};"""
+
+    outcomes = await executor().run(code, "js", TWO_SUM_TESTS)
+
+    assert [o["status"] for o in outcomes] == ["passed"] * 3
+
+
+def test_build_output_must_be_a_regular_file(tmp_path):
+    build, work = tmp_path / "build", tmp_path / "work"
+    build.mkdir()
+    work.mkdir()
+    (tmp_path / "secret").write_text("root only")
+    (build / "solution").symlink_to(tmp_path / "secret")
+
+    assert not code_execution_module._copy_build_output(str(build), str(work), "solution")
+    assert not (work / "solution").exists()
+
+    (build / "solution").unlink()
+    (build / "solution").write_bytes(b"\x7fELF")
+    assert code_execution_module._copy_build_output(str(build), str(work), "solution")
+    assert (work / "solution").read_bytes() == b"\x7fELF" and os.access(work / "solution", os.X_OK)
+
+
+@pytest.mark.asyncio
+@sandboxed
+@pytest.mark.skipif(shutil.which("go") is None, reason="go is not installed")
+async def test_go_submission_builds_in_the_sandbox(monkeypatch):
+    code = """func twoSum(nums []int, target int) []int {
+	seen := map[int]int{}
+	for i, n := range nums {
+		if j, ok := seen[target-n]; ok {
+			return []int{j, i}
+		}
+		seen[n] = i
+	}
+	return nil
+}"""
+
+    outcomes = await executor().run(code, "go", TWO_SUM_TESTS[:2])
+    broken = await executor().run("func f(x int) int { return y }", "go", one_test())
+    monkeypatch.setattr(code_execution_module, "hidden_paths", lambda: ["/nonexistent/code-exec"])
+    unconfined = await executor().run(code, "go", TWO_SUM_TESTS[:1])
+
+    assert [o["status"] for o in outcomes] == ["passed", "passed"]
+    assert broken[0]["status"] == "compile_error" and "undefined: y" in broken[0]["error"]
+    # The build itself does not run outside the sandbox either
+    assert unconfined[0]["status"] == "sandbox_unavailable"
+
+
+@pytest.mark.asyncio
+@sandboxed
+async def test_run_tests_shapes_results_for_the_workspace(monkeypatch):
+    monkeypatch.setattr(prep_module, "code_executor", executor())
+    challenge = {"challenge_type": "coding", "coding_challenge": {"test_cases": TWO_SUM_TESTS[:2]}}
+    code = PYTHON_TWO_SUM.replace("return [seen[target - n], i]", "return [i, seen[target - n]]")
+
+    results = await prep_module.technical_prep_service._run_tests(challenge, code, "python")
+
+    assert [r["passed"] for r in results] == [False, False]
+    assert results[0]["actual"] == "[1, 0]"
+    assert results[0]["status"] == "wrong_answer"
+    assert results[0]["description"] == "Basic" and results[1]["description"] == "Test 2"
+    assert results[0]["runtime_ms"] is not None and results[0]["memory_kb"] > 0
+
+
+@pytest.mark.asyncio
+async def test_generated_test_cases_come_from_the_async_client(monkeypatch):
+    class FakeCompletions:
+        async def create(self, **kwargs):
+            message = type("Message", (), {"content": '[{"input": {"x": 1}, "expected_output": 2}]'})
+            return type("Response", (), {"choices": [type("Choice", (), {"message": message})]})
+
+    class FakeClient:
+        chat = type("Chat", (), {"completions": FakeCompletions()})
+
+    monkeypatch.setattr(prep_module, "AsyncTrackedOpenAIClient", FakeClient)
+    challenge = {"title": "Double", "coding_challenge": {"description": "Return twice x"}}
+
+    cases = await prep_module.technical_prep_service._generate_test_cases(challenge, "python")
+
+    assert cases == [{"input": {"x": 1}, "expected_output": 2, "description": "Test case"}]
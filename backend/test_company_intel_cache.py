@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock
+
+from services.company_intel_cache import CompanyIntelCache, normalize_company_name
+
+
+@pytest.fixture
+def intel_dao(monkeypatch):
+    from mongo.company_intel_dao import company_intel_dao
+    monkeypatch.setattr(company_intel_dao, "get_entry", AsyncMock(return_value=None))
+    monkeypatch.setattr(company_intel_dao, "put_entry", AsyncMock())
+    monkeypatch.setattr(company_intel_dao, "try_begin_refresh", AsyncMock(return_value=True))
+    monkeypatch.setattr(company_intel_dao, "end_refresh", AsyncMock())
+    return company_intel_dao
+
+
+def _entry(data, fresh_in, stale_in):
+    now = datetime.now(timezone.utc)
+    return {
+        "data": data,
+        "fresh_until": now + timedelta(seconds=fresh_in),
+        "stale_until": now + timedelta(seconds=stale_in),
+    }
+
+
+@pytest.mark.parametrize("raw", ["Google", "Google LLC", "google, inc.", "  GOOGLE Inc  "])
+def test_normalize_company_name_variants(raw):
+    assert normalize_company_name(raw) == "google"
+
+
+def test_normalize_company_name_keeps_meaningful_words():
+    assert normalize_company_name("The Walt Disney Company") == "walt disney"
+    assert normalize_company_name("AT&T") == "at and t"
+    assert normalize_company_name("Nestlé S.A.") == "nestle"
+    assert normalize_company_name("The Company") == "company"
+
+
+@pytest.mark.asyncio
+async def test_miss_generates_and_stores(intel_dao):
+    cache = CompanyIntelCache()
+    compute = AsyncMock(return_value={"summary": "x"})
+
+    assert await cache.get_or_compute("Acme Inc", "history", compute) == {"summary": "x"}
+
+    compute.assert_awaited_once()
+    key, section = intel_dao.put_entry.await_args.args[:2]
+    assert (key, section) == ("acme", "history")
+    assert cache.stats()["sections"]["history"]["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_skips_generation(intel_dao):
+    intel_dao.get_entry.return_value = _entry("cached", 60, 120)
+    cache = CompanyIntelCache()
+    compute = AsyncMock(return_value="new")
+
+    assert await cache.get_or_compute("Acme", "history", compute) == "cached"
+    compute.assert_not_awaited()
+    assert cache.stats()["totals"]["hit_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_stale_hit_serves_old_value_and_refreshes(intel_dao):
+    intel_dao.get_entry.return_value = _entry("old", -10, 60)
+    cache = CompanyIntelCache()
+    compute = AsyncMock(return_value="new")
+
+    assert await cache.get_or_compute("Acme", "company_news", compute) == "old"
+    await asyncio.gather(*cache._refreshing)
+
+    compute.assert_awaited_once()
+    assert intel_dao.put_entry.await_args.args[2] == "new"
+    stats = cache.stats()["sections"]["company_news"]
+    assert stats["stale_hits"] == 1 and stats["refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_generation(intel_dao):
+    cache = CompanyIntelCache()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "profile"
+
+    results = await asyncio.gather(*[cache.get_or_compute("Acme", "company_profile", compute) for _ in range(5)])
+
+    assert results == ["profile"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_error_payloads_are_not_cached(intel_dao):
+    cache = CompanyIntelCache()
+    compute = AsyncMock(return_value={"error": "Cohere returned no text"})
+
+    await cache.get_or_compute("Acme", "job_company_research", compute)
+
+    intel_dao.put_entry.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_lookup_failure_falls_through_to_generation(intel_dao):
+    intel_dao.get_entry.side_effect = RuntimeError("mongo down")
+    cache = CompanyIntelCache()
+
+    assert await cache.get_or_compute("Acme", "history", AsyncMock(return_value="text")) == "text"
+    assert cache.stats()["sections"]["history"]["errors"] == 1
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from services.company_research_service import CompanyResearchService, RESEARCH_SECTIONS
+
+
+@pytest.fixture(autouse=True)
+def empty_intel_cache(monkeypatch):
+    from mongo.company_intel_dao import company_intel_dao
+    monkeypatch.setattr(company_intel_dao, "get_entry", AsyncMock(return_value=None))
+    monkeypatch.setattr(company_intel_dao, "put_entry", AsyncMock())
+    return company_intel_dao
+
+
+@pytest.mark.asyncio
+async def test_sections_run_concurrently(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_call(prompt, system_message=""):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "text"
+
+    monkeypatch.setattr(CompanyResearchService, "_call_openai_async", staticmethod(fake_call))
+
+    sections = [
+        section async for section, _ in CompanyResearchService.stream_company_research("Acme", max_concurrency=3)
+    ]
+
+    assert sorted(sections) == sorted(RESEARCH_SECTIONS)
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_slow_section_falls_back_alone(monkeypatch):
+    async def slow_history(company_name, context, custom_prompt=None):
+        await asyncio.sleep(1)
+        return "never"
+
+    async def fake_call(prompt, system_message=""):
+        return "ai text"
+
+    monkeypatch.setattr(CompanyResearchService, "_call_openai_async", staticmethod(fake_call))
+    monkeypatch.setattr(CompanyResearchService, "_generate_company_history", staticmethod(slow_history))
+
+    results = dict([
+        item async for item in CompanyResearchService.stream_company_research("Acme", section_timeout=0.05)
+    ])
+
+    fallback = CompanyResearchService._generate_fallback_research("Acme")
+    assert results["history"] == fallback["history"]
+    assert results["market_position"] == "ai text"
+
+
+@pytest.mark.asyncio
+async def test_generate_company_research_keeps_report_shape(monkeypatch):
+    async def fake_call(prompt, system_message=""):
+        return "ai text"
+
+    monkeypatch.setattr(CompanyResearchService, "_call_openai_async", staticmethod(fake_call))
+
+    report = await CompanyResearchService.generate_company_research("Acme", job_role="Engineer")
+
+    assert list(report.keys()) == RESEARCH_SECTIONS + ["generated_at"]
+
+
+@pytest.mark.asyncio
+async def test_only_company_sections_are_shared(monkeypatch, empty_intel_cache):
+    async def fake_call(prompt, system_message=""):
+        return "ai text"
+
+    monkeypatch.setattr(CompanyResearchService, "_call_openai_async", staticmethod(fake_call))
+
+    await CompanyResearchService.generate_company_research("Acme", job_role="Engineer")
+
+    stored = {call.args[1] for call in empty_intel_cache.put_entry.await_args_list}
+    assert "history" in stored
+    assert "talking_points" not in stored
+    assert "intelligent_questions" not in stored
+
+
+@pytest.mark.asyncio
+async def test_fallback_sections_are_not_shared(monkeypatch, empty_intel_cache):
+    async def failing_call(prompt, system_message=""):
+        from services.company_research_service import _ai_call_failed
+        _ai_call_failed.set(True)
+        raise Exception("OpenAI API error: down")
+
+    monkeypatch.setattr(CompanyResearchService, "_call_openai_async", staticmethod(failing_call))
+
+    await CompanyResearchService.generate_company_research("Acme")
+
+    empty_intel_cache.put_entry.assert_not_awaited()
@@ -0,0 +1,280 @@
+import httpx
+import pytest
+
+from services import github_sync
+from services.github_sync import GitHubClient, GitHubError, summarize_commit_activity
+
+WEEKS = [{"total": n, "week": i} for i, n in enumerate([1, 0, 2, 3, 4, 5])]
+
+
+def repo(repo_id, pushed_at="2026-01-01T00:00:00Z", **extra):
+    return {
+        "id": repo_id,
+        "name": f"repo{repo_id}",
+        "full_name": f"octo/repo{repo_id}",
+        "html_url": f"https://github.com/octo/repo{repo_id}",
+        "pushed_at": pushed_at,
+        **extra,
+    }
+
+
+class FakeGitHub:
+    """Serves /user/repos in pages plus per-repo languages and commit activity, honouring ETags"""
+
+    def __init__(self, repos, per_page=2):
+        self.repos = repos
+        self.per_page = per_page
+        self.activity_status = 200
+        self.calls = []
+
+    def set_repos(self, repos):
+        self.repos = repos
+
+    def _page(self, request):
+        page = int(request.url.params.get("page", "1"))
+        items = self.repos[(page - 1) * self.per_page:page * self.per_page]
+        headers = {"ETag": f'"list-{page}-{hash(str(items))}"'}
+        if page * self.per_page < len(self.repos):
+            headers["Link"] = f'<https://api.github.com/user/repos?per_page=100&sort=updated&page={page + 1}>; rel="next"'
+        return items, headers
+
+    def handler(self, request):
+        self.calls.append(request.url.path)
+        etag = request.headers.get("If-None-Match")
+        path = request.url.path
+        if path == "/user/repos":
+            body, headers = self._page(request)
+        elif path.endswith("/languages"):
+            body, headers = {"Python": 100}, {"ETag": f'"lang-{path}"'}
+        elif path.endswith("/stats/commit_activity"):
+            if self.activity_status == 202:
+                return httpx.Response(202, json={})
+            body, headers = WEEKS, {"ETag": f'"activity-{path}"'}
+        else:
+            return httpx.Response(404, json={"message": "Not Found"})
+        if etag and etag == headers["ETag"]:
+            return httpx.Response(304, headers={"X-RateLimit-Remaining": "4999"})
+        return httpx.Response(200, json=body, headers={**headers, "X-RateLimit-Remaining": "4990"})
+
+
+class FakeTokensDAO:
+    def __init__(self, token="tok"):
+        self.token = token
+
+    async def get_tokens(self, uuid):
+        return {"access_token": self.token} if self.token else None
+
+
+class FakeReposDAO:
+    def __init__(self):
+        self.repos = {}
+        self.state = None
+        self.stored_batches = []
+        self.store_fails = False
+
+    async def get_sync_state(self, uuid):
+        return self.state
+
+    async def save_sync_state(self, uuid, state):
+        self.state = {**(self.state or {}), **state}
+
+    async def get_user_repos(self, uuid):
+        return [dict(doc, repo_id=repo_id) for repo_id, doc in self.repos.items()]
+
+    async def get_sync_index(self, uuid):
+        return {repo_id: dict(doc) for repo_id, doc in self.repos.items()}
+
+    async def store_repos(self, uuid, repos):
+        if self.store_fails:
+            return False
+        self.stored_batches.append([r["repo_id"] for r in repos])
+        for r in repos:
+            doc = self.repos.setdefault(r["repo_id"], {"is_featured": False, "notes": ""})
+            doc.update({k: v for k, v in r.items() if k not in ("is_featured", "notes")})
+        return True
+
+    async def update_repo_fields(self, uuid, repo_id, fields):
+        self.repos[repo_id].update(fields)
+
+    async def delete_repos_except(self, uuid, repo_ids):
+        stale = set(self.repos) - set(repo_ids)
+        for repo_id in stale:
+            del self.repos[repo_id]
+        return len(stale)
+
+    async def mark_synced(self, uuid, synced_at):
+        for doc in self.repos.values():
+            doc["last_synced"] = synced_at
+
+
+@pytest.fixture
+def github(monkeypatch):
+    fake = FakeGitHub([repo(1), repo(2), repo(3), repo(4, private=True), repo(5)])
+    dao = FakeReposDAO()
+    monkeypatch.setattr(github_sync, "github_client", GitHubClient(transport=httpx.MockTransport(fake.handler)))
+    monkeypatch.setattr(github_sync, "github_repos_dao", dao)
+    monkeypatch.setattr(github_sync, "github_tokens_dao", FakeTokensDAO())
+    return fake, dao
+
+
+@pytest.mark.asyncio
+async def test_first_sync_walks_every_page_and_fetches_details(github):
+    fake, dao = github
+
+    summary = await github_sync.sync_user_repositories("u1")
+
+    assert sorted(dao.repos) == [1, 2, 3, 5]
+    assert fake.calls.count("/user/repos") == 3
+    assert dao.repos[5]["languages"] == {"Python": 100}
+    assert dao.repos[1]["commit_activity"]["total_commits"] == 15
+    assert dao.repos[1]["commit_activity"]["recent_commits"] == 14
+    assert summary["repositories"] == 4 and summary["details_fetched"] == 4
+    assert summary["complete"] and summary["rate_limit_remaining"] == 4990
+
+
+@pytest.mark.asyncio
+async def test_unchanged_listing_is_revalidated_with_etags(github):
+    fake, dao = github
+    await github_sync.sync_user_repositories("u1")
+    dao.repos[1]["is_featured"] = True
+    fake.calls.clear()
+
+    summary = await github_sync.sync_user_repositories("u1")
+
+    assert fake.calls == ["/user/repos"] * 3
+    assert summary["requests"] == summary["not_modified"] == 3
+    assert summary["updated"] == 0 and summary["removed"] == 0
+    assert dao.stored_batches[1:] == []
+    assert dao.repos[1]["is_featured"]
+
+
+@pytest.mark.asyncio
+async def test_only_pushed_repos_refetch_details(github):
+    fake, dao = github
+    await github_sync.sync_user_repositories("u1")
+    fake.set_repos([repo(1, pushed_at="2026-02-01T00:00:00Z"), repo(2), repo(3), repo(5)])
+    fake.calls.clear()
+
+    summary = await github_sync.sync_user_repositories("u1")
+
+    detail_calls = [c for c in fake.calls if c != "/user/repos"]
+    assert detail_calls == ["/repos/octo/repo1/languages", "/repos/octo/repo1/stats/commit_activity"]
+    assert summary["details_fetched"] == 1
+    assert dao.repos[1]["pushed_at"] == "2026-02-01T00:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_repos_gone_from_github_are_removed(github):
+    fake, dao = github
+    await github_sync.sync_user_repositories("u1")
+    fake.set_repos([repo(1), repo(2)])
+
+    summary = await github_sync.sync_user_repositories("u1")
+
+    assert sorted(dao.repos) == [1, 2]
+    assert summary["removed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pending_commit_activity_is_retried_next_sync(github):
+    fake, dao = github
+    fake.activity_status = 202
+    await github_sync.sync_user_repositories("u1")
+    assert dao.repos[1]["commit_activity_pending"]
+    assert "commit_activity" not in dao.repos[1]
+
+    fake.activity_status = 200
+    fake.calls.clear()
+    await github_sync.sync_user_repositories("u1")
+
+    assert "/repos/octo/repo1/stats/commit_activity" in fake.calls
+    assert not dao.repos[1]["commit_activity_pending"]
+    assert dao.repos[1]["commit_activity"]["total_commits"] == 15
+
+
+@pytest.mark.asyncio
+async def test_failed_store_does_not_save_page_etags(github):
+    fake, dao = github
+    dao.store_fails = True
+
+    with pytest.raises(RuntimeError):
+        await github_sync.sync_user_repositories("u1")
+    assert dao.state is None
+
+    dao.store_fails = False
+    await github_sync.sync_user_repositories("u1")
+    assert sorted(dao.repos) == [1, 2, 3, 5]
+
+
+@pytest.mark.asyncio
+async def test_first_repository_list_syncs_before_answering(github, monkeypatch):
+    from routes import githubAPI
+
+    fake, dao = github
+    monkeypatch.setattr(githubAPI, "github_repos_dao", dao)
+
+    def load():
+        # What the frontend's first page load sends
+        return githubAPI.get_user_repositories(include_forks=False, include_archived=False, refresh=False, uuid="u1")
+
+    first = await load()
+    calls = len(fake.calls)
+    second = await load()
+
+    assert first["count"] == 4 and first["cached"] is False
+    assert second["count"] == 4 and second["cached"] is True
+    assert len(fake.calls) == calls
+
+    # A user with no public repositories is not re-synced on every load
+    dao.repos.clear()
+    assert (await load())["count"] == 0
+    assert len(fake.calls) == calls
+
+
+@pytest.mark.asyncio
+async def test_missing_token_is_not_retried(github, monkeypatch):
+    monkeypatch.setattr(github_sync, "github_tokens_dao", FakeTokensDAO(token=None))
+
+    with pytest.raises(GitHubError) as exc:
+        await github_sync.sync_user_repositories("u1")
+    assert exc.value.status_code == 401
+    assert await github_sync.handle_github_sync({"uuid": "u1"}) == {"skipped": "GitHub not connected"}
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_raised_for_the_queue_to_retry(monkeypatch):
+    def handler(request):
+        return httpx.Response(403, headers={"X-RateLimit-Remaining": "0"}, json={"message": "rate limited"})
+
+    monkeypatch.setattr(github_sync, "github_client", GitHubClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(github_sync, "github_repos_dao", FakeReposDAO())
+    monkeypatch.setattr(github_sync, "github_tokens_dao", FakeTokensDAO())
+
+    with pytest.raises(GitHubError, match="rate limit"):
+        await github_sync.handle_github_sync({"uuid": "u1"})
+
+
+@pytest.mark.asyncio
+async def test_forbidden_repo_is_skipped_not_fatal(monkeypatch):
+    fake = FakeGitHub([repo(1), repo(2)])
+
+    def handler(request):
+        if request.url.path.startswith("/repos/octo/repo2/"):
+            return httpx.Response(403, headers={"X-RateLimit-Remaining": "4990"}, json={"message": "Forbidden"})
+        return fake.handler(request)
+
+    dao = FakeReposDAO()
+    monkeypatch.setattr(github_sync, "github_client", GitHubClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(github_sync, "github_repos_dao", dao)
+    monkeypatch.setattr(github_sync, "github_tokens_dao", FakeTokensDAO())
+
+    summary = await github_sync.sync_user_repositories("u1")
+
+    assert summary["complete"] and summary["skipped"] == ["octo/repo2"]
+    assert dao.repos[1]["languages"] == {"Python": 100}
+    assert sorted(dao.repos) == [1, 2] and "languages" not in dao.repos[2]
+
+
+def test_summarize_commit_activity_handles_empty_stats():
+    assert summarize_commit_activity([]) == {"total_commits": 0, "recent_commits": 0}
+    assert summarize_commit_activity(WEEKS[:2])["recent_commits"] == 1
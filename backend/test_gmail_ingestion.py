@@ -0,0 +1,251 @@
+import base64
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from services import gmail_ingestion
+from services.gmail_ingestion import GmailError
+
+
+def message(message_id, subject, history_id, labels=("INBOX",)):
+    return {
+        "id": message_id,
+        "threadId": f"t{message_id}",
+        "historyId": str(history_id),
+        "snippet": f"snippet {message_id}",
+        "labelIds": list(labels),
+        "payload": {"headers": [{"name": "Subject", "value": subject}, {"name": "From", "value": "hr@acme.com"}]},
+    }
+
+
+class Request:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+
+class FakeBatch:
+    def __init__(self, gmail, callback):
+        self.gmail = gmail
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request, request_id))
+
+    def execute(self):
+        self.gmail.http_requests += 1
+        self.gmail.batch_sizes.append(len(self.requests))
+        for request, request_id in self.requests:
+            try:
+                self.callback(request_id, request.fn(), None)
+            except KeyError as e:
+                self.callback(request_id, None, e)
+
+
+class FakeGmail:
+    """The slice of the discovery client the ingestion layer uses; counts HTTP round trips"""
+
+    def __init__(self, messages):
+        self.store = {m["id"]: m for m in messages}
+        self.records = []
+        self.history_id = "100"
+        self.history_expired = False
+        # Gmail only keeps about a week of history; older start ids get a 404
+        self.oldest_history_id = 0
+        self.http_requests = 0
+        self.batch_sizes = []
+        self.formats = []
+
+    def users(self):
+        return self
+
+    def getProfile(self, userId):
+        def run():
+            self.http_requests += 1
+            return {"emailAddress": "me@example.com", "historyId": self.history_id}
+
+        return Request(run)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def list(self, userId, q=None, maxResults=None, startHistoryId=None, historyTypes=None, pageToken=None):
+        if startHistoryId is not None:
+            return Request(lambda: self._history(startHistoryId))
+        self.http_requests += 1
+        ids = [m for m in self.store if q in self.store[m]["payload"]["headers"][0]["value"]]
+        return Request(lambda: {"messages": [{"id": i} for i in ids[:maxResults]]})
+
+    def _history(self, start):
+        self.http_requests += 1
+        if self.history_expired or int(start) < self.oldest_history_id:
+            raise HttpError(type("Resp", (), {"status": 404, "reason": "Not Found"})(), b"{}")
+        return {"history": [h for h in self.records if int(h["id"]) > int(start)], "historyId": self.history_id}
+
+    def messages(self):
+        return self
+
+    def history(self):
+        return self
+
+    def get(self, userId, id, format, metadataHeaders=None):
+        self.formats.append(format)
+
+        def run():
+            msg = self.store[id]
+            if format == "full":
+                data = base64.urlsafe_b64encode(f"body of {id}".encode()).decode()
+                return {**msg, "payload": {"mimeType": "text/plain", "body": {"data": data}}}
+            return msg
+
+        return Request(run)
+
+
+class FakeMessagesDAO:
+    def __init__(self):
+        self.docs = {}
+        self.history_id = None
+
+    async def get_messages(self, uuid, ids):
+        return {i: {k: v for k, v in self.docs[i].items() if k != "body"} for i in ids if i in self.docs}
+
+    async def store_messages(self, uuid, messages):
+        for m in messages:
+            self.docs.setdefault(m["id"], {}).update(m)
+
+    async def get_body(self, uuid, message_id):
+        return self.docs.get(message_id, {}).get("body")
+
+    async def store_body(self, uuid, message_id, body):
+        if message_id in self.docs:
+            self.docs[message_id]["body"] = body
+
+    async def invalidate(self, uuid, ids):
+        for i in ids:
+            self.docs.pop(i, None)
+
+    async def get_history_id(self, uuid):
+        return self.history_id
+
+    async def save_history_id(self, uuid, history_id):
+        self.history_id = history_id
+
+    async def delete_user_messages(self, uuid):
+        self.docs.clear()
+        self.history_id = None
+
+
+@pytest.fixture
+def gmail(monkeypatch):
+    fake = FakeGmail([message(str(i), f"Acme update {i}", 50 + i) for i in range(1, 61)]
+                     + [message("x", "Newsletter", 90)])
+    dao = FakeMessagesDAO()
+
+    async def client(uuid):
+        return fake
+
+    monkeypatch.setattr(gmail_ingestion, "get_gmail_client", client)
+    monkeypatch.setattr(gmail_ingestion, "gmail_messages_dao", dao)
+    return fake, dao
+
+
+@pytest.mark.asyncio
+async def test_search_fetches_metadata_in_batches(gmail):
+    fake, dao = gmail
+
+    emails = await gmail_ingestion.search_messages("u1", "Acme", max_results=60)
+
+    assert [e["id"] for e in emails] == [str(i) for i in range(1, 61)]
+    assert emails[0]["subject"] == "Acme update 1" and emails[0]["thread_id"] == "t1"
+    # Profile (history cursor), one list call plus two batches of at most 50,
+    # never a full-format fetch
+    assert fake.http_requests == 4 and fake.batch_sizes == [50, 10]
+    assert set(fake.formats) == {"metadata"}
+    assert dao.history_id == "100"
+
+
+@pytest.mark.asyncio
+async def test_repeat_search_only_fetches_the_delta(gmail):
+    fake, dao = gmail
+    await gmail_ingestion.search_messages("u1", "Acme", max_results=20)
+    fake.http_requests, fake.batch_sizes = 0, []
+
+    emails = await gmail_ingestion.search_messages("u1", "Acme", max_results=25)
+
+    assert len(emails) == 25
+    # History replay, list, and one batch for the five new ids
+    assert fake.http_requests == 3 and fake.batch_sizes == [5]
+    assert dao.history_id == "100"
+
+
+@pytest.mark.asyncio
+async def test_old_messages_do_not_seed_an_expired_history_cursor(gmail):
+    fake, dao = gmail
+    # Every matching message last changed before the history Gmail still has
+    fake.oldest_history_id = 95
+    await gmail_ingestion.search_messages("u1", "Acme", max_results=20)
+    fake.http_requests, fake.batch_sizes = 0, []
+
+    emails = await gmail_ingestion.search_messages("u1", "Acme", max_results=20)
+
+    assert len(emails) == 20
+    # History replay and list only: the cache survived
+    assert fake.http_requests == 2 and fake.batch_sizes == []
+    assert dao.history_id == "100"
+
+
+@pytest.mark.asyncio
+async def test_label_changes_invalidate_cached_messages(gmail):
+    fake, dao = gmail
+    await gmail_ingestion.search_messages("u1", "Acme", max_results=3)
+    fake.store["2"]["labelIds"] = ["INBOX", "STARRED"]
+    fake.records = [{"id": "101", "labelsAdded": [{"message": {"id": "2"}, "labelIds": ["STARRED"]}]}]
+    fake.history_id = "101"
+    fake.batch_sizes = []
+
+    emails = await gmail_ingestion.search_messages("u1", "Acme", max_results=3)
+
+    assert fake.batch_sizes == [1]
+    assert emails[1]["labels"] == ["INBOX", "STARRED"]
+    assert dao.history_id == "101"
+
+
+@pytest.mark.asyncio
+async def test_expired_history_rebuilds_the_cache(gmail):
+    fake, dao = gmail
+    await gmail_ingestion.search_messages("u1", "Acme", max_results=5)
+    fake.history_expired = True
+    fake.batch_sizes = []
+
+    emails = await gmail_ingestion.search_messages("u1", "Acme", max_results=5)
+
+    assert len(emails) == 5 and fake.batch_sizes == [5]
+
+
+@pytest.mark.asyncio
+async def test_body_is_fetched_once_and_cached(gmail):
+    fake, dao = gmail
+    await gmail_ingestion.search_messages("u1", "Acme", max_results=1)
+
+    first = await gmail_ingestion.get_message_body("u1", "1")
+    second = await gmail_ingestion.get_message_body("u1", "1")
+
+    assert first == second == "body of 1"
+    assert fake.formats.count("full") == 1
+    assert "body" not in (await dao.get_messages("u1", ["1"]))["1"]
+
+
+@pytest.mark.asyncio
+async def test_not_connected(monkeypatch):
+    class NoTokens:
+        async def get_tokens(self, uuid):
+            return None
+
+    monkeypatch.setattr(gmail_ingestion, "gmail_tokens_dao", NoTokens())
+
+    with pytest.raises(GmailError) as exc:
+        await gmail_ingestion.search_messages("u1", "Acme")
+    assert exc.value.status_code == 401
@@ -0,0 +1,138 @@
+import pytest
+from unittest.mock import AsyncMock
+from pymongo.errors import OperationFailure
+
+from mongo.dao_setup import API_CALL_LOGS, JOBS, NETWORKS, RESUMES, TEAMS
+from mongo.index_registry import IndexRegistry, import_dao_modules, index_registry
+from mongo.query_paths import scan_query_paths
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    def __init__(self, indexes=(), stats=None):
+        self.indexes = [{"name": "_id_", "key": {"_id": 1}}, *indexes]
+        self.stats = stats
+        self.create_index = AsyncMock()
+
+    async def list_indexes(self):
+        return FakeCursor(self.indexes)
+
+    async def aggregate(self, pipeline):
+        if self.stats is None:
+            raise OperationFailure("not authorized")
+        return FakeCursor(self.stats)
+
+
+class FakeDB:
+    def __init__(self, collections):
+        self.collections = collections
+        self.command = AsyncMock()
+
+    def get_collection(self, name):
+        return self.collections[name]
+
+
+@pytest.fixture(scope="module")
+def query_paths():
+    import_dao_modules()
+    return scan_query_paths()
+
+
+def test_every_dao_query_path_has_an_index(query_paths):
+    missing = index_registry.unsupported(query_paths)
+
+    assert not missing, "Queries without a supporting index (declare one in the DAO):\n" + "\n".join(
+        f"  {p.location}: {p.collection} {list(p.fields)} sort={list(p.sort)}" for p in missing
+    )
+
+
+def test_scanner_sees_the_hot_paths(query_paths):
+    seen = {(p.collection, p.fields[0]) for p in query_paths if p.fields}
+
+    assert (JOBS, "uuid") in seen
+    assert (TEAMS, "members.uuid") in seen
+    assert ("resume_versions", "resume_id") in seen
+
+
+@pytest.mark.parametrize("collection,field", [
+    (JOBS, "uuid"),
+    (RESUMES, "uuid"),
+    ("resume_versions", "resume_id"),
+    (TEAMS, "members.uuid"),
+    (API_CALL_LOGS, "timestamp"),
+    (NETWORKS, "email"),
+])
+def test_hot_filters_are_indexed(query_paths, collection, field):
+    assert any(spec.fields[0] == field for spec in index_registry.specs(collection))
+
+
+def test_network_email_index_is_unique(query_paths):
+    (spec,) = [s for s in index_registry.specs(NETWORKS) if s.fields == ("email",)]
+    assert spec.unique
+
+
+def test_leading_field_rule():
+    registry = IndexRegistry()
+    registry.declare("jobs", [("uuid", 1), ("date_created", -1)])
+    registry.declare("logs", [("timestamp", -1)])
+
+    assert registry.is_supported("jobs", ("uuid", "archived"))
+    assert not registry.is_supported("jobs", ("date_created",))
+    assert registry.is_supported("logs", (), ("timestamp",))
+    assert registry.is_supported("anything", ("_id",))
+    assert registry.is_supported("anything", ())
+
+
+@pytest.mark.asyncio
+async def test_reconcile_builds_missing_and_reports_the_rest():
+    registry = IndexRegistry()
+    registry.declare("jobs", [("uuid", 1), ("date_created", -1)])
+    registry.declare("jobs", "dedupe_key", unique=True)
+    registry.declare("sessions", "expires_at", ttl_seconds=0)
+    jobs = FakeCollection(
+        indexes=[
+            {"name": "dedupe_key_1", "key": {"dedupe_key": 1}},
+            {"name": "status_1", "key": {"status": 1}},
+        ],
+        stats=[{"name": "status_1", "accesses": {"ops": 0}}, {"name": "dedupe_key_1", "accesses": {"ops": 9}}],
+    )
+    sessions = FakeCollection(indexes=[
+        {"name": "expires_at_1", "key": {"expires_at": 1}, "expireAfterSeconds": 3600},
+    ])
+    db = FakeDB({"jobs": jobs, "sessions": sessions})
+
+    report = await registry.reconcile(db, create_missing=True, strict=False)
+
+    jobs.create_index.assert_awaited_once_with(
+        [("uuid", 1), ("date_created", -1)], name="uuid_1_date_created_-1"
+    )
+    assert report["created"] == ["jobs.uuid_1_date_created_-1"]
+    assert report["conflicts"] == ["jobs.dedupe_key_1 (unique=False, declared True)"]
+    assert report["undeclared"] == ["jobs.status_1"]
+    assert report["unused"] == ["jobs.status_1"]
+    assert report["ttl_updated"] == ["sessions.expires_at_1"]
+    db.command.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_strict_reconcile_raises_when_an_index_cannot_be_built():
+    registry = IndexRegistry()
+    registry.declare("networks", "email", unique=True)
+    networks = FakeCollection()
+    networks.create_index.side_effect = OperationFailure("E11000 duplicate key")
+
+    with pytest.raises(RuntimeError, match="networks.email_1"):
+        await registry.reconcile(FakeDB({"networks": networks}), create_missing=True, strict=True)
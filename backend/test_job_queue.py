@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from services.job_queue import JobQueue, backoff_delay
+from services import job_research_pipeline
+
+
+@pytest.fixture
+def tasks_dao(monkeypatch):
+    from mongo.background_tasks_dao import background_tasks_dao
+    for name in ("enqueue", "complete", "retry_later", "fail", "extend_lease"):
+        monkeypatch.setattr(background_tasks_dao, name, AsyncMock(return_value=True))
+    return background_tasks_dao
+
+
+def _task(attempts=1, max_attempts=3):
+    return {
+        "_id": "t1",
+        "worker_id": "w1",
+        "kind": "demo",
+        "idempotency_key": "demo:1",
+        "payload": {"n": 1},
+        "attempts": attempts,
+        "max_attempts": max_attempts,
+    }
+
+
+@pytest.mark.asyncio
+async def test_successful_task_is_completed(tasks_dao):
+    queue = JobQueue()
+    queue.register("demo", AsyncMock(return_value={"ok": True}))
+
+    await queue.run_task(_task())
+
+    tasks_dao.complete.assert_awaited_once_with("t1", "w1", {"ok": True})
+
+
+@pytest.mark.asyncio
+async def test_failed_task_is_retried_then_failed(tasks_dao):
+    queue = JobQueue()
+    queue.register("demo", AsyncMock(side_effect=RuntimeError("down")))
+
+    await queue.run_task(_task(attempts=1))
+    tasks_dao.retry_later.assert_awaited_once()
+    tasks_dao.fail.assert_not_awaited()
+
+    await queue.run_task(_task(attempts=3))
+    tasks_dao.fail.assert_awaited_once_with("t1", "w1", "RuntimeError: down")
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_while_the_handler_runs(tasks_dao):
+    queue = JobQueue(lease_seconds=0.15)
+
+    async def slow(payload):
+        await asyncio.sleep(0.2)
+        return {"ok": True}
+
+    queue.register("demo", slow)
+    await queue.run_task(_task())
+
+    assert tasks_dao.extend_lease.await_count >= 2
+    tasks_dao.extend_lease.assert_awaited_with("t1", "w1", 0.15)
+    calls = tasks_dao.extend_lease.await_count
+    await asyncio.sleep(0.1)
+    assert tasks_dao.extend_lease.await_count == calls
+
+
+@pytest.mark.asyncio
+async def test_outcome_is_dropped_once_the_lease_is_lost(tasks_dao, capsys):
+    tasks_dao.complete.return_value = False
+    queue = JobQueue()
+    queue.register("demo", AsyncMock(return_value={"ok": True}))
+
+    await queue.run_task(_task())
+
+    tasks_dao.retry_later.assert_not_awaited()
+    assert "no longer holds the task" in capsys.readouterr().out
+
+
+def test_backoff_is_capped():
+    assert 0 <= backoff_delay(1, base=10, cap=100) <= 10
+    assert backoff_delay(20, base=10, cap=100) <= 100
+
+
+@pytest.mark.asyncio
+async def test_research_handler_raises_when_everything_fails(monkeypatch):
+    monkeypatch.setattr(job_research_pipeline.jobs_dao, "get_job", AsyncMock(return_value={"company": "Acme"}))
+    monkeypatch.setattr(job_research_pipeline.jobs_dao, "update_job", AsyncMock())
+    monkeypatch.setattr(job_research_pipeline, "run_company_research", AsyncMock(side_effect=RuntimeError("ai")))
+    monkeypatch.setattr(job_research_pipeline, "run_company_news", AsyncMock(return_value=[]))
+    monkeypatch.setattr(job_research_pipeline, "generate_job_salary_negotiation", AsyncMock(return_value=None))
+
+    with pytest.raises(RuntimeError):
+        await job_research_pipeline.handle_job_research({"job_id": "j1"})
+    job_research_pipeline.jobs_dao.update_job.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_research_handler_saves_partial_results(monkeypatch):
+    monkeypatch.setattr(job_research_pipeline.jobs_dao, "get_job", AsyncMock(return_value={"company": {"name": "Acme"}}))
+    monkeypatch.setattr(job_research_pipeline.jobs_dao, "update_job", AsyncMock())
+    monkeypatch.setattr(job_research_pipeline, "run_company_research", AsyncMock(return_value={"basic_info": {"size": "50"}}))
+    monkeypatch.setattr(job_research_pipeline, "run_company_news", AsyncMock(side_effect=RuntimeError("bing")))
+    salary = AsyncMock(return_value={"talking_points": []})
+    monkeypatch.setattr(job_research_pipeline, "generate_job_salary_negotiation", salary)
+
+    result = await job_research_pipeline.handle_job_research({"job_id": "j1"})
+
+    assert result == {"updated_fields": ["company_research", "salary_negotiation"]}
+    assert salary.await_args.kwargs["company_size"] == "50"
@@ -0,0 +1,136 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from services.job_runner import Job, JobRunner, items_processed
+
+
+class FakeScheduledJobsDAO:
+    """In-memory scheduled_jobs with the same claim semantics as the Mongo DAO"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def ensure(self, name, first_run_at):
+        self.docs.setdefault(name, {"_id": name, "next_run_at": first_run_at, "owner": None,
+                                    "lease_until": None, "runs": 0, "failures": 0})
+
+    async def claim(self, name, owner, now, lease_seconds):
+        doc = self.docs.get(name)
+        if doc is None or doc["next_run_at"] > now:
+            return None
+        if doc["lease_until"] is not None and doc["lease_until"] > now:
+            return None
+        before = dict(doc)
+        doc.update(owner=owner, lease_until=now + timedelta(seconds=lease_seconds), started_at=now)
+        return before
+
+    async def renew(self, name, owner, lease_until):
+        doc = self.docs[name]
+        if doc["owner"] != owner:
+            return False
+        doc["lease_until"] = lease_until
+        return True
+
+    async def finish(self, name, owner, next_run_at, last_run, failed):
+        doc = self.docs[name]
+        if doc["owner"] != owner:
+            return
+        doc.update(owner=None, lease_until=None, next_run_at=next_run_at, last_run=last_run)
+        doc["runs"] += 1
+        doc["failures"] = doc["failures"] + 1 if failed else 0
+
+    async def run_now(self, name, now):
+        self.docs[name]["next_run_at"] = now
+        return True
+
+    async def get_all(self):
+        return [self.docs[name] for name in sorted(self.docs)]
+
+
+async def settle(*runners):
+    for runner in runners:
+        await asyncio.gather(*runner._running.values())
+
+
+@pytest.mark.asyncio
+async def test_due_job_runs_once_across_runners():
+    dao = FakeScheduledJobsDAO()
+    calls = []
+
+    async def job():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 3
+
+    runners = [JobRunner(dao=dao) for _ in range(3)]
+    for i, runner in enumerate(runners):
+        runner.owner = f"worker-{i}"
+        runner.register("reminders", job, interval_seconds=60)
+
+    started = await asyncio.gather(*(runner.tick() for runner in runners))
+    await settle(*runners)
+    # Not due again until the interval has passed
+    await asyncio.gather(*(runner.tick() for runner in runners))
+
+    assert sum(len(names) for names in started) == 1
+    assert len(calls) == 1
+    doc = dao.docs["reminders"]
+    assert doc["owner"] is None and doc["runs"] == 1
+    assert doc["last_run"]["items"] == 3
+    assert doc["next_run_at"] > datetime.now(timezone.utc) + timedelta(seconds=50)
+
+
+@pytest.mark.asyncio
+async def test_failures_back_off_and_are_recorded():
+    dao = FakeScheduledJobsDAO()
+    runner = JobRunner(dao=dao)
+
+    async def broken():
+        raise RuntimeError("mongo down")
+
+    runner.register("rollup", broken, interval_seconds=60)
+    for _ in range(3):
+        await dao.run_now("rollup", datetime.now(timezone.utc)) if "rollup" in dao.docs else None
+        await runner.tick()
+        await settle(runner)
+
+    doc = dao.docs["rollup"]
+    assert doc["failures"] == 3
+    assert doc["last_run"]["error"] == "RuntimeError: mongo down"
+    # 60s * 2**3 with +-10% jitter
+    delay = (doc["next_run_at"] - doc["last_run"]["finished_at"]).total_seconds()
+    assert 430 < delay < 530
+    assert runner.metrics["rollup"]["failures"] == 3
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_taken_over():
+    dao = FakeScheduledJobsDAO()
+    now = datetime.now(timezone.utc)
+    await dao.ensure("events", now)
+    # A runner that died mid-run left its lease behind
+    dao.docs["events"].update(owner="dead", lease_until=now - timedelta(seconds=1), next_run_at=now - timedelta(minutes=2))
+
+    runner = JobRunner(dao=dao)
+
+    async def job():
+        return 0
+
+    runner.register("events", job, interval_seconds=60)
+    assert await runner.tick() == ["events"]
+    await settle(runner)
+
+    assert dao.docs["events"]["last_run"]["lag_ms"] >= 120000
+
+
+def test_backoff_is_capped_and_items_are_counts():
+    job = Job("daily", None, interval_seconds=86400, lease_seconds=300, jitter=0)
+    assert job.next_delay(0) == 86400
+    assert job.next_delay(5) == 86400
+    assert Job("minute", None, 60, 300, jitter=0).next_delay(20) == 3600
+
+    assert items_processed(4) == 4
+    assert items_processed({"items": 2}) == 2
+    assert items_processed(None) is None and items_processed(True) is None
@@ -0,0 +1,84 @@
+import pytest
+from bson import ObjectId
+
+from mongo.jobs_dao import JobsDAO
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        ids = set(query["_id"]["$in"])
+        uuid = query.get("uuid")
+        return FakeCursor([
+            d for d in self.docs if d["_id"] in ids and (uuid is None or d.get("uuid") == uuid)
+        ])
+
+
+@pytest.fixture
+def dao():
+    dao = JobsDAO.__new__(JobsDAO)
+    dao.resume_id = ObjectId()
+    dao.version_id = ObjectId()
+    dao.resumes = FakeCollection([
+        {"_id": dao.resume_id, "uuid": "u1", "name": "Main CV", "version_name": "v3"},
+    ])
+    dao.resume_versions = FakeCollection([
+        {"_id": dao.version_id, "resume_id": str(dao.resume_id), "version_name": "Tailored"},
+    ])
+    dao.cover_letters = FakeCollection([
+        {"_id": "cl1", "uuid": "u1", "title": "Acme letter"},
+        {"_id": "cl2", "uuid": "someone-else", "title": "Not mine"},
+    ])
+    return dao
+
+
+@pytest.mark.asyncio
+async def test_materials_resolved_with_one_query_per_collection(dao):
+    jobs = [
+        {"materials": {"resume_id": str(dao.resume_id), "cover_letter_id": "cl1"}}
+        for _ in range(50)
+    ]
+
+    await dao.attach_material_details(jobs, "u1")
+
+    assert len(dao.resumes.queries) == 1
+    assert len(dao.cover_letters.queries) == 1
+    assert dao.resume_versions.queries == []
+    assert jobs[-1]["materials"]["resume_name"] == "Main CV"
+    assert jobs[-1]["materials"]["resume_version"] == "v3"
+    assert jobs[-1]["materials"]["cover_letter_name"] == "Acme letter"
+
+
+@pytest.mark.asyncio
+async def test_version_ids_and_foreign_documents(dao):
+    jobs = [
+        {"materials": {"resume_id": str(dao.version_id)}},
+        {"materials": {"cover_letter_id": "cl2"}},
+        {"materials": {"resume_id": "not-an-object-id"}},
+        {"title": "no materials"},
+    ]
+
+    await dao.attach_material_details(jobs, "u1")
+
+    assert jobs[0]["materials"]["resume_name"] == "Main CV"
+    assert jobs[0]["materials"]["resume_version"] == "Tailored"
+    assert "cover_letter_name" not in jobs[1]["materials"]
+    assert "resume_name" not in jobs[2]["materials"]
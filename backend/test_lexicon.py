@@ -0,0 +1,82 @@
+from services.interview_coaching_service import STARFrameworkAnalyzer, WeakLanguageDetector
+from services.job_requirements_extractor import extract_education_level, extract_skills
+from services.resume_validator import ResumeValidator
+from services.writing_practice_service import WritingPracticeService
+from utils.lexicon import Hit, Lexicon
+
+SKILLS = Lexicon.from_groups({
+    "javascript": ["javascript", "js", "node", "node.js"],
+    "java": ["java"],
+    "c++": ["c++", "cpp"],
+    "machine learning": ["machine learning", "ml"],
+})
+
+
+def test_matches_whole_words_only():
+    assert SKILLS.labels("JavaScript and HTML5 with XML") == ["javascript"]
+    assert SKILLS.labels("Java, C++ and some ML") == ["java", "c++", "machine learning"]
+    assert SKILLS.find_all("cpp/c++") == [Hit("cpp", "c++", 0, 3), Hit("c++", "c++", 4, 7)]
+
+
+def test_longest_phrase_wins_and_whitespace_is_flexible():
+    assert SKILLS.find_all("Node.js, node.jsx") == [
+        Hit("node.js", "javascript", 0, 7),
+        Hit("node", "javascript", 9, 13),
+    ]
+    assert SKILLS.search("Machine\n  Learning engineer") == Hit("machine learning", "machine learning", 0, 18)
+
+
+def test_labels_see_overlapping_phrases_counts_do_not():
+    lexicon = Lexicon.from_groups({"action": ["i worked"], "situation": ["worked at"]})
+
+    assert lexicon.labels("I worked at Acme") == ["action", "situation"]
+    assert lexicon.count("I worked at Acme") == 1
+
+
+def test_counts_and_starts_with():
+    fillers = Lexicon(["so", "like", "you know"])
+    assert fillers.term_counts("So, like, you know... also likely so") == {"so": 2, "like": 1, "you know": 1}
+
+    verbs = Lexicon(["led", "built"])
+    assert verbs.starts_with("• Led, then built") == Hit("led", "led", 2, 5)
+    assert verbs.starts_with("Ledger reconciliation") is None
+    assert Lexicon([]).find_all("anything") == []
+
+
+def test_skill_extraction_has_no_substring_false_positives():
+    skills = [s["name"] for s in extract_skills("Senior JavaScript engineer: HTML, Postgresql, GitHub Actions")]
+
+    assert skills == ["javascript", "sql", "html"]
+    assert extract_education_level("Masters degree preferred, undergraduate required") == "bachelor"
+
+
+def test_resume_spelling_and_action_verbs():
+    resume = {
+        "summary": "Sandwich shop manager wich recieved praise",
+        "experience": [{"description": "- Led a team of five"}, {"description": "Was responsible for stuff"}],
+    }
+
+    assert ResumeValidator._check_spelling(resume) == [
+        "Possible misspelling: 'recieved' → 'received'",
+        "Possible misspelling: 'wich' → 'which'",
+    ]
+    assert "Experience items [2]" in ResumeValidator._check_action_verbs(resume)[0]
+
+
+def test_weak_language_counts_whole_words():
+    result = WeakLanguageDetector.detect_weak_language("I just adjusted it. Also, so, I just did it, um")
+
+    weak = {w["weak_phrase"]: w["count"] for w in result["weak_phrases"]}
+    fillers = {f["filler"]: f["count"] for f in result["filler_words"]}
+    assert weak == {"just": 2, "did": 1}
+    assert fillers == {"um": 1, "so": 1}
+
+
+def test_star_and_writing_scorers():
+    star = STARFrameworkAnalyzer.analyze_star_framework("I worked at Acme and I led a rewrite that resulted in savings")
+    assert (star["situation_present"], star["task_present"], star["action_present"], star["result_present"]) == \
+        (True, False, True, True)
+
+    # "also" and "adjust" no longer count as filler words
+    assert WritingPracticeService._calculate_conciseness_score("also adjust " * 50, 100) == 100
+    assert WritingPracticeService._calculate_conciseness_score("really " * 100, 100) == 80
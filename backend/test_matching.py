@@ -0,0 +1,134 @@
+import pytest
+
+import mongo.matching_service as matching_service
+from mongo.matching_service import compute_match_for_job, compute_matches_for_user, score_jobs
+
+PROFILE = {
+    "uuid": "u1",
+    "skills": [{"name": "python", "level": 3}, {"name": "k8s", "level": 2}, {"name": "aws", "level": 1}],
+    "educationLevel": "Bachelor",
+    "totalYearsExperience": 4,
+    "matchingPreferences": {},
+}
+
+
+def job(job_id, skills, min_years=None, education=None, title="Software Engineer"):
+    return {
+        "_id": job_id,
+        "title": title,
+        "company": "Acme",
+        "requiredSkills": [{"name": name, "level": level} for name, level in skills],
+        "minYearsExperience": min_years,
+        "educationLevel": education,
+    }
+
+
+JOBS = [
+    job("j1", [("python", 2), ("kubernetes", 1)], min_years=3),
+    job("j2", [("react", 1), ("cloud", 2)], min_years=8, education="masters"),
+    job("j3", [], title="Intern"),
+]
+
+
+# compute_match_for_job's output for JOBS before scoring was batched
+# (generatedAt left out), with skills/experience weighted 1 and education 0
+LEGACY_MATCHES = [
+    {
+        "jobId": "j1", "jobTitle": "Software Engineer", "company": "Acme", "overallScore": 100,
+        "categoryBreakdown": {"skills": 100, "experience": 100, "education": 100},
+        "skills": {
+            "score": 100, "matching": ["python", "kubernetes"], "partial": [], "missing": [],
+            "details": [
+                {"skill": "python", "requiredLevel": 2, "userLevel": 3, "coverage": 100},
+                {"skill": "kubernetes", "requiredLevel": 1, "userLevel": 2, "coverage": 100},
+            ],
+        },
+        "experience": {"score": 100, "userYears": 4.0, "requiredMin": 3.0, "requiredPreferred": 3.0,
+                       "level": {"user": "Mid", "required": "Mid"}},
+        "education": {"score": 100, "userLevel": "Bachelor", "requiredLevel": "bachelor"},
+        "suggestions": [],
+    },
+    {
+        "jobId": "j2", "jobTitle": "Software Engineer", "company": "Acme", "overallScore": 25,
+        "categoryBreakdown": {"skills": 0, "experience": 50, "education": 75},
+        "skills": {
+            "score": 0, "matching": [], "partial": ["cloud"], "missing": ["react"],
+            "details": [
+                {"skill": "react", "requiredLevel": 1, "userLevel": 0, "coverage": 0},
+                {"skill": "cloud", "requiredLevel": 2, "userLevel": 1, "coverage": 50},
+            ],
+        },
+        "experience": {"score": 50, "userYears": 4.0, "requiredMin": 8.0, "requiredPreferred": 8.0,
+                       "level": {"user": "Mid", "required": "Senior"}},
+        "education": {"score": 75, "userLevel": "Bachelor", "requiredLevel": "masters"},
+        "suggestions": ["Improve skill: react", "Gain more relevant experience or highlight internships/projects."],
+    },
+    {
+        "jobId": "j3", "jobTitle": "Intern", "company": "Acme", "overallScore": 100,
+        "categoryBreakdown": {"skills": 100, "experience": 100, "education": 100},
+        "skills": {"score": 100, "matching": [], "partial": [], "missing": [], "details": []},
+        "experience": {"score": 100, "userYears": 4.0, "requiredMin": 0.0, "requiredPreferred": 0.0,
+                       "level": {"user": "Mid", "required": "Entry"}},
+        "education": {"score": 100, "userLevel": "Bachelor", "requiredLevel": "none"},
+        "suggestions": [],
+    },
+]
+
+
+class FakeHistoryDAO:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def log_matches(self, uuid, matches):
+        if self.fail:
+            raise RuntimeError("mongo down")
+        self.batches.append((uuid, [m["jobId"] for m in matches]))
+        return len(matches)
+
+    async def log_match(self, uuid, match):
+        raise AssertionError("history is written per batch")
+
+
+@pytest.fixture
+def history(monkeypatch):
+    async def get_profile(uuid):
+        return PROFILE
+
+    async def get_jobs(uuid, job_ids=None):
+        return {"results": JOBS}
+
+    dao = FakeHistoryDAO()
+    monkeypatch.setattr(matching_service, "_get_profile", get_profile)
+    monkeypatch.setattr(matching_service, "_get_jobs_for_matching", get_jobs)
+    monkeypatch.setattr(matching_service, "match_history_dao", dao)
+    return dao
+
+
+@pytest.mark.asyncio
+async def test_batch_scores_match_legacy_per_job_scoring():
+    weights = {"skillsWeight": 1, "experienceWeight": 1, "educationWeight": 0}
+    batch = score_jobs(PROFILE, JOBS, weights)
+
+    assert [{k: v for k, v in m.items() if k != "generatedAt"} for m in batch] == LEGACY_MATCHES
+    assert len({m["generatedAt"] for m in batch}) == 1
+    for j, expected in zip(JOBS, LEGACY_MATCHES):
+        single = await compute_match_for_job("u1", j, PROFILE, weights)
+        assert {k: v for k, v in single.items() if k != "generatedAt"} == expected
+
+
+@pytest.mark.asyncio
+async def test_matches_are_sorted_and_history_written_once(history):
+    results = await compute_matches_for_user("u1")
+
+    assert [m["jobId"] for m in results] == ["j1", "j3", "j2"]
+    assert history.batches == [("u1", ["j1", "j2", "j3"])]
+
+
+@pytest.mark.asyncio
+async def test_history_failure_does_not_break_matching(history):
+    history.fail = True
+
+    results = await compute_matches_for_user("u1")
+
+    assert len(results) == 3
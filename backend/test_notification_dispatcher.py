@@ -0,0 +1,155 @@
+import asyncio
+import smtplib
+from email.mime.text import MIMEText
+
+import pytest
+
+from services import notification_dispatcher as dispatcher_module
+from services.notification_dispatcher import MemoryTransport, NotificationDispatcher, SmtpTransport
+
+
+class FakeDeadLetters:
+    def __init__(self):
+        self.rows = []
+
+    async def add(self, **row):
+        self.rows.append(row)
+
+
+def message(subject="Reminder"):
+    msg = MIMEText("body")
+    msg["Subject"] = subject
+    return msg
+
+
+def make_dispatcher(transport, **kwargs):
+    kwargs.setdefault("backoff_base", 0.001)
+    kwargs.setdefault("backoff_max", 0.001)
+    return NotificationDispatcher(transport=transport, dead_letters=FakeDeadLetters(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_go_out_in_one_batch():
+    transport = MemoryTransport("app@example.com")
+    dispatcher = make_dispatcher(transport)
+
+    results = await asyncio.gather(*(dispatcher.send(message(), f"user{i}@example.com") for i in range(5)))
+    await dispatcher.stop()
+
+    assert transport.batches == [5]
+    assert [r["sent_to"] for r in results] == [f"user{i}@example.com" for i in range(5)]
+    assert {m["sender"] for m in transport.sent} == {"app@example.com"}
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_and_permanent_ones_dead_lettered():
+    failures = {"flaky@example.com": 2}
+
+    def fail(recipient, raw):
+        if recipient == "bounced@example.com":
+            return smtplib.SMTPRecipientsRefused({recipient: (550, b"no such user")})
+        if failures.get(recipient):
+            failures[recipient] -= 1
+            return smtplib.SMTPServerDisconnected("dropped")
+        return None
+
+    dispatcher = make_dispatcher(MemoryTransport(fail=fail))
+
+    result = await dispatcher.send(message(), "flaky@example.com")
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        await dispatcher.send(message("Bounce"), "bounced@example.com")
+    await dispatcher.stop()
+
+    assert result["attempts"] == 3
+    (dead,) = dispatcher.dead_letters.rows
+    assert (dead["recipient"], dead["subject"], dead["attempts"]) == ("bounced@example.com", "Bounce", 1)
+    assert dispatcher.stats()["retried"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_at_max_attempts():
+    dispatcher = make_dispatcher(MemoryTransport(fail=lambda r, raw: OSError("timeout")), max_attempts=2)
+
+    with pytest.raises(OSError):
+        await dispatcher.send(message(), "a@example.com")
+    await dispatcher.stop()
+
+    assert dispatcher.dead_letters.rows[0]["attempts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_recipient_rate_limit_holds_messages_back():
+    transport = MemoryTransport()
+    dispatcher = make_dispatcher(transport, recipient_limit=2, recipient_window=0.2)
+
+    await asyncio.gather(*(dispatcher.send(message(), "same@example.com") for _ in range(3)),
+                         dispatcher.send(message(), "other@example.com"))
+    await dispatcher.stop()
+
+    assert transport.batches == [3, 1]
+    assert len(transport.sent) == 4
+
+
+class FakeSMTP:
+    """Stand-in for smtplib.SMTP_SSL that can drop the connection once"""
+    opened = []
+
+    def __init__(self, host, port, timeout=None):
+        self.drop_next = False
+        self.sent = []
+        FakeSMTP.opened.append(self)
+
+    def login(self, user, password):
+        pass
+
+    def sendmail(self, sender, recipient, raw):
+        if self.drop_next:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(recipient)
+
+    def noop(self):
+        return 250, b"OK"
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_smtp_transport_reuses_and_reopens_its_connection(monkeypatch):
+    FakeSMTP.opened = []
+    monkeypatch.setattr(dispatcher_module.smtplib, "SMTP_SSL", FakeSMTP)
+    transport = SmtpTransport(username="app@example.com", password="secret")
+
+    assert transport.send_batch([("app@example.com", "a@example.com", "x"), ("app@example.com", "b@example.com", "y")]) == [None, None]
+    assert transport.send_batch([("app@example.com", "c@example.com", "z")]) == [None]
+    assert len(FakeSMTP.opened) == 1
+
+    FakeSMTP.opened[0].drop_next = True
+    assert transport.send_batch([("app@example.com", "d@example.com", "w")]) == [None]
+    assert len(FakeSMTP.opened) == 2 and FakeSMTP.opened[1].sent == ["d@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_interview_and_deadline_reminders_go_through_the_dispatcher(monkeypatch):
+    from datetime import datetime, timezone
+
+    import routes.jobs as jobs_routes
+    import services.calendar_service as calendar_module
+
+    transport = MemoryTransport("app@example.com")
+    dispatcher = make_dispatcher(transport)
+    monkeypatch.setattr(calendar_module, "notification_dispatcher", dispatcher)
+    monkeypatch.setattr(jobs_routes, "notification_dispatcher", dispatcher)
+    monkeypatch.setattr(calendar_module.calendar_service, "sender_email", "app@example.com")
+    monkeypatch.setattr(calendar_module.calendar_service, "sender_password", "secret")
+    monkeypatch.setenv("GMAIL_SENDER", "app@example.com")
+    monkeypatch.setenv("GMAIL_APP_PASSWORD", "secret")
+
+    interview = {"interview_datetime": datetime(2026, 10, 20, 15, tzinfo=timezone.utc), "company_name": "Acme"}
+    assert await calendar_module.calendar_service.send_email_reminder("a@example.com", interview, 24) is True
+    assert await jobs_routes.send_deadline_reminder_email("b@example.com", "Engineer", "Acme", "2026-10-20", 3) is True
+    await dispatcher.stop()
+
+    assert [m["recipient"] for m in transport.sent] == ["a@example.com", "b@example.com"]
@@ -0,0 +1,242 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+import services.peer_benchmarks as peer_benchmarks
+from services.peer_benchmarks import (
+    ALL_COHORT,
+    PeerBenchmarkRollup,
+    cohort_row,
+    cohort_row_from_totals,
+    empty_cohort_row,
+    member_row,
+    member_totals,
+    merge_totals,
+    percentile_of,
+    quantiles,
+)
+from routes.performance_analytics import (
+    analyze_career_progression,
+    analyze_job_search_performance,
+    analyze_market_positioning,
+    analyze_skill_gaps,
+)
+
+NOW = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def user_data(industry="Tech", level="Senior", jobs=(), skills=(), salaries=(), interviews=0):
+    return {
+        "profile": {"industry": industry, "experience_level": level},
+        "jobs": list(jobs),
+        "skills": [{"name": name, "category": "Technical"} for name in skills],
+        "salaries": [{"base_salary": salary} for salary in salaries],
+        "interviews": interviews,
+    }
+
+
+def job(status="Applied", industry="Software", days_ago=0):
+    return {"status": status, "company_industry": industry, "date_created": NOW - timedelta(days=days_ago)}
+
+
+class FakeDAO:
+    """In-memory stand-in for PeerBenchmarksDAO"""
+
+    def __init__(self, users):
+        self.users = users
+        self.changed = set(users)
+        self.members = {}
+        self.cohorts = {}
+        self.state = {}
+        self.loaded = []
+        self.member_reads = []
+
+    async def get_state(self):
+        return dict(self.state)
+
+    async def save_state(self, watermark, **stats):
+        self.state.update(watermark=watermark, **stats)
+
+    async def all_users(self):
+        return set(self.users)
+
+    async def changed_users(self, since):
+        return set(self.changed)
+
+    async def load_user_data(self, uuids):
+        self.loaded.extend(uuids)
+        return {uuid: self.users[uuid] for uuid in uuids}
+
+    async def get_member_cohorts(self, uuids):
+        return {uuid: self.members[uuid]["cohort"] for uuid in uuids if uuid in self.members}
+
+    async def save_members(self, rows):
+        self.members.update({row["_id"]: row for row in rows})
+
+    async def delete_members(self, uuids):
+        for uuid in uuids:
+            self.members.pop(uuid, None)
+
+    async def get_members(self, cohort=None):
+        self.member_reads.append(cohort)
+        return [m for m in self.members.values() if cohort is None or m["cohort"] == cohort]
+
+    async def member_cohort_keys(self):
+        return {m["cohort"] for m in self.members.values()}
+
+    async def save_cohort(self, row):
+        self.cohorts[row["_id"]] = row
+
+    async def delete_cohort(self, key):
+        self.cohorts.pop(key, None)
+
+    async def cohort_keys(self):
+        return set(self.cohorts)
+
+    async def get_member(self, uuid):
+        return self.members.get(uuid)
+
+    async def get_cohorts(self, keys):
+        return {key: self.cohorts[key] for key in keys if key in self.cohorts}
+
+
+def test_quantiles_and_percentiles():
+    qs = quantiles(list(range(101)))
+
+    assert qs[0] == 0 and qs[10] == 50 and qs[-1] == 100
+    assert percentile_of(50, qs) == 50
+    assert percentile_of(-1, qs) == 0
+    assert percentile_of(1000, qs) == 100
+    assert percentile_of(10, []) == 50
+
+
+def test_member_row_summarizes_one_user():
+    row = member_row("u1", user_data(
+        jobs=[job("Offer", days_ago=60), job("Interview"), job(industry="")],
+        skills=["Python", "python", "SQL"],
+        salaries=[90000],
+        interviews=2,
+    ), NOW)
+
+    assert row["cohort"] == "tech|senior"
+    assert (row["applications"], row["offers"], row["interviews"]) == (3, 1, 1)
+    assert row["skills"] == ["python", "sql"]
+    assert {entry["name"] for entry in row["industries"]} == {"Software", "Unknown"}
+    assert row["first_application"] == NOW - timedelta(days=60)
+    assert member_row("u2", user_data(), NOW) is None
+
+
+def test_cohort_row_rolls_up_members():
+    members = [
+        member_row("a", user_data(jobs=[job("Offer", days_ago=90), job()], skills=["Python", "SQL"], salaries=[100000]), NOW),
+        member_row("b", user_data(jobs=[job(), job(), job(), job()], skills=["Python"], salaries=[80000]), NOW),
+    ]
+
+    row = cohort_row("tech|senior", members, NOW)
+
+    assert row["users"] == 2
+    assert row["applications"]["success_rate"] == pytest.approx(1 / 6)
+    assert row["applications"]["avg_applications_per_month"] == pytest.approx(6 / 3)
+    assert row["career"]["average_success_rate"] == pytest.approx(0.25)
+    assert row["skills"]["frequencies"][0] == {"name": "python", "users": 2}
+    assert row["salaries"]["average"] == 90000
+
+
+@pytest.mark.asyncio
+async def test_incremental_rollup_only_reloads_changed_users():
+    dao = FakeDAO({
+        "a": user_data(jobs=[job("Offer")]),
+        "b": user_data(jobs=[job()]),
+        "c": user_data(industry="Finance", jobs=[job()]),
+    })
+    rollup = PeerBenchmarkRollup(dao, batch_size=2)
+
+    first = await rollup.run()
+    assert first["full"] and set(dao.cohorts) == {"tech|senior", "finance|senior", ALL_COHORT}
+
+    dao.loaded.clear()
+    dao.member_reads.clear()
+    dao.changed = {"c"}
+    dao.users["c"] = user_data(industry="Tech", jobs=[job("Offer"), job()])
+    second = await rollup.run()
+
+    assert not second["full"]
+    assert dao.loaded == ["c"]
+    assert second["cohorts"] == ["finance|senior", "tech|senior"]
+    assert "finance|senior" not in dao.cohorts
+    assert dao.cohorts["tech|senior"]["users"] == 3
+    assert dao.cohorts[ALL_COHORT]["applications"]["total"] == 4
+    assert dao.cohorts[ALL_COHORT]["users"] == 3
+    # Only the touched cohorts are re-read; ALL_COHORT is summed from the cohort rows
+    assert sorted(dao.member_reads) == ["finance|senior", "tech|senior"]
+
+
+@pytest.mark.asyncio
+async def test_small_cohorts_fall_back_to_all_users(monkeypatch):
+    dao = FakeDAO({f"u{i}": user_data(industry="Tech" if i else "Niche", jobs=[job()]) for i in range(7)})
+    await PeerBenchmarkRollup(dao).run()
+    monkeypatch.setattr(peer_benchmarks, "peer_benchmarks_dao", dao)
+
+    assert (await peer_benchmarks.get_cohort_benchmarks("u1"))["_id"] == "tech|senior"
+    assert (await peer_benchmarks.get_cohort_benchmarks("u0"))["_id"] == ALL_COHORT
+    assert (await peer_benchmarks.get_cohort_benchmarks("nobody"))["_id"] == ALL_COHORT
+
+    # Five peers left once u1 is taken out; with one user fewer the cohort is too small
+    del dao.users["u6"]
+    await PeerBenchmarkRollup(dao).run(full=True)
+    assert (await peer_benchmarks.get_cohort_benchmarks("u1"))["_id"] == ALL_COHORT
+
+
+@pytest.mark.asyncio
+async def test_benchmarks_leave_out_the_users_own_data(monkeypatch):
+    users = {"me": user_data(jobs=[job("Offer")], skills=["Rust"], salaries=[200000])}
+    users.update({f"p{i}": user_data(jobs=[job(), job(days_ago=30)], skills=["Python"], salaries=[100000]) for i in range(5)})
+    dao = FakeDAO(users)
+    await PeerBenchmarkRollup(dao).run()
+    monkeypatch.setattr(peer_benchmarks, "peer_benchmarks_dao", dao)
+
+    peers = await peer_benchmarks.get_cohort_benchmarks("me")
+
+    assert peers["_id"] == "tech|senior" and peers["users"] == 5
+    assert peers["applications"]["success_rate"] == 0
+    assert peers["career"]["success_rate_quantiles"][-1] == 0
+    assert peers["skills"]["frequencies"] == [{"name": "python", "users": 5}]
+    assert peers["salaries"]["quantiles"][-1] == 100000
+    assert peers["applications"]["avg_applications_per_month"] == pytest.approx(10)
+    assert dao.cohorts["tech|senior"]["users"] == 6
+
+    others = await peer_benchmarks.get_cohort_benchmarks("p0")
+    assert others["users"] == 5 and others["applications"]["success_rate"] == pytest.approx(1 / 9)
+    assert others["salaries"]["quantiles"][-1] == 200000
+
+
+def test_cohort_totals_add_and_subtract():
+    rows = [member_row(name, user_data(jobs=[job("Offer", days_ago=n * 10), job()], skills=[name], salaries=[n * 1000]), NOW)
+            for n, name in enumerate("abc", start=1)]
+    everyone = cohort_row("x", rows, NOW)
+
+    assert merge_totals(cohort_row("x", rows[:2], NOW)["totals"], cohort_row("x", rows[2:], NOW)["totals"]) == everyone["totals"]
+    without_b = merge_totals(everyone["totals"], member_totals(rows[1]), -1)
+    expected = cohort_row("x", [rows[0], rows[2]], NOW)
+    served = cohort_row_from_totals("x", without_b, NOW)
+    # Only the spare earliest/latest dates kept for subtraction differ
+    assert {k: v for k, v in served.items() if k != "totals"} == {k: v for k, v in expected.items() if k != "totals"}
+
+
+def test_analysis_reads_the_cohort_row():
+    members = [member_row(str(i), user_data(jobs=[job("Offer" if i < 2 else "Applied")], skills=["Python", f"s{i}"], salaries=[50000 + i * 10000]), NOW) for i in range(10)]
+    peers = cohort_row("tech|senior", members, NOW)
+    user_jobs = [{"status": "Offer"}, {"status": "Applied"}]
+
+    performance = analyze_job_search_performance(user_jobs, peers)
+    assert performance["peer_benchmarks"]["average_success_rate"] == pytest.approx(0.2)
+    assert 80 < performance["peer_benchmarks"]["percentile_ranking"] < 90
+    assert performance["performance_vs_peers"]["success_rate"] == "above_average"
+
+    gaps = analyze_skill_gaps([{"name": "SQL"}], peers)
+    assert gaps["missing_common_skills"] == ["python"]
+
+    market = analyze_market_positioning("u", [{"base_salary": 95000}], peers)
+    assert market["salary_positioning"]["peer_average"] == 95000
+    assert market["salary_positioning"]["market_percentile"] == 50
+
+    assert analyze_career_progression(user_jobs, [], empty_cohort_row())["peer_patterns"]["average_success_rate"] == 0
@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from redis_client import Cache, InMemoryCache
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_roundtrip_and_ttl(monkeypatch):
+    import redis_client
+
+    now = [1000.0]
+    monkeypatch.setattr(redis_client.time, "monotonic", lambda: now[0])
+
+    cache = Cache(InMemoryCache())
+    await cache.set_json("k", {"a": 1}, ex=10)
+    assert await cache.get_json("k") == {"a": 1}
+
+    now[0] += 11
+    assert await cache.get_json("k") is None
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_mget_mset_and_eviction():
+    cache = Cache(InMemoryCache(max_entries=2))
+    await cache.mset({"a": "1", "b": "2"})
+    assert await cache.mget(["a", "b", "missing"]) == ["1", "2", None]
+
+    await cache.set("c", "3")
+    assert await cache.get("a") is None
+    assert await cache.delete("b", "c") == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_errors_degrade_to_miss():
+    backend = InMemoryCache()
+    backend.get = AsyncMock(side_effect=RuntimeError("down"))
+    backend.mget = AsyncMock(side_effect=RuntimeError("down"))
+    cache = Cache(backend)
+
+    assert await cache.get("k") is None
+    assert await cache.mget(["a", "b"]) == [None, None]
+    assert cache.stats()["errors"] == 2
+
+
+def test_redis_url_without_redis_package_fails_loudly(monkeypatch):
+    import sys
+    import redis_client
+
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379/0")
+    monkeypatch.delenv("CACHE_BACKEND", raising=False)
+    monkeypatch.setitem(sys.modules, "redis", None)
+    monkeypatch.setitem(sys.modules, "redis.asyncio", None)
+
+    with pytest.raises(RuntimeError, match="REDIS_URL"):
+        redis_client._build_backend()
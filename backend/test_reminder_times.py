@@ -0,0 +1,109 @@
+import pytest
+from bson import ObjectId
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import services.event_reminder_scheduler as event_scheduler
+import services.referral_reminder_scheduler as referral_scheduler
+from mongo import network_events_dao as events_module
+from mongo import referrals_dao as referrals_module
+from utils.reminder_times import (
+    event_datetime,
+    next_event_reminder,
+    next_referral_reminder,
+    request_datetime,
+)
+
+UTC = timezone.utc
+
+
+def test_event_datetime_reads_frontend_times_as_eastern():
+    assert event_datetime("2026-11-02", "18:30") == datetime(2026, 11, 2, 23, 30, tzinfo=UTC)
+    assert event_datetime("2026-11-02") == datetime(2026, 11, 2, 17, 0, tzinfo=UTC)
+    assert event_datetime("2026-11-02", "late") == datetime(2026, 11, 2, 17, 0, tzinfo=UTC)
+    assert event_datetime("") is None
+
+
+def test_request_datetime_keeps_stored_datetimes_utc():
+    assert request_datetime(datetime(2026, 11, 2, 9)) == datetime(2026, 11, 2, 9, tzinfo=UTC)
+    assert request_datetime("2026-11-02T09:00:00") == datetime(2026, 11, 2, 14, tzinfo=UTC)
+    assert request_datetime(None) is None
+
+
+def test_next_event_reminder_walks_the_windows():
+    event_at = datetime(2026, 11, 2, 18, tzinfo=UTC)
+
+    assert next_event_reminder(event_at, {}, event_at - timedelta(days=3)) == ("24h_before", event_at - timedelta(hours=25))
+    assert next_event_reminder(event_at, {"24h_before": True}, event_at - timedelta(hours=24.5)) == (
+        "1h_before", event_at - timedelta(hours=1.5)
+    )
+    # Created inside the last day: the 24h reminder is skipped, not sent late
+    assert next_event_reminder(event_at, {}, event_at - timedelta(hours=10))[0] == "1h_before"
+    assert next_event_reminder(event_at, {"1h_before": True}, event_at - timedelta(hours=10)) == (None, None)
+
+
+def test_next_referral_reminder_only_for_pending():
+    request_at = datetime(2026, 11, 2, 15, tzinfo=UTC)
+    day = datetime(2026, 11, 2, tzinfo=UTC)
+
+    assert next_referral_reminder(request_at, "pending", {}, day - timedelta(days=3)) == ("24h_before", day - timedelta(days=1))
+    assert next_referral_reminder(request_at, None, {"24h_before": True}, day) == ("same_day", day)
+    assert next_referral_reminder(request_at, "pending", {}, request_at + timedelta(hours=2)) == (None, None)
+    assert next_referral_reminder(request_at, "requested", {}, day - timedelta(days=3)) == (None, None)
+
+
+def test_reminder_fields_unset_when_nothing_is_left():
+    now = datetime(2026, 11, 1, tzinfo=UTC)
+    to_set, to_unset = events_module.reminder_fields({"event_date": "2026-11-03", "start_time": "10:00"}, now)
+    assert to_set["next_reminder_at"] == datetime(2026, 11, 2, 14, tzinfo=UTC)
+    assert not to_unset
+
+    to_set, to_unset = referrals_module.reminder_fields({"request_date": "2026-11-03", "status": "completed"}, now)
+    assert "next_reminder_at" not in to_set and to_unset == {"next_reminder_at": ""}
+
+
+def fake_dao(due):
+    dao = MagicMock()
+    dao.get_due_reminders = AsyncMock(return_value=due)
+    dao.sync_reminder = AsyncMock()
+    dao.mark_reminder_sent = AsyncMock(return_value=1)
+    return dao
+
+
+@pytest.mark.asyncio
+async def test_event_scheduler_sends_only_due_reminders(monkeypatch):
+    now = datetime.now(UTC)
+    due = {"_id": ObjectId(), "uuid": "u1", "event_at": now + timedelta(hours=1), "reminders_sent": {"24h_before": True}}
+    stale = {"_id": ObjectId(), "uuid": "u1", "event_at": now - timedelta(hours=3), "reminders_sent": {}}
+    dao = fake_dao([due, stale])
+    email = AsyncMock()
+    monkeypatch.setattr(event_scheduler, "network_events_dao", dao)
+    monkeypatch.setattr(event_scheduler, "event_reminder_service", email)
+    monkeypatch.setattr(event_scheduler.profile_dao, "get_profile", AsyncMock(return_value={"email": "a@b.c"}))
+
+    await event_scheduler.check_and_send_event_reminders()
+
+    email.send_event_reminder_email.assert_awaited_once_with(recipient_email="a@b.c", event_data=due, hours_until=1)
+    dao.mark_reminder_sent.assert_awaited_once_with(str(due["_id"]), "1h_before")
+    dao.sync_reminder.assert_awaited_once_with(stale["_id"])
+
+
+@pytest.mark.asyncio
+async def test_referral_scheduler_leaves_failed_sends_due(monkeypatch):
+    now = datetime.now(UTC)
+    referral = {
+        "_id": ObjectId(), "uuid": "u1", "contact_id": "c1", "status": "pending",
+        "request_at": now + timedelta(minutes=30), "reminders_sent": {"24h_before": True},
+    }
+    dao = fake_dao([referral])
+    email = AsyncMock()
+    monkeypatch.setattr(referral_scheduler, "referrals_dao", dao)
+    monkeypatch.setattr(referral_scheduler, "referral_reminder_service", email)
+    monkeypatch.setattr(referral_scheduler.profile_dao, "get_profile", AsyncMock(return_value={"email": "a@b.c"}))
+    monkeypatch.setattr(referral_scheduler.network_dao, "get_contact", AsyncMock(return_value=None))
+
+    await referral_scheduler.check_and_send_referral_reminders()
+
+    email.send_referral_reminder_email.assert_not_called()
+    dao.mark_reminder_sent.assert_not_called()
+    dao.sync_reminder.assert_not_called()
@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from services.render_cache import RenderCache, render_key, resume_content, not_modified, etag_for
+
+
+@pytest.fixture
+def media(monkeypatch):
+    from mongo.media_dao import media_dao
+    monkeypatch.setattr(media_dao, "find_media_ids", AsyncMock(return_value=[]))
+    monkeypatch.setattr(media_dao, "get_media", AsyncMock(return_value=None))
+    monkeypatch.setattr(media_dao, "add_media", AsyncMock(return_value="m1"))
+    monkeypatch.setattr(media_dao, "delete_media", AsyncMock(return_value=True))
+    return media_dao
+
+
+def _request(if_none_match=None):
+    request = MagicMock()
+    request.headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return request
+
+
+def test_key_depends_on_content_template_and_format():
+    base = render_key("r1", "pdf", "<html>a</html>", "modern")
+
+    assert base == render_key("r1", "pdf", "<html>a</html>", "modern")
+    assert base != render_key("r1", "pdf", "<html>b</html>", "modern")
+    assert base != render_key("r1", "pdf", "<html>a</html>", "classic")
+    assert base != render_key("r1", "docx", "<html>a</html>", "modern")
+
+
+def test_bookkeeping_fields_do_not_change_docx_key():
+    resume = {"name": "CV", "skills": ["python"], "date_updated": 1, "_id": "r1"}
+    touched = {**resume, "date_updated": 2}
+
+    assert render_key("r1", "docx", resume_content(resume)) == render_key("r1", "docx", resume_content(touched))
+
+
+def test_if_none_match_returns_304():
+    key = render_key("r1", "pdf", "<html/>")
+
+    assert not_modified(_request(etag_for(key)), key).status_code == 304
+    assert not_modified(_request(f'W/{etag_for(key)}, "other"'), key).status_code == 304
+    assert not_modified(_request('"other"'), key) is None
+    assert not_modified(_request(), key) is None
+
+
+@pytest.mark.asyncio
+async def test_miss_renders_and_stores(media):
+    cache = RenderCache()
+    render = AsyncMock(return_value=b"%PDF")
+
+    assert await cache.get_or_render("r1", "k1", "pdf", render) == b"%PDF"
+
+    render.assert_awaited_once()
+    metadata = media.add_media.await_args.kwargs["extra_metadata"]
+    assert metadata == {"kind": "render", "render_key": "k1", "format": "pdf"}
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_rendering(media):
+    media.find_media_ids.return_value = ["m1"]
+    media.get_media.return_value = {"contents": b"%PDF-cached"}
+    cache = RenderCache()
+    render = AsyncMock()
+
+    assert await cache.get_or_render("r1", "k1", "pdf", render) == b"%PDF-cached"
+    render.assert_not_awaited()
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_old_renders_are_pruned(media):
+    cache = RenderCache(max_renders_per_document=2)
+    media.find_media_ids.side_effect = [[], ["new", "mid", "old"]]
+
+    await cache.get_or_render("r1", "k1", "pdf", AsyncMock(return_value=b"%PDF"))
+
+    media.delete_media.assert_awaited_once_with("old")
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_all_renders(media):
+    media.find_media_ids.return_value = ["a", "b"]
+
+    assert await RenderCache().invalidate("r1") == 2
+    assert media.delete_media.await_count == 2
@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+import redis_client
+import sessions.session_manager as sm
+from redis_client import Cache, InMemoryCache
+from sessions.session_manager import SessionManager
+from sessions.session_store import MemorySessionStore, RedisSessionStore
+
+
+@pytest.mark.asyncio
+async def test_multiple_sessions_per_user():
+    manager = SessionManager(MemorySessionStore())
+    t1 = await manager.begin_session("u1")
+    t2 = await manager.begin_session("u1")
+
+    assert await manager.authenticate_session("u1", t1)
+    assert await manager.authenticate_session("u1", t2)
+    assert not await manager.authenticate_session("u2", t1)
+
+    assert await manager.kill_session("u1", t1)
+    assert not await manager.authenticate_session("u1", t1)
+    assert await manager.authenticate_session("u1", t2)
+
+    assert await manager.kill_session("u1")
+    assert not await manager.authenticate_session("u1", t2)
+
+
+@pytest.mark.asyncio
+async def test_expired_session_rejected_and_purged():
+    store = MemorySessionStore()
+    manager = SessionManager(store)
+    token = await manager.begin_session("u1")
+    token_hash = sm._hash_token(token)
+
+    store.sessions[token_hash]["expires_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+    manager.local_cache.clear()
+
+    assert not await manager.authenticate_session("u1", token)
+    assert await manager.clean_sessions() == 0
+    assert token_hash not in store.sessions
+
+
+@pytest.mark.asyncio
+async def test_sliding_expiry_extends_old_sessions():
+    store = MemorySessionStore()
+    manager = SessionManager(store)
+    token = await manager.begin_session("u1")
+    token_hash = sm._hash_token(token)
+
+    old_expiry = datetime.now(timezone.utc) + sm.SESSION_TTL - sm.SESSION_REFRESH_INTERVAL * 2
+    store.sessions[token_hash]["expires_at"] = old_expiry
+    manager.local_cache.clear()
+
+    assert await manager.authenticate_session("u1", token)
+    assert store.sessions[token_hash]["expires_at"] > old_expiry
+
+
+@pytest.mark.asyncio
+async def test_redis_index_outlives_extended_sessions(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(redis_client.time, "monotonic", lambda: clock[0])
+    cache = Cache(InMemoryCache())
+    store = RedisSessionStore(cache)
+    now = datetime.now(timezone.utc)
+
+    await store.create("short", "u1", now + timedelta(seconds=10))
+    await store.create("kept", "u1", now + timedelta(seconds=10))
+    await store.touch("kept", now + timedelta(seconds=100))
+    clock[0] += 50
+
+    # The short session expired; the extended one is still found by "log out everywhere"
+    assert await store.get("short") is None
+    assert "kept" in await store.delete_user("u1")
+    assert await store.get("kept") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_delete_and_login_prune_the_index():
+    cache = Cache(InMemoryCache())
+    store = RedisSessionStore(cache)
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+
+    await store.create("a", "u1", expires_at)
+    await store.create("b", "u1", expires_at)
+    assert await store.delete("a")
+    assert await cache.smembers("session_user:u1") == ["b"]
+
+    await cache.delete("session:b")
+    await store.create("c", "u1", expires_at)
+    assert await cache.smembers("session_user:u1") == ["c"]
+
+
+def test_redis_store_requires_a_shared_cache(monkeypatch):
+    monkeypatch.setenv("SESSION_STORE", "redis")
+    monkeypatch.setattr(redis_client, "cache", Cache(InMemoryCache()))
+
+    with pytest.raises(RuntimeError, match="SESSION_STORE=redis"):
+        sm._build_store()
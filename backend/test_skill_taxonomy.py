@@ -0,0 +1,127 @@
+import pytest
+
+import services.skill_taxonomy as taxonomy_module
+from mongo.matching_service import _compute_skill_match
+from services.job_requirements_extractor import extract_skills
+from services.skill_taxonomy import DEFAULT_TAXONOMY, SkillIndex, SkillTaxonomy, parse_entries, skill_taxonomy
+
+ENTRIES = [
+    {"id": 1, "name": "Python", "aliases": ["py", "python3"], "parent": 100},
+    {"id": 2, "name": "FastAPI", "aliases": [], "parent": 1},
+    {"id": 3, "name": "Go", "aliases": ["golang", "py"], "parent": 100},
+    {"id": 100, "name": "Programming", "aliases": [], "parent": None},
+]
+
+
+class FakeTaxonomyDAO:
+    def __init__(self, entries=None, version=None):
+        self.entries = entries
+        self.version = version
+        self.reads = 0
+
+    async def get_version(self):
+        return self.version
+
+    async def get_all(self):
+        self.reads += 1
+        return self.entries
+
+    async def replace_all(self, entries):
+        self.entries = entries
+        self.version = (self.version or 0) + 1
+        return self.version
+
+
+def test_index_resolves_aliases_and_ancestors():
+    index = SkillIndex(ENTRIES)
+
+    assert index.resolve(" PYTHON3 ") == 1
+    # First entry keeps an alias two entries claim
+    assert index.resolve("py") == 1
+    assert index.resolve("golang") == 3 and index.resolve("rust") is None
+    assert index.expand([2]) == {2, 1, 100}
+    assert index.extract("FastAPI services in Go and python3") == [1, 2, 3]
+
+
+@pytest.mark.parametrize("entries,error", [
+    ([{"id": 1, "name": "a", "parent": 9}], "unknown parent"),
+    ([{"id": 1, "name": "a", "parent": 2}, {"id": 2, "name": "b", "parent": 1}], "own ancestor"),
+    ([{"id": 1, "name": "a"}, {"id": 1, "name": "b"}], "Duplicate"),
+])
+def test_invalid_taxonomies_are_rejected(entries, error):
+    with pytest.raises(ValueError, match=error):
+        SkillIndex(entries)
+
+
+def test_parse_entries_accepts_parent_names():
+    entries = parse_entries([
+        {"id": 1, "name": "Cloud"},
+        {"id": 2, "name": "GCP", "aliases": ["Google  Cloud", ""], "parent": "cloud"},
+    ])
+
+    assert entries[1] == {"id": 2, "name": "gcp", "aliases": ["google cloud"], "parent": 1}
+    with pytest.raises(ValueError, match="unknown parent"):
+        parse_entries([{"id": 1, "name": "gcp", "parent": "cloud"}])
+
+
+def test_default_taxonomy_drives_extraction():
+    SkillIndex(DEFAULT_TAXONOMY)
+    skills = extract_skills("Node.js and k8s on AWS, frontend a plus")
+
+    assert [(s["name"], s["taxonomyId"]) for s in skills] == [
+        ("javascript", 4), ("aws", 9), ("kubernetes", 13), ("web development", 102),
+    ]
+
+
+def test_matching_compares_ids_and_covers_categories():
+    profile = [
+        {"name": "k8s", "level": 2},
+        {"name": "aws", "taxonomyId": 9, "level": 1},
+        {"name": "Underwater Basket Weaving", "level": 3},
+    ]
+    required = [
+        {"name": "kubernetes", "taxonomyId": 13, "level": 1},
+        {"name": "cloud", "taxonomyId": 104, "level": 2},
+        {"name": "underwater basket weaving", "level": 1},
+        {"name": "react", "taxonomyId": 5, "level": 1},
+    ]
+
+    result = _compute_skill_match(profile, required)
+
+    assert result["matching"] == ["kubernetes", "underwater basket weaving"]
+    assert result["partial"] == ["cloud"]
+    assert result["missing"] == ["react"]
+    assert result["score"] == 50
+
+
+def test_stale_stored_ids_fall_back_to_names():
+    result = _compute_skill_match([{"name": "python", "taxonomyId": 9999}], [{"name": "Python", "taxonomyId": 1}])
+
+    assert result["matching"] == ["Python"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_seeds_then_reloads_only_on_new_versions(monkeypatch):
+    dao = FakeTaxonomyDAO()
+    monkeypatch.setattr(taxonomy_module, "skill_taxonomy_dao", dao)
+    taxonomy = SkillTaxonomy()
+
+    assert await taxonomy.refresh() is True
+    assert dao.entries == DEFAULT_TAXONOMY and taxonomy.index.version == 1
+    assert await taxonomy.refresh() is False
+    assert dao.reads == 1
+
+    await dao.replace_all(ENTRIES)
+    assert await taxonomy.refresh() is True
+    assert taxonomy.index.resolve("golang") == 3 and taxonomy.index.resolve("aws") is None
+
+
+@pytest.mark.asyncio
+async def test_broken_taxonomy_keeps_the_running_index(monkeypatch):
+    dao = FakeTaxonomyDAO([{"id": 1, "name": "a", "parent": 2}], version=5)
+    monkeypatch.setattr(taxonomy_module, "skill_taxonomy_dao", dao)
+    running = skill_taxonomy.index
+
+    with pytest.raises(ValueError):
+        await skill_taxonomy.refresh()
+    assert skill_taxonomy.index is running
@@ -19,27 +19,44 @@ async def test_ai_route_generate_calls_dao(monkeypatch):
     assert resp == {'response': 'ok'}
 
 
-def test_ai_dao_call_cohere_extracts_text():
+@pytest.mark.asyncio
+async def test_ai_dao_call_cohere_extracts_text():
     dao = AIDAO.__new__(AIDAO)
     dao.co = MagicMock()
 
     mock_resp = MagicMock()
     mock_resp.message.content = [MagicMock(text='hello')]
-    dao.co.chat.return_value = mock_resp
+    dao.co.chat = AsyncMock(return_value=mock_resp)
 
-    out = dao._call_cohere('p', 's')
+    out = await dao._call_cohere('p', 's')
 
     assert out == 'hello'
 
 
 @pytest.mark.asyncio
-async def test_ai_dao_generate_text_uses_executor(monkeypatch):
-    from concurrent.futures import ThreadPoolExecutor
+async def test_ai_dao_call_cohere_without_client_raises():
+    dao = AIDAO.__new__(AIDAO)
+    dao.co = None
+
+    with pytest.raises(Exception, match="not configured"):
+        await dao._call_cohere('p', 's')
 
+
+@pytest.mark.asyncio
+async def test_ai_dao_generate_text_awaits_async_client(monkeypatch):
     dao = AIDAO.__new__(AIDAO)
     dao.co = MagicMock()
-    dao.executor = ThreadPoolExecutor(max_workers=1)
-    monkeypatch.setattr(dao, '_call_cohere', MagicMock(return_value='x'))
+    monkeypatch.setattr(dao, '_call_cohere', AsyncMock(return_value='x'))
 
     out = await dao.generate_text('p', 's')
     assert out == 'x'
+    dao._call_cohere.assert_awaited_once_with('p', 's')
+
+
+@pytest.mark.asyncio
+async def test_ai_dao_generate_text_wraps_errors(monkeypatch):
+    dao = AIDAO.__new__(AIDAO)
+    monkeypatch.setattr(dao, '_call_cohere', AsyncMock(side_effect=RuntimeError('boom')))
+
+    with pytest.raises(Exception, match="Error generating AI text: boom"):
+        await dao.generate_text('p', 's')
@@ -0,0 +1,194 @@
+import copy
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from mongo.technical_prep_dao import TechnicalPrepDAO
+
+
+def matches(doc, query):
+    return all(doc.get(field) == value for field, value in query.items())
+
+
+def apply_update(doc, update):
+    for field, value in update.get("$set", {}).items():
+        doc[field] = value
+    for path, amount in update.get("$inc", {}).items():
+        target = doc
+        *parents, field = path.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[field] = target.get(field, 0) + amount
+    for field, value in update.get("$max", {}).items():
+        if field not in doc or value > doc[field]:
+            doc[field] = value
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction=None):
+        keys = [(key, direction)] if isinstance(key, str) else key
+        for field, order in reversed(keys):
+            self.docs.sort(key=lambda d: d.get(field), reverse=order == -1)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = []
+
+    async def insert_one(self, doc):
+        doc.setdefault("_id", ObjectId())
+        self.docs.append(copy.deepcopy(doc))
+        return type("Result", (), {"inserted_id": doc["_id"]})()
+
+    async def find_one(self, query):
+        doc = next((d for d in self.docs if matches(d, query)), None)
+        return copy.deepcopy(doc)
+
+    def find(self, query, projection=None):
+        return FakeCursor([copy.deepcopy(d) for d in self.docs if matches(d, query)])
+
+    async def update_one(self, query, update, upsert=False):
+        await self.find_one_and_update(query, update, upsert=upsert)
+
+    async def find_one_and_update(self, query, update, projection=None, upsert=False,
+                                  return_document=ReturnDocument.BEFORE):
+        doc = next((d for d in self.docs if matches(d, query)), None)
+        if doc is None:
+            if not upsert:
+                return None
+            doc = dict(query)
+            self.docs.append(doc)
+            apply_update(doc, update)
+            return None
+        before = copy.deepcopy(doc)
+        apply_update(doc, update)
+        return before if return_document == ReturnDocument.BEFORE else copy.deepcopy(doc)
+
+    async def find_one_and_delete(self, query, projection=None):
+        doc = next((d for d in self.docs if matches(d, query)), None)
+        if doc is not None:
+            self.docs.remove(doc)
+        return doc
+
+
+def make_dao():
+    dao = TechnicalPrepDAO.__new__(TechnicalPrepDAO)
+    dao.challenges_collection = FakeCollection()
+    dao.attempts_collection = FakeCollection()
+    dao.leaderboards_collection = FakeCollection()
+    dao.user_stats_collection = FakeCollection()
+    return dao
+
+
+def recomputed_statistics(attempts):
+    """What get_user_statistics used to compute from raw attempts"""
+    completed = [a for a in attempts if a.get("status") == "completed"]
+    scores = [a.get("score", 0) for a in completed if a.get("score") is not None]
+    by_type = {}
+    for attempt in attempts:
+        by_type[attempt.get("challenge_type", "unknown")] = by_type.get(attempt.get("challenge_type", "unknown"), 0) + 1
+    return {
+        "total_attempts": len(attempts),
+        "completed_attempts": len(completed),
+        "average_score": sum(scores) / len(scores) if scores else 0,
+        "attempts_by_type": by_type,
+        "best_score": max(scores) if scores else 0,
+        "total_time_spent_minutes": sum(a.get("duration_seconds", 0) for a in completed) // 60,
+    }
+
+
+async def start(dao, uuid, challenge_id, challenge_type="coding", minutes_ago=10):
+    return await dao.create_attempt({
+        "uuid": uuid,
+        "challenge_id": challenge_id,
+        "challenge_type": challenge_type,
+        "status": "in_progress",
+        "start_time": datetime.now(timezone.utc) - timedelta(minutes=minutes_ago),
+    })
+
+
+@pytest.mark.asyncio
+async def test_counters_match_a_full_recompute():
+    dao = make_dao()
+    a1 = await start(dao, "u1", "c1")
+    a2 = await start(dao, "u1", "c2", challenge_type="system_design", minutes_ago=95)
+    await start(dao, "u1", "c1")
+    await dao.update_attempt(a1, {"score": 50.0})
+    await dao.complete_attempt(a1, 66.7, 2, 3)
+    await dao.complete_attempt(a2, 80.0, 4, 5)
+    # Completing again replaces the earlier result rather than adding to it
+    await dao.complete_attempt(a1, 100.0, 3, 3)
+
+    stats = await dao.get_user_statistics("u1")
+    recent = stats.pop("recent_attempts")
+
+    assert stats == recomputed_statistics(dao.attempts_collection.docs)
+    assert len(recent) == 3
+    assert stats["average_score"] == 90.0 and stats["total_time_spent_minutes"] == 105
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_keeps_each_users_best_score():
+    dao = make_dao()
+    first = await start(dao, "alice", "c1")
+    second = await start(dao, "alice", "c1")
+    bob = await start(dao, "bob", "c1")
+    await start(dao, "carol", "c1")
+    await start(dao, "dave", "other")
+
+    await dao.update_attempt(first, {"score": 90.0})
+    await dao.complete_attempt(second, 40.0, 2, 5)
+    await dao.complete_attempt(bob, 60.0, 3, 5)
+
+    assert await dao.get_leaderboard("c1") == [
+        {"uuid": "alice", "score": 90.0},
+        {"uuid": "bob", "score": 60.0},
+        {"uuid": "carol", "score": 0},
+    ]
+    assert await dao.get_leaderboard("c1", limit=1) == [{"uuid": "alice", "score": 90.0}]
+
+
+@pytest.mark.asyncio
+async def test_deleting_an_attempt_takes_it_out_of_the_counters():
+    dao = make_dao()
+    kept = await start(dao, "u1", "c1")
+    removed = await start(dao, "u1", "c2", challenge_type="case_study")
+    await dao.complete_attempt(kept, 70.0, 7, 10)
+    await dao.complete_attempt(removed, 30.0, 3, 10)
+
+    assert await dao.delete_attempt(removed)
+    assert not await dao.delete_attempt(str(ObjectId()))
+
+    stats = await dao.get_user_statistics("u1")
+    stats.pop("recent_attempts")
+    expected = recomputed_statistics(dao.attempts_collection.docs)
+    # Best score is a high-water mark until the next rebuild
+    assert stats.pop("best_score") == 70.0 and expected.pop("best_score") == 70.0
+    assert stats == expected
+
+
+@pytest.mark.asyncio
+async def test_user_without_attempts_gets_empty_statistics():
+    stats = await make_dao().get_user_statistics("nobody")
+
+    assert stats["total_attempts"] == 0 and stats["attempts_by_type"] == {}
@@ -0,0 +1,160 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from fastapi import HTTPException
+
+import routes.application_workflow_router as workflow_router
+from mongo.application_workflow_dao import ApplicationWorkflowDAO, parse_schedule_time
+from schema.ApplicationWorkflow import ApplicationSchedule
+
+NOW = datetime.now(timezone.utc)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def sort(self, *args):
+        return self
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeSchedules:
+    """Records the filters and pipelines the DAO sends; returns canned docs"""
+
+    def __init__(self, docs=()):
+        self.docs = list(docs)
+        self.inserted = []
+        self.queries = []
+        self.pipelines = []
+
+    async def insert_one(self, doc):
+        self.inserted.append(doc)
+        return type("Result", (), {"inserted_id": doc["_id"]})()
+
+    def find(self, query):
+        self.queries.append(query)
+        return FakeCursor(self.docs)
+
+    async def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.docs)
+
+
+@pytest.fixture
+def dao():
+    dao = ApplicationWorkflowDAO()
+    dao.schedules_collection = FakeSchedules()
+    return dao
+
+
+def test_parse_schedule_time():
+    expected = datetime(2026, 10, 20, 9, 30, tzinfo=timezone.utc)
+
+    assert parse_schedule_time("2026-10-20T09:30:00Z") == expected
+    assert parse_schedule_time("2026-10-20T11:30:00+02:00") == expected
+    assert parse_schedule_time(datetime(2026, 10, 20, 9, 30)) == expected
+    assert parse_schedule_time("next tuesday") is None and parse_schedule_time(None) is None
+
+
+@pytest.mark.asyncio
+async def test_schedules_are_stored_and_queried_as_datetimes(dao):
+    await dao.schedule_application({"uuid": "u1", "scheduled_time": "2026-10-20T09:30:00Z"})
+    await dao.get_schedules_by_time_range(NOW, NOW + timedelta(hours=1), uuid="u1")
+
+    assert dao.schedules_collection.inserted[0]["scheduled_time"] == datetime(2026, 10, 20, 9, 30, tzinfo=timezone.utc)
+    assert dao.schedules_collection.queries == [
+        {"status": "scheduled", "scheduled_time": {"$gte": NOW, "$lte": NOW + timedelta(hours=1)}, "uuid": "u1"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unparseable_schedule_time_is_rejected(dao, monkeypatch):
+    monkeypatch.setattr(workflow_router, "application_workflow_dao", dao)
+
+    with pytest.raises(HTTPException) as exc:
+        await workflow_router.schedule_application(ApplicationSchedule(scheduled_time="next tuesday"), uuid="u1")
+    assert exc.value.status_code == 400
+    with pytest.raises(ValueError):
+        await dao.schedule_application({"uuid": "u1", "scheduled_time": "next tuesday"})
+    assert dao.schedules_collection.inserted == []
+
+    await workflow_router.schedule_application(ApplicationSchedule(scheduled_time="2026-10-20T09:30:00Z"), uuid="u1")
+    assert dao.schedules_collection.inserted[0]["scheduled_time"] == datetime(2026, 10, 20, 9, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_details_join_jobs_and_packages_in_one_aggregation(dao):
+    job_id, package_id = ObjectId(), str(ObjectId())
+    dao.schedules_collection.docs = [{
+        "_id": "s1", "uuid": "u1", "status": "pending", "job_id": str(job_id), "package_id": package_id,
+        "scheduled_time": datetime(2026, 10, 20, 9, 30),
+        "job": {"_id": job_id, "title": "Engineer"}, "package": {"_id": package_id, "name": "Default"},
+    }]
+
+    (schedule,) = await dao.get_schedules_with_details("u1", NOW, NOW + timedelta(days=1), ["scheduled", "pending"])
+
+    (pipeline,) = dao.schedules_collection.pipelines
+    assert pipeline[0]["$match"] == {
+        "uuid": "u1",
+        "status": {"$in": ["scheduled", "pending"]},
+        "scheduled_time": {"$gte": NOW, "$lte": NOW + timedelta(days=1)},
+    }
+    assert [stage["$lookup"]["as"] for stage in pipeline if "$lookup" in stage] == ["_jobs", "_packages", "_packages_by_oid"]
+    assert schedule["scheduled_time"].tzinfo is timezone.utc
+    assert schedule["job"]["_id"] == str(job_id) and schedule["package"]["name"] == "Default"
+
+
+@pytest.mark.asyncio
+async def test_upcoming_and_calendar_use_the_per_user_query(monkeypatch):
+    calls = []
+
+    async def get_schedules_with_details(uuid, start_time, end_time, statuses=("scheduled",)):
+        calls.append((uuid, tuple(statuses)))
+        return [
+            {"_id": "s1", "job_id": "j1", "status": "scheduled", "scheduled_time": NOW + timedelta(hours=2),
+             "job": {"title": "Engineer", "company": {"name": "Acme"}}, "package": None},
+            {"_id": "s2", "job_id": "j2", "status": "pending", "scheduled_time": NOW + timedelta(hours=3),
+             "job": None, "package": None},
+        ]
+
+    monkeypatch.setattr(workflow_router.application_workflow_dao, "get_schedules_with_details",
+                        get_schedules_with_details)
+
+    upcoming = await workflow_router.get_upcoming_schedules(hours=24, uuid="u1")
+    calendar = await workflow_router.get_calendar_view(
+        start_date=NOW.isoformat(), end_date=(NOW + timedelta(days=1)).isoformat(), uuid="u1"
+    )
+
+    assert calls == [("u1", ("scheduled",)), ("u1", ("scheduled", "pending"))]
+    assert upcoming["count"] == 2 and round(upcoming["schedules"][0]["hours_until"]) == 2
+    # Schedules whose job is gone are left off the calendar
+    assert [(e["schedule_id"], e["company"]) for e in calendar["events"]] == [("s1", "Acme")]
+    assert calendar["events"][0]["date"] == (NOW + timedelta(hours=2)).isoformat()
+
+
+@pytest.mark.asyncio
+async def test_submission_timing_counts_every_submission(monkeypatch):
+    async def get_submissions(uuid):
+        return [
+            {"submitted_at": datetime(2026, 10, 13, 10, 5), "status": "Interview"},
+            {"submitted_at": datetime(2026, 10, 13, 10, 45), "status": "Applied"},
+            {"submitted_at": datetime(2026, 10, 17, 22, 0), "status": "Applied"},
+        ]
+
+    monkeypatch.setattr(workflow_router.jobs_dao, "get_submissions", get_submissions)
+
+    patterns = (await workflow_router.get_submission_timing_analytics(uuid="u1"))["user_patterns"]
+
+    assert patterns["submissions_by_day"] == {"Tuesday": 2, "Saturday": 1}
+    assert patterns["submissions_by_hour"] == {10: 2, 22: 1}
+    assert patterns["response_rate_by_day"] == {"Tuesday": 50.0, "Saturday": 0.0}
+    assert patterns["total_submissions"] == 3
@@ -0,0 +1,127 @@
+"""
+Compiled phrase dictionaries for the text analyzers.
+
+A Lexicon compiles a dictionary of words and phrases once, at import, into a
+single case-insensitive regex shaped like a trie (phrases sharing a prefix
+share one branch), so a text is scanned in one pass however many terms the
+dictionary has. Matches are whole words: "java" does not hit inside
+"javascript", nor "ml" inside "html". Where phrases overlap, the leftmost
+longest one wins ("node.js" over "node"), and a space in a phrase matches
+any run of whitespace. labels() also looks at hits that start inside
+another one ("worked at" in "i worked at"), since it asks what a text
+mentions rather than how often.
+
+Each term maps to a label: the canonical id a group of synonyms shares
+(skills), the replacement to suggest (weak language), or the term itself.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Hashable, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+_LEADING_NON_WORD = re.compile(r"[\W_]*")
+
+
+class Hit(NamedTuple):
+    term: str
+    label: Hashable
+    start: int
+    end: int
+
+
+def normalize_term(phrase: str) -> str:
+    """Lowercased with runs of whitespace collapsed, the form terms are stored in"""
+    return " ".join(phrase.lower().split())
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Regex for a trie node; "" marks the end of a term"""
+    branches = [
+        (r"\s+" if char == " " else re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # Greedy optional, so the longer term is tried first
+        pattern = f"(?:{pattern})?"
+    return pattern
+
+
+class Lexicon:
+    """A dictionary of terms compiled into one whole-word matcher"""
+
+    def __init__(self, terms: Union[Mapping[str, Hashable], Iterable[str]]):
+        if not isinstance(terms, Mapping):
+            terms = {term: term for term in terms}
+        self.labels_by_term: Dict[str, Hashable] = {}
+        for term, label in terms.items():
+            self.labels_by_term.setdefault(normalize_term(term), label)
+        # Label order follows the dictionary, so results are stable
+        self.label_order = list(dict.fromkeys(self.labels_by_term.values()))
+
+        trie: Dict[str, dict] = {}
+        for term in self.labels_by_term:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        body = _trie_pattern(trie) if self.labels_by_term else "(?!)"
+        # Texts are lowercased before scanning (much cheaper than IGNORECASE); the
+        # case-insensitive variants cover the rare text whose length lowercasing changes
+        self.pattern = re.compile(rf"(?<!\w)(?:{body})(?!\w)")
+        # Zero-width at every word start, so hits may overlap
+        self.overlapping_pattern = re.compile(rf"(?<!\w)(?=((?:{body}))(?!\w))")
+        self._pattern_ignorecase = re.compile(self.pattern.pattern, re.IGNORECASE)
+        self._overlapping_ignorecase = re.compile(self.overlapping_pattern.pattern, re.IGNORECASE)
+
+    @classmethod
+    def from_groups(cls, groups: Mapping[Hashable, Iterable[str]]) -> "Lexicon":
+        """{label: [synonyms]} -> a lexicon where every synonym reports its group's label"""
+        return cls({term: label for label, terms in groups.items() for term in terms})
+
+    def _prepare(self, text: str, overlapping: bool = False) -> Tuple[re.Pattern, str]:
+        """Pattern and text to scan; offsets into the scanned text are offsets into text"""
+        text = text or ""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return (self.overlapping_pattern if overlapping else self.pattern), lowered
+        return (self._overlapping_ignorecase if overlapping else self._pattern_ignorecase), text
+
+    def _hit(self, match: re.Match, group: int = 0) -> Hit:
+        term = normalize_term(match.group(group))
+        return Hit(term, self.labels_by_term[term], match.start(group), match.end(group))
+
+    def finditer(self, text: str, overlapping: bool = False) -> Iterator[Hit]:
+        """Every hit, left to right, with offsets into text; non-overlapping unless asked"""
+        pattern, scanned = self._prepare(text, overlapping)
+        group = 1 if overlapping else 0
+        for match in pattern.finditer(scanned):
+            yield self._hit(match, group)
+
+    def find_all(self, text: str) -> List[Hit]:
+        return list(self.finditer(text))
+
+    def search(self, text: str) -> Optional[Hit]:
+        pattern, scanned = self._prepare(text)
+        match = pattern.search(scanned)
+        return self._hit(match) if match else None
+
+    def starts_with(self, text: str) -> Optional[Hit]:
+        """The hit text opens with, ignoring leading spaces, bullets and punctuation"""
+        pattern, scanned = self._prepare(text)
+        match = pattern.match(scanned, _LEADING_NON_WORD.match(scanned).end())
+        return self._hit(match) if match else None
+
+    def count(self, text: str) -> int:
+        pattern, scanned = self._prepare(text)
+        return sum(1 for _ in pattern.finditer(scanned))
+
+    def term_counts(self, text: str) -> Counter:
+        return Counter(hit.term for hit in self.finditer(text))
+
+    def labels(self, text: str) -> List[Hashable]:
+        """Distinct labels found, in dictionary order"""
+        found = {hit.label for hit in self.finditer(text, overlapping=True)}
+        return [label for label in self.label_order if label in found]
@@ -0,0 +1,126 @@
+"""
+Reminder due-times for network events and referral requests.
+
+Dates arrive from the frontend as loose strings (date only, naive local
+times, ISO with or without offset). They are normalized to a UTC datetime
+once, when the document is written, and the next reminder's due time is
+stored next to it as `next_reminder_at`. The schedulers then only run an
+indexed range query for documents that are due instead of parsing every
+document every minute.
+"""
+
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+# Naive times from the frontend are Eastern (standard time)
+FRONTEND_TZ = timezone(timedelta(hours=-5))
+
+# Event reminder kind -> window (hours before the event it opens, closes)
+EVENT_REMINDER_WINDOWS = [
+    ("24h_before", 25, 24),
+    ("1h_before", 1.5, 0.5),
+]
+
+# A same-day referral reminder is still useful this long after the request time
+REFERRAL_GRACE = timedelta(hours=1)
+
+
+def _parse(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _to_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None or dt.tzinfo.utcoffset(dt) is None:
+        dt = dt.replace(tzinfo=FRONTEND_TZ)
+    return dt.astimezone(timezone.utc)
+
+
+def _as_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """Datetimes read back from Mongo are naive UTC"""
+    if dt is None:
+        return None
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def event_datetime(event_date: Any, start_time: Any = None) -> Optional[datetime]:
+    """
+    UTC start of an event from its date and optional "HH:MM[:SS]" start time.
+    Without a start time (or with an unparseable one) the event is at noon.
+    """
+    date = _parse(event_date)
+    if date is None:
+        return None
+    date = _to_utc(date)
+    if start_time:
+        if not isinstance(start_time, str):
+            return date
+        start = None
+        for fmt in ("%H:%M", "%H:%M:%S"):
+            try:
+                start = datetime.strptime(start_time, fmt).time()
+                break
+            except ValueError:
+                continue
+        start = start or time(12, 0)
+    else:
+        start = time(12, 0)
+    return datetime.combine(date.date(), start, tzinfo=FRONTEND_TZ).astimezone(timezone.utc)
+
+
+def request_datetime(request_date: Any) -> Optional[datetime]:
+    """UTC datetime of a referral request date (stored datetimes are already UTC)"""
+    if isinstance(request_date, datetime):
+        return _as_utc(request_date)
+    parsed = _parse(request_date)
+    return _to_utc(parsed) if parsed else None
+
+
+def next_event_reminder(
+    event_at: Optional[datetime], reminders_sent: Optional[Dict[str, Any]], now: datetime
+) -> Tuple[Optional[str], Optional[datetime]]:
+    """(kind, due_at) of the next unsent reminder whose window has not closed"""
+    event_at = _as_utc(event_at)
+    if event_at is None:
+        return None, None
+    sent = reminders_sent or {}
+    for kind, opens, closes in EVENT_REMINDER_WINDOWS:
+        if sent.get(kind) or now > event_at - timedelta(hours=closes):
+            continue
+        return kind, event_at - timedelta(hours=opens)
+    return None, None
+
+
+def referral_reminder_windows(request_at: datetime):
+    """24h reminder the (UTC) day before the request date, urgent one on the day"""
+    day = request_at.replace(hour=0, minute=0, second=0, microsecond=0)
+    return [
+        ("24h_before", day - timedelta(days=1), day),
+        ("same_day", day, min(day + timedelta(days=1), request_at + REFERRAL_GRACE)),
+    ]
+
+
+def next_referral_reminder(
+    request_at: Optional[datetime], status: Optional[str], reminders_sent: Optional[Dict[str, Any]], now: datetime
+) -> Tuple[Optional[str], Optional[datetime]]:
+    request_at = _as_utc(request_at)
+    if request_at is None or (status or "pending") != "pending":
+        return None, None
+    sent = reminders_sent or {}
+    for kind, opens, closes in referral_reminder_windows(request_at):
+        if sent.get(kind) or now >= closes:
+            continue
+        return kind, opens
+    return None, None
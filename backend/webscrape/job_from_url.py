@@ -1,7 +1,6 @@
 from bs4 import BeautifulSoup
-import requests, tldextract, asyncio, base64
-from playwright.sync_api import sync_playwright
-from concurrent.futures import ThreadPoolExecutor
+import requests, tldextract, base64
+from services.browser_pool import browser_pool
 
 
 # INSTALLING PLAYWRIGHT --> do ```playwright install``` in your terminal
@@ -10,26 +9,26 @@ class URLScrapeError(Exception):
     def __init__(self, message: str = "Unable to scrape this URL"):
         super().__init__(message)
 
-# Thread pool for running sync Playwright (Windows compatibility)
-_executor = ThreadPoolExecutor(max_workers=3)
+async def _block_images_and_fonts(route):
+    if route.request.resource_type in ["image", "font"]:
+        await route.abort()
+    else:
+        await route.continue_()
 
-def _scrape_with_playwright(url: str) -> str:
-    """Synchronous function that uses sync_playwright for Windows compatibility"""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-        page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "font"] else route.continue_())
-        page.goto(url, wait_until="domcontentloaded", timeout=60000)
-        html = page.content()
-        browser.close()
-        return html
+async def _fetch_page(context, url: str) -> str:
+    page = await context.new_page()
+    await page.route("**/*", _block_images_and_fonts)
+    await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    return await page.content()
+
+async def _scrape_with_playwright(url: str) -> str:
+    """Fetch a page through the shared browser pool"""
+    return await browser_pool.run(_fetch_page, url)
 
 async def job_from_url(url: str):
     ext = tldextract.extract(url)
 
-    # Run the sync playwright code in a thread pool
-    loop = asyncio.get_event_loop()
-    html = await loop.run_in_executor(_executor, _scrape_with_playwright, url)
+    html = await _scrape_with_playwright(url)
     
     try:
         if ext.domain.lower() == "indeed":
@@ -124,8 +123,7 @@ async def indeed_scrape(html: str) -> dict:
     }
 
 async def indeed_company_info(url: str):
-    loop = asyncio.get_event_loop()
-    html = await loop.run_in_executor(_executor, _scrape_with_playwright, url)
+    html = await _scrape_with_playwright(url)
 
     soup = BeautifulSoup(html, "html.parser")
 
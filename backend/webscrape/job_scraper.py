@@ -3,11 +3,9 @@ Enhanced Job Scraper for Indeed, LinkedIn, and Glassdoor
 Main entry point and shared utilities
 """
 
-import asyncio
 import logging
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import TimeoutError as PlaywrightTimeout
 from typing import Optional, Dict, Any, Tuple
-from concurrent.futures import ThreadPoolExecutor
 import traceback
 import tldextract
 from bs4 import BeautifulSoup
@@ -18,11 +16,26 @@ import re
 from .linkedin_scraper import scrape_linkedin
 from .glassdoor_scraper import scrape_glassdoor
 from .indeed_scraper import scrape_indeed
+from services.browser_pool import browser_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-_executor = ThreadPoolExecutor(max_workers=3)
+SCRAPE_CONTEXT_OPTIONS = {
+    "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    "viewport": {'width': 1920, 'height': 1080},
+    "locale": 'en-US',
+    "timezone_id": 'America/New_York',
+}
+
+# Element that shows the job posting has rendered, per platform. We wait for it
+# instead of sleeping a fixed 2 seconds after every navigation.
+_JOB_READY_SELECTORS = {
+    "indeed.com": "#jobDescriptionText, [data-testid='jobsearch-JobInfoHeader-title']",
+    "linkedin.com": ".show-more-less-html__markup, .description__text, .top-card-layout__title",
+    "glassdoor": "[class*='JobDetails_jobDescription'], [data-test='employer-name'], #JobDescriptionContainer",
+}
+READY_WAIT_MS = 5000
 
 
 class URLScrapeError(Exception):
@@ -31,162 +44,163 @@ class URLScrapeError(Exception):
         super().__init__(message)
 
 
-def _scrape_with_playwright_sync(url: str, scrape_company: bool = False) -> Tuple[str, Optional[str]]:
-    """Scrape job page and optionally company page with a fresh browser context."""
-    job_html = None
-    company_html = None
+def _ready_selector(url: str) -> Optional[str]:
+    for domain, selector in _JOB_READY_SELECTORS.items():
+        if domain in url:
+            return selector
+    return None
 
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                slow_mo=50,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox'
-                ]
-            )
 
-            # --------------------
-            # TAB 1: Job Page
-            # --------------------
-            context = browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1920, 'height': 1080},
-                locale='en-US',
-                timezone_id='America/New_York'
-            )
+async def _block_heavy_resources(route):
+    if route.request.resource_type in ["image", "font", "media"]:
+        await route.abort()
+    else:
+        await route.continue_()
 
-            job_page = context.new_page()
-            job_page.add_init_script("Object.defineProperty(navigator, 'webdriver', { get: () => undefined });")
-            job_page.route("**/*", lambda route: (
-                route.abort() if route.request.resource_type in ["image", "font", "media"]
-                else route.continue_()
-            ))
-
-            logger.info(f"📄 Fetching job page: {url}")
-            job_page.goto(url, wait_until="domcontentloaded", timeout=45000)
-            # Refresh page ONLY for Indeed to bypass initial load issues
-            if 'indeed.com' in url:
-                 job_page.reload(wait_until="domcontentloaded", timeout=45000)
-                 logger.info("🔄 Indeed job page refreshed")
-            job_page.wait_for_timeout(2000)
-            job_html = job_page.content()
-            logger.info(f"✅ Job page loaded: {job_page.title()}")
-
-            # Extract company URL based on platform
-            company_url = None
-            soup = BeautifulSoup(job_html, "html.parser")
+
+async def _wait_until_rendered(page, selector: Optional[str]) -> None:
+    """Wait for the posting to render, but never longer than READY_WAIT_MS"""
+    try:
+        if selector:
+            await page.wait_for_selector(selector, timeout=READY_WAIT_MS)
+        else:
+            await page.wait_for_load_state("load", timeout=READY_WAIT_MS)
+    except PlaywrightTimeout:
+        logger.info("⏱️ Page not fully rendered in time; using current content")
+
+
+async def _fetch_job_page(context, url: str) -> str:
+    page = await context.new_page()
+    await page.add_init_script("Object.defineProperty(navigator, 'webdriver', { get: () => undefined });")
+    await page.route("**/*", _block_heavy_resources)
+
+    logger.info(f"📄 Fetching job page: {url}")
+    await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+    # Refresh page ONLY for Indeed to bypass initial load issues
+    if 'indeed.com' in url:
+        await page.reload(wait_until="domcontentloaded", timeout=45000)
+        logger.info("🔄 Indeed job page refreshed")
+    await _wait_until_rendered(page, _ready_selector(url))
+    html = await page.content()
+    logger.info(f"✅ Job page loaded: {await page.title()}")
+    return html
+
+
+async def _fetch_company_page(context, company_url: str) -> str:
+    page = await context.new_page()
+    logger.info(f"🏢 Fetching company page: {company_url}")
+    await page.goto(company_url, wait_until="domcontentloaded", timeout=30000)
+    # Refresh page ONLY for Indeed company pages to bypass initial load issues
+    if 'indeed.com' in company_url:
+        await page.reload(wait_until="domcontentloaded", timeout=30000)
+        logger.info("🔄 Indeed company page refreshed")
+    await _wait_until_rendered(page, None)
+    html = await page.content()
+    logger.info(f"✅ Company page loaded: {len(html)} characters")
+    return html
+
+
+def _extract_company_url(job_html: str, url: str) -> Optional[str]:
+    """Find (or construct) the company profile URL on a job posting page"""
+    # Extract company URL based on platform
+    company_url = None
+    soup = BeautifulSoup(job_html, "html.parser")
+    
+    if 'linkedin.com' in url:
+        company_elem = soup.select_one(
+            'a[data-tracking-control-name="public_jobs_topcard-org-name"], a[data-tracking-control-name="public_jobs_topcard-logo"]'
+        )
+        company_url = company_elem['href'] if company_elem else None
+        if not company_url:
+            company_text_elem = soup.select_one('a.topcard__org-name-link')
+            if company_text_elem:
+                company_text = company_text_elem.get_text(strip=True).lower().replace(' ', '-')
+                company_url = f"https://www.linkedin.com/company/{company_text}"
+                logger.info(f"🏢 Constructed LinkedIn company URL: {company_url}")
             
-            if 'linkedin.com' in url:
-                company_elem = soup.select_one(
-                    'a[data-tracking-control-name="public_jobs_topcard-org-name"], a[data-tracking-control-name="public_jobs_topcard-logo"]'
-                )
-                company_url = company_elem['href'] if company_elem else None
-                if not company_url:
-                    company_text_elem = soup.select_one('a.topcard__org-name-link')
-                    if company_text_elem:
-                        company_text = company_text_elem.get_text(strip=True).lower().replace(' ', '-')
-                        company_url = f"https://www.linkedin.com/company/{company_text}"
-                        logger.info(f"🏢 Constructed LinkedIn company URL: {company_url}")
-                    
-            elif 'indeed.com' in url:
-                # First try to find the direct link
-                href = soup.select_one('[data-testid="inlineHeader-companyName"] a')
-                if href:
-                    company_url = href.get("href")
-                    logger.info(f"🏢 Found Indeed company URL: {company_url}")
-                else:
-                    # Try alternative selector
-                    company_elem = soup.select_one('[data-testid="jobsearch-CompanyInfoContainer"] a')
-                    if company_elem:
-                        company_url = company_elem.get("href")
-                        logger.info(f"🏢 Found Indeed company URL (alternative): {company_url}")
-                
-                # If no direct link found, construct from company name
-                if not company_url:
-                    company_name_elem = soup.select_one('[data-testid="inlineHeader-companyName"]') or \
-                                       soup.select_one('[data-testid="jobsearch-CompanyInfoContainer"] a')
-                    if company_name_elem:
-                        company_name = company_name_elem.get_text(strip=True)
-                        # Convert company name to URL format: spaces to hyphens, remove special chars
-                        company_slug = company_name.replace(' ', '-').replace("'", '').replace(',', '')
-                        company_url = f"https://www.indeed.com/cmp/{company_slug}"
-                        logger.info(f"🏢 Constructed Indeed company URL: {company_url}")
-                    else:
-                        logger.warning("⚠️ Could not find Indeed company name to construct URL")
+    elif 'indeed.com' in url:
+        # First try to find the direct link
+        href = soup.select_one('[data-testid="inlineHeader-companyName"] a')
+        if href:
+            company_url = href.get("href")
+            logger.info(f"🏢 Found Indeed company URL: {company_url}")
+        else:
+            # Try alternative selector
+            company_elem = soup.select_one('[data-testid="jobsearch-CompanyInfoContainer"] a')
+            if company_elem:
+                company_url = company_elem.get("href")
+                logger.info(f"🏢 Found Indeed company URL (alternative): {company_url}")
+        
+        # If no direct link found, construct from company name
+        if not company_url:
+            company_name_elem = soup.select_one('[data-testid="inlineHeader-companyName"]') or \
+                               soup.select_one('[data-testid="jobsearch-CompanyInfoContainer"] a')
+            if company_name_elem:
+                company_name = company_name_elem.get_text(strip=True)
+                # Convert company name to URL format: spaces to hyphens, remove special chars
+                company_slug = company_name.replace(' ', '-').replace("'", '').replace(',', '')
+                company_url = f"https://www.indeed.com/cmp/{company_slug}"
+                logger.info(f"🏢 Constructed Indeed company URL: {company_url}")
+            else:
+                logger.warning("⚠️ Could not find Indeed company name to construct URL")
+    
+    elif 'glassdoor.com' in url or 'glassdoor.co.uk' in url:
+        # Strategy 1: Look for the employer profile link (the exact structure you showed)
+        company_elem = soup.select_one('a.EmployerProfile_profileContainer__63w3R')
+        if company_elem:
+            company_url = company_elem.get("href")
+            if company_url:
+                if not company_url.startswith("http"):
+                    base_domain = "glassdoor.co.uk" if "glassdoor.co.uk" in url else "glassdoor.com"
+                    company_url = f"https://www.{base_domain}{company_url}"
+                logger.info(f"🏢 Found Glassdoor company URL from profile container: {company_url}")
+        
+        # Strategy 2: Try other common selectors if first fails
+        if not company_url:
+            company_elem = soup.select_one('a[href*="/Overview/Working-at-"]')
+            if company_elem:
+                company_url = company_elem.get("href")
+                if company_url and not company_url.startswith("http"):
+                    base_domain = "glassdoor.co.uk" if "glassdoor.co.uk" in url else "glassdoor.com"
+                    company_url = f"https://www.{base_domain}{company_url}"
+                logger.info(f"🏢 Found Glassdoor company URL: {company_url}")
+        
+        # Strategy 3: If still no link found, try to construct from company name
+        if not company_url:
+            company_name_elem = soup.select_one('[data-test="employer-name"]')
+            if not company_name_elem:
+                company_name_elem = soup.select_one('div.EmployerProfile_employerNameHeading__bXBYr h4')
             
-            elif 'glassdoor.com' in url or 'glassdoor.co.uk' in url:
-                # Strategy 1: Look for the employer profile link (the exact structure you showed)
-                company_elem = soup.select_one('a.EmployerProfile_profileContainer__63w3R')
-                if company_elem:
-                    company_url = company_elem.get("href")
-                    if company_url:
-                        if not company_url.startswith("http"):
-                            base_domain = "glassdoor.co.uk" if "glassdoor.co.uk" in url else "glassdoor.com"
-                            company_url = f"https://www.{base_domain}{company_url}"
-                        logger.info(f"🏢 Found Glassdoor company URL from profile container: {company_url}")
-                
-                # Strategy 2: Try other common selectors if first fails
-                if not company_url:
-                    company_elem = soup.select_one('a[href*="/Overview/Working-at-"]')
-                    if company_elem:
-                        company_url = company_elem.get("href")
-                        if company_url and not company_url.startswith("http"):
-                            base_domain = "glassdoor.co.uk" if "glassdoor.co.uk" in url else "glassdoor.com"
-                            company_url = f"https://www.{base_domain}{company_url}"
-                        logger.info(f"🏢 Found Glassdoor company URL: {company_url}")
-                
-                # Strategy 3: If still no link found, try to construct from company name
-                if not company_url:
-                    company_name_elem = soup.select_one('[data-test="employer-name"]')
-                    if not company_name_elem:
-                        company_name_elem = soup.select_one('div.EmployerProfile_employerNameHeading__bXBYr h4')
-                    
-                    if company_name_elem:
-                        company_name = company_name_elem.get_text(strip=True)
-                        # Remove rating if present
-                        company_name = re.sub(r'\d+\.\d+', '', company_name).strip()
-                        # Convert to URL slug
-                        company_slug = company_name.replace(' ', '-').replace("'", '').replace(',', '').replace('.', '')
-                        base_domain = "glassdoor.co.uk" if "glassdoor.co.uk" in url else "glassdoor.com"
-                        company_url = f"https://www.{base_domain}/Overview/Working-at-{company_slug}-EI_IE.htm"
-                        logger.info(f"🏢 Constructed Glassdoor company URL: {company_url}")
-                    else:
-                        logger.warning("⚠️ Could not find Glassdoor company name to construct URL")
-
-            # Close job page and clear context
-            job_page.close()
-            context.close()
-
-            # --------------------
-            # TAB 2: Company Page
-            # --------------------
-            if scrape_company and company_url:
-                logger.info(f"🏢 Fetching company page: {company_url}")
-                context = browser.new_context(
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    viewport={'width': 1920, 'height': 1080},
-                    locale='en-US',
-                    timezone_id='America/New_York'
-                )
-                company_page = context.new_page()
-                company_page.goto(company_url, wait_until="domcontentloaded", timeout=30000)
-                # # Refresh page ONLY for Indeed company pages to bypass initial load issues
-                if 'indeed.com' in company_url:
-                     company_page.reload(wait_until="domcontentloaded", timeout=30000)
-                     logger.info("🔄 Indeed company page refreshed")
-                company_page.wait_for_timeout(2000)
-                company_html = company_page.content()
-                logger.info(f"✅ Company page loaded: {len(company_html)} characters")
-                company_page.close()
-                context.close()
-            elif scrape_company:
-                logger.warning("⚠️ Company scraping requested but no company URL found")
-
-            browser.close()
-            return job_html, company_html
+            if company_name_elem:
+                company_name = company_name_elem.get_text(strip=True)
+                # Remove rating if present
+                company_name = re.sub(r'\d+\.\d+', '', company_name).strip()
+                # Convert to URL slug
+                company_slug = company_name.replace(' ', '-').replace("'", '').replace(',', '').replace('.', '')
+                base_domain = "glassdoor.co.uk" if "glassdoor.co.uk" in url else "glassdoor.com"
+                company_url = f"https://www.{base_domain}/Overview/Working-at-{company_slug}-EI_IE.htm"
+                logger.info(f"🏢 Constructed Glassdoor company URL: {company_url}")
+            else:
+                logger.warning("⚠️ Could not find Glassdoor company name to construct URL")
+
+    return company_url
+
+
+async def _scrape_with_playwright(url: str, scrape_company: bool = False) -> Tuple[str, Optional[str]]:
+    """Scrape job page and optionally company page, each in a fresh pooled browser context."""
+    try:
+        job_html = await browser_pool.run(_fetch_job_page, url, context_options=SCRAPE_CONTEXT_OPTIONS)
+
+        company_html = None
+        company_url = _extract_company_url(job_html, url)
+        if scrape_company and company_url:
+            company_html = await browser_pool.run(
+                _fetch_company_page, company_url, context_options=SCRAPE_CONTEXT_OPTIONS
+            )
+        elif scrape_company:
+            logger.warning("⚠️ Company scraping requested but no company URL found")
+
+        return job_html, company_html
 
     except Exception as e:
         logger.error(f"❌ Error in Playwright scraping: {e}")
@@ -202,13 +216,7 @@ async def job_from_url(url: str) -> Dict[str, Any]:
     logger.info(f"🔗 URL: {url}")
 
     try:
-        loop = asyncio.get_event_loop()
-        job_html, company_html = await loop.run_in_executor(
-            _executor,
-            _scrape_with_playwright_sync,
-            url,
-            True
-        )
+        job_html, company_html = await _scrape_with_playwright(url, scrape_company=True)
 
         if domain == "indeed":
             return await scrape_indeed(job_html, company_html, url)
@@ -166,6 +166,13 @@ class ApplicationWorkflowAPI {
     return api.get("/application-workflow/analytics/recommendations");
   }
   
+  /* Every dashboard section (funnel, rates, trends, breakdowns, ...) in one request */
+  getAnalyticsDashboard(days = 90) {
+    return api.get("/application-workflow/analytics/dashboard", {
+      params: { days }
+    });
+  }
+  
   /* UC-121: Personal Response Time Tracking */
   getPersonalResponseMetrics() {
     return api.get("/application-workflow/analytics/response-metrics");
@@ -11,8 +11,8 @@ class JobsAPI {
         return api.get(`${BASE_URL}?job_id=${jobId}`);
     }
 
-    getAll() {
-        return api.get(`${BASE_URL}/me`);
+    getAll({ summary = false } = {}) {
+        return api.get(`${BASE_URL}/me`, summary ? { params: { summary: true } } : undefined);
     }
 
     update(jobId, data) {
@@ -79,6 +79,10 @@ class JobsAPI {
     retryResearch(jobId) {
         return api.post(`${BASE_URL}/${jobId}/retry-research`);
     }
+
+    getResearchStatus(jobId) {
+        return api.get(`${BASE_URL}/${jobId}/research-status`);
+    }
 }
 
 export default new JobsAPI();
\ No newline at end of file
@@ -1,4 +1,4 @@
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import MaterialsModal from "./materials/MaterialsModal";
 import JobsAPI from "../../api/jobs";
 import ResumesAPI from "../../api/resumes";
@@ -9,7 +9,7 @@ import ProfilesAPI from "../../api/profiles";
 import LinkedEmailsTab from "./LinkedEmailsTab";
 
 export default function JobDetailsModal({
-  selectedJob,
+  selectedJob: listJob,
   setSelectedJob,
   setReminderJob,
   updateJob,    
@@ -21,11 +21,33 @@ export default function JobDetailsModal({
   readOnly = false
 }) {
 
-  console.log("SELECTED JOB:", selectedJob);
+  console.log("SELECTED JOB:", listJob);
 
   const [materialsOpen, setMaterialsOpen] = useState(false);
   const [downloading, setDownloading] = useState(null);
   const [activeTab, setActiveTab] = useState("details");
+  const [research, setResearch] = useState(null);
+
+  // The job list is loaded without research blobs; fetch them for this job
+  useEffect(() => {
+    setResearch(null);
+    if (!listJob?.id || !listJob.research_omitted) return;
+
+    let cancelled = false;
+    JobsAPI.get(listJob.id)
+      .then(res => {
+        if (cancelled || !res?.data) return;
+        setResearch({
+          company_research: res.data.company_research || null,
+          company_news: res.data.company_news || null,
+          salary_negotiation: res.data.salary_negotiation || null,
+        });
+      })
+      .catch(err => console.error("Failed to load job research:", err));
+    return () => { cancelled = true; };
+  }, [listJob?.id, listJob?.research_omitted]);
+
+  const selectedJob = listJob && research ? { ...listJob, ...research } : listJob;
 
 
   if (!selectedJob) return null;
@@ -7,7 +7,8 @@ export function useJobOperations(setJobs, setSelectedJob, setSelectedJobIds, set
     try {
       if (setLoading) setLoading(true);
 
-      const res = await JobsAPI.getAll();
+      // The list leaves out research blobs; JobDetailsModal loads them on open
+      const res = await JobsAPI.getAll({ summary: true });
 
       const transformedJobs = (res.data || []).map(job => {
         console.log("JOB FROM BACKEND:", job);
@@ -19,6 +20,7 @@ export function useJobOperations(setJobs, setSelectedJob, setSelectedJobIds, set
           companyData: job.company_data || null,
           company_news: job.company_news || null,
           company_research: job.company_research || null,
+          research_omitted: true,
           location: job.location,
           salary: job.salary,
           url: job.url,
@@ -391,15 +393,27 @@ export function useJobOperations(setJobs, setSelectedJob, setSelectedJobIds, set
     try {
       console.log(`🔄 Retrying research for job ${jobId}`);
       
-      const res = await JobsAPI.retryResearch(jobId);
-      
-      if (res && res.data) {
-        console.log(`✅ Research completed:`, res.data.updated_fields);
-        
-        await loadJobs();
-        
-        alert(`✅ Research completed successfully!\nUpdated: ${res.data.updated_fields.join(', ')}`);
+      await JobsAPI.retryResearch(jobId);
+
+      // Research runs in a background worker; poll until it settles
+      for (let i = 0; i < 60; i++) {
+        await new Promise(resolve => setTimeout(resolve, 3000));
+        const res = await JobsAPI.getResearchStatus(jobId);
+        const status = res?.data;
+
+        if (status?.state === "completed") {
+          console.log(`✅ Research completed:`, status.updated_fields);
+          await loadJobs();
+          alert(`✅ Research completed successfully!\nUpdated: ${(status.updated_fields || []).join(', ')}`);
+          return;
+        }
+        if (status?.state === "failed") {
+          alert(`Research failed: ${status.last_error || "unknown error"}`);
+          return;
+        }
       }
+
+      alert("Research is still running in the background. Refresh later to see the results.");
     } catch (error) {
       console.error("Failed to retry research:", error);
       alert(error.response?.data?.detail || "Failed to retry research. Please try again later.");
@@ -1,7 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { BarChart3, TrendingUp, Clock, Target, AlertCircle, Award, Zap, ArrowUp, ArrowDown, Briefcase, Users, Download, Plus, CheckCircle, X } from 'lucide-react';
 import ApplicationWorkflowAPI from '../../api/applicationWorkflow';
-import JobsAPI from '../../api/jobs';
 import posthog from 'posthog-js';
 
 export default function AnalyticsDashboard() {
@@ -11,7 +10,7 @@ export default function AnalyticsDashboard() {
   const [trends, setTrends] = useState(null);
   const [recommendations, setRecommendations] = useState([]);
   const [benchmarks, setBenchmarks] = useState(null);
-  const [jobs, setJobs] = useState([]);
+  const [totalJobs, setTotalJobs] = useState(0);
   const [goals, setGoals] = useState([]);
   const [loading, setLoading] = useState(true);
   const [timeRange, setTimeRange] = useState('90');
@@ -39,30 +38,26 @@ export default function AnalyticsDashboard() {
     setError(null);
     
     try {
-      // Use the imported API classes instead of direct fetch calls
-      const [funnelRes, responseRes, successRes, trendsRes, recsRes, benchRes, jobsRes, goalsRes] = await Promise.all([
-        ApplicationWorkflowAPI.getApplicationFunnel(),
-        ApplicationWorkflowAPI.getResponseTimes(),
-        ApplicationWorkflowAPI.getSuccessRates(),
-        ApplicationWorkflowAPI.getApplicationTrends(parseInt(timeRange)),
-        ApplicationWorkflowAPI.getOptimizationRecommendations(),
-        ApplicationWorkflowAPI.getPerformanceBenchmarks(),
-        JobsAPI.getAll(),
+      const [dashboardRes, goalsRes] = await Promise.all([
+        ApplicationWorkflowAPI.getAnalyticsDashboard(parseInt(timeRange)),
         ApplicationWorkflowAPI.getGoals()
       ]);
       
       // Extract data from axios responses
-      setFunnel(funnelRes.data);
-      setResponseTimes(responseRes.data);
-      setSuccessRates(successRes.data);
-      setTrends(trendsRes.data);
-      setRecommendations(recsRes.data || []);
-      setBenchmarks(benchRes.data);
-      setJobs(jobsRes.data || []);
+      const dashboard = dashboardRes.data;
+      setFunnel(dashboard.funnel);
+      setResponseTimes(dashboard.response_times);
+      setSuccessRates(dashboard.success_rates);
+      setTrends(dashboard.trends);
+      setRecommendations(dashboard.recommendations || []);
+      setBenchmarks(dashboard.benchmarks);
       setGoals(goalsRes.data || []);
 
-      // Process jobs data for additional insights
-      processJobsData(jobsRes.data || []);
+      // Industry, job type and status counts are aggregated server-side
+      setTotalJobs(dashboard.breakdowns.total_jobs);
+      setIndustryBreakdown(dashboard.breakdowns.by_industry);
+      setJobTypeBreakdown(dashboard.breakdowns.by_job_type);
+      setStatusDistribution(dashboard.breakdowns.by_status);
       
     } catch (error) {
       console.error('Failed to load analytics:', error);
@@ -72,31 +67,6 @@ export default function AnalyticsDashboard() {
     }
   };
 
-  const processJobsData = (jobsData) => {
-    // Industry breakdown
-    const industries = {};
-    const jobTypes = {};
-    const statuses = {};
-
-    jobsData.forEach(job => {
-      // Count by industry
-      const industry = job.industry || 'Unknown';
-      industries[industry] = (industries[industry] || 0) + 1;
-
-      // Count by job type
-      const jobType = job.job_type || 'Unknown';
-      jobTypes[jobType] = (jobTypes[jobType] || 0) + 1;
-
-      // Count by status - normalize status to lowercase
-      const status = (job.status || 'applied').toLowerCase();
-      statuses[status] = (statuses[status] || 0) + 1;
-    });
-
-    setIndustryBreakdown(industries);
-    setJobTypeBreakdown(jobTypes);
-    setStatusDistribution(statuses);
-  };
-
   const handleCreateGoal = async () => {
     try {
       await ApplicationWorkflowAPI.createGoal(newGoal);
@@ -203,7 +173,7 @@ export default function AnalyticsDashboard() {
         ...Object.entries(industryBreakdown).map(([industry, count]) => [
           industry,
           count,
-          `${((count / jobs.length) * 100).toFixed(1)}%`
+          `${((count / totalJobs) * 100).toFixed(1)}%`
         ]),
         [],
       ];
@@ -215,7 +185,7 @@ export default function AnalyticsDashboard() {
         ...Object.entries(jobTypeBreakdown).map(([type, count]) => [
           type,
           count,
-          `${((count / jobs.length) * 100).toFixed(1)}%`
+          `${((count / totalJobs) * 100).toFixed(1)}%`
         ]),
         [],
       ];
@@ -842,7 +812,7 @@ export default function AnalyticsDashboard() {
                   .sort((a, b) => b[1] - a[1])
                   .slice(0, 5)
                   .map(([industry, count]) => {
-                    const percentage = ((count / jobs.length) * 100).toFixed(1);
+                    const percentage = ((count / totalJobs) * 100).toFixed(1);
                     return (
                       <div key={industry}>
                         <div style={{ display: 'flex', justifyContent: 'space-between', marginBottom: '4px' }}>
@@ -898,7 +868,7 @@ export default function AnalyticsDashboard() {
                 {Object.entries(jobTypeBreakdown)
                   .sort((a, b) => b[1] - a[1])
                   .map(([type, count]) => {
-                    const percentage = ((count / jobs.length) * 100).toFixed(1);
+                    const percentage = ((count / totalJobs) * 100).toFixed(1);
                     return (
                       <div key={type}>
                         <div style={{ display: 'flex', justifyContent: 'space-between', marginBottom: '4px' }}>